@@ -0,0 +1,54 @@
+"""Add embedding_cache table
+
+Revision ID: 86
+Revises: 85
+Create Date: 2026-02-02
+
+Adds a content-addressed embedding cache keyed by (model_name, text_hash) so
+re-indexing unchanged chunk text reuses stored embeddings instead of calling
+the embedding model again.
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+from app.config import config
+
+# revision identifiers, used by Alembic.
+revision: str = "86"
+down_revision: str | None = "85"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Get embedding dimension from config
+EMBEDDING_DIM = config.embedding_dimension
+
+
+def upgrade() -> None:
+    """Create embedding_cache table."""
+
+    op.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS embedding_cache (
+            id SERIAL PRIMARY KEY,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+            model_name VARCHAR NOT NULL,
+            text_hash VARCHAR(64) NOT NULL,
+            embedding vector({EMBEDDING_DIM}),
+            CONSTRAINT uq_embedding_cache_model_text_hash UNIQUE (model_name, text_hash)
+        );
+        """
+    )
+
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_embedding_cache_created_at
+        ON embedding_cache(created_at);
+        """
+    )
+
+
+def downgrade() -> None:
+    """Drop embedding_cache table."""
+
+    op.execute("DROP TABLE IF EXISTS embedding_cache CASCADE;")
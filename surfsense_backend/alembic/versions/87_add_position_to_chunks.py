@@ -0,0 +1,39 @@
+"""Add position column to chunks
+
+Revision ID: 87
+Revises: 86
+Create Date: 2026-02-03
+
+Chunks are now diffed against the existing rows when a document changes, and
+unchanged chunks keep their row (and ID). Because newly inserted chunks can
+then have higher IDs than chunks that follow them in the document, the
+position of each chunk within its document is stored explicitly.
+Existing rows keep position NULL and continue to be ordered by ID.
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "87"
+down_revision: str | None = "86"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add position column to chunks."""
+
+    op.execute(
+        """
+        ALTER TABLE chunks
+        ADD COLUMN IF NOT EXISTS position INTEGER;
+        """
+    )
+
+
+def downgrade() -> None:
+    """Remove position column from chunks."""
+
+    op.execute("ALTER TABLE chunks DROP COLUMN IF EXISTS position;")
@@ -0,0 +1,93 @@
+"""Add stored search_vector columns for full-text search
+
+Revision ID: 88
+Revises: 87
+Create Date: 2026-02-04
+
+Keyword search used to compute to_tsvector('english', content) inline, so
+ts_rank_cd re-parsed the text of every candidate row at query time. The
+vector is now stored in a search_vector column on documents, chunks and
+surfsense_docs_chunks, kept up to date by a BEFORE INSERT/UPDATE trigger,
+backfilled here and indexed with GIN. The old expression indexes are no
+longer used by any query and are dropped.
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "88"
+down_revision: str | None = "87"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+TABLES = ("documents", "chunks", "surfsense_docs_chunks")
+
+INDEX_NAMES = {
+    "documents": "document_search_vector_index",
+    "chunks": "chucks_search_vector_index",
+    "surfsense_docs_chunks": "surfsense_docs_chunks_search_vector_index",
+}
+
+
+def upgrade() -> None:
+    """Add, backfill and index search_vector columns."""
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION update_search_vector() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector := to_tsvector('english', NEW.content);
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql;
+        """
+    )
+
+    for table in TABLES:
+        op.execute(
+            f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector;"
+        )
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_search_vector_update ON {table};")
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_search_vector_update
+            BEFORE INSERT OR UPDATE OF content ON {table}
+            FOR EACH ROW EXECUTE FUNCTION update_search_vector();
+            """
+        )
+        op.execute(
+            f"""
+            UPDATE {table}
+            SET search_vector = to_tsvector('english', content)
+            WHERE search_vector IS NULL;
+            """
+        )
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS {INDEX_NAMES[table]} "
+            f"ON {table} USING gin (search_vector);"
+        )
+
+    op.execute("DROP INDEX IF EXISTS document_search_index;")
+    op.execute("DROP INDEX IF EXISTS chucks_search_index;")
+
+
+def downgrade() -> None:
+    """Remove search_vector columns and restore the expression indexes."""
+
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS document_search_index "
+        "ON documents USING gin (to_tsvector('english', content));"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS chucks_search_index "
+        "ON chunks USING gin (to_tsvector('english', content));"
+    )
+
+    for table in TABLES:
+        op.execute(f"DROP INDEX IF EXISTS {INDEX_NAMES[table]};")
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_search_vector_update ON {table};")
+        op.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector;")
+
+    op.execute("DROP FUNCTION IF EXISTS update_search_vector();")
@@ -0,0 +1,81 @@
+"""Add denormalized search_space_id to chunks
+
+Revision ID: 89
+Revises: 88
+Create Date: 2026-02-05
+
+Vector search over chunks filters by the parent document's search space.
+With the filter only available through the documents join, small search
+spaces on large instances either lose most HNSW candidates to the filter or
+fall back to a sequential scan. chunks.search_space_id (maintained by a
+BEFORE INSERT trigger and backfilled here) lets the retrievers select a
+small search space's chunks through a B-tree index and rank them exactly.
+
+Also adds the missing index on chunks.document_id, used whenever all chunks
+of the selected documents are loaded.
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "89"
+down_revision: str | None = "88"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add, backfill and index chunks.search_space_id."""
+
+    op.execute("ALTER TABLE chunks ADD COLUMN IF NOT EXISTS search_space_id INTEGER;")
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION set_chunk_search_space_id() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_space_id := (
+                SELECT search_space_id FROM documents WHERE id = NEW.document_id
+            );
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute("DROP TRIGGER IF EXISTS chunks_search_space_id_update ON chunks;")
+    op.execute(
+        """
+        CREATE TRIGGER chunks_search_space_id_update
+        BEFORE INSERT OR UPDATE OF document_id ON chunks
+        FOR EACH ROW EXECUTE FUNCTION set_chunk_search_space_id();
+        """
+    )
+
+    op.execute(
+        """
+        UPDATE chunks
+        SET search_space_id = documents.search_space_id
+        FROM documents
+        WHERE chunks.document_id = documents.id
+          AND chunks.search_space_id IS NULL;
+        """
+    )
+
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_chunks_search_space_id "
+        "ON chunks (search_space_id);"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_chunks_document_id ON chunks (document_id);"
+    )
+
+
+def downgrade() -> None:
+    """Remove chunks.search_space_id."""
+
+    op.execute("DROP INDEX IF EXISTS ix_chunks_document_id;")
+    op.execute("DROP INDEX IF EXISTS ix_chunks_search_space_id;")
+    op.execute("DROP TRIGGER IF EXISTS chunks_search_space_id_update ON chunks;")
+    op.execute("DROP FUNCTION IF EXISTS set_chunk_search_space_id();")
+    op.execute("ALTER TABLE chunks DROP COLUMN IF EXISTS search_space_id;")
@@ -0,0 +1,37 @@
+"""Add composite (search_space_id, created_at) index to logs
+
+Revision ID: 90
+Revises: 89
+Create Date: 2026-02-12
+
+The logs summary endpoint, polled by the dashboard, aggregates one search
+space's logs over a time window and reads its newest active tasks and
+failures. With only single-column indexes Postgres has to combine the
+search_space_id and created_at indexes or scan every log of the search
+space; the composite index serves the window directly and in order.
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "90"
+down_revision: str | None = "89"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Index logs by search space and creation time."""
+
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_logs_search_space_id_created_at "
+        "ON logs (search_space_id, created_at);"
+    )
+
+
+def downgrade() -> None:
+    """Remove the logs (search_space_id, created_at) index."""
+
+    op.execute("DROP INDEX IF EXISTS ix_logs_search_space_id_created_at;")
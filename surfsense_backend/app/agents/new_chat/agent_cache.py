@@ -0,0 +1,176 @@
+"""
+Cache of compiled SurfSense deep agents.
+
+Building a deep agent discovers the search space's connectors and document
+types, builds every tool (including listing the tools of each MCP server) and
+compiles the LangGraph graph, which is a noticeable delay before the first
+token of every message. Compiled agents are therefore cached per
+(search space, LLM/prompt config, connector set, tool selection) and reused
+across messages, threads and users of the search space.
+
+Tools of a cached agent must not close over per-request objects, so the
+database session, connector service, user and thread are handed to them as
+``RequestScoped`` proxies that resolve to the objects bound for the current
+request via ``bind_request_dependencies``. Tools that need a plain value
+(e.g. an ID used in a query) unwrap it with ``resolve_request_scoped`` when
+they run.
+
+Invalidation:
+- LLM and prompt settings are part of the key, so editing an LLM config
+  builds a new agent on the next message.
+- The connector set version is a fingerprint of the search space's
+  connectors (and MCP server configs), so adding, removing or reconfiguring
+  connectors from any process changes the key.
+- Entries expire after AGENT_CACHE_TTL seconds, which bounds how long a
+  newly indexed document type can be missing from the tool descriptions.
+"""
+
+import dataclasses
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import config
+from app.db import SearchSourceConnector, SearchSourceConnectorType
+
+_request_dependencies: ContextVar[dict[str, Any] | None] = ContextVar(
+    "surfsense_agent_request_dependencies", default=None
+)
+
+# cache key -> (expires at, compiled agent)
+_agent_cache: OrderedDict[tuple, tuple[float, Any]] = OrderedDict()
+
+
+class RequestScoped:
+    """
+    Stand-in for a per-request dependency in the tools of a cached agent.
+
+    Attribute access is forwarded to the object bound under ``name`` for the
+    current request.
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+
+    def resolve(self) -> Any:
+        dependencies = _request_dependencies.get()
+        if dependencies is None or self._name not in dependencies:
+            raise RuntimeError(f"No '{self._name}' bound for the current agent request")
+        return dependencies[self._name]
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.resolve(), attr)
+
+    def __repr__(self) -> str:
+        return f"RequestScoped({self._name!r})"
+
+
+def resolve_request_scoped(value: Any) -> Any:
+    """The current request's object for a RequestScoped proxy, else ``value``."""
+    if isinstance(value, RequestScoped):
+        return value.resolve()
+    return value
+
+
+def bind_request_dependencies(**dependencies: Any) -> None:
+    """
+    Bind the per-request objects used by ``RequestScoped`` proxies.
+
+    The binding is made in the current context, so it is visible to the
+    caller and to every task the agent run starts afterwards.
+    """
+    _request_dependencies.set(dependencies)
+
+
+async def get_connector_set_version(
+    session: AsyncSession, search_space_id: int
+) -> tuple[str, list[SearchSourceConnectorType]]:
+    """
+    Fingerprint the connectors of a search space.
+
+    Args:
+        session: Database session
+        search_space_id: The search space ID
+
+    Returns:
+        Tuple of (version, connector types present in the search space)
+    """
+    result = await session.execute(
+        select(
+            SearchSourceConnector.id,
+            SearchSourceConnector.connector_type,
+            SearchSourceConnector.config,
+        )
+        .filter(SearchSourceConnector.search_space_id == search_space_id)
+        .order_by(SearchSourceConnector.id)
+    )
+
+    fingerprint = []
+    connector_types: list[SearchSourceConnectorType] = []
+    for connector_id, connector_type, connector_config in result:
+        if connector_type not in connector_types:
+            connector_types.append(connector_type)
+        # Only MCP configs change the agent's tools; other configs hold
+        # credentials that are refreshed during indexing
+        server_config = (
+            (connector_config or {}).get("server_config")
+            if connector_type == SearchSourceConnectorType.MCP_CONNECTOR
+            else None
+        )
+        fingerprint.append([connector_id, str(connector_type), server_config])
+
+    version = hashlib.sha256(
+        json.dumps(fingerprint, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+    return version, connector_types
+
+
+def fingerprint_agent_config(agent_config: Any) -> str | None:
+    """Stable hash of an AgentConfig's LLM and prompt settings."""
+    if agent_config is None:
+        return None
+    return hashlib.sha256(
+        json.dumps(
+            dataclasses.asdict(agent_config), sort_keys=True, default=str
+        ).encode("utf-8")
+    ).hexdigest()
+
+
+def get_cached_agent(cache_key: tuple) -> Any | None:
+    """Get a cached agent that has not expired yet."""
+    cached = _agent_cache.get(cache_key)
+    if cached is None:
+        return None
+    if cached[0] <= time.monotonic():
+        _agent_cache.pop(cache_key, None)
+        return None
+    _agent_cache.move_to_end(cache_key)
+    return cached[1]
+
+
+def store_cached_agent(cache_key: tuple, agent: Any) -> None:
+    """Cache an agent, evicting the least recently used ones over the limit."""
+    _agent_cache[cache_key] = (time.monotonic() + config.AGENT_CACHE_TTL, agent)
+    _agent_cache.move_to_end(cache_key)
+    while len(_agent_cache) > config.AGENT_CACHE_MAX_SIZE:
+        _agent_cache.popitem(last=False)
+
+
+def invalidate_agent_cache(search_space_id: int | None = None) -> None:
+    """
+    Drop cached agents.
+
+    Args:
+        search_space_id: Only drop the agents of this search space (all if None)
+    """
+    if search_space_id is None:
+        _agent_cache.clear()
+        return
+    for cache_key in [key for key in _agent_cache if key[0] == search_space_id]:
+        _agent_cache.pop(cache_key, None)
@@ -6,6 +6,7 @@ with configurable tools via the tools registry and configurable prompts
 via NewLLMConfig.
 """
 
+import logging
 from collections.abc import Sequence
 from typing import Any
 
@@ -15,6 +16,14 @@ from langchain_core.tools import BaseTool
 from langgraph.types import Checkpointer
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.agents.new_chat.agent_cache import (
+    RequestScoped,
+    bind_request_dependencies,
+    fingerprint_agent_config,
+    get_cached_agent,
+    get_connector_set_version,
+    store_cached_agent,
+)
 from app.agents.new_chat.context import SurfSenseContextSchema
 from app.agents.new_chat.llm_config import AgentConfig
 from app.agents.new_chat.system_prompt import (
@@ -22,6 +31,7 @@ from app.agents.new_chat.system_prompt import (
     build_surfsense_system_prompt,
 )
 from app.agents.new_chat.tools.registry import build_tools_async
+from app.config import config
 from app.services.connector_service import ConnectorService
 
 # =============================================================================
@@ -148,6 +158,11 @@ async def create_surfsense_deep_agent(
     - Custom system instructions (or use defaults)
     - Citation toggle (enable/disable citation requirements)
 
+    Compiled agents are cached (see agent_cache.py); each call binds this
+    request's db_session and connector_service and returns a cached agent
+    when the search space, user, thread, agent_config, connectors and tool
+    selection are unchanged.
+
     Args:
         llm: ChatLiteLLM instance for the agent's language model
         search_space_id: The user's search space ID
@@ -204,38 +219,72 @@ async def create_surfsense_deep_agent(
             additional_tools=[my_custom_tool]
         )
     """
+    # Tools reach the request's session, connector service, user and thread
+    # through RequestScoped proxies, so a compiled agent can be reused across
+    # requests, threads and users
+    bind_request_dependencies(
+        db_session=db_session,
+        connector_service=connector_service,
+        user_id=user_id,
+        thread_id=thread_id,
+    )
+
     # Discover available connectors and document types for this search space
     # This enables dynamic tool docstrings that inform the LLM about what's actually available
     available_connectors: list[str] | None = None
     available_document_types: list[str] | None = None
+    connector_set_version: str | None = None
 
     try:
         # Get enabled search source connectors for this search space
-        connector_types = await connector_service.get_available_connectors(
-            search_space_id
+        connector_set_version, connector_types = await get_connector_set_version(
+            db_session, search_space_id
         )
         if connector_types:
             # Convert enum values to strings and also include mapped document types
             available_connectors = _map_connectors_to_searchable_types(connector_types)
+    except Exception as e:
+        # Log but don't fail - fall back to all connectors if discovery fails
+        logging.warning(f"Failed to discover available connectors: {e}")
+
+    # Agents with caller-provided tools, an unknown LLM config or an unknown
+    # connector set are never cached
+    cache_key = None
+    if (
+        config.AGENT_CACHE_ENABLED
+        and agent_config is not None
+        and connector_set_version is not None
+        and not additional_tools
+    ):
+        cache_key = (
+            search_space_id,
+            fingerprint_agent_config(agent_config),
+            connector_set_version,
+            firecrawl_api_key,
+            tuple(sorted(enabled_tools)) if enabled_tools is not None else None,
+            tuple(sorted(disabled_tools or [])),
+            id(checkpointer),
+        )
+        agent = get_cached_agent(cache_key)
+        if agent is not None:
+            return agent
 
+    try:
         # Get document types that have at least one document indexed
         available_document_types = await connector_service.get_available_document_types(
             search_space_id
         )
     except Exception as e:
-        # Log but don't fail - fall back to all connectors if discovery fails
-        import logging
-
-        logging.warning(f"Failed to discover available connectors/document types: {e}")
+        logging.warning(f"Failed to discover available document types: {e}")
 
     # Build dependencies dict for the tools registry
     dependencies = {
         "search_space_id": search_space_id,
-        "db_session": db_session,
-        "connector_service": connector_service,
+        "db_session": RequestScoped("db_session"),
+        "connector_service": RequestScoped("connector_service"),
         "firecrawl_api_key": firecrawl_api_key,
-        "user_id": user_id,  # Required for memory tools
-        "thread_id": thread_id,  # For podcast tool
+        "user_id": RequestScoped("user_id"),  # Required for memory tools
+        "thread_id": RequestScoped("thread_id"),  # For podcast tool
         # Dynamic connector/document type discovery for knowledge base tool
         "available_connectors": available_connectors,
         "available_document_types": available_document_types,
@@ -271,4 +320,7 @@ async def create_surfsense_deep_agent(
         checkpointer=checkpointer,
     )
 
+    if cache_key is not None:
+        store_cached_agent(cache_key, agent)
+
     return agent
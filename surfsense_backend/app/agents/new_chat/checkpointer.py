@@ -3,15 +3,22 @@ PostgreSQL-based checkpointer for LangGraph agents.
 
 This module provides a persistent checkpointer using AsyncPostgresSaver
 that stores conversation state in the PostgreSQL database.
+
+The saver is backed by a psycopg connection pool (CHECKPOINTER_POOL_MIN_SIZE /
+CHECKPOINTER_POOL_MAX_SIZE), so concurrent chat streams do not serialize their
+checkpoint reads and writes on a single connection.
 """
 
 from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+from langgraph.types import Durability
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
 
 from app.config import config
 
 # Global checkpointer instance (initialized lazily)
 _checkpointer: AsyncPostgresSaver | None = None
-_checkpointer_context = None  # Store the context manager for cleanup
+_checkpointer_pool: AsyncConnectionPool | None = None
 _checkpointer_initialized: bool = False
 
 
@@ -50,14 +57,26 @@ async def get_checkpointer() -> AsyncPostgresSaver:
     Returns:
         AsyncPostgresSaver: The configured checkpointer instance
     """
-    global _checkpointer, _checkpointer_context, _checkpointer_initialized
+    global _checkpointer, _checkpointer_pool, _checkpointer_initialized
 
     if _checkpointer is None:
-        conn_string = get_postgres_connection_string()
-        # from_conn_string returns an async context manager
-        # We need to enter the context to get the actual checkpointer
-        _checkpointer_context = AsyncPostgresSaver.from_conn_string(conn_string)
-        _checkpointer = await _checkpointer_context.__aenter__()
+        # Same connection settings AsyncPostgresSaver.from_conn_string uses
+        pool = AsyncConnectionPool(
+            conninfo=get_postgres_connection_string(),
+            min_size=config.CHECKPOINTER_POOL_MIN_SIZE,
+            max_size=max(
+                config.CHECKPOINTER_POOL_MIN_SIZE, config.CHECKPOINTER_POOL_MAX_SIZE
+            ),
+            kwargs={
+                "autocommit": True,
+                "prepare_threshold": 0,
+                "row_factory": dict_row,
+            },
+            open=False,
+        )
+        await pool.open()
+        _checkpointer_pool = pool
+        _checkpointer = AsyncPostgresSaver(pool)
 
     # Setup tables on first call (idempotent)
     if not _checkpointer_initialized:
@@ -67,6 +86,27 @@ async def get_checkpointer() -> AsyncPostgresSaver:
     return _checkpointer
 
 
+def get_checkpoint_durability() -> Durability:
+    """
+    Get the LangGraph durability mode for agent runs.
+
+    - "async" (default): each super-step is checkpointed in the background
+      while the next one runs.
+    - "sync": each super-step is checkpointed before the next one starts.
+    - "exit": intermediate checkpoints and task writes are coalesced in
+      memory and persisted once, when the run finishes, is interrupted or
+      fails. Fewest database round trips, but a crashed process loses the
+      progress of the run in flight.
+
+    Returns:
+        The durability mode to pass to the graph's stream/invoke call
+    """
+    durability = config.CHECKPOINT_DURABILITY
+    if durability not in ("sync", "async", "exit"):
+        return "async"
+    return durability
+
+
 async def setup_checkpointer_tables() -> None:
     """
     Explicitly setup the checkpointer tables.
@@ -80,15 +120,15 @@ async def setup_checkpointer_tables() -> None:
 
 async def close_checkpointer() -> None:
     """
-    Close the checkpointer connection.
+    Close the checkpointer connection pool.
 
     This should be called during application shutdown.
     """
-    global _checkpointer, _checkpointer_context, _checkpointer_initialized
+    global _checkpointer, _checkpointer_pool, _checkpointer_initialized
 
-    if _checkpointer_context is not None:
-        await _checkpointer_context.__aexit__(None, None, None)
+    if _checkpointer_pool is not None:
+        await _checkpointer_pool.close()
         _checkpointer = None
-        _checkpointer_context = None
+        _checkpointer_pool = None
         _checkpointer_initialized = False
-        print("[Checkpointer] PostgreSQL connection closed")
+        print("[Checkpointer] PostgreSQL connection pool closed")
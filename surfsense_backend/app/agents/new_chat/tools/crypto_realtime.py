@@ -18,7 +18,7 @@ from typing import Any
 
 from langchain_core.tools import tool
 
-from app.connectors.dexscreener_connector import DexScreenerConnector
+from app.connectors.dexscreener_connector import get_dexscreener_connector
 
 logger = logging.getLogger(__name__)
 
@@ -75,8 +75,8 @@ def create_get_live_token_price_tool():
         token_id = generate_token_id(chain, token_address)
         
         try:
-            # Initialize DexScreener connector
-            connector = DexScreenerConnector()
+            # Shared connector: reuses its HTTP connection and cached responses
+            connector = get_dexscreener_connector()
             
             # Fetch live data from API
             pairs, error = await connector.get_token_pairs(chain, token_address)
@@ -198,8 +198,8 @@ def create_get_live_token_data_tool():
         token_id = generate_token_id(chain, token_address)
 
         try:
-            # Initialize DexScreener connector
-            connector = DexScreenerConnector()
+            # Shared connector: reuses its HTTP connection and cached responses
+            connector = get_dexscreener_connector()
 
             # Fetch live data from API
             pairs, error = await connector.get_token_pairs(chain, token_address)
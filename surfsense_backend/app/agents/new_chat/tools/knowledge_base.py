@@ -8,6 +8,7 @@ This module provides:
 - Tool factory for creating search_knowledge_base tools
 """
 
+import asyncio
 import json
 from datetime import datetime
 from typing import Any
@@ -59,6 +60,14 @@ _ALL_CONNECTORS: list[str] = [
     "COMPOSIO_GOOGLE_CALENDAR_CONNECTOR",
 ]
 
+# Connectors backed by live web search APIs rather than indexed documents
+_WEB_SEARCH_CONNECTORS: set[str] = {
+    "TAVILY_API",
+    "SEARXNG_API",
+    "LINKUP_API",
+    "BAIDU_SEARCH_API",
+}
+
 # Human-readable descriptions for each connector type
 # Used for generating dynamic docstrings and informing the LLM
 CONNECTOR_DESCRIPTIONS: dict[str, str] = {
@@ -304,6 +313,342 @@ def format_documents_for_context(documents: list[dict[str, Any]]) -> str:
 # =============================================================================
 
 
+async def _search_connector(
+    connector_service: ConnectorService,
+    connector: str,
+    query: str,
+    search_space_id: int,
+    top_k: int,
+    start_date: datetime | None,
+    end_date: datetime | None,
+) -> list[dict[str, Any]]:
+    """
+    Search a single connector and return its documents.
+
+    Args:
+        connector_service: Initialized connector service
+        connector: Canonical connector type to search
+        query: The search query
+        search_space_id: The user's search space ID
+        top_k: Number of results to return
+        start_date: Start datetime (UTC) for filtering documents
+        end_date: End datetime (UTC) for filtering documents
+
+    Returns:
+        Documents found for the connector
+    """
+    if connector == "YOUTUBE_VIDEO":
+        _, chunks = await connector_service.search_youtube(
+            user_query=query,
+            search_space_id=search_space_id,
+            top_k=top_k,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        return chunks
+
+    elif connector == "EXTENSION":
+        _, chunks = await connector_service.search_extension(
+            user_query=query,
+            search_space_id=search_space_id,
+            top_k=top_k,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        return chunks
+
+    elif connector == "CRAWLED_URL":
+        _, chunks = await connector_service.search_crawled_urls(
+            user_query=query,
+            search_space_id=search_space_id,
+            top_k=top_k,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        return chunks
+
+    elif connector == "FILE":
+        _, chunks = await connector_service.search_files(
+            user_query=query,
+            search_space_id=search_space_id,
+            top_k=top_k,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        return chunks
+
+    elif connector == "SLACK_CONNECTOR":
+        _, chunks = await connector_service.search_slack(
+            user_query=query,
+            search_space_id=search_space_id,
+            top_k=top_k,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        return chunks
+
+    elif connector == "TEAMS_CONNECTOR":
+        _, chunks = await connector_service.search_teams(
+            user_query=query,
+            search_space_id=search_space_id,
+            top_k=top_k,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        return chunks
+
+    elif connector == "NOTION_CONNECTOR":
+        _, chunks = await connector_service.search_notion(
+            user_query=query,
+            search_space_id=search_space_id,
+            top_k=top_k,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        return chunks
+
+    elif connector == "GITHUB_CONNECTOR":
+        _, chunks = await connector_service.search_github(
+            user_query=query,
+            search_space_id=search_space_id,
+            top_k=top_k,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        return chunks
+
+    elif connector == "LINEAR_CONNECTOR":
+        _, chunks = await connector_service.search_linear(
+            user_query=query,
+            search_space_id=search_space_id,
+            top_k=top_k,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        return chunks
+
+    elif connector == "TAVILY_API":
+        _, chunks = await connector_service.search_tavily(
+            user_query=query,
+            search_space_id=search_space_id,
+            top_k=top_k,
+        )
+        return chunks
+
+    elif connector == "SEARXNG_API":
+        _, chunks = await connector_service.search_searxng(
+            user_query=query,
+            search_space_id=search_space_id,
+            top_k=top_k,
+        )
+        return chunks
+
+    elif connector == "LINKUP_API":
+        # Keep behavior aligned with researcher: default "standard"
+        _, chunks = await connector_service.search_linkup(
+            user_query=query,
+            search_space_id=search_space_id,
+            mode="standard",
+        )
+        return chunks
+
+    elif connector == "BAIDU_SEARCH_API":
+        _, chunks = await connector_service.search_baidu(
+            user_query=query,
+            search_space_id=search_space_id,
+            top_k=top_k,
+        )
+        return chunks
+
+    elif connector == "DISCORD_CONNECTOR":
+        _, chunks = await connector_service.search_discord(
+            user_query=query,
+            search_space_id=search_space_id,
+            top_k=top_k,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        return chunks
+
+    elif connector == "JIRA_CONNECTOR":
+        _, chunks = await connector_service.search_jira(
+            user_query=query,
+            search_space_id=search_space_id,
+            top_k=top_k,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        return chunks
+
+    elif connector == "GOOGLE_CALENDAR_CONNECTOR":
+        _, chunks = await connector_service.search_google_calendar(
+            user_query=query,
+            search_space_id=search_space_id,
+            top_k=top_k,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        return chunks
+
+    elif connector == "AIRTABLE_CONNECTOR":
+        _, chunks = await connector_service.search_airtable(
+            user_query=query,
+            search_space_id=search_space_id,
+            top_k=top_k,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        return chunks
+
+    elif connector == "GOOGLE_GMAIL_CONNECTOR":
+        _, chunks = await connector_service.search_google_gmail(
+            user_query=query,
+            search_space_id=search_space_id,
+            top_k=top_k,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        return chunks
+
+    elif connector == "GOOGLE_DRIVE_FILE":
+        _, chunks = await connector_service.search_google_drive(
+            user_query=query,
+            search_space_id=search_space_id,
+            top_k=top_k,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        return chunks
+
+    elif connector == "CONFLUENCE_CONNECTOR":
+        _, chunks = await connector_service.search_confluence(
+            user_query=query,
+            search_space_id=search_space_id,
+            top_k=top_k,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        return chunks
+
+    elif connector == "CLICKUP_CONNECTOR":
+        _, chunks = await connector_service.search_clickup(
+            user_query=query,
+            search_space_id=search_space_id,
+            top_k=top_k,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        return chunks
+
+    elif connector == "LUMA_CONNECTOR":
+        _, chunks = await connector_service.search_luma(
+            user_query=query,
+            search_space_id=search_space_id,
+            top_k=top_k,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        return chunks
+
+    elif connector == "ELASTICSEARCH_CONNECTOR":
+        _, chunks = await connector_service.search_elasticsearch(
+            user_query=query,
+            search_space_id=search_space_id,
+            top_k=top_k,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        return chunks
+
+    elif connector == "NOTE":
+        _, chunks = await connector_service.search_notes(
+            user_query=query,
+            search_space_id=search_space_id,
+            top_k=top_k,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        return chunks
+
+    elif connector == "BOOKSTACK_CONNECTOR":
+        _, chunks = await connector_service.search_bookstack(
+            user_query=query,
+            search_space_id=search_space_id,
+            top_k=top_k,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        return chunks
+
+    elif connector == "CIRCLEBACK":
+        _, chunks = await connector_service.search_circleback(
+            user_query=query,
+            search_space_id=search_space_id,
+            top_k=top_k,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        return chunks
+
+    elif connector == "OBSIDIAN_CONNECTOR":
+        _, chunks = await connector_service.search_obsidian(
+            user_query=query,
+            search_space_id=search_space_id,
+            top_k=top_k,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        return chunks
+
+    elif connector == "DEXSCREENER_CONNECTOR":
+        _, chunks = await connector_service.search_dexscreener(
+            user_query=query,
+            search_space_id=search_space_id,
+            top_k=top_k,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        print(f"[DEBUG] DexScreener search returned {len(chunks)} chunks")
+        if chunks:
+            print(f"[DEBUG] First chunk metadata: {chunks[0].get('document', {}).get('metadata', {})}")
+        return chunks
+
+    # =========================================================
+    # Composio Connectors
+    # =========================================================
+    elif connector == "COMPOSIO_GOOGLE_DRIVE_CONNECTOR":
+        _, chunks = await connector_service.search_composio_google_drive(
+            user_query=query,
+            search_space_id=search_space_id,
+            top_k=top_k,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        return chunks
+
+    elif connector == "COMPOSIO_GMAIL_CONNECTOR":
+        _, chunks = await connector_service.search_composio_gmail(
+            user_query=query,
+            search_space_id=search_space_id,
+            top_k=top_k,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        return chunks
+
+    elif connector == "COMPOSIO_GOOGLE_CALENDAR_CONNECTOR":
+        _, chunks = await connector_service.search_composio_google_calendar(
+            user_query=query,
+            search_space_id=search_space_id,
+            top_k=top_k,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        return chunks
+
+    return []
+
+
 async def search_knowledge_base_async(
     query: str,
     search_space_id: int,
@@ -347,320 +692,60 @@ async def search_knowledge_base_async(
 
     connectors = _normalize_connectors(connectors_to_search, available_connectors)
 
-    for connector in connectors:
-        try:
-            if connector == "YOUTUBE_VIDEO":
-                _, chunks = await connector_service.search_youtube(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                    start_date=resolved_start_date,
-                    end_date=resolved_end_date,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "EXTENSION":
-                _, chunks = await connector_service.search_extension(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                    start_date=resolved_start_date,
-                    end_date=resolved_end_date,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "CRAWLED_URL":
-                _, chunks = await connector_service.search_crawled_urls(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                    start_date=resolved_start_date,
-                    end_date=resolved_end_date,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "FILE":
-                _, chunks = await connector_service.search_files(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                    start_date=resolved_start_date,
-                    end_date=resolved_end_date,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "SLACK_CONNECTOR":
-                _, chunks = await connector_service.search_slack(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                    start_date=resolved_start_date,
-                    end_date=resolved_end_date,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "TEAMS_CONNECTOR":
-                _, chunks = await connector_service.search_teams(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                    start_date=resolved_start_date,
-                    end_date=resolved_end_date,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "NOTION_CONNECTOR":
-                _, chunks = await connector_service.search_notion(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                    start_date=resolved_start_date,
-                    end_date=resolved_end_date,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "GITHUB_CONNECTOR":
-                _, chunks = await connector_service.search_github(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                    start_date=resolved_start_date,
-                    end_date=resolved_end_date,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "LINEAR_CONNECTOR":
-                _, chunks = await connector_service.search_linear(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                    start_date=resolved_start_date,
-                    end_date=resolved_end_date,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "TAVILY_API":
-                _, chunks = await connector_service.search_tavily(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                )
-                all_documents.extend(chunks)
+    web_connectors = [c for c in connectors if c in _WEB_SEARCH_CONNECTORS]
+    document_types = [c for c in connectors if c not in _WEB_SEARCH_CONNECTORS]
 
-            elif connector == "SEARXNG_API":
-                _, chunks = await connector_service.search_searxng(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "LINKUP_API":
-                # Keep behavior aligned with researcher: default "standard"
-                _, chunks = await connector_service.search_linkup(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    mode="standard",
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "BAIDU_SEARCH_API":
-                _, chunks = await connector_service.search_baidu(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "DISCORD_CONNECTOR":
-                _, chunks = await connector_service.search_discord(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                    start_date=resolved_start_date,
-                    end_date=resolved_end_date,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "JIRA_CONNECTOR":
-                _, chunks = await connector_service.search_jira(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                    start_date=resolved_start_date,
-                    end_date=resolved_end_date,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "GOOGLE_CALENDAR_CONNECTOR":
-                _, chunks = await connector_service.search_google_calendar(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                    start_date=resolved_start_date,
-                    end_date=resolved_end_date,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "AIRTABLE_CONNECTOR":
-                _, chunks = await connector_service.search_airtable(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                    start_date=resolved_start_date,
-                    end_date=resolved_end_date,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "GOOGLE_GMAIL_CONNECTOR":
-                _, chunks = await connector_service.search_google_gmail(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                    start_date=resolved_start_date,
-                    end_date=resolved_end_date,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "GOOGLE_DRIVE_FILE":
-                _, chunks = await connector_service.search_google_drive(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                    start_date=resolved_start_date,
-                    end_date=resolved_end_date,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "CONFLUENCE_CONNECTOR":
-                _, chunks = await connector_service.search_confluence(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                    start_date=resolved_start_date,
-                    end_date=resolved_end_date,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "CLICKUP_CONNECTOR":
-                _, chunks = await connector_service.search_clickup(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                    start_date=resolved_start_date,
-                    end_date=resolved_end_date,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "LUMA_CONNECTOR":
-                _, chunks = await connector_service.search_luma(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                    start_date=resolved_start_date,
-                    end_date=resolved_end_date,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "ELASTICSEARCH_CONNECTOR":
-                _, chunks = await connector_service.search_elasticsearch(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                    start_date=resolved_start_date,
-                    end_date=resolved_end_date,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "NOTE":
-                _, chunks = await connector_service.search_notes(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                    start_date=resolved_start_date,
-                    end_date=resolved_end_date,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "BOOKSTACK_CONNECTOR":
-                _, chunks = await connector_service.search_bookstack(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                    start_date=resolved_start_date,
-                    end_date=resolved_end_date,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "CIRCLEBACK":
-                _, chunks = await connector_service.search_circleback(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                    start_date=resolved_start_date,
-                    end_date=resolved_end_date,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "OBSIDIAN_CONNECTOR":
-                _, chunks = await connector_service.search_obsidian(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                    start_date=resolved_start_date,
-                    end_date=resolved_end_date,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "DEXSCREENER_CONNECTOR":
-                _, chunks = await connector_service.search_dexscreener(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                    start_date=resolved_start_date,
-                    end_date=resolved_end_date,
-                )
-                print(f"[DEBUG] DexScreener search returned {len(chunks)} chunks")
-                if chunks:
-                    print(f"[DEBUG] First chunk metadata: {chunks[0].get('document', {}).get('metadata', {})}")
-                all_documents.extend(chunks)
-
-            # =========================================================
-            # Composio Connectors
-            # =========================================================
-            elif connector == "COMPOSIO_GOOGLE_DRIVE_CONNECTOR":
-                _, chunks = await connector_service.search_composio_google_drive(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                    start_date=resolved_start_date,
-                    end_date=resolved_end_date,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "COMPOSIO_GMAIL_CONNECTOR":
-                _, chunks = await connector_service.search_composio_gmail(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                    start_date=resolved_start_date,
-                    end_date=resolved_end_date,
-                )
-                all_documents.extend(chunks)
-
-            elif connector == "COMPOSIO_GOOGLE_CALENDAR_CONNECTOR":
-                _, chunks = await connector_service.search_composio_google_calendar(
-                    user_query=query,
-                    search_space_id=search_space_id,
-                    top_k=top_k,
-                    start_date=resolved_start_date,
-                    end_date=resolved_end_date,
-                )
-                all_documents.extend(chunks)
+    async def _prefetch() -> None:
+        # Rank every indexed document type in one pass up front; the
+        # per-connector searches then only format the prefetched results.
+        if len(document_types) < 2:
+            return
+        try:
+            await connector_service.prefetch_combined_search(
+                query_text=query,
+                search_space_id=search_space_id,
+                document_types=document_types,
+                top_k=top_k,
+                start_date=resolved_start_date,
+                end_date=resolved_end_date,
+            )
+        except Exception as e:
+            print(f"Error prefetching knowledge base search: {e}")
 
+    async def _search(connector: str) -> list[dict[str, Any]]:
+        try:
+            return await _search_connector(
+                connector_service,
+                connector,
+                query,
+                search_space_id,
+                top_k,
+                resolved_start_date,
+                resolved_end_date,
+            )
         except Exception as e:
             print(f"Error searching connector {connector}: {e}")
-            continue
+            return []
+
+    if connector_service.supports_concurrent_search:
+        # Every search checks out its own session, so the web searches run
+        # while the local document types are being ranked and formatted
+        async def _search_local() -> list[list[dict[str, Any]]]:
+            await _prefetch()
+            return await asyncio.gather(*(_search(c) for c in document_types))
+
+        web_results, local_results = await asyncio.gather(
+            asyncio.gather(*(_search(c) for c in web_connectors)),
+            _search_local(),
+        )
+        results_by_connector = dict(zip(web_connectors, web_results, strict=True))
+        results_by_connector.update(zip(document_types, local_results, strict=True))
+        for connector in connectors:
+            all_documents.extend(results_by_connector[connector])
+    else:
+        await _prefetch()
+        for connector in connectors:
+            all_documents.extend(await _search(connector))
 
     # Deduplicate by content hash
     seen_doc_ids: set[Any] = set()
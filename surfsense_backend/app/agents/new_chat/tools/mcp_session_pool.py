@@ -0,0 +1,459 @@
+"""MCP Session Pool.
+
+Keeps one long-lived MCP session per configured server (per process), so chat
+turns do not spawn a stdio server or open an HTTP session just to list tools,
+and tool calls do not open yet another session.
+
+- Each session is owned by a background task, because the MCP transports are
+  anyio context managers that must be entered and exited in the same task.
+  Tool calls from any task are multiplexed over the shared ClientSession.
+- Sessions idle for longer than MCP_HEALTH_CHECK_INTERVAL are pinged before
+  reuse; dead sessions are reconnected with exponential backoff, and a server
+  that keeps failing is not retried until its cooldown has passed.
+- Sessions unused for MCP_SESSION_IDLE_TIMEOUT seconds are closed.
+- Tool definitions are cached for MCP_TOOLS_CACHE_TTL seconds, and dropped
+  early when the server sends a tools/list_changed notification.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from collections.abc import Callable
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from dataclasses import dataclass
+from typing import Any
+
+import anyio
+from mcp import ClientSession, types
+from mcp.client.stdio import StdioServerParameters, stdio_client
+from mcp.client.streamable_http import streamablehttp_client
+
+from app.agents.new_chat.tools.mcp_client import MAX_RETRIES, RETRY_BACKOFF, RETRY_DELAY
+from app.config import config
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait for a server to start and initialize its session
+CONNECT_TIMEOUT = 30.0
+# Longest cooldown before reconnecting to a server that keeps failing
+MAX_RECONNECT_COOLDOWN = 300.0
+
+# Errors raised when writing a request to a transport that is already closed;
+# the server never received the request, so it is safe to send it again
+_SEND_ERRORS = (anyio.ClosedResourceError, anyio.BrokenResourceError)
+# Errors raised when the transport under a pooled session has gone away
+_CONNECTION_ERRORS = (*_SEND_ERRORS, anyio.EndOfStream, ConnectionError)
+
+
+@dataclass(frozen=True)
+class MCPServer:
+    """An MCP server the pool can connect to.
+
+    Attributes:
+        key: Identity of the server and its configuration
+        label: Human-readable name for logs
+        transport: "stdio" or "http"
+        open_streams: Opens the transport and yields its (read, write) streams
+    """
+
+    key: str
+    label: str
+    transport: str
+    open_streams: Callable[[], AbstractAsyncContextManager[tuple[Any, Any]]]
+
+
+def _server_key(connector_id: int, server_config: dict[str, Any]) -> str:
+    config_hash = hashlib.sha256(
+        json.dumps(server_config, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()[:16]
+    return f"{connector_id}:{config_hash}"
+
+
+def stdio_server(
+    connector_id: int,
+    command: str,
+    args: list[str],
+    env: dict[str, str] | None = None,
+) -> MCPServer:
+    """Describe a stdio MCP server (spawned as a subprocess)."""
+
+    @asynccontextmanager
+    async def open_streams():
+        server_env = os.environ.copy()
+        server_env.update(env or {})
+        server_params = StdioServerParameters(
+            command=command, args=args, env=server_env
+        )
+        async with stdio_client(server=server_params) as (read, write):
+            yield read, write
+
+    return MCPServer(
+        key=_server_key(
+            connector_id, {"command": command, "args": args, "env": env or {}}
+        ),
+        label=f"{command} {' '.join(args)}".strip(),
+        transport="stdio",
+        open_streams=open_streams,
+    )
+
+
+def http_server(
+    connector_id: int, url: str, headers: dict[str, str] | None = None
+) -> MCPServer:
+    """Describe a remote MCP server reached over streamable HTTP."""
+
+    @asynccontextmanager
+    async def open_streams():
+        async with streamablehttp_client(url, headers=headers or {}) as (
+            read,
+            write,
+            _,
+        ):
+            yield read, write
+
+    return MCPServer(
+        key=_server_key(connector_id, {"url": url, "headers": headers or {}}),
+        label=url,
+        transport="http",
+        open_streams=open_streams,
+    )
+
+
+def _tool_definitions(response: types.ListToolsResult) -> list[dict[str, Any]]:
+    return [
+        {
+            "name": tool.name,
+            "description": tool.description or "",
+            "input_schema": tool.inputSchema if hasattr(tool, "inputSchema") else {},
+        }
+        for tool in response.tools
+    ]
+
+
+def _tool_result_text(response: types.CallToolResult) -> str:
+    result = []
+    for content in response.content:
+        if hasattr(content, "text"):
+            result.append(content.text)
+        elif hasattr(content, "data"):
+            result.append(str(content.data))
+        else:
+            result.append(str(content))
+    return "\n".join(result) if result else ""
+
+
+class _PooledConnection:
+    """A session kept open by its own background task."""
+
+    def __init__(self, server: MCPServer, on_tools_changed: Callable[[], None]):
+        self.server = server
+        self.session: ClientSession | None = None
+        self.last_used = time.monotonic()
+        self._on_tools_changed = on_tools_changed
+        self._ready = asyncio.Event()
+        self._closing = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._error: BaseException | None = None
+
+    @property
+    def is_alive(self) -> bool:
+        return (
+            self.session is not None
+            and self._task is not None
+            and not self._task.done()
+        )
+
+    async def _handle_message(self, message: Any) -> None:
+        if isinstance(message, types.ServerNotification) and isinstance(
+            message.root, types.ToolListChangedNotification
+        ):
+            logger.info(f"MCP server '{self.server.label}' changed its tool list")
+            self._on_tools_changed()
+
+    async def _run(self) -> None:
+        try:
+            async with (
+                self.server.open_streams() as (read, write),
+                ClientSession(
+                    read, write, message_handler=self._handle_message
+                ) as session,
+            ):
+                await session.initialize()
+                self.session = session
+                self._ready.set()
+                await self._closing.wait()
+        except Exception as e:
+            self._error = e
+            logger.warning(f"MCP session to '{self.server.label}' ended: {e!s}")
+        finally:
+            self.session = None
+            self._ready.set()
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+        try:
+            await asyncio.wait_for(self._ready.wait(), CONNECT_TIMEOUT)
+        except TimeoutError:
+            await self.close()
+            raise TimeoutError(
+                f"MCP server '{self.server.label}' did not start within "
+                f"{CONNECT_TIMEOUT:.0f}s"
+            ) from None
+        if self.session is None:
+            raise RuntimeError(
+                f"Failed to connect to MCP server '{self.server.label}': {self._error}"
+            ) from self._error
+
+    async def close(self) -> None:
+        self._closing.set()
+        if self._task is not None and not self._task.done():
+            try:
+                await asyncio.wait_for(self._task, CONNECT_TIMEOUT)
+            except TimeoutError:
+                self._task.cancel()
+
+
+class MCPSessionPool:
+    """Per-process pool of warm MCP sessions with a tool definition cache."""
+
+    def __init__(self):
+        self._connections: dict[str, _PooledConnection] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        # server key -> (expires at, tool definitions)
+        self._tools_cache: dict[str, tuple[float, list[dict[str, Any]]]] = {}
+        # server key -> (consecutive failures, no reconnect before)
+        self._failures: dict[str, tuple[int, float]] = {}
+        self._reaper: asyncio.Task | None = None
+
+    def _invalidate_tools(self, server_key: str) -> None:
+        self._tools_cache.pop(server_key, None)
+
+    async def _connect(self, server: MCPServer) -> _PooledConnection:
+        failures, retry_at = self._failures.get(server.key, (0, 0.0))
+        now = time.monotonic()
+        if now < retry_at:
+            raise RuntimeError(
+                f"MCP server '{server.label}' is unavailable, next reconnect "
+                f"attempt in {retry_at - now:.0f}s"
+            )
+
+        delay = RETRY_DELAY
+        last_error: Exception | None = None
+        for attempt in range(MAX_RETRIES):
+            connection = _PooledConnection(
+                server, lambda: self._invalidate_tools(server.key)
+            )
+            try:
+                await connection.start()
+                self._failures.pop(server.key, None)
+                logger.info(
+                    f"Connected to MCP server '{server.label}' "
+                    f"({server.transport}, attempt {attempt + 1})"
+                )
+                return connection
+            except Exception as e:
+                last_error = e
+                if attempt < MAX_RETRIES - 1:
+                    logger.warning(
+                        f"MCP server connection failed (attempt {attempt + 1}/"
+                        f"{MAX_RETRIES}): {e!s}. Retrying in {delay:.1f}s..."
+                    )
+                    await asyncio.sleep(delay)
+                    delay *= RETRY_BACKOFF
+
+        failures += 1
+        cooldown = min(MAX_RECONNECT_COOLDOWN, RETRY_DELAY * RETRY_BACKOFF**failures)
+        self._failures[server.key] = (failures, time.monotonic() + cooldown)
+        raise RuntimeError(
+            f"Failed to connect to MCP server '{server.label}' after "
+            f"{MAX_RETRIES} attempts: {last_error}"
+        ) from last_error
+
+    async def _is_healthy(self, connection: _PooledConnection) -> bool:
+        if not connection.is_alive:
+            return False
+        idle = time.monotonic() - connection.last_used
+        if idle < config.MCP_HEALTH_CHECK_INTERVAL:
+            return True
+        try:
+            await asyncio.wait_for(connection.session.send_ping(), CONNECT_TIMEOUT)
+            return True
+        except Exception as e:
+            logger.warning(
+                f"MCP server '{connection.server.label}' failed health check: {e!s}"
+            )
+            return False
+
+    def _ensure_reaper(self) -> None:
+        if self._reaper is None or self._reaper.done():
+            self._reaper = asyncio.create_task(self._reap_idle())
+
+    async def _reap_idle(self) -> None:
+        while self._connections:
+            await asyncio.sleep(max(1, config.MCP_SESSION_IDLE_TIMEOUT // 4))
+            await self.evict_idle()
+
+    def _lock(self, server: MCPServer) -> asyncio.Lock:
+        return self._locks.setdefault(server.key, asyncio.Lock())
+
+    async def _discard(self, server: MCPServer, session: ClientSession) -> None:
+        """Close the server's pooled connection after ``session`` failed."""
+        async with self._lock(server):
+            connection = self._connections.get(server.key)
+            if connection is None:
+                return
+            if connection.session is not session and connection.is_alive:
+                # Another caller already replaced the failed session
+                return
+            del self._connections[server.key]
+            await connection.close()
+
+    async def get_session(self, server: MCPServer) -> ClientSession:
+        """
+        Get the warm session for a server, connecting if needed.
+
+        Args:
+            server: The MCP server
+
+        Returns:
+            An initialized ClientSession
+
+        Raises:
+            RuntimeError: If the server cannot be reached
+        """
+        async with self._lock(server):
+            connection = self._connections.get(server.key)
+            if connection is not None and not await self._is_healthy(connection):
+                del self._connections[server.key]
+                await connection.close()
+                connection = None
+
+            if connection is None:
+                connection = await self._connect(server)
+                self._connections[server.key] = connection
+                self._ensure_reaper()
+
+            connection.last_used = time.monotonic()
+            return connection.session
+
+    async def list_tools(self, server: MCPServer) -> list[dict[str, Any]]:
+        """
+        List a server's tools, served from cache while fresh.
+
+        Args:
+            server: The MCP server
+
+        Returns:
+            Tool definitions with name, description and input_schema
+        """
+        cached = self._tools_cache.get(server.key)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+
+        session = await self.get_session(server)
+        try:
+            response = await session.list_tools()
+        except _CONNECTION_ERRORS:
+            await self._discard(server, session)
+            session = await self.get_session(server)
+            response = await session.list_tools()
+
+        tool_definitions = _tool_definitions(response)
+        self._tools_cache[server.key] = (
+            time.monotonic() + config.MCP_TOOLS_CACHE_TTL,
+            tool_definitions,
+        )
+        logger.info(
+            f"Listed {len(tool_definitions)} tools from MCP server '{server.label}'"
+        )
+        return tool_definitions
+
+    async def call_tool(
+        self, server: MCPServer, tool_name: str, arguments: dict[str, Any]
+    ) -> str:
+        """
+        Call a tool over the server's pooled session.
+
+        A call that fails because the session's transport was already closed
+        when the request was written is retried once on a fresh session.
+        Calls that fail after the request may have reached the server are
+        not retried, since tools can have side effects; the session is
+        discarded so the next call reconnects.
+
+        Args:
+            server: The MCP server
+            tool_name: Name of the tool to call
+            arguments: Arguments to pass to the tool
+
+        Returns:
+            The tool's text output
+        """
+        session = await self.get_session(server)
+        try:
+            try:
+                response = await session.call_tool(tool_name, arguments=arguments)
+            except _SEND_ERRORS:
+                await self._discard(server, session)
+                session = await self.get_session(server)
+                response = await session.call_tool(tool_name, arguments=arguments)
+            except _CONNECTION_ERRORS:
+                await self._discard(server, session)
+                raise
+        except RuntimeError as e:
+            # Some MCP servers (like server-memory) return extra fields not in
+            # their schema
+            if "Invalid structured content" in str(e):
+                logger.warning(
+                    f"MCP server returned data not matching its schema, "
+                    f"but continuing: {e!s}"
+                )
+                return "Operation completed (server returned unexpected format)"
+            raise
+
+        result = _tool_result_text(response)
+        logger.info(f"MCP tool '{tool_name}' succeeded: {result[:200]}")
+        return result
+
+    async def evict_idle(self) -> None:
+        """Close sessions that have not been used for MCP_SESSION_IDLE_TIMEOUT."""
+        cutoff = time.monotonic() - config.MCP_SESSION_IDLE_TIMEOUT
+        for key, connection in list(self._connections.items()):
+            if connection.last_used < cutoff or not connection.is_alive:
+                logger.info(f"Closing idle MCP session '{connection.server.label}'")
+                self._connections.pop(key, None)
+                await connection.close()
+
+    async def close_all(self) -> None:
+        """Close every pooled session."""
+        if self._reaper is not None:
+            self._reaper.cancel()
+            self._reaper = None
+        connections = list(self._connections.values())
+        self._connections.clear()
+        self._tools_cache.clear()
+        await asyncio.gather(
+            *(connection.close() for connection in connections),
+            return_exceptions=True,
+        )
+
+
+_pool: MCPSessionPool | None = None
+
+
+def get_mcp_session_pool() -> MCPSessionPool:
+    """Get the process-wide MCP session pool."""
+    global _pool
+    if _pool is None:
+        _pool = MCPSessionPool()
+    return _pool
+
+
+async def close_mcp_session_pool() -> None:
+    """Close the process-wide MCP session pool (application shutdown)."""
+    global _pool
+    if _pool is not None:
+        await _pool.close_all()
+        _pool = None
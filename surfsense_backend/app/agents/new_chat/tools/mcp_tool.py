@@ -8,19 +8,25 @@ Supports both transport types:
 - streamable-http/http/sse: Remote HTTP-based MCP servers (url, headers)
 
 This implements real MCP protocol support similar to Cursor's implementation.
+
+Sessions and tool definitions are pooled per process by mcp_session_pool.py,
+so loading tools for a chat turn normally does not touch the MCP servers.
 """
 
 import logging
 from typing import Any
 
 from langchain_core.tools import StructuredTool
-from mcp import ClientSession
-from mcp.client.streamable_http import streamablehttp_client
 from pydantic import BaseModel, create_model
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.agents.new_chat.tools.mcp_client import MCPClient
+from app.agents.new_chat.tools.mcp_session_pool import (
+    MCPServer,
+    get_mcp_session_pool,
+    http_server,
+    stdio_server,
+)
 from app.db import SearchSourceConnector, SearchSourceConnectorType
 
 logger = logging.getLogger(__name__)
@@ -71,15 +77,19 @@ def _create_dynamic_input_model_from_schema(
     return create_model(model_name, **field_definitions)
 
 
-async def _create_mcp_tool_from_definition_stdio(
+def _create_mcp_tool_from_definition(
     tool_def: dict[str, Any],
-    mcp_client: MCPClient,
+    server: MCPServer,
+    metadata: dict[str, Any] | None = None,
 ) -> StructuredTool:
-    """Create a LangChain tool from an MCP tool definition (stdio transport).
+    """Create a LangChain tool from an MCP tool definition.
+
+    Calls are made over the server's pooled session (see mcp_session_pool.py).
 
     Args:
         tool_def: Tool definition from MCP server with name, description, input_schema
-        mcp_client: MCP client instance for calling the tool
+        server: The MCP server that provides the tool
+        metadata: Extra tool metadata
 
     Returns:
         LangChain StructuredTool instance
@@ -90,20 +100,17 @@ async def _create_mcp_tool_from_definition_stdio(
     input_schema = tool_def.get("input_schema", {"type": "object", "properties": {}})
 
     # Log the actual schema for debugging
-    logger.info(f"MCP tool '{tool_name}' input schema: {input_schema}")
+    logger.debug(f"MCP tool '{tool_name}' input schema: {input_schema}")
 
     # Create dynamic input model from schema
     input_model = _create_dynamic_input_model_from_schema(tool_name, input_schema)
 
     async def mcp_tool_call(**kwargs) -> str:
-        """Execute the MCP tool call via the client with retry support."""
+        """Execute the MCP tool call over the pooled session."""
         logger.info(f"MCP tool '{tool_name}' called with params: {kwargs}")
 
         try:
-            # Connect to server and call tool (connect has built-in retry logic)
-            async with mcp_client.connect():
-                result = await mcp_client.call_tool(tool_name, kwargs)
-                return str(result)
+            return await get_mcp_session_pool().call_tool(server, tool_name, kwargs)
         except RuntimeError as e:
             # Connection failures after all retries
             error_msg = f"MCP tool '{tool_name}' connection failed after retries: {e!s}"
@@ -122,89 +129,48 @@ async def _create_mcp_tool_from_definition_stdio(
         coroutine=mcp_tool_call,
         args_schema=input_model,
         # Store the original MCP schema as metadata so we can access it later
-        metadata={"mcp_input_schema": input_schema, "mcp_transport": "stdio"},
+        metadata={
+            "mcp_input_schema": input_schema,
+            "mcp_transport": server.transport,
+            **(metadata or {}),
+        },
     )
 
-    logger.info(f"Created MCP tool (stdio): '{tool_name}'")
+    logger.debug(f"Created MCP tool ({server.transport}): '{tool_name}'")
     return tool
 
 
-async def _create_mcp_tool_from_definition_http(
-    tool_def: dict[str, Any],
-    url: str,
-    headers: dict[str, str],
-) -> StructuredTool:
-    """Create a LangChain tool from an MCP tool definition (HTTP transport).
+async def _load_server_tools(
+    connector_id: int,
+    server: MCPServer,
+    metadata: dict[str, Any] | None = None,
+) -> list[StructuredTool]:
+    """Create LangChain tools for every tool an MCP server offers.
 
     Args:
-        tool_def: Tool definition from MCP server with name, description, input_schema
-        url: URL of the MCP server
-        headers: HTTP headers for authentication
+        connector_id: Connector ID for logging
+        server: The MCP server
+        metadata: Extra metadata for each tool
 
     Returns:
-        LangChain StructuredTool instance
-
+        List of tools from the MCP server
     """
-    tool_name = tool_def.get("name", "unnamed_tool")
-    tool_description = tool_def.get("description", "No description provided")
-    input_schema = tool_def.get("input_schema", {"type": "object", "properties": {}})
-
-    # Log the actual schema for debugging
-    logger.info(f"MCP HTTP tool '{tool_name}' input schema: {input_schema}")
-
-    # Create dynamic input model from schema
-    input_model = _create_dynamic_input_model_from_schema(tool_name, input_schema)
+    tools: list[StructuredTool] = []
 
-    async def mcp_http_tool_call(**kwargs) -> str:
-        """Execute the MCP tool call via HTTP transport."""
-        logger.info(f"MCP HTTP tool '{tool_name}' called with params: {kwargs}")
+    # Tool definitions are cached by the pool, so this only reaches the
+    # server when the cache is cold or the server changed its tools
+    tool_definitions = await get_mcp_session_pool().list_tools(server)
 
+    for tool_def in tool_definitions:
         try:
-            async with (
-                streamablehttp_client(url, headers=headers) as (read, write, _),
-                ClientSession(read, write) as session,
-            ):
-                await session.initialize()
-
-                # Call the tool
-                response = await session.call_tool(tool_name, arguments=kwargs)
-
-                # Extract content from response
-                result = []
-                for content in response.content:
-                    if hasattr(content, "text"):
-                        result.append(content.text)
-                    elif hasattr(content, "data"):
-                        result.append(str(content.data))
-                    else:
-                        result.append(str(content))
-
-                result_str = "\n".join(result) if result else ""
-                logger.info(
-                    f"MCP HTTP tool '{tool_name}' succeeded: {result_str[:200]}"
-                )
-                return result_str
-
+            tools.append(_create_mcp_tool_from_definition(tool_def, server, metadata))
         except Exception as e:
-            error_msg = f"MCP HTTP tool '{tool_name}' execution failed: {e!s}"
-            logger.exception(error_msg)
-            return f"Error: {error_msg}"
-
-    # Create StructuredTool
-    tool = StructuredTool(
-        name=tool_name,
-        description=tool_description,
-        coroutine=mcp_http_tool_call,
-        args_schema=input_model,
-        metadata={
-            "mcp_input_schema": input_schema,
-            "mcp_transport": "http",
-            "mcp_url": url,
-        },
-    )
+            logger.exception(
+                f"Failed to create tool '{tool_def.get('name')}' "
+                f"from connector {connector_id}: {e!s}"
+            )
 
-    logger.info(f"Created MCP tool (HTTP): '{tool_name}'")
-    return tool
+    return tools
 
 
 async def _load_stdio_mcp_tools(
@@ -222,15 +188,13 @@ async def _load_stdio_mcp_tools(
     Returns:
         List of tools from the MCP server
     """
-    tools: list[StructuredTool] = []
-
     # Validate required command field
     command = server_config.get("command")
     if not command or not isinstance(command, str):
         logger.warning(
             f"MCP connector {connector_id} (name: '{connector_name}') missing or invalid command field, skipping"
         )
-        return tools
+        return []
 
     # Validate args field (must be list if present)
     args = server_config.get("args", [])
@@ -238,7 +202,7 @@ async def _load_stdio_mcp_tools(
         logger.warning(
             f"MCP connector {connector_id} (name: '{connector_name}') has invalid args field (must be list), skipping"
         )
-        return tools
+        return []
 
     # Validate env field (must be dict if present)
     env = server_config.get("env", {})
@@ -246,32 +210,11 @@ async def _load_stdio_mcp_tools(
         logger.warning(
             f"MCP connector {connector_id} (name: '{connector_name}') has invalid env field (must be dict), skipping"
         )
-        return tools
-
-    # Create MCP client
-    mcp_client = MCPClient(command, args, env)
-
-    # Connect and discover tools
-    async with mcp_client.connect():
-        tool_definitions = await mcp_client.list_tools()
-
-        logger.info(
-            f"Discovered {len(tool_definitions)} tools from stdio MCP server "
-            f"'{command}' (connector {connector_id})"
-        )
-
-    # Create LangChain tools from definitions
-    for tool_def in tool_definitions:
-        try:
-            tool = await _create_mcp_tool_from_definition_stdio(tool_def, mcp_client)
-            tools.append(tool)
-        except Exception as e:
-            logger.exception(
-                f"Failed to create tool '{tool_def.get('name')}' "
-                f"from connector {connector_id}: {e!s}"
-            )
+        return []
 
-    return tools
+    return await _load_server_tools(
+        connector_id, stdio_server(connector_id, command, args, env)
+    )
 
 
 async def _load_http_mcp_tools(
@@ -289,15 +232,13 @@ async def _load_http_mcp_tools(
     Returns:
         List of tools from the MCP server
     """
-    tools: list[StructuredTool] = []
-
     # Validate required url field
     url = server_config.get("url")
     if not url or not isinstance(url, str):
         logger.warning(
             f"MCP connector {connector_id} (name: '{connector_name}') missing or invalid url field, skipping"
         )
-        return tools
+        return []
 
     # Validate headers field (must be dict if present)
     headers = server_config.get("headers", {})
@@ -305,54 +246,19 @@ async def _load_http_mcp_tools(
         logger.warning(
             f"MCP connector {connector_id} (name: '{connector_name}') has invalid headers field (must be dict), skipping"
         )
-        return tools
+        return []
 
-    # Connect and discover tools via HTTP
     try:
-        async with (
-            streamablehttp_client(url, headers=headers) as (read, write, _),
-            ClientSession(read, write) as session,
-        ):
-            await session.initialize()
-
-            # List available tools
-            response = await session.list_tools()
-            tool_definitions = []
-            for tool in response.tools:
-                tool_definitions.append(
-                    {
-                        "name": tool.name,
-                        "description": tool.description or "",
-                        "input_schema": tool.inputSchema
-                        if hasattr(tool, "inputSchema")
-                        else {},
-                    }
-                )
-
-            logger.info(
-                f"Discovered {len(tool_definitions)} tools from HTTP MCP server "
-                f"'{url}' (connector {connector_id})"
-            )
-
-        # Create LangChain tools from definitions
-        for tool_def in tool_definitions:
-            try:
-                tool = await _create_mcp_tool_from_definition_http(
-                    tool_def, url, headers
-                )
-                tools.append(tool)
-            except Exception as e:
-                logger.exception(
-                    f"Failed to create HTTP tool '{tool_def.get('name')}' "
-                    f"from connector {connector_id}: {e!s}"
-                )
-
+        return await _load_server_tools(
+            connector_id,
+            http_server(connector_id, url, headers),
+            metadata={"mcp_url": url},
+        )
     except Exception as e:
         logger.exception(
             f"Failed to connect to HTTP MCP server at '{url}' (connector {connector_id}): {e!s}"
         )
-
-    return tools
+        return []
 
 
 async def load_mcp_tools(
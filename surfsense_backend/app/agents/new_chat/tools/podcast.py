@@ -18,6 +18,7 @@ import redis
 from langchain_core.tools import tool
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.agents.new_chat.agent_cache import RequestScoped, resolve_request_scoped
 from app.db import Podcast, PodcastStatus
 
 # Redis connection for tracking active podcast tasks
@@ -62,7 +63,7 @@ def set_generating_podcast(search_space_id: int, podcast_id: int) -> None:
 def create_generate_podcast_tool(
     search_space_id: int,
     db_session: AsyncSession,
-    thread_id: int | None = None,
+    thread_id: int | RequestScoped | None = None,
 ):
     """
     Factory function to create the generate_podcast tool with injected dependencies.
@@ -73,7 +74,8 @@ def create_generate_podcast_tool(
     Args:
         search_space_id: The user's search space ID
         db_session: Database session for creating the podcast record
-        thread_id: The chat thread ID for associating the podcast
+        thread_id: The chat thread ID for associating the podcast, or a proxy
+            resolved to the current request's thread when the tool runs
 
     Returns:
         A configured tool function for generating podcasts
@@ -125,7 +127,7 @@ def create_generate_podcast_tool(
                 title=podcast_title,
                 status=PodcastStatus.PENDING,
                 search_space_id=search_space_id,
-                thread_id=thread_id,
+                thread_id=resolve_request_scoped(thread_id),
             )
             db_session.add(podcast)
             await db_session.commit()
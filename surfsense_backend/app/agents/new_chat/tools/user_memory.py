@@ -17,8 +17,9 @@ from langchain_core.tools import tool
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.config import config
+from app.agents.new_chat.agent_cache import RequestScoped, resolve_request_scoped
 from app.db import MemoryCategory, UserMemory
+from app.services.embedding_service import get_embedding_service
 
 logger = logging.getLogger(__name__)
 
@@ -112,7 +113,7 @@ def format_memories_for_context(memories: list[dict[str, Any]]) -> str:
 
 
 def create_save_memory_tool(
-    user_id: str,
+    user_id: str | RequestScoped,
     search_space_id: int,
     db_session: AsyncSession,
 ):
@@ -120,7 +121,8 @@ def create_save_memory_tool(
     Factory function to create the save_memory tool.
 
     Args:
-        user_id: The user's UUID
+        user_id: The user's UUID, or a proxy resolved to the current request's
+            user when the tool runs
         search_space_id: The search space ID (for space-specific memories)
         db_session: Database session for executing queries
 
@@ -165,20 +167,21 @@ def create_save_memory_tool(
         if category not in valid_categories:
             category = "fact"
 
+        current_user_id = resolve_request_scoped(user_id)
         try:
             # Convert user_id to UUID
-            uuid_user_id = _to_uuid(user_id)
+            uuid_user_id = _to_uuid(current_user_id)
 
             # Check if we've hit the memory limit
             memory_count = await get_user_memory_count(
-                db_session, user_id, search_space_id
+                db_session, current_user_id, search_space_id
             )
             if memory_count >= MAX_MEMORIES_PER_USER:
                 # Delete oldest memory to make room
-                await delete_oldest_memory(db_session, user_id, search_space_id)
+                await delete_oldest_memory(db_session, current_user_id, search_space_id)
 
             # Generate embedding for the memory
-            embedding = config.embedding_model_instance.embed(content)
+            embedding = await get_embedding_service().embed_text(content)
 
             # Create new memory using ORM
             # The pgvector Vector column type handles embedding conversion automatically
@@ -203,7 +206,7 @@ def create_save_memory_tool(
             }
 
         except Exception as e:
-            logger.exception(f"Failed to save memory for user {user_id}: {e}")
+            logger.exception(f"Failed to save memory for user {current_user_id}: {e}")
             # Rollback the session to clear any failed transaction state
             await db_session.rollback()
             return {
@@ -216,7 +219,7 @@ def create_save_memory_tool(
 
 
 def create_recall_memory_tool(
-    user_id: str,
+    user_id: str | RequestScoped,
     search_space_id: int,
     db_session: AsyncSession,
 ):
@@ -224,7 +227,8 @@ def create_recall_memory_tool(
     Factory function to create the recall_memory tool.
 
     Args:
-        user_id: The user's UUID
+        user_id: The user's UUID, or a proxy resolved to the current request's
+            user when the tool runs
         search_space_id: The search space ID
         db_session: Database session for executing queries
 
@@ -262,13 +266,14 @@ def create_recall_memory_tool(
         """
         top_k = min(max(top_k, 1), 20)  # Clamp between 1 and 20
 
+        current_user_id = resolve_request_scoped(user_id)
         try:
             # Convert user_id to UUID
-            uuid_user_id = _to_uuid(user_id)
+            uuid_user_id = _to_uuid(current_user_id)
 
             if query:
                 # Semantic search using embeddings
-                query_embedding = config.embedding_model_instance.embed(query)
+                query_embedding = await get_embedding_service().embed_query(query)
 
                 # Build query with vector similarity
                 stmt = (
@@ -340,7 +345,9 @@ def create_recall_memory_tool(
             }
 
         except Exception as e:
-            logger.exception(f"Failed to recall memories for user {user_id}: {e}")
+            logger.exception(
+                f"Failed to recall memories for user {current_user_id}: {e}"
+            )
             await db_session.rollback()
             return {
                 "status": "error",
@@ -10,7 +10,7 @@ from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_core.runnables import RunnableConfig
 from litellm import aspeech
 
-from app.config import config as app_config
+from app.config import config as app_config, ensure_ffmpeg_installed
 from app.services.kokoro_tts_service import get_kokoro_tts_service
 from app.services.llm_service import get_document_summary_llm
 
@@ -198,6 +198,8 @@ async def create_merged_podcast_audio(
 
     # Merge audio files using ffmpeg
     try:
+        ensure_ffmpeg_installed()
+
         # Create FFmpeg instance with the first input
         ffmpeg = FFmpeg().option("y")
 
@@ -9,7 +9,9 @@ from app.agents.new_chat.checkpointer import (
     close_checkpointer,
     setup_checkpointer_tables,
 )
+from app.agents.new_chat.tools.mcp_session_pool import close_mcp_session_pool
 from app.config import config, initialize_llm_router
+from app.connectors.dexscreener_connector import close_dexscreener_client
 from app.db import User, create_db_and_tables, get_async_session
 from app.routes import router as crud_router
 from app.schemas import UserCreate, UserRead, UserUpdate
@@ -30,6 +32,10 @@ async def lifespan(app: FastAPI):
     yield
     # Cleanup: close checkpointer connection on shutdown
     await close_checkpointer()
+    # Stop pooled MCP server sessions
+    await close_mcp_session_pool()
+    # Close the shared DexScreener HTTP client
+    await close_dexscreener_client()
 
 
 def registration_allowed():
@@ -79,6 +79,7 @@ celery_app = Celery(
         "app.tasks.celery_tasks.schedule_checker_task",
         "app.tasks.celery_tasks.blocknote_migration_tasks",
         "app.tasks.celery_tasks.document_reindex_tasks",
+        "app.tasks.celery_tasks.embedding_cache_tasks",
     ],
 )
 
@@ -121,4 +122,12 @@ celery_app.conf.beat_schedule = {
             "expires": 30,  # Task expires after 30 seconds if not picked up
         },
     },
+    # Drop embedding cache entries past EMBEDDING_CACHE_RETENTION_DAYS once a day
+    "cleanup-embedding-cache": {
+        "task": "cleanup_embedding_cache",
+        "schedule": crontab(minute="30", hour="3"),
+        "options": {
+            "expires": 3600,
+        },
+    },
 }
@@ -1,11 +1,11 @@
+import json
 import os
 import shutil
+import threading
 from pathlib import Path
 
 import yaml
-from chonkie import AutoEmbeddings, CodeChunker, RecursiveChunker
 from dotenv import load_dotenv
-from rerankers import Reranker
 
 # Get the base directory of the project
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
@@ -24,6 +24,89 @@ def is_ffmpeg_installed():
     return shutil.which("ffmpeg") is not None
 
 
+_ffmpeg_checked = False
+
+
+def ensure_ffmpeg_installed():
+    """
+    Make sure an ffmpeg binary is available, installing a static build on
+    first use if needed. Only the features that shell out to ffmpeg (the
+    podcaster) call this, so other processes never pay for the check.
+
+    Raises:
+        ValueError: If ffmpeg is still not available afterwards
+    """
+    global _ffmpeg_checked
+    if _ffmpeg_checked:
+        return
+
+    if not is_ffmpeg_installed():
+        import static_ffmpeg
+
+        # ffmpeg installed on first call to add_paths(), threadsafe.
+        static_ffmpeg.add_paths()
+        # check if ffmpeg is installed again
+        if not is_ffmpeg_installed():
+            raise ValueError(
+                "FFmpeg is not installed on the system. Please install it to use the Surfsense Podcaster."
+            )
+    _ffmpeg_checked = True
+
+
+# Embedding dimensions already read from a loaded model, keyed by model name,
+# so later processes (Alembic, Celery beat, ...) can build the Vector column
+# types without loading the model
+EMBEDDING_DIMENSION_CACHE_FILE = BASE_DIR / ".cache" / "embedding_dimensions.json"
+# Likewise for max_seq_length, which sets the chunk size. Written by whichever
+# process loads the model, so embedding server clients chunk like the server
+EMBEDDING_MAX_SEQ_LENGTH_CACHE_FILE = (
+    BASE_DIR / ".cache" / "embedding_max_seq_lengths.json"
+)
+
+# Chunk size used when the embedding model's max_seq_length is unknown
+DEFAULT_CHUNK_SIZE = 512
+
+
+def _read_model_cache(path: Path, model_name: str) -> int | None:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f).get(model_name)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_model_cache(path: Path, model_name: str, value: int) -> None:
+    try:
+        cached = {}
+        if path.exists():
+            with open(path, encoding="utf-8") as f:
+                cached = json.load(f)
+        cached[model_name] = value
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(cached, f)
+    except (OSError, ValueError) as e:
+        print(f"Warning: Could not write {path.name}: {e}")
+
+
+def _read_cached_embedding_dimension(model_name: str) -> int | None:
+    return _read_model_cache(EMBEDDING_DIMENSION_CACHE_FILE, model_name)
+
+
+def _write_cached_embedding_dimension(model_name: str, dimension: int) -> None:
+    _write_model_cache(EMBEDDING_DIMENSION_CACHE_FILE, model_name, dimension)
+
+
+def _read_cached_embedding_max_seq_length(model_name: str) -> int | None:
+    return _read_model_cache(EMBEDDING_MAX_SEQ_LENGTH_CACHE_FILE, model_name)
+
+
+def _write_cached_embedding_max_seq_length(
+    model_name: str, max_seq_length: int
+) -> None:
+    _write_model_cache(EMBEDDING_MAX_SEQ_LENGTH_CACHE_FILE, model_name, max_seq_length)
+
+
 def load_global_llm_configs():
     """
     Load global LLM configurations from YAML file.
@@ -106,18 +189,6 @@ def initialize_llm_router():
 
 
 class Config:
-    # Check if ffmpeg is installed
-    if not is_ffmpeg_installed():
-        import static_ffmpeg
-
-        # ffmpeg installed on first call to add_paths(), threadsafe.
-        static_ffmpeg.add_paths()
-        # check if ffmpeg is installed again
-        if not is_ffmpeg_installed():
-            raise ValueError(
-                "FFmpeg is not installed on the system. Please install it to use the Surfsense Podcaster."
-            )
-
     # Deployment Mode (self-hosted or cloud)
     # self-hosted: Full access to local file system connectors (Obsidian, etc.)
     # cloud: Only cloud-based connectors available
@@ -229,28 +300,129 @@ class Config:
     if AZURE_OPENAI_API_KEY:
         embedding_kwargs["azure_api_key"] = AZURE_OPENAI_API_KEY
 
-    embedding_model_instance = AutoEmbeddings.get_embeddings(
-        EMBEDDING_MODEL,
-        **embedding_kwargs,
+    # Optional: embedding dimension of EMBEDDING_MODEL. When set (or cached from
+    # an earlier run), building the database models does not load the model.
+    EMBEDDING_DIMENSION = (
+        int(os.getenv("EMBEDDING_DIMENSION"))
+        if os.getenv("EMBEDDING_DIMENSION")
+        else None
+    )
+
+    # The embedding model, chunkers and reranker are loaded on first use (see
+    # the properties below), so processes only load what they actually use
+    _model_lock = threading.RLock()
+    _embedding_model_instance = None
+    _embedding_dimension = None
+    _chunker_instance = None
+    _code_chunker_instance = None
+    _reranker_instance = None
+
+    # Embedding batching (see app/services/embedding_service.py)
+    # Max texts per embed_batch call, max summed tokens per batch and size of
+    # the thread pool that runs the (synchronous) embedding model
+    EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+    EMBEDDING_BATCH_MAX_TOKENS = int(os.getenv("EMBEDDING_BATCH_MAX_TOKENS", "32768"))
+    EMBEDDING_MAX_WORKERS = int(os.getenv("EMBEDDING_MAX_WORKERS", "2"))
+    # Reuse stored embeddings for identical text (embedding_cache table)
+    EMBEDDING_CACHE_ENABLED = (
+        os.getenv("EMBEDDING_CACHE_ENABLED", "TRUE").upper() == "TRUE"
     )
-    chunker_instance = RecursiveChunker(
-        chunk_size=getattr(embedding_model_instance, "max_seq_length", 512)
+    # Days an embedding_cache entry is kept; a daily Celery beat task deletes
+    # older entries and those of other embedding models. 0 keeps them forever
+    EMBEDDING_CACHE_RETENTION_DAYS = int(
+        os.getenv("EMBEDDING_CACHE_RETENTION_DAYS", "30")
     )
-    code_chunker_instance = CodeChunker(
-        chunk_size=getattr(embedding_model_instance, "max_seq_length", 512)
+    # Number of recent search query embeddings kept in memory per process
+    QUERY_EMBEDDING_CACHE_SIZE = int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "1024"))
+    # Unix socket of the local embedding server (app/services/embedding_server.py).
+    # When set, processes send texts to the server instead of loading the model;
+    # the server waits up to MAX_WAIT_MS to batch concurrent requests together
+    EMBEDDING_SERVER_SOCKET = os.getenv("EMBEDDING_SERVER_SOCKET") or None
+    EMBEDDING_SERVER_MAX_WAIT_MS = int(os.getenv("EMBEDDING_SERVER_MAX_WAIT_MS", "5"))
+    # Chunk size in tokens. Defaults to the embedding model's max_seq_length,
+    # as recorded by the process that loaded it (see Config.chunk_size)
+    EMBEDDING_MAX_SEQ_LENGTH = (
+        int(os.getenv("EMBEDDING_MAX_SEQ_LENGTH"))
+        if os.getenv("EMBEDDING_MAX_SEQ_LENGTH")
+        else None
     )
 
+    # LangGraph checkpointer (app/agents/new_chat/checkpointer.py): connection
+    # pool size and durability mode ("async", "sync" or "exit"; "exit" persists
+    # each agent run's checkpoints once, when the run ends)
+    CHECKPOINTER_POOL_MIN_SIZE = int(os.getenv("CHECKPOINTER_POOL_MIN_SIZE", "2"))
+    CHECKPOINTER_POOL_MAX_SIZE = int(os.getenv("CHECKPOINTER_POOL_MAX_SIZE", "20"))
+    CHECKPOINT_DURABILITY = os.getenv("CHECKPOINT_DURABILITY", "async").lower()
+
+    # Compiled chat agents are reused across messages (see
+    # app/agents/new_chat/agent_cache.py); entries expire after TTL seconds
+    AGENT_CACHE_ENABLED = os.getenv("AGENT_CACHE_ENABLED", "TRUE").upper() == "TRUE"
+    AGENT_CACHE_MAX_SIZE = int(os.getenv("AGENT_CACHE_MAX_SIZE", "256"))
+    AGENT_CACHE_TTL = int(os.getenv("AGENT_CACHE_TTL", "300"))
+
+    # MCP session pool (app/agents/new_chat/tools/mcp_session_pool.py): close
+    # sessions idle this long, ping sessions idle this long before reuse, and
+    # keep listed tool definitions this long (all in seconds)
+    MCP_SESSION_IDLE_TIMEOUT = int(os.getenv("MCP_SESSION_IDLE_TIMEOUT", "900"))
+    MCP_HEALTH_CHECK_INTERVAL = int(os.getenv("MCP_HEALTH_CHECK_INTERVAL", "60"))
+    MCP_TOOLS_CACHE_TTL = int(os.getenv("MCP_TOOLS_CACHE_TTL", "300"))
+
+    # Chat text deltas are held for up to this many milliseconds or characters
+    # and sent as one SSE part (see VercelStreamingService); 0 ms disables it
+    STREAM_COALESCE_MS = int(os.getenv("STREAM_COALESCE_MS", "20"))
+    STREAM_COALESCE_CHARS = int(os.getenv("STREAM_COALESCE_CHARS", "256"))
+    # How chat runs the agent: "updates" streams model tokens and node updates
+    # (see app/tasks/chat/agent_events.py), "events" uses astream_events
+    CHAT_STREAM_MODE = os.getenv("CHAT_STREAM_MODE", "updates").lower()
+
+    # Large document summaries (DoclingService): chunk summaries run this many
+    # at a time (per deployment in Auto mode), are combined in groups of at
+    # most COMBINE_MAX_CHARS, and are cached for CACHE_TTL seconds (0 disables)
+    DOCUMENT_SUMMARY_MAX_CONCURRENCY = int(
+        os.getenv("DOCUMENT_SUMMARY_MAX_CONCURRENCY", "4")
+    )
+    DOCUMENT_SUMMARY_COMBINE_MAX_CHARS = int(
+        os.getenv("DOCUMENT_SUMMARY_COMBINE_MAX_CHARS", "100000")
+    )
+    DOCUMENT_SUMMARY_CACHE_TTL = int(os.getenv("DOCUMENT_SUMMARY_CACHE_TTL", "86400"))
+
+    # Max pooled sessions one chat request may hold for concurrent knowledge
+    # base retrieval (see ConnectorService)
+    SEARCH_MAX_CONCURRENT_SESSIONS = int(
+        os.getenv("SEARCH_MAX_CONCURRENT_SESSIONS", "4")
+    )
+
+    # Vector search strategy (see app/retriever/vector_search_strategy.py):
+    # search spaces with at most this many rows use an exact filtered scan
+    # instead of the shared HNSW index; the choice is cached for TTL seconds
+    VECTOR_EXACT_SEARCH_MAX_ROWS = int(
+        os.getenv("VECTOR_EXACT_SEARCH_MAX_ROWS", "50000")
+    )
+    VECTOR_SEARCH_STRATEGY_TTL = int(os.getenv("VECTOR_SEARCH_STRATEGY_TTL", "600"))
+
+    # Seconds a member's resolved search space permissions are cached per
+    # process (see app/utils/rbac.py). Opt-in: RBAC routes only invalidate the
+    # cache of the process serving them, other workers keep honouring revoked
+    # permissions for up to this long. 0 (default) disables it
+    PERMISSION_CACHE_TTL = int(os.getenv("PERMISSION_CACHE_TTL", "0"))
+
+    # Connector indexers write new documents and their chunks with bulk
+    # inserts and commit every BATCH_SIZE documents or BATCH_MAX_BYTES of
+    # content and embeddings, whichever comes first (see DocumentWriter)
+    INDEXING_BATCH_SIZE = int(os.getenv("INDEXING_BATCH_SIZE", "50"))
+    INDEXING_BATCH_MAX_BYTES = int(
+        os.getenv("INDEXING_BATCH_MAX_BYTES", str(16 * 1024 * 1024))
+    )
+    # Task log and notification progress is written on its own connection
+    # at most once per this many seconds; ticks in between are merged into
+    # the next write (see ProgressReporter)
+    PROGRESS_UPDATE_INTERVAL = float(os.getenv("PROGRESS_UPDATE_INTERVAL", "2"))
+
     # Reranker's Configuration | Pinecode, Cohere etc. Read more at https://github.com/AnswerDotAI/rerankers?tab=readme-ov-file#usage
     RERANKERS_ENABLED = os.getenv("RERANKERS_ENABLED", "FALSE").upper() == "TRUE"
     if RERANKERS_ENABLED:
         RERANKERS_MODEL_NAME = os.getenv("RERANKERS_MODEL_NAME")
         RERANKERS_MODEL_TYPE = os.getenv("RERANKERS_MODEL_TYPE")
-        reranker_instance = Reranker(
-            model_name=RERANKERS_MODEL_NAME,
-            model_type=RERANKERS_MODEL_TYPE,
-        )
-    else:
-        reranker_instance = None
 
     # OAuth JWT
     SECRET_KEY = os.getenv("SECRET_KEY")
@@ -279,17 +451,125 @@ class Config:
     STT_SERVICE_API_BASE = os.getenv("STT_SERVICE_API_BASE")
     STT_SERVICE_API_KEY = os.getenv("STT_SERVICE_API_KEY")
 
+    @property
+    def embedding_model_instance(self):
+        """The embedding model, loaded on first access."""
+        if Config._embedding_model_instance is None:
+            with Config._model_lock:
+                if Config._embedding_model_instance is None:
+                    from chonkie import AutoEmbeddings
+
+                    instance = AutoEmbeddings.get_embeddings(
+                        self.EMBEDDING_MODEL,
+                        **self.embedding_kwargs,
+                    )
+                    if hasattr(instance, "dimension"):
+                        self._validate_embedding_dimension(instance.dimension)
+                        _write_cached_embedding_dimension(
+                            self.EMBEDDING_MODEL, instance.dimension
+                        )
+                    max_seq_length = getattr(instance, "max_seq_length", None)
+                    if isinstance(max_seq_length, int):
+                        _write_cached_embedding_max_seq_length(
+                            self.EMBEDDING_MODEL, max_seq_length
+                        )
+                    Config._embedding_model_instance = instance
+        return Config._embedding_model_instance
+
+    @property
+    def embedding_dimension(self) -> int:
+        """
+        Dimension of the embedding model's vectors.
+
+        Taken from EMBEDDING_DIMENSION or the dimension cache when available;
+        only loads the embedding model when neither knows the model.
+        """
+        if Config._embedding_dimension is None:
+            dimension = self.EMBEDDING_DIMENSION or _read_cached_embedding_dimension(
+                self.EMBEDDING_MODEL
+            )
+            if dimension is None:
+                dimension = self.embedding_model_instance.dimension
+            self._validate_embedding_dimension(dimension)
+            Config._embedding_dimension = dimension
+        return Config._embedding_dimension
+
+    @property
+    def chunk_size(self) -> int:
+        """
+        Chunk size in tokens for the chunkers.
+
+        EMBEDDING_MAX_SEQ_LENGTH when set; otherwise the embedding model's
+        max_seq_length. Processes using the embedding server never load the
+        model and read the value the server recorded when it loaded it;
+        DEFAULT_CHUNK_SIZE is only used when neither knows it.
+        """
+        if self.EMBEDDING_MAX_SEQ_LENGTH:
+            return self.EMBEDDING_MAX_SEQ_LENGTH
+        max_seq_length = _read_cached_embedding_max_seq_length(self.EMBEDDING_MODEL)
+        if max_seq_length is None and not self.EMBEDDING_SERVER_SOCKET:
+            max_seq_length = getattr(
+                self.embedding_model_instance, "max_seq_length", None
+            )
+        if not isinstance(max_seq_length, int):
+            print(
+                f"Warning: max_seq_length of {self.EMBEDDING_MODEL} is unknown, "
+                f"chunking with {DEFAULT_CHUNK_SIZE} tokens. Start the embedding "
+                "server before its clients or set EMBEDDING_MAX_SEQ_LENGTH"
+            )
+            return DEFAULT_CHUNK_SIZE
+        return max_seq_length
+
+    @property
+    def chunker_instance(self):
+        """Recursive text chunker, created on first access."""
+        if Config._chunker_instance is None:
+            with Config._model_lock:
+                if Config._chunker_instance is None:
+                    from chonkie import RecursiveChunker
+
+                    Config._chunker_instance = RecursiveChunker(
+                        chunk_size=self.chunk_size
+                    )
+        return Config._chunker_instance
+
+    @property
+    def code_chunker_instance(self):
+        """Code chunker, created on first access."""
+        if Config._code_chunker_instance is None:
+            with Config._model_lock:
+                if Config._code_chunker_instance is None:
+                    from chonkie import CodeChunker
+
+                    Config._code_chunker_instance = CodeChunker(
+                        chunk_size=self.chunk_size
+                    )
+        return Config._code_chunker_instance
+
+    @property
+    def reranker_instance(self):
+        """The reranker when RERANKERS_ENABLED, loaded on first access."""
+        if not self.RERANKERS_ENABLED:
+            return None
+        if Config._reranker_instance is None:
+            with Config._model_lock:
+                if Config._reranker_instance is None:
+                    from rerankers import Reranker
+
+                    Config._reranker_instance = Reranker(
+                        model_name=self.RERANKERS_MODEL_NAME,
+                        model_type=self.RERANKERS_MODEL_TYPE,
+                    )
+        return Config._reranker_instance
+
     # Validation Checks
-    # Check embedding dimension
-    if (
-        hasattr(embedding_model_instance, "dimension")
-        and embedding_model_instance.dimension > 2000
-    ):
-        raise ValueError(
-            f"Embedding dimension for Model: {EMBEDDING_MODEL} "
-            f"has {embedding_model_instance.dimension} dimensions, which "
-            f"exceeds the maximum of 2000 allowed by PGVector."
-        )
+    def _validate_embedding_dimension(self, dimension: int) -> None:
+        if dimension > 2000:
+            raise ValueError(
+                f"Embedding dimension for Model: {self.EMBEDDING_MODEL} "
+                f"has {dimension} dimensions, which "
+                f"exceeds the maximum of 2000 allowed by PGVector."
+            )
 
     @classmethod
     def get_settings(cls):
@@ -12,10 +12,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
 
-from app.config import config
 from app.connectors.composio_connector import ComposioConnector
 from app.db import Document, DocumentType
 from app.services.composio_service import TOOLKIT_TO_DOCUMENT_TYPE
+from app.services.embedding_service import get_embedding_service
 from app.services.llm_service import get_user_long_context_llm
 from app.services.task_logging_service import TaskLoggingService
 from app.tasks.connector_indexers.base import calculate_date_range
@@ -307,11 +307,13 @@ async def _process_gmail_message_batch(
                     summary_content = (
                         f"Gmail: {subject}\n\nFrom: {sender}\nDate: {date_str}"
                     )
-                    summary_embedding = config.embedding_model_instance.embed(
+                    summary_embedding = await get_embedding_service().embed_text(
                         summary_content
                     )
 
-                chunks = await create_document_chunks(markdown_content)
+                chunks = await create_document_chunks(
+                    markdown_content, existing_document
+                )
 
                 existing_document.title = f"Gmail: {subject}"
                 existing_document.content = summary_content
@@ -361,7 +363,7 @@ async def _process_gmail_message_batch(
                 summary_content = (
                     f"Gmail: {subject}\n\nFrom: {sender}\nDate: {date_str}"
                 )
-                summary_embedding = config.embedding_model_instance.embed(
+                summary_embedding = await get_embedding_service().embed_text(
                     summary_content
                 )
 
@@ -12,10 +12,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
 
-from app.config import config
 from app.connectors.composio_connector import ComposioConnector
 from app.db import Document, DocumentType
 from app.services.composio_service import TOOLKIT_TO_DOCUMENT_TYPE
+from app.services.embedding_service import get_embedding_service
 from app.services.llm_service import get_user_long_context_llm
 from app.services.task_logging_service import TaskLoggingService
 from app.tasks.connector_indexers.base import (
@@ -326,11 +326,13 @@ async def index_composio_google_calendar(
                         summary_content = f"Calendar: {summary}\n\nStart: {start_time}\nEnd: {end_time}"
                         if location:
                             summary_content += f"\nLocation: {location}"
-                        summary_embedding = config.embedding_model_instance.embed(
+                        summary_embedding = await get_embedding_service().embed_text(
                             summary_content
                         )
 
-                    chunks = await create_document_chunks(markdown_content)
+                    chunks = await create_document_chunks(
+                        markdown_content, existing_document
+                    )
 
                     existing_document.title = f"Calendar: {summary}"
                     existing_document.content = summary_content
@@ -400,7 +402,7 @@ async def index_composio_google_calendar(
                     )
                     if location:
                         summary_content += f"\nLocation: {location}"
-                    summary_embedding = config.embedding_model_instance.embed(
+                    summary_embedding = await get_embedding_service().embed_text(
                         summary_content
                     )
 
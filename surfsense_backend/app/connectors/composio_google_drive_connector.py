@@ -20,6 +20,7 @@ from app.config import config
 from app.connectors.composio_connector import ComposioConnector
 from app.db import Document, DocumentType, Log
 from app.services.composio_service import TOOLKIT_TO_DOCUMENT_TYPE
+from app.services.embedding_service import get_embedding_service
 from app.services.llm_service import get_user_long_context_llm
 from app.services.task_logging_service import TaskLoggingService
 from app.utils.document_converters import (
@@ -1155,9 +1156,11 @@ async def _process_single_drive_file(
             )
         else:
             summary_content = f"Google Drive File: {file_name}\n\nType: {mime_type}"
-            summary_embedding = config.embedding_model_instance.embed(summary_content)
+            summary_embedding = await get_embedding_service().embed_text(
+                summary_content
+            )
 
-        chunks = await create_document_chunks(markdown_content)
+        chunks = await create_document_chunks(markdown_content, existing_document)
 
         existing_document.title = f"Drive: {file_name}"
         existing_document.content = summary_content
@@ -1206,7 +1209,7 @@ async def _process_single_drive_file(
         )
     else:
         summary_content = f"Google Drive File: {file_name}\n\nType: {mime_type}"
-        summary_embedding = config.embedding_model_instance.embed(summary_content)
+        summary_embedding = await get_embedding_service().embed_text(summary_content)
 
     chunks = await create_document_chunks(markdown_content)
 
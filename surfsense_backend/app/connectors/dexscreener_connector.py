@@ -6,13 +6,83 @@ Allows fetching pair information for tracked tokens across multiple blockchain n
 """
 
 import asyncio
+import importlib.util
 import logging
+import time
 from typing import Any
 
 import httpx
 
 logger = logging.getLogger(__name__)
 
+# Seconds a response is reused for identical requests (prices move quickly,
+# but many users ask about the same token at the same moment)
+RESPONSE_CACHE_TTL = 5.0
+# Requests allowed in a burst before the rate limiter spaces them out
+RATE_LIMIT_BURST = 5
+
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+class TokenBucket:
+    """Token bucket rate limiter; callers over the rate wait for their turn."""
+
+    def __init__(self, rate: float, capacity: int):
+        """
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum number of tokens (burst size)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+
+    async def acquire(self) -> None:
+        """Take a token, sleeping until it is available."""
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+        # Reserve the token before sleeping so concurrent callers queue up
+        self._tokens -= 1
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / self.rate)
+
+
+# Shared by every connector in the process: DexScreener limits per client IP
+# (300 req/min)
+_rate_limiter = TokenBucket(rate=5.0, capacity=RATE_LIMIT_BURST)
+
+_http_client: httpx.AsyncClient | None = None
+_http_client_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Get the keep-alive HTTP client shared by connectors on this event loop."""
+    global _http_client, _http_client_loop
+    loop = asyncio.get_running_loop()
+    if _http_client is None or _http_client.is_closed or _http_client_loop is not loop:
+        # Celery tasks run each task in a new event loop, which cannot reuse
+        # connections opened on a previous one
+        _http_client = httpx.AsyncClient(
+            timeout=30.0,
+            http2=_HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_keepalive_connections=10, keepalive_expiry=60),
+        )
+        _http_client_loop = loop
+    return _http_client
+
+
+async def close_dexscreener_client() -> None:
+    """Close the shared HTTP client (on application shutdown)."""
+    global _http_client, _http_client_loop
+    if _http_client is not None and _http_client_loop is asyncio.get_running_loop():
+        await _http_client.aclose()
+    _http_client = None
+    _http_client_loop = None
+
 
 class DexScreenerConnector:
     """Class for retrieving trading pair data from DexScreener API."""
@@ -24,7 +94,11 @@ class DexScreenerConnector:
         Note: DexScreener API is public and doesn't require authentication.
         """
         self.base_url = "https://api.dexscreener.com"
-        self.rate_limit_delay = 0.2  # 200ms delay between requests to respect rate limits
+        self.rate_limit_delay = 0.2  # 200ms between requests on average (300 req/min)
+        # url -> (expires at, response)
+        self._response_cache: dict[str, tuple[float, dict[str, Any] | None]] = {}
+        # url -> request in flight, shared by identical concurrent requests
+        self._in_flight: dict[str, asyncio.Task] = {}
         
     async def make_request(
         self, 
@@ -33,6 +107,9 @@ class DexScreenerConnector:
     ) -> dict[str, Any] | None:
         """
         Make an async request to the DexScreener API with retry logic.
+
+        Responses are cached for RESPONSE_CACHE_TTL seconds and identical
+        concurrent requests share one API call.
         
         Args:
             endpoint: API endpoint path (without base URL)
@@ -45,37 +122,57 @@ class DexScreenerConnector:
             Exception: If the API request fails after all retries
         """
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
-        
+
+        cached = self._response_cache.get(url)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+
+        request = self._in_flight.get(url)
+        if request is None or request.get_loop() is not asyncio.get_running_loop():
+            request = asyncio.ensure_future(self._fetch(url, endpoint, max_retries))
+            self._in_flight[url] = request
+            request.add_done_callback(lambda done: self._forget_request(url, done))
+
+        # Shielded so a cancelled caller does not cancel the shared request
+        return await asyncio.shield(request)
+
+    async def _fetch(
+        self, url: str, endpoint: str, max_retries: int
+    ) -> dict[str, Any] | None:
+        """Request url from the API, retrying failures, and cache the response."""
+        client = _get_http_client()
+
         for attempt in range(max_retries):
             try:
-                async with httpx.AsyncClient(timeout=30.0) as client:
-                    response = await client.get(url)
-                    
-                    if response.status_code == 200:
-                        # Add delay to respect rate limits
-                        await self._rate_limit_delay()
-                        return response.json()
-                    elif response.status_code == 429:
-                        # Rate limit exceeded - exponential backoff
-                        wait_time = (2 ** attempt) * 1.0  # 1s, 2s, 4s
-                        logger.warning(f"Rate limit exceeded. Waiting {wait_time}s before retry...")
-                        await asyncio.sleep(wait_time)
-                        continue
-                    elif response.status_code == 404:
-                        # Token/pair not found - return None instead of raising
-                        logger.info(f"Token not found: {endpoint}")
-                        return None
-                    else:
-                        raise Exception(
-                            f"API request failed with status code {response.status_code}: {response.text}"
-                        )
+                await self._rate_limit_delay()
+                response = await client.get(url)
+                
+                if response.status_code == 200:
+                    data = response.json()
+                    self._cache_response(url, data)
+                    return data
+                elif response.status_code == 429:
+                    # Rate limit exceeded - exponential backoff
+                    wait_time = (2 ** attempt) * 1.0  # 1s, 2s, 4s
+                    logger.warning(f"Rate limit exceeded. Waiting {wait_time}s before retry...")
+                    await asyncio.sleep(wait_time)
+                    continue
+                elif response.status_code == 404:
+                    # Token/pair not found - return None instead of raising
+                    logger.info(f"Token not found: {endpoint}")
+                    self._cache_response(url, None)
+                    return None
+                else:
+                    raise Exception(
+                        f"API request failed with status code {response.status_code}: {response.text}"
+                    )
                         
-            except httpx.TimeoutException:
+            except httpx.TimeoutException as e:
                 if attempt < max_retries - 1:
                     logger.warning(f"Request timeout. Retrying... (attempt {attempt + 1}/{max_retries})")
                     continue
                 else:
-                    raise Exception(f"Request timeout after {max_retries} attempts")
+                    raise Exception(f"Request timeout after {max_retries} attempts") from e
             except httpx.RequestError as e:
                 if attempt < max_retries - 1:
                     logger.warning(f"Network error: {e}. Retrying... (attempt {attempt + 1}/{max_retries})")
@@ -84,11 +181,26 @@ class DexScreenerConnector:
                     raise Exception(f"Network error after {max_retries} attempts: {e}") from e
         
         return None
+
+    def _forget_request(self, url: str, request: asyncio.Task) -> None:
+        """Drop a finished request from the in-flight requests."""
+        if self._in_flight.get(url) is request:
+            del self._in_flight[url]
+
+    def _cache_response(self, url: str, data: dict[str, Any] | None) -> None:
+        """Cache a response, dropping expired entries as the cache grows."""
+        now = time.monotonic()
+        if len(self._response_cache) >= 1024:
+            self._response_cache = {
+                key: entry
+                for key, entry in self._response_cache.items()
+                if entry[0] > now
+            }
+        self._response_cache[url] = (now + RESPONSE_CACHE_TTL, data)
     
     async def _rate_limit_delay(self):
-        """Add delay to respect API rate limits (300 req/min = ~200ms between requests)."""
-        import asyncio
-        await asyncio.sleep(self.rate_limit_delay)
+        """Wait for the shared token bucket (300 req/min with small bursts)."""
+        await _rate_limiter.acquire()
     
     async def get_token_pairs(
         self, 
@@ -229,6 +341,17 @@ class DexScreenerConnector:
         return markdown_content
 
 
+_shared_connector: DexScreenerConnector | None = None
+
+
+def get_dexscreener_connector() -> DexScreenerConnector:
+    """Get the connector shared by chat tools, so they share its response cache."""
+    global _shared_connector
+    if _shared_connector is None:
+        _shared_connector = DexScreenerConnector()
+    return _shared_connector
+
+
 # Example usage (uncomment to use):
 """
 import asyncio
@@ -13,15 +13,22 @@ from sqlalchemy import (
     Column,
     Enum as SQLAlchemyEnum,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
     UniqueConstraint,
     text,
 )
-from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR, UUID
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import DeclarativeBase, Mapped, declared_attr, relationship
+from sqlalchemy.orm import (
+    DeclarativeBase,
+    Mapped,
+    declared_attr,
+    deferred,
+    relationship,
+)
 
 from app.config import config
 
@@ -332,6 +339,11 @@ class Base(DeclarativeBase):
     pass
 
 
+# Full-text search column type; plain text on SQLite so the test database
+# can still be created from the models
+SEARCH_VECTOR_TYPE = TSVECTOR().with_variant(Text, "sqlite")
+
+
 class TimestampMixin:
     @declared_attr
     def created_at(cls):  # noqa: N805
@@ -660,7 +672,7 @@ class UserMemory(BaseModel, TimestampMixin):
         default=MemoryCategory.fact,
     )
     # Vector embedding for semantic search
-    embedding = Column(Vector(config.embedding_model_instance.dimension))
+    embedding = Column(Vector(config.embedding_dimension))
 
     # Track when memory was last updated
     updated_at = Column(
@@ -686,7 +698,9 @@ class Document(BaseModel, TimestampMixin):
     content = Column(Text, nullable=False)
     content_hash = Column(String, nullable=False, index=True, unique=True)
     unique_identifier_hash = Column(String, nullable=True, index=True, unique=True)
-    embedding = Column(Vector(config.embedding_model_instance.dimension))
+    embedding = Column(Vector(config.embedding_dimension))
+    # to_tsvector('english', content), maintained by a database trigger
+    search_vector = deferred(Column(SEARCH_VECTOR_TYPE, nullable=True))
 
     # BlockNote live editing state (NULL when never edited)
     blocknote_document = Column(JSONB, nullable=True)
@@ -712,14 +726,47 @@ class Chunk(BaseModel, TimestampMixin):
     __tablename__ = "chunks"
 
     content = Column(Text, nullable=False)
-    embedding = Column(Vector(config.embedding_model_instance.dimension))
+    embedding = Column(Vector(config.embedding_dimension))
+    # to_tsvector('english', content), maintained by a database trigger
+    search_vector = deferred(Column(SEARCH_VECTOR_TYPE, nullable=True))
+    # Order of the chunk within its document. Chunks reused across incremental
+    # updates keep their ID, so ID order no longer implies document order.
+    # NULL for chunks written before positions were tracked.
+    position = Column(Integer, nullable=True)
+    # Denormalized from the parent document (set by a database trigger) so
+    # vector search can filter chunks by search space through an index
+    search_space_id = Column(Integer, nullable=True, index=True)
 
     document_id = Column(
-        Integer, ForeignKey("documents.id", ondelete="CASCADE"), nullable=False
+        Integer,
+        ForeignKey("documents.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
     )
     document = relationship("Document", back_populates="chunks")
 
 
+class EmbeddingCache(BaseModel, TimestampMixin):
+    """
+    Content-addressed embedding cache.
+
+    Keyed by (embedding model name, sha256 of the embedded text) so identical
+    chunk text is never sent to the embedding model twice, e.g. when a Slack
+    channel or an edited document is re-indexed.
+    """
+
+    __tablename__ = "embedding_cache"
+    __table_args__ = (
+        UniqueConstraint(
+            "model_name", "text_hash", name="uq_embedding_cache_model_text_hash"
+        ),
+    )
+
+    model_name = Column(String, nullable=False)
+    text_hash = Column(String(64), nullable=False)
+    embedding = Column(Vector(config.embedding_dimension))
+
+
 class SurfsenseDocsDocument(BaseModel, TimestampMixin):
     """
     Surfsense documentation storage.
@@ -734,7 +781,7 @@ class SurfsenseDocsDocument(BaseModel, TimestampMixin):
     title = Column(String, nullable=False)
     content = Column(Text, nullable=False)
     content_hash = Column(String, nullable=False, index=True)  # For detecting changes
-    embedding = Column(Vector(config.embedding_model_instance.dimension))
+    embedding = Column(Vector(config.embedding_dimension))
     updated_at = Column(TIMESTAMP(timezone=True), nullable=True, index=True)
 
     chunks = relationship(
@@ -750,7 +797,9 @@ class SurfsenseDocsChunk(BaseModel, TimestampMixin):
     __tablename__ = "surfsense_docs_chunks"
 
     content = Column(Text, nullable=False)
-    embedding = Column(Vector(config.embedding_model_instance.dimension))
+    embedding = Column(Vector(config.embedding_dimension))
+    # to_tsvector('english', content), maintained by a database trigger
+    search_vector = deferred(Column(SEARCH_VECTOR_TYPE, nullable=True))
 
     document_id = Column(
         Integer,
@@ -986,6 +1035,10 @@ class NewLLMConfig(BaseModel, TimestampMixin):
 
 class Log(BaseModel, TimestampMixin):
     __tablename__ = "logs"
+    __table_args__ = (
+        # Serves the per-search-space time window queries of the logs summary
+        Index("ix_logs_search_space_id_created_at", "search_space_id", "created_at"),
+    )
 
     level = Column(SQLAlchemyEnum(LogLevel), nullable=False, index=True)
     status = Column(SQLAlchemyEnum(LogStatus), nullable=False, index=True)
@@ -1331,8 +1384,73 @@ engine = create_async_engine(
 async_session_maker = async_sessionmaker(engine, expire_on_commit=False)
 
 
+# Tables whose search_vector column is kept in sync with content by trigger
+SEARCH_VECTOR_TABLES = ("documents", "chunks", "surfsense_docs_chunks")
+
+
+async def setup_search_vector_triggers(conn):
+    """
+    Keep the stored full-text search vectors in sync with content, so keyword
+    search does not re-parse every candidate row at query time.
+    """
+    await conn.execute(
+        text(
+            """
+            CREATE OR REPLACE FUNCTION update_search_vector() RETURNS trigger AS $$
+            BEGIN
+                NEW.search_vector := to_tsvector('english', NEW.content);
+                RETURN NEW;
+            END
+            $$ LANGUAGE plpgsql
+            """
+        )
+    )
+    for table in SEARCH_VECTOR_TABLES:
+        await conn.execute(
+            text(f"DROP TRIGGER IF EXISTS {table}_search_vector_update ON {table}")
+        )
+        await conn.execute(
+            text(
+                f"CREATE TRIGGER {table}_search_vector_update "
+                f"BEFORE INSERT OR UPDATE OF content ON {table} "
+                "FOR EACH ROW EXECUTE FUNCTION update_search_vector()"
+            )
+        )
+
+
+async def setup_chunk_search_space_trigger(conn):
+    """Copy the parent document's search_space_id onto every new chunk."""
+    await conn.execute(
+        text(
+            """
+            CREATE OR REPLACE FUNCTION set_chunk_search_space_id() RETURNS trigger AS $$
+            BEGIN
+                NEW.search_space_id := (
+                    SELECT search_space_id FROM documents WHERE id = NEW.document_id
+                );
+                RETURN NEW;
+            END
+            $$ LANGUAGE plpgsql
+            """
+        )
+    )
+    await conn.execute(
+        text("DROP TRIGGER IF EXISTS chunks_search_space_id_update ON chunks")
+    )
+    await conn.execute(
+        text(
+            "CREATE TRIGGER chunks_search_space_id_update "
+            "BEFORE INSERT OR UPDATE OF document_id ON chunks "
+            "FOR EACH ROW EXECUTE FUNCTION set_chunk_search_space_id()"
+        )
+    )
+
+
 async def setup_indexes():
     async with engine.begin() as conn:
+        await setup_search_vector_triggers(conn)
+        await setup_chunk_search_space_trigger(conn)
+
         # Create indexes
         # Document Summary Indexes
         await conn.execute(
@@ -1342,7 +1460,7 @@ async def setup_indexes():
         )
         await conn.execute(
             text(
-                "CREATE INDEX IF NOT EXISTS document_search_index ON documents USING gin (to_tsvector('english', content))"
+                "CREATE INDEX IF NOT EXISTS document_search_vector_index ON documents USING gin (search_vector)"
             )
         )
         # Document Chuck Indexes
@@ -1353,7 +1471,7 @@ async def setup_indexes():
         )
         await conn.execute(
             text(
-                "CREATE INDEX IF NOT EXISTS chucks_search_index ON chunks USING gin (to_tsvector('english', content))"
+                "CREATE INDEX IF NOT EXISTS chucks_search_vector_index ON chunks USING gin (search_vector)"
             )
         )
         # pg_trgm indexes for efficient ILIKE '%term%' searches on titles
@@ -1375,6 +1493,11 @@ async def setup_indexes():
                 "CREATE INDEX IF NOT EXISTS idx_documents_search_space_updated ON documents (search_space_id, updated_at DESC NULLS LAST) INCLUDE (id, title, document_type)"
             )
         )
+        await conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS surfsense_docs_chunks_search_vector_index ON surfsense_docs_chunks USING gin (search_vector)"
+            )
+        )
         await conn.execute(
             text(
                 "CREATE INDEX IF NOT EXISTS idx_surfsense_docs_title_trgm ON surfsense_docs_documents USING gin (title gin_trgm_ops)"
@@ -1,5 +1,7 @@
 from datetime import datetime
 
+from app.retriever.vector_search_strategy import prepare_vector_search
+
 
 class ChucksHybridSearchRetriever:
     def __init__(self, db_session):
@@ -18,6 +20,7 @@ class ChucksHybridSearchRetriever:
         search_space_id: int,
         start_date: datetime | None = None,
         end_date: datetime | None = None,
+        query_embedding: list[float] | None = None,
     ) -> list:
         """
         Perform vector similarity search on chunks.
@@ -28,6 +31,8 @@ class ChucksHybridSearchRetriever:
             search_space_id: The search space ID to search within
             start_date: Optional start date for filtering documents by updated_at
             end_date: Optional end date for filtering documents by updated_at
+            query_embedding: Optional precomputed embedding of query_text, so
+                callers searching several times per request embed the query once
 
         Returns:
             List of chunks sorted by vector similarity
@@ -35,18 +40,19 @@ class ChucksHybridSearchRetriever:
         from sqlalchemy import select
         from sqlalchemy.orm import joinedload
 
-        from app.config import config
         from app.db import Chunk, Document
+        from app.services.embedding_service import get_embedding_service
 
-        # Get embedding for the query
-        embedding_model = config.embedding_model_instance
-        query_embedding = embedding_model.embed(query_text)
+        # Get embedding for the query (unless the caller already computed it)
+        if query_embedding is None:
+            query_embedding = await get_embedding_service().embed_query(query_text)
 
         # Build the query filtered by search space
         query = (
             select(Chunk)
             .options(joinedload(Chunk.document).joinedload(Document.search_space))
             .join(Document, Chunk.document_id == Document.id)
+            .where(Chunk.search_space_id == search_space_id)
             .where(Document.search_space_id == search_space_id)
         )
 
@@ -56,8 +62,14 @@ class ChucksHybridSearchRetriever:
         if end_date is not None:
             query = query.where(Document.updated_at <= end_date)
 
-        # Add vector similarity ordering
-        query = query.order_by(Chunk.embedding.op("<=>")(query_embedding)).limit(top_k)
+        # Add vector similarity ordering (exact or HNSW, depending on search space size)
+        distance = await prepare_vector_search(
+            self.db_session,
+            Chunk.search_space_id,
+            search_space_id,
+            Chunk.embedding.op("<=>")(query_embedding),
+        )
+        query = query.order_by(distance).limit(top_k)
 
         # Execute the query
         result = await self.db_session.execute(query)
@@ -91,8 +103,8 @@ class ChucksHybridSearchRetriever:
 
         from app.db import Chunk, Document
 
-        # Create tsvector and tsquery for PostgreSQL full-text search
-        tsvector = func.to_tsvector("english", Chunk.content)
+        # Stored tsvector (kept in sync by trigger) and tsquery for full-text search
+        tsvector = Chunk.search_vector
         tsquery = func.plainto_tsquery("english", query_text)
 
         # Build the query filtered by search space
@@ -129,6 +141,7 @@ class ChucksHybridSearchRetriever:
         document_type: str | None = None,
         start_date: datetime | None = None,
         end_date: datetime | None = None,
+        query_embedding: list[float] | None = None,
     ) -> list:
         """
         Hybrid search that returns **documents** (not individual chunks).
@@ -143,6 +156,8 @@ class ChucksHybridSearchRetriever:
             document_type: Optional document type to filter results (e.g., "FILE", "CRAWLED_URL")
             start_date: Optional start date for filtering documents by updated_at
             end_date: Optional end date for filtering documents by updated_at
+            query_embedding: Optional precomputed embedding of query_text, so
+                callers searching several times per request embed the query once
 
         Returns:
             List of dictionaries containing document data and relevance scores. Each dict contains:
@@ -154,23 +169,27 @@ class ChucksHybridSearchRetriever:
         from sqlalchemy import func, select, text
         from sqlalchemy.orm import joinedload
 
-        from app.config import config
         from app.db import Chunk, Document, DocumentType
+        from app.services.embedding_service import get_embedding_service
 
-        # Get embedding for the query
-        embedding_model = config.embedding_model_instance
-        query_embedding = embedding_model.embed(query_text)
+        # Get embedding for the query (unless the caller already computed it)
+        if query_embedding is None:
+            query_embedding = await get_embedding_service().embed_query(query_text)
 
         # RRF constants
         k = 60
         n_results = top_k * 5  # Fetch extra chunks for better document-level fusion
 
-        # Create tsvector and tsquery for PostgreSQL full-text search
-        tsvector = func.to_tsvector("english", Chunk.content)
+        # Stored tsvector (kept in sync by trigger) and tsquery for full-text search
+        tsvector = Chunk.search_vector
         tsquery = func.plainto_tsquery("english", query_text)
 
         # Base conditions for chunk filtering - search space is required
-        base_conditions = [Document.search_space_id == search_space_id]
+        # (chunks.search_space_id lets the planner filter chunks by index)
+        base_conditions = [
+            Chunk.search_space_id == search_space_id,
+            Document.search_space_id == search_space_id,
+        ]
 
         # Add document type filter if provided
         if document_type is not None:
@@ -191,20 +210,26 @@ class ChucksHybridSearchRetriever:
         if end_date is not None:
             base_conditions.append(Document.updated_at <= end_date)
 
+        # Exact or HNSW vector search, depending on search space size
+        distance = await prepare_vector_search(
+            self.db_session,
+            Chunk.search_space_id,
+            search_space_id,
+            Chunk.embedding.op("<=>")(query_embedding),
+        )
+
         # CTE for semantic search filtered by search space
         semantic_search_cte = (
             select(
                 Chunk.id,
-                func.rank()
-                .over(order_by=Chunk.embedding.op("<=>")(query_embedding))
-                .label("rank"),
+                func.rank().over(order_by=distance).label("rank"),
             )
             .join(Document, Chunk.document_id == Document.id)
             .where(*base_conditions)
         )
 
         semantic_search_cte = (
-            semantic_search_cte.order_by(Chunk.embedding.op("<=>")(query_embedding))
+            semantic_search_cte.order_by(distance)
             .limit(n_results)
             .cte("semantic_search")
         )
@@ -300,6 +325,201 @@ class ChucksHybridSearchRetriever:
         if not doc_ids:
             return []
 
+        return await self._fetch_grouped_documents(doc_ids, doc_scores, base_conditions)
+
+    async def hybrid_search_by_type(
+        self,
+        query_text: str,
+        top_k: int,
+        search_space_id: int,
+        document_types: list[str],
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        query_embedding: list[float] | None = None,
+    ) -> dict[str, list]:
+        """
+        Hybrid search over several document types in a single pass.
+
+        Equivalent to calling `hybrid_search` once per document type, but all
+        types are ranked by one query (plus one query to fetch the chunks of
+        the selected documents). Every type gets its own ordered, limited
+        semantic and keyword subquery, combined with UNION ALL, so each can
+        stop after n_results rows instead of ranking the whole search space.
+
+        Args:
+            query_text: The search query text
+            top_k: Number of documents to return per document type
+            search_space_id: The search space ID to search within
+            document_types: Document types to search (e.g., ["FILE", "CRAWLED_URL"])
+            start_date: Optional start date for filtering documents by updated_at
+            end_date: Optional end date for filtering documents by updated_at
+            query_embedding: Optional precomputed embedding of query_text
+
+        Returns:
+            Dict mapping each requested document type to the same document-grouped
+            results `hybrid_search` returns for that type
+        """
+        from sqlalchemy import func, select, union_all
+        from sqlalchemy.orm import joinedload
+
+        from app.db import Chunk, Document, DocumentType
+        from app.services.embedding_service import get_embedding_service
+
+        results: dict[str, list] = {
+            document_type: [] for document_type in document_types
+        }
+
+        # Unknown document types simply get no results (as in hybrid_search)
+        doc_type_enums = [
+            DocumentType[document_type]
+            for document_type in document_types
+            if document_type in DocumentType.__members__
+        ]
+        if not doc_type_enums:
+            return results
+
+        if query_embedding is None:
+            query_embedding = await get_embedding_service().embed_query(query_text)
+
+        # RRF constants
+        k = 60
+        n_results = top_k * 5  # Fetch extra chunks for better document-level fusion
+
+        tsvector = Chunk.search_vector
+        tsquery = func.plainto_tsquery("english", query_text)
+        keyword_rank = func.ts_rank_cd(tsvector, tsquery)
+
+        base_conditions = [
+            Chunk.search_space_id == search_space_id,
+            Document.search_space_id == search_space_id,
+            Document.document_type.in_(doc_type_enums),
+        ]
+        if start_date is not None:
+            base_conditions.append(Document.updated_at >= start_date)
+        if end_date is not None:
+            base_conditions.append(Document.updated_at <= end_date)
+
+        # Exact or HNSW vector search, depending on search space size
+        distance = await prepare_vector_search(
+            self.db_session,
+            Chunk.search_space_id,
+            search_space_id,
+            Chunk.embedding.op("<=>")(query_embedding),
+        )
+
+        # Top n_results chunks of every document type by semantic similarity
+        semantic_search_cte = union_all(
+            *(
+                select(Chunk.id, func.rank().over(order_by=distance).label("rank"))
+                .join(Document, Chunk.document_id == Document.id)
+                .where(*base_conditions, Document.document_type == doc_type)
+                .order_by(distance)
+                .limit(n_results)
+                for doc_type in doc_type_enums
+            )
+        ).cte("semantic_search")
+
+        # Top n_results chunks of every document type by keyword rank
+        keyword_search_cte = union_all(
+            *(
+                select(
+                    Chunk.id,
+                    func.rank().over(order_by=keyword_rank.desc()).label("rank"),
+                )
+                .join(Document, Chunk.document_id == Document.id)
+                .where(*base_conditions, Document.document_type == doc_type)
+                .where(tsvector.op("@@")(tsquery))
+                .order_by(keyword_rank.desc())
+                .limit(n_results)
+                for doc_type in doc_type_enums
+            )
+        ).cte("keyword_search")
+
+        # RRF fusion, then keep the top_k chunks of every document type
+        score = func.coalesce(
+            1.0 / (k + semantic_search_cte.c.rank), 0.0
+        ) + func.coalesce(1.0 / (k + keyword_search_cte.c.rank), 0.0)
+        fused = (
+            select(
+                Chunk.id,
+                Document.document_type,
+                score.label("score"),
+                func.row_number()
+                .over(partition_by=Document.document_type, order_by=score.desc())
+                .label("type_rank"),
+            )
+            .select_from(
+                semantic_search_cte.outerjoin(
+                    keyword_search_cte,
+                    semantic_search_cte.c.id == keyword_search_cte.c.id,
+                    full=True,
+                )
+            )
+            .join(
+                Chunk,
+                Chunk.id
+                == func.coalesce(semantic_search_cte.c.id, keyword_search_cte.c.id),
+            )
+            .join(Document, Chunk.document_id == Document.id)
+            .subquery("fused")
+        )
+        final_query = (
+            select(Chunk, fused.c.score)
+            .join(fused, Chunk.id == fused.c.id)
+            .options(joinedload(Chunk.document))
+            .where(fused.c.type_rank <= top_k)
+            .order_by(fused.c.document_type, fused.c.score.desc())
+        )
+
+        result = await self.db_session.execute(final_query)
+        chunks_with_scores = result.all()
+        if not chunks_with_scores:
+            return results
+
+        # Group by document (best chunk score wins), keeping top_k documents per type
+        doc_scores: dict[int, float] = {}
+        type_doc_ids: dict[str, list[int]] = {}
+        for chunk, chunk_score in chunks_with_scores:
+            doc_id = chunk.document.id
+            if doc_id in doc_scores:
+                doc_scores[doc_id] = max(doc_scores[doc_id], float(chunk_score))
+                continue
+            doc_scores[doc_id] = float(chunk_score)
+            type_doc_ids.setdefault(chunk.document.document_type.value, []).append(
+                doc_id
+            )
+
+        doc_ids = [doc_id for ids in type_doc_ids.values() for doc_id in ids[:top_k]]
+        grouped_docs = await self._fetch_grouped_documents(
+            doc_ids, doc_scores, base_conditions
+        )
+        for doc in grouped_docs:
+            results.setdefault(doc["source"], []).append(doc)
+
+        return results
+
+    async def _fetch_grouped_documents(
+        self,
+        doc_ids: list[int],
+        doc_scores: dict[int, float],
+        base_conditions: list,
+    ) -> list[dict]:
+        """
+        Load all chunks of the selected documents and group them per document.
+
+        Args:
+            doc_ids: Selected document IDs, in result order
+            doc_scores: Relevance score per document ID
+            base_conditions: Document filters of the search being served
+
+        Returns:
+            Document-grouped results in the same order as doc_ids
+        """
+        from sqlalchemy import select
+        from sqlalchemy.orm import joinedload
+
+        from app.db import Chunk, Document
+
         # Fetch ALL chunks for selected documents in a single query so the final prompt can cite
         # any chunk from those documents.
         chunk_query = (
@@ -308,7 +528,7 @@ class ChucksHybridSearchRetriever:
             .join(Document, Chunk.document_id == Document.id)
             .where(Document.id.in_(doc_ids))
             .where(*base_conditions)
-            .order_by(Chunk.document_id, Chunk.id)
+            .order_by(Chunk.document_id, Chunk.position, Chunk.id)
         )
         chunks_result = await self.db_session.execute(chunk_query)
         all_chunks = chunks_result.scalars().all()
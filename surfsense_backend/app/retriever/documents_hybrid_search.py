@@ -1,5 +1,7 @@
 from datetime import datetime
 
+from app.retriever.vector_search_strategy import prepare_vector_search
+
 
 class DocumentHybridSearchRetriever:
     def __init__(self, db_session):
@@ -18,6 +20,7 @@ class DocumentHybridSearchRetriever:
         search_space_id: int,
         start_date: datetime | None = None,
         end_date: datetime | None = None,
+        query_embedding: list[float] | None = None,
     ) -> list:
         """
         Perform vector similarity search on documents.
@@ -28,6 +31,8 @@ class DocumentHybridSearchRetriever:
             search_space_id: The search space ID to search within
             start_date: Optional start date for filtering documents by updated_at
             end_date: Optional end date for filtering documents by updated_at
+            query_embedding: Optional precomputed embedding of query_text, so
+                callers searching several times per request embed the query once
 
         Returns:
             List of documents sorted by vector similarity
@@ -35,12 +40,12 @@ class DocumentHybridSearchRetriever:
         from sqlalchemy import select
         from sqlalchemy.orm import joinedload
 
-        from app.config import config
         from app.db import Document
+        from app.services.embedding_service import get_embedding_service
 
-        # Get embedding for the query
-        embedding_model = config.embedding_model_instance
-        query_embedding = embedding_model.embed(query_text)
+        # Get embedding for the query (unless the caller already computed it)
+        if query_embedding is None:
+            query_embedding = await get_embedding_service().embed_query(query_text)
 
         # Build the query filtered by search space
         query = (
@@ -55,10 +60,14 @@ class DocumentHybridSearchRetriever:
         if end_date is not None:
             query = query.where(Document.updated_at <= end_date)
 
-        # Add vector similarity ordering
-        query = query.order_by(Document.embedding.op("<=>")(query_embedding)).limit(
-            top_k
+        # Add vector similarity ordering (exact or HNSW, depending on search space size)
+        distance = await prepare_vector_search(
+            self.db_session,
+            Document.search_space_id,
+            search_space_id,
+            Document.embedding.op("<=>")(query_embedding),
         )
+        query = query.order_by(distance).limit(top_k)
 
         # Execute the query
         result = await self.db_session.execute(query)
@@ -92,8 +101,8 @@ class DocumentHybridSearchRetriever:
 
         from app.db import Document
 
-        # Create tsvector and tsquery for PostgreSQL full-text search
-        tsvector = func.to_tsvector("english", Document.content)
+        # Stored tsvector (kept in sync by trigger) and tsquery for full-text search
+        tsvector = Document.search_vector
         tsquery = func.plainto_tsquery("english", query_text)
 
         # Build the query filtered by search space
@@ -129,6 +138,7 @@ class DocumentHybridSearchRetriever:
         document_type: str | None = None,
         start_date: datetime | None = None,
         end_date: datetime | None = None,
+        query_embedding: list[float] | None = None,
     ) -> list:
         """
         Hybrid search that returns **documents** (not individual chunks).
@@ -143,24 +153,26 @@ class DocumentHybridSearchRetriever:
             document_type: Optional document type to filter results (e.g., "FILE", "CRAWLED_URL")
             start_date: Optional start date for filtering documents by updated_at
             end_date: Optional end date for filtering documents by updated_at
+            query_embedding: Optional precomputed embedding of query_text, so
+                callers searching several times per request embed the query once
 
         """
         from sqlalchemy import func, select, text
         from sqlalchemy.orm import joinedload
 
-        from app.config import config
-        from app.db import Chunk, Document, DocumentType
+        from app.db import Document, DocumentType
+        from app.services.embedding_service import get_embedding_service
 
-        # Get embedding for the query
-        embedding_model = config.embedding_model_instance
-        query_embedding = embedding_model.embed(query_text)
+        # Get embedding for the query (unless the caller already computed it)
+        if query_embedding is None:
+            query_embedding = await get_embedding_service().embed_query(query_text)
 
         # RRF constants
         k = 60
         n_results = top_k * 2  # Fetch extra documents for better fusion
 
-        # Create tsvector and tsquery for PostgreSQL full-text search
-        tsvector = func.to_tsvector("english", Document.content)
+        # Stored tsvector (kept in sync by trigger) and tsquery for full-text search
+        tsvector = Document.search_vector
         tsquery = func.plainto_tsquery("english", query_text)
 
         # Base conditions for document filtering - search space is required
@@ -185,16 +197,22 @@ class DocumentHybridSearchRetriever:
         if end_date is not None:
             base_conditions.append(Document.updated_at <= end_date)
 
+        # Exact or HNSW vector search, depending on search space size
+        distance = await prepare_vector_search(
+            self.db_session,
+            Document.search_space_id,
+            search_space_id,
+            Document.embedding.op("<=>")(query_embedding),
+        )
+
         # CTE for semantic search filtered by search space
         semantic_search_cte = select(
             Document.id,
-            func.rank()
-            .over(order_by=Document.embedding.op("<=>")(query_embedding))
-            .label("rank"),
+            func.rank().over(order_by=distance).label("rank"),
         ).where(*base_conditions)
 
         semantic_search_cte = (
-            semantic_search_cte.order_by(Document.embedding.op("<=>")(query_embedding))
+            semantic_search_cte.order_by(distance)
             .limit(n_results)
             .cte("semantic_search")
         )
@@ -251,6 +269,174 @@ class DocumentHybridSearchRetriever:
         if not documents_with_scores:
             return []
 
+        return await self._fetch_grouped_documents(documents_with_scores)
+
+    async def hybrid_search_by_type(
+        self,
+        query_text: str,
+        top_k: int,
+        search_space_id: int,
+        document_types: list[str],
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        query_embedding: list[float] | None = None,
+    ) -> dict[str, list]:
+        """
+        Hybrid search over several document types in a single pass.
+
+        Equivalent to calling `hybrid_search` once per document type, but all
+        types are ranked by one query (plus one query to fetch the chunks of
+        the selected documents). Every type gets its own ordered, limited
+        semantic and keyword subquery, combined with UNION ALL, so each can
+        stop after n_results rows instead of ranking the whole search space.
+
+        Args:
+            query_text: The search query text
+            top_k: Number of documents to return per document type
+            search_space_id: The search space ID to search within
+            document_types: Document types to search (e.g., ["FILE", "CRAWLED_URL"])
+            start_date: Optional start date for filtering documents by updated_at
+            end_date: Optional end date for filtering documents by updated_at
+            query_embedding: Optional precomputed embedding of query_text
+
+        Returns:
+            Dict mapping each requested document type to the same document-grouped
+            results `hybrid_search` returns for that type
+        """
+        from sqlalchemy import func, select, union_all
+        from sqlalchemy.orm import joinedload
+
+        from app.db import Document, DocumentType
+        from app.services.embedding_service import get_embedding_service
+
+        results: dict[str, list] = {
+            document_type: [] for document_type in document_types
+        }
+
+        # Unknown document types simply get no results (as in hybrid_search)
+        doc_type_enums = [
+            DocumentType[document_type]
+            for document_type in document_types
+            if document_type in DocumentType.__members__
+        ]
+        if not doc_type_enums:
+            return results
+
+        if query_embedding is None:
+            query_embedding = await get_embedding_service().embed_query(query_text)
+
+        # RRF constants
+        k = 60
+        n_results = top_k * 2  # Fetch extra documents for better fusion
+
+        tsvector = Document.search_vector
+        tsquery = func.plainto_tsquery("english", query_text)
+        keyword_rank = func.ts_rank_cd(tsvector, tsquery)
+
+        base_conditions = [
+            Document.search_space_id == search_space_id,
+            Document.document_type.in_(doc_type_enums),
+        ]
+        if start_date is not None:
+            base_conditions.append(Document.updated_at >= start_date)
+        if end_date is not None:
+            base_conditions.append(Document.updated_at <= end_date)
+
+        # Exact or HNSW vector search, depending on search space size
+        distance = await prepare_vector_search(
+            self.db_session,
+            Document.search_space_id,
+            search_space_id,
+            Document.embedding.op("<=>")(query_embedding),
+        )
+
+        # Top n_results documents of every document type by semantic similarity
+        semantic_search_cte = union_all(
+            *(
+                select(Document.id, func.rank().over(order_by=distance).label("rank"))
+                .where(*base_conditions, Document.document_type == doc_type)
+                .order_by(distance)
+                .limit(n_results)
+                for doc_type in doc_type_enums
+            )
+        ).cte("semantic_search")
+
+        # Top n_results documents of every document type by keyword rank
+        keyword_search_cte = union_all(
+            *(
+                select(
+                    Document.id,
+                    func.rank().over(order_by=keyword_rank.desc()).label("rank"),
+                )
+                .where(*base_conditions, Document.document_type == doc_type)
+                .where(tsvector.op("@@")(tsquery))
+                .order_by(keyword_rank.desc())
+                .limit(n_results)
+                for doc_type in doc_type_enums
+            )
+        ).cte("keyword_search")
+
+        # RRF fusion, then keep the top_k documents of every document type
+        score = func.coalesce(
+            1.0 / (k + semantic_search_cte.c.rank), 0.0
+        ) + func.coalesce(1.0 / (k + keyword_search_cte.c.rank), 0.0)
+        fused = (
+            select(
+                Document.id,
+                Document.document_type,
+                score.label("score"),
+                func.row_number()
+                .over(partition_by=Document.document_type, order_by=score.desc())
+                .label("type_rank"),
+            )
+            .select_from(
+                semantic_search_cte.outerjoin(
+                    keyword_search_cte,
+                    semantic_search_cte.c.id == keyword_search_cte.c.id,
+                    full=True,
+                )
+            )
+            .join(
+                Document,
+                Document.id
+                == func.coalesce(semantic_search_cte.c.id, keyword_search_cte.c.id),
+            )
+            .subquery("fused")
+        )
+        final_query = (
+            select(Document, fused.c.score)
+            .join(fused, Document.id == fused.c.id)
+            .options(joinedload(Document.search_space))
+            .where(fused.c.type_rank <= top_k)
+            .order_by(fused.c.document_type, fused.c.score.desc())
+        )
+
+        result = await self.db_session.execute(final_query)
+        documents_with_scores = result.all()
+        if not documents_with_scores:
+            return results
+
+        grouped_docs = await self._fetch_grouped_documents(documents_with_scores)
+        for doc in grouped_docs:
+            results.setdefault(doc["source"], []).append(doc)
+
+        return results
+
+    async def _fetch_grouped_documents(self, documents_with_scores: list) -> list[dict]:
+        """
+        Load all chunks of the selected documents and group them per document.
+
+        Args:
+            documents_with_scores: (Document, score) rows, in result order
+
+        Returns:
+            Document-grouped results in the same order as documents_with_scores
+        """
+        from sqlalchemy import select
+        from sqlalchemy.orm import joinedload
+
+        from app.db import Chunk
+
         # Collect document IDs for chunk fetching
         doc_ids: list[int] = [doc.id for doc, _score in documents_with_scores]
 
@@ -259,7 +445,7 @@ class DocumentHybridSearchRetriever:
             select(Chunk)
             .options(joinedload(Chunk.document))
             .where(Chunk.document_id.in_(doc_ids))
-            .order_by(Chunk.document_id, Chunk.id)
+            .order_by(Chunk.document_id, Chunk.position, Chunk.id)
         )
         chunks_result = await self.db_session.execute(chunks_query)
         chunks = chunks_result.scalars().all()
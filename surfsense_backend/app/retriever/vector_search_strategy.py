@@ -0,0 +1,129 @@
+"""
+Vector search strategy selection per search space.
+
+The HNSW indexes on chunks and documents are shared by all search spaces, so
+the search space filter is applied to the candidates of the approximate index
+scan. For a small search space on a large instance that post-filter either
+drops almost every candidate (too few results) or the planner gives up on the
+index and scans the whole table.
+
+Each search space therefore gets one of two strategies, based on its size:
+
+- ``exact``: small enough to scan. Rows are selected through the
+  ``search_space_id`` B-tree index and ranked by their exact distance.
+- ``hnsw``: large search space. The HNSW index is used with pgvector's
+  iterative index scans (pgvector >= 0.8), which keep scanning the graph
+  until enough rows pass the filter.
+"""
+
+import logging
+import time
+from typing import Any, Literal
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import config
+
+logger = logging.getLogger(__name__)
+
+VectorSearchStrategy = Literal["exact", "hnsw"]
+
+# (table name, search space id) -> (expires at, strategy)
+_strategy_cache: dict[tuple[str, int], tuple[float, VectorSearchStrategy]] = {}
+_iterative_scan_supported: bool | None = None
+
+
+async def _supports_iterative_scan(session: AsyncSession) -> bool:
+    """Whether the installed pgvector version has hnsw.iterative_scan."""
+    global _iterative_scan_supported
+    if _iterative_scan_supported is None:
+        result = await session.execute(
+            text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+        )
+        version = result.scalar() or "0.0"
+        try:
+            major, minor = (int(part) for part in version.split(".")[:2])
+            _iterative_scan_supported = (major, minor) >= (0, 8)
+        except ValueError:
+            _iterative_scan_supported = False
+    return _iterative_scan_supported
+
+
+async def get_vector_search_strategy(
+    session: AsyncSession, search_space_column: Any, search_space_id: int
+) -> VectorSearchStrategy:
+    """
+    Pick the vector search strategy for a search space.
+
+    Only counts up to VECTOR_EXACT_SEARCH_MAX_ROWS + 1 rows, so the lookup
+    stays cheap for large search spaces, and caches the result for
+    VECTOR_SEARCH_STRATEGY_TTL seconds.
+
+    Args:
+        session: Database session
+        search_space_column: search_space_id column of the searched table
+        search_space_id: The search space being searched
+
+    Returns:
+        "exact" or "hnsw"
+    """
+    cache_key = (search_space_column.table.name, search_space_id)
+    now = time.monotonic()
+    cached = _strategy_cache.get(cache_key)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+
+    max_rows = config.VECTOR_EXACT_SEARCH_MAX_ROWS
+    bounded_rows = (
+        select(search_space_column)
+        .where(search_space_column == search_space_id)
+        .limit(max_rows + 1)
+        .subquery()
+    )
+    result = await session.execute(select(func.count()).select_from(bounded_rows))
+    row_count = result.scalar() or 0
+
+    strategy: VectorSearchStrategy = "exact" if row_count <= max_rows else "hnsw"
+    _strategy_cache[cache_key] = (now + config.VECTOR_SEARCH_STRATEGY_TTL, strategy)
+    logger.debug(
+        f"Vector search strategy for {cache_key[0]} in search space "
+        f"{search_space_id}: {strategy}"
+    )
+    return strategy
+
+
+async def prepare_vector_search(
+    session: AsyncSession,
+    search_space_column: Any,
+    search_space_id: int,
+    distance: Any,
+) -> Any:
+    """
+    Apply the search space's vector search strategy.
+
+    Args:
+        session: Database session the search query will run on
+        search_space_column: search_space_id column of the searched table
+        search_space_id: The search space being searched
+        distance: The ``embedding <=> query`` expression
+
+    Returns:
+        The distance expression the query should order by
+    """
+    strategy = await get_vector_search_strategy(
+        session, search_space_column, search_space_id
+    )
+
+    if strategy == "exact":
+        # Ordering by an expression the HNSW index cannot serve makes the
+        # planner filter by search space first and sort the exact distances
+        return distance.op("+")(0)
+
+    if await _supports_iterative_scan(session):
+        # Transaction-local; strict order keeps the ranks computed from the
+        # index order exact
+        await session.execute(
+            text("SELECT set_config('hnsw.iterative_scan', 'strict_order', true)")
+        )
+    return distance
@@ -1,7 +1,12 @@
 # Force asyncio to use standard event loop before unstructured imports
 import asyncio
+import base64
+import json
+from datetime import datetime
 
 from fastapi import APIRouter, Depends, Form, HTTPException, UploadFile
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, func, or_, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
@@ -17,6 +22,7 @@ from app.db import (
     get_async_session,
 )
 from app.schemas import (
+    DocumentListRead,
     DocumentRead,
     DocumentsCreate,
     DocumentTitleRead,
@@ -169,13 +175,205 @@ async def create_documents_file_upload(
         ) from e
 
 
-@router.get("/documents", response_model=PaginatedResponse[DocumentRead])
+# Columns a document listing can return, in response order. Listing never
+# loads the embedding, search_vector or blocknote_document columns.
+DOCUMENT_LIST_COLUMNS = {
+    "id": Document.id,
+    "title": Document.title,
+    "document_type": Document.document_type,
+    "document_metadata": Document.document_metadata,
+    "content": Document.content,
+    "content_hash": Document.content_hash,
+    "unique_identifier_hash": Document.unique_identifier_hash,
+    "created_at": Document.created_at,
+    "updated_at": Document.updated_at,
+    "search_space_id": Document.search_space_id,
+}
+
+# Rows fetched per round trip when exporting documents as NDJSON
+EXPORT_BATCH_SIZE = 500
+
+
+def _parse_list_fields(fields: str | None) -> list[str]:
+    """Resolve a comma-separated ?fields= value to listing columns."""
+    if fields is None or not fields.strip():
+        return list(DOCUMENT_LIST_COLUMNS)
+
+    requested = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = requested - DOCUMENT_LIST_COLUMNS.keys()
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown document field(s): {', '.join(sorted(unknown))}",
+        )
+    # id is always returned so rows can be identified
+    return [name for name in DOCUMENT_LIST_COLUMNS if name == "id" or name in requested]
+
+
+def _encode_cursor(updated_at: datetime | None, document_id: int) -> str:
+    payload = {"u": updated_at.isoformat() if updated_at else None, "id": document_id}
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime | None, int]:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        updated_at = payload["u"]
+        return (
+            datetime.fromisoformat(updated_at) if updated_at else None,
+            int(payload["id"]),
+        )
+    except (ValueError, KeyError, TypeError) as e:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from e
+
+
+def _after_cursor(cursor: str):
+    """
+    Filter for rows after the cursor in (updated_at DESC NULLS LAST, id DESC)
+    order, which idx_documents_search_space_updated serves without sorting.
+    """
+    updated_at, document_id = _decode_cursor(cursor)
+    if updated_at is None:
+        return and_(Document.updated_at.is_(None), Document.id < document_id)
+    return or_(
+        tuple_(Document.updated_at, Document.id) < (updated_at, document_id),
+        Document.updated_at.is_(None),
+    )
+
+
+async def _document_list_query(
+    session: AsyncSession,
+    user: User,
+    search_space_id: int | None,
+    document_types: str | None,
+    field_names: list[str],
+    title: str | None = None,
+):
+    """
+    Build the projected listing query and its count query, checking
+    DOCUMENTS_READ permission when a search space is given.
+    """
+    # updated_at and id are always selected to build the next cursor
+    columns = [
+        DOCUMENT_LIST_COLUMNS[name]
+        for name in dict.fromkeys([*field_names, "updated_at", "id"])
+    ]
+
+    if search_space_id is not None:
+        await check_permission(
+            session,
+            user,
+            search_space_id,
+            Permission.DOCUMENTS_READ.value,
+            "You don't have permission to read documents in this search space",
+        )
+        query = select(*columns).filter(Document.search_space_id == search_space_id)
+        count_query = (
+            select(func.count())
+            .select_from(Document)
+            .filter(Document.search_space_id == search_space_id)
+        )
+    else:
+        # Get documents from all search spaces user has membership in
+        query = (
+            select(*columns)
+            .select_from(Document)
+            .join(SearchSpace)
+            .join(SearchSpaceMembership)
+            .filter(SearchSpaceMembership.user_id == user.id)
+        )
+        count_query = (
+            select(func.count())
+            .select_from(Document)
+            .join(SearchSpace)
+            .join(SearchSpaceMembership)
+            .filter(SearchSpaceMembership.user_id == user.id)
+        )
+
+    if title is not None:
+        # Only search by title (case-insensitive)
+        query = query.filter(Document.title.ilike(f"%{title}%"))
+        count_query = count_query.filter(Document.title.ilike(f"%{title}%"))
+
+    # Filter by document_types if provided
+    if document_types is not None and document_types.strip():
+        type_list = [t.strip() for t in document_types.split(",") if t.strip()]
+        if type_list:
+            query = query.filter(Document.document_type.in_(type_list))
+            count_query = count_query.filter(Document.document_type.in_(type_list))
+
+    query = query.order_by(Document.updated_at.desc().nullslast(), Document.id.desc())
+    return query, count_query
+
+
+async def _paginate_documents(
+    session: AsyncSession,
+    query,
+    count_query,
+    field_names: list[str],
+    skip: int | None,
+    page: int | None,
+    page_size: int,
+    cursor: str | None,
+) -> PaginatedResponse[DocumentListRead]:
+    total_result = await session.execute(count_query)
+    total = total_result.scalar() or 0
+
+    # Calculate offset; a cursor replaces the offset
+    offset = 0
+    if cursor is not None:
+        query = query.filter(_after_cursor(cursor))
+    elif skip is not None:
+        offset = skip
+    elif page is not None:
+        offset = page * page_size
+
+    # Get paginated results, with one extra row to detect has_more
+    if page_size == -1:
+        result = await session.execute(query.offset(offset))
+    else:
+        result = await session.execute(query.offset(offset).limit(page_size + 1))
+
+    rows = result.all()
+    has_more = page_size > 0 and len(rows) > page_size
+    if has_more:
+        rows = rows[:page_size]
+
+    api_documents = [
+        DocumentListRead(**{name: getattr(row, name) for name in field_names})
+        for row in rows
+    ]
+
+    # Calculate pagination info
+    actual_page = (
+        page if page is not None else (offset // page_size if page_size > 0 else 0)
+    )
+
+    return PaginatedResponse(
+        items=api_documents,
+        total=total,
+        page=actual_page,
+        page_size=page_size,
+        has_more=has_more,
+        next_cursor=(
+            _encode_cursor(rows[-1].updated_at, rows[-1].id) if has_more else None
+        ),
+    )
+
+
+@router.get(
+    "/documents",
+    response_model=PaginatedResponse[DocumentListRead],
+    response_model_exclude_unset=True,
+)
 async def read_documents(
     skip: int | None = None,
     page: int | None = None,
     page_size: int = 50,
     search_space_id: int | None = None,
     document_types: str | None = None,
+    fields: str | None = None,
+    cursor: str | None = None,
     session: AsyncSession = Depends(get_async_session),
     user: User = Depends(current_active_user),
 ):
@@ -189,105 +387,26 @@ async def read_documents(
         page_size: Number of items per page (default: 50). Use -1 to return all remaining items after the offset.
         search_space_id: If provided, restrict results to a specific search space.
         document_types: Comma-separated list of document types to filter by (e.g., "EXTENSION,FILE,SLACK_CONNECTOR").
+        fields: Comma-separated document fields to return (e.g., "title,document_type,updated_at"). Default: all fields.
+        cursor: 'next_cursor' from the previous page. If provided, it takes precedence over 'skip' and 'page'.
         session: Database session (injected).
         user: Current authenticated user (injected).
 
     Returns:
-        PaginatedResponse[DocumentRead]: Paginated list of documents visible to the user.
+        PaginatedResponse[DocumentListRead]: Paginated list of documents visible to the user.
 
     Notes:
         - If both 'skip' and 'page' are provided, 'skip' is used.
         - Results are scoped to documents in search spaces the user has membership in.
+        - Results are ordered by most recently updated first.
     """
     try:
-        from sqlalchemy import func
-
-        # If specific search_space_id, check permission
-        if search_space_id is not None:
-            await check_permission(
-                session,
-                user,
-                search_space_id,
-                Permission.DOCUMENTS_READ.value,
-                "You don't have permission to read documents in this search space",
-            )
-            query = select(Document).filter(Document.search_space_id == search_space_id)
-            count_query = (
-                select(func.count())
-                .select_from(Document)
-                .filter(Document.search_space_id == search_space_id)
-            )
-        else:
-            # Get documents from all search spaces user has membership in
-            query = (
-                select(Document)
-                .join(SearchSpace)
-                .join(SearchSpaceMembership)
-                .filter(SearchSpaceMembership.user_id == user.id)
-            )
-            count_query = (
-                select(func.count())
-                .select_from(Document)
-                .join(SearchSpace)
-                .join(SearchSpaceMembership)
-                .filter(SearchSpaceMembership.user_id == user.id)
-            )
-
-        # Filter by document_types if provided
-        if document_types is not None and document_types.strip():
-            type_list = [t.strip() for t in document_types.split(",") if t.strip()]
-            if type_list:
-                query = query.filter(Document.document_type.in_(type_list))
-                count_query = count_query.filter(Document.document_type.in_(type_list))
-
-        total_result = await session.execute(count_query)
-        total = total_result.scalar() or 0
-
-        # Calculate offset
-        offset = 0
-        if skip is not None:
-            offset = skip
-        elif page is not None:
-            offset = page * page_size
-
-        # Get paginated results
-        if page_size == -1:
-            result = await session.execute(query.offset(offset))
-        else:
-            result = await session.execute(query.offset(offset).limit(page_size))
-
-        db_documents = result.scalars().all()
-
-        # Convert database objects to API-friendly format
-        api_documents = []
-        for doc in db_documents:
-            api_documents.append(
-                DocumentRead(
-                    id=doc.id,
-                    title=doc.title,
-                    document_type=doc.document_type,
-                    document_metadata=doc.document_metadata,
-                    content=doc.content,
-                    content_hash=doc.content_hash,
-                    unique_identifier_hash=doc.unique_identifier_hash,
-                    created_at=doc.created_at,
-                    updated_at=doc.updated_at,
-                    search_space_id=doc.search_space_id,
-                )
-            )
-
-        # Calculate pagination info
-        actual_page = (
-            page if page is not None else (offset // page_size if page_size > 0 else 0)
+        field_names = _parse_list_fields(fields)
+        query, count_query = await _document_list_query(
+            session, user, search_space_id, document_types, field_names
         )
-        has_more = (offset + len(api_documents)) < total if page_size > 0 else False
-
-        return PaginatedResponse(
-            items=api_documents,
-            total=total,
-            page=actual_page,
-            page_size=page_size,
-            has_more=has_more,
+        return await _paginate_documents(
+            session, query, count_query, field_names, skip, page, page_size, cursor
         )
     except HTTPException:
         raise
@@ -297,7 +416,11 @@ async def read_documents(
         ) from e
 
 
-@router.get("/documents/search", response_model=PaginatedResponse[DocumentRead])
+@router.get(
+    "/documents/search",
+    response_model=PaginatedResponse[DocumentListRead],
+    response_model_exclude_unset=True,
+)
 async def search_documents(
     title: str,
     skip: int | None = None,
@@ -305,6 +428,8 @@ async def search_documents(
     page_size: int = 50,
     search_space_id: int | None = None,
     document_types: str | None = None,
+    fields: str | None = None,
+    cursor: str | None = None,
     session: AsyncSession = Depends(get_async_session),
     user: User = Depends(current_active_user),
 ):
@@ -319,109 +444,25 @@ async def search_documents(
         page_size: Number of items per page. Use -1 to return all remaining items after the offset. Default: 50.
         search_space_id: Filter results to a specific search space. Default: None.
         document_types: Comma-separated list of document types to filter by (e.g., "EXTENSION,FILE,SLACK_CONNECTOR").
+        fields: Comma-separated document fields to return. Default: all fields.
+        cursor: 'next_cursor' from the previous page. If provided, it takes precedence over 'skip' and 'page'.
         session: Database session (injected).
         user: Current authenticated user (injected).
 
     Returns:
-        PaginatedResponse[DocumentRead]: Paginated list of documents matching the query and filter.
+        PaginatedResponse[DocumentListRead]: Paginated list of documents matching the query and filter.
 
     Notes:
         - Title matching uses ILIKE (case-insensitive).
         - If both 'skip' and 'page' are provided, 'skip' is used.
     """
     try:
-        from sqlalchemy import func
-
-        # If specific search_space_id, check permission
-        if search_space_id is not None:
-            await check_permission(
-                session,
-                user,
-                search_space_id,
-                Permission.DOCUMENTS_READ.value,
-                "You don't have permission to read documents in this search space",
-            )
-            query = select(Document).filter(Document.search_space_id == search_space_id)
-            count_query = (
-                select(func.count())
-                .select_from(Document)
-                .filter(Document.search_space_id == search_space_id)
-            )
-        else:
-            # Get documents from all search spaces user has membership in
-            query = (
-                select(Document)
-                .join(SearchSpace)
-                .join(SearchSpaceMembership)
-                .filter(SearchSpaceMembership.user_id == user.id)
-            )
-            count_query = (
-                select(func.count())
-                .select_from(Document)
-                .join(SearchSpace)
-                .join(SearchSpaceMembership)
-                .filter(SearchSpaceMembership.user_id == user.id)
-            )
-
-        # Only search by title (case-insensitive)
-        query = query.filter(Document.title.ilike(f"%{title}%"))
-        count_query = count_query.filter(Document.title.ilike(f"%{title}%"))
-
-        # Filter by document_types if provided
-        if document_types is not None and document_types.strip():
-            type_list = [t.strip() for t in document_types.split(",") if t.strip()]
-            if type_list:
-                query = query.filter(Document.document_type.in_(type_list))
-                count_query = count_query.filter(Document.document_type.in_(type_list))
-
-        total_result = await session.execute(count_query)
-        total = total_result.scalar() or 0
-
-        # Calculate offset
-        offset = 0
-        if skip is not None:
-            offset = skip
-        elif page is not None:
-            offset = page * page_size
-
-        # Get paginated results
-        if page_size == -1:
-            result = await session.execute(query.offset(offset))
-        else:
-            result = await session.execute(query.offset(offset).limit(page_size))
-
-        db_documents = result.scalars().all()
-
-        # Convert database objects to API-friendly format
-        api_documents = []
-        for doc in db_documents:
-            api_documents.append(
-                DocumentRead(
-                    id=doc.id,
-                    title=doc.title,
-                    document_type=doc.document_type,
-                    document_metadata=doc.document_metadata,
-                    content=doc.content,
-                    content_hash=doc.content_hash,
-                    unique_identifier_hash=doc.unique_identifier_hash,
-                    created_at=doc.created_at,
-                    updated_at=doc.updated_at,
-                    search_space_id=doc.search_space_id,
-                )
-            )
-
-        # Calculate pagination info
-        actual_page = (
-            page if page is not None else (offset // page_size if page_size > 0 else 0)
+        field_names = _parse_list_fields(fields)
+        query, count_query = await _document_list_query(
+            session, user, search_space_id, document_types, field_names, title=title
         )
-        has_more = (offset + len(api_documents)) < total if page_size > 0 else False
-
-        return PaginatedResponse(
-            items=api_documents,
-            total=total,
-            page=actual_page,
-            page_size=page_size,
-            has_more=has_more,
+        return await _paginate_documents(
+            session, query, count_query, field_names, skip, page, page_size, cursor
         )
     except HTTPException:
         raise
@@ -594,6 +635,52 @@ async def get_document_type_counts(
         ) from e
 
 
+@router.get("/documents/export")
+async def export_documents(
+    search_space_id: int | None = None,
+    document_types: str | None = None,
+    fields: str | None = None,
+    session: AsyncSession = Depends(get_async_session),
+    user: User = Depends(current_active_user),
+):
+    """
+    Stream documents the user has access to as newline-delimited JSON.
+    Requires DOCUMENTS_READ permission for the search space(s).
+
+    Rows are read from a server-side cursor in batches of EXPORT_BATCH_SIZE,
+    so exporting a whole search space does not hold it in memory.
+
+    Args:
+        search_space_id: If provided, restrict results to a specific search space.
+        document_types: Comma-separated list of document types to filter by.
+        fields: Comma-separated document fields to return. Default: all fields.
+        session: Database session (injected).
+        user: Current authenticated user (injected).
+
+    Returns:
+        StreamingResponse: One DocumentListRead JSON object per line.
+    """
+    field_names = _parse_list_fields(fields)
+    query, _ = await _document_list_query(
+        session, user, search_space_id, document_types, field_names
+    )
+
+    async def stream_rows():
+        result = await session.stream(
+            query.execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        async for rows in result.partitions():
+            yield "".join(
+                DocumentListRead(
+                    **{name: getattr(row, name) for name in field_names}
+                ).model_dump_json(exclude_unset=True)
+                + "\n"
+                for row in rows
+            )
+
+    return StreamingResponse(stream_rows(), media_type="application/x-ndjson")
+
+
 @router.get("/documents/by-chunk/{chunk_id}", response_model=DocumentWithChunksRead)
 async def get_document_by_chunk_id(
     chunk_id: int,
@@ -1,7 +1,7 @@
 from datetime import datetime, timedelta
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import and_, desc
+from sqlalchemy import and_, desc, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
@@ -21,6 +21,10 @@ from app.utils.rbac import check_permission
 
 router = APIRouter()
 
+# Row limits for the lists in the logs summary
+SUMMARY_ACTIVE_TASKS_LIMIT = 50
+SUMMARY_RECENT_FAILURES_LIMIT = 10
+
 
 @router.post("/logs", response_model=LogRead)
 async def create_log(
@@ -259,6 +263,9 @@ async def get_logs_summary(
     """
     Get a summary of logs for a search space in the last X hours.
     Requires LOGS_READ permission for the search space.
+
+    Counts are aggregated in the database; only the newest active tasks and
+    failures are loaded.
     """
     try:
         # Check permission
@@ -272,90 +279,90 @@ async def get_logs_summary(
 
         # Calculate time window
         since = datetime.utcnow().replace(microsecond=0) - timedelta(hours=hours)
+        in_window = and_(
+            Log.search_space_id == search_space_id, Log.created_at >= since
+        )
 
-        # Get logs from the time window
-        result = await session.execute(
-            select(Log)
-            .filter(
-                and_(Log.search_space_id == search_space_id, Log.created_at >= since)
-            )
-            .order_by(desc(Log.created_at))
+        # Count by status and level in a single pass with FILTER clauses
+        count_columns = [func.count().label("total")]
+        count_columns += [
+            func.count().filter(Log.status == status).label(f"status_{status.name}")
+            for status in LogStatus
+        ]
+        count_columns += [
+            func.count().filter(Log.level == level).label(f"level_{level.name}")
+            for level in LogLevel
+        ]
+        counts = (
+            (await session.execute(select(*count_columns).filter(in_window)))
+            .one()
+            ._mapping
+        )
+
+        source_result = await session.execute(
+            select(Log.source, func.count())
+            .filter(in_window, Log.source.isnot(None))
+            .group_by(Log.source)
         )
-        logs = result.scalars().all()
 
-        # Create summary
         summary = {
-            "total_logs": len(logs),
+            "total_logs": counts["total"],
             "time_window_hours": hours,
-            "by_status": {},
-            "by_level": {},
-            "by_source": {},
+            "by_status": {
+                status.value: counts[f"status_{status.name}"]
+                for status in LogStatus
+                if counts[f"status_{status.name}"]
+            },
+            "by_level": {
+                level.value: counts[f"level_{level.name}"]
+                for level in LogLevel
+                if counts[f"level_{level.name}"]
+            },
+            "by_source": dict(source_result.all()),
             "active_tasks": [],
             "recent_failures": [],
         }
 
-        # Count by status and level
-        for log in logs:
-            # Status counts
-            status_str = log.status.value
-            summary["by_status"][status_str] = (
-                summary["by_status"].get(status_str, 0) + 1
+        # Active tasks (IN_PROGRESS), newest first
+        active_result = await session.execute(
+            select(Log.id, Log.message, Log.created_at, Log.source, Log.log_metadata)
+            .filter(in_window, Log.status == LogStatus.IN_PROGRESS)
+            .order_by(desc(Log.created_at))
+            .limit(SUMMARY_ACTIVE_TASKS_LIMIT)
+        )
+        for log in active_result.all():
+            metadata = log.log_metadata or {}
+            summary["active_tasks"].append(
+                {
+                    "id": log.id,
+                    "task_name": metadata.get("task_name", "Unknown"),
+                    "message": log.message,
+                    "started_at": log.created_at,
+                    "source": log.source,
+                    "document_id": metadata.get("document_id"),
+                    "connector_id": metadata.get("connector_id"),
+                }
             )
 
-            # Level counts
-            level_str = log.level.value
-            summary["by_level"][level_str] = summary["by_level"].get(level_str, 0) + 1
-
-            # Source counts
-            if log.source:
-                summary["by_source"][log.source] = (
-                    summary["by_source"].get(log.source, 0) + 1
-                )
-
-            # Active tasks (IN_PROGRESS)
-            if log.status == LogStatus.IN_PROGRESS:
-                task_name = (
-                    log.log_metadata.get("task_name", "Unknown")
-                    if log.log_metadata
-                    else "Unknown"
-                )
-                document_id = (
-                    log.log_metadata.get("document_id") if log.log_metadata else None
-                )
-                connector_id = (
-                    log.log_metadata.get("connector_id") if log.log_metadata else None
-                )
-                summary["active_tasks"].append(
-                    {
-                        "id": log.id,
-                        "task_name": task_name,
-                        "message": log.message,
-                        "started_at": log.created_at,
-                        "source": log.source,
-                        "document_id": document_id,
-                        "connector_id": connector_id,
-                    }
-                )
-
-            # Recent failures
-            if log.status == LogStatus.FAILED and len(summary["recent_failures"]) < 10:
-                task_name = (
-                    log.log_metadata.get("task_name", "Unknown")
-                    if log.log_metadata
-                    else "Unknown"
-                )
-                summary["recent_failures"].append(
-                    {
-                        "id": log.id,
-                        "task_name": task_name,
-                        "message": log.message,
-                        "failed_at": log.created_at,
-                        "source": log.source,
-                        "error_details": log.log_metadata.get("error_details")
-                        if log.log_metadata
-                        else None,
-                    }
-                )
+        # Recent failures
+        failure_result = await session.execute(
+            select(Log.id, Log.message, Log.created_at, Log.source, Log.log_metadata)
+            .filter(in_window, Log.status == LogStatus.FAILED)
+            .order_by(desc(Log.created_at))
+            .limit(SUMMARY_RECENT_FAILURES_LIMIT)
+        )
+        for log in failure_result.all():
+            metadata = log.log_metadata or {}
+            summary["recent_failures"].append(
+                {
+                    "id": log.id,
+                    "task_name": metadata.get("task_name", "Unknown"),
+                    "message": log.message,
+                    "failed_at": log.created_at,
+                    "source": log.source,
+                    "error_details": metadata.get("error_details"),
+                }
+            )
 
         return summary
 
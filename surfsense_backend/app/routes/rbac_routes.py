@@ -50,6 +50,7 @@ from app.utils.rbac import (
     generate_invite_code,
     get_default_role,
     get_user_permissions,
+    invalidate_access_cache,
 )
 
 logger = logging.getLogger(__name__)
@@ -393,6 +394,7 @@ async def update_role(
             setattr(db_role, key, value)
 
         await session.commit()
+        invalidate_access_cache(search_space_id, session)
         await session.refresh(db_role)
         return db_role
 
@@ -446,6 +448,7 @@ async def delete_role(
 
         await session.delete(db_role)
         await session.commit()
+        invalidate_access_cache(search_space_id, session)
         return {"message": "Role deleted successfully"}
 
     except HTTPException:
@@ -584,6 +587,7 @@ async def update_member_role(
 
         db_membership.role_id = membership_update.role_id
         await session.commit()
+        invalidate_access_cache(search_space_id, session)
         await session.refresh(db_membership)
 
         # Fetch user email
@@ -650,6 +654,7 @@ async def leave_search_space(
 
         await session.delete(db_membership)
         await session.commit()
+        invalidate_access_cache(search_space_id, session)
         return {"message": "Successfully left the search space"}
 
     except HTTPException:
@@ -702,6 +707,7 @@ async def remove_member(
 
         await session.delete(db_membership)
         await session.commit()
+        invalidate_access_cache(search_space_id, session)
         return {"message": "Member removed successfully"}
 
     except HTTPException:
@@ -1081,6 +1087,7 @@ async def accept_invite(
         invite.uses_count += 1
 
         await session.commit()
+        invalidate_access_cache(invite.search_space_id, session)
 
         role_name = invite.role.name if invite.role else "Default"
         search_space_name = invite.search_space.name if invite.search_space else ""
@@ -1118,7 +1125,7 @@ async def get_my_access(
     Get the current user's access info for a search space.
     """
     try:
-        membership = await check_search_space_access(session, user, search_space_id)
+        access = await check_search_space_access(session, user, search_space_id)
 
         # Get search space name
         result = await session.execute(
@@ -1132,8 +1139,8 @@ async def get_my_access(
         return UserSearchSpaceAccess(
             search_space_id=search_space_id,
             search_space_name=search_space.name if search_space else "",
-            is_owner=membership.is_owner,
-            role_name=membership.role.name if membership.role else None,
+            is_owner=access.is_owner,
+            role_name=access.role_name,
             permissions=permissions,
         )
 
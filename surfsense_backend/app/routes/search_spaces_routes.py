@@ -1,12 +1,16 @@
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import func
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import and_, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.orm import aliased
 
+from app.agents.new_chat.agent_cache import invalidate_agent_cache
 from app.config import config
 from app.db import (
+    Document,
+    NewChatThread,
     NewLLMConfig,
     Permission,
     SearchSpace,
@@ -25,12 +29,19 @@ from app.schemas import (
     SearchSpaceWithStats,
 )
 from app.users import current_active_user
-from app.utils.rbac import check_permission, check_search_space_access
+from app.utils.rbac import (
+    check_permission,
+    check_search_space_access,
+    invalidate_access_cache,
+)
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Optional stats for GET /searchspaces?include=...
+SEARCH_SPACE_STATS_INCLUDES = frozenset({"document_counts", "last_activity"})
+
 
 async def create_default_roles_and_membership(
     session: AsyncSession,
@@ -106,11 +117,76 @@ async def create_search_space(
         ) from e
 
 
+def _search_spaces_with_stats_query(user: User, owned_only: bool, includes: set[str]):
+    """
+    Build one statement returning search spaces with their stats.
+
+    Member counts, document counts and last activity are correlated
+    subqueries, so Postgres evaluates them only for the returned page using
+    the search_space_id indexes instead of one round trip per search space.
+    """
+    members = aliased(SearchSpaceMembership)
+    member_count = (
+        select(func.count(members.id))
+        .where(members.search_space_id == SearchSpace.id)
+        .correlate(SearchSpace)
+        .scalar_subquery()
+    )
+    columns = [
+        SearchSpace,
+        member_count.label("member_count"),
+        func.coalesce(SearchSpaceMembership.is_owner, False).label("is_owner"),
+    ]
+
+    if "document_counts" in includes:
+        columns.append(
+            select(func.count(Document.id))
+            .where(Document.search_space_id == SearchSpace.id)
+            .correlate(SearchSpace)
+            .scalar_subquery()
+            .label("document_count")
+        )
+    if "last_activity" in includes:
+        last_document = (
+            select(func.max(func.coalesce(Document.updated_at, Document.created_at)))
+            .where(Document.search_space_id == SearchSpace.id)
+            .correlate(SearchSpace)
+            .scalar_subquery()
+        )
+        last_thread = (
+            select(func.max(NewChatThread.updated_at))
+            .where(NewChatThread.search_space_id == SearchSpace.id)
+            .correlate(SearchSpace)
+            .scalar_subquery()
+        )
+        # GREATEST ignores NULLs, so spaces without chats still get a value
+        columns.append(
+            func.greatest(last_document, last_thread).label("last_activity_at")
+        )
+
+    user_membership = and_(
+        SearchSpaceMembership.search_space_id == SearchSpace.id,
+        SearchSpaceMembership.user_id == user.id,
+    )
+    query = select(*columns)
+    if owned_only:
+        # Only search spaces where user is the original creator (user_id)
+        return query.outerjoin(SearchSpaceMembership, user_membership).filter(
+            SearchSpace.user_id == user.id
+        )
+    # All search spaces the user has membership in
+    return query.join(SearchSpaceMembership, user_membership)
+
+
 @router.get("/searchspaces", response_model=list[SearchSpaceWithStats])
 async def read_search_spaces(
     skip: int = 0,
     limit: int = 200,
     owned_only: bool = False,
+    include: str | None = Query(
+        None,
+        description="Comma-separated extra stats: document_counts, last_activity",
+    ),
     session: AsyncSession = Depends(get_async_session),
     user: User = Depends(current_active_user),
 ):
@@ -122,66 +198,41 @@ async def read_search_spaces(
         limit: Maximum number of items to return
         owned_only: If True, only return search spaces owned by the user.
                    If False (default), return all search spaces the user has access to.
+        include: Optional comma-separated stats to add to each search space
+                 ("document_counts", "last_activity").
     """
-    try:
-        if owned_only:
-            # Return only search spaces where user is the original creator (user_id)
-            result = await session.execute(
-                select(SearchSpace)
-                .filter(SearchSpace.user_id == user.id)
-                .order_by(SearchSpace.id.asc())
-                .offset(skip)
-                .limit(limit)
-            )
-        else:
-            # Return all search spaces the user has membership in
-            result = await session.execute(
-                select(SearchSpace)
-                .join(SearchSpaceMembership)
-                .filter(SearchSpaceMembership.user_id == user.id)
-                .order_by(SearchSpace.id.asc())
-                .offset(skip)
-                .limit(limit)
-            )
+    includes = {part.strip() for part in (include or "").split(",") if part.strip()}
+    unknown = includes - SEARCH_SPACE_STATS_INCLUDES
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown include value(s): {', '.join(sorted(unknown))}",
+        )
 
-        search_spaces = result.scalars().all()
+    try:
+        result = await session.execute(
+            _search_spaces_with_stats_query(user, owned_only, includes)
+            .order_by(SearchSpace.id.asc())
+            .offset(skip)
+            .limit(limit)
+        )
 
-        # Get member counts and ownership info for each search space
-        search_spaces_with_stats = []
-        for space in search_spaces:
-            # Get member count
-            count_result = await session.execute(
-                select(func.count(SearchSpaceMembership.id)).filter(
-                    SearchSpaceMembership.search_space_id == space.id
-                )
+        return [
+            SearchSpaceWithStats(
+                id=row.SearchSpace.id,
+                name=row.SearchSpace.name,
+                description=row.SearchSpace.description,
+                created_at=row.SearchSpace.created_at,
+                user_id=row.SearchSpace.user_id,
+                citations_enabled=row.SearchSpace.citations_enabled,
+                qna_custom_instructions=row.SearchSpace.qna_custom_instructions,
+                member_count=row.member_count or 1,
+                is_owner=row.is_owner,
+                document_count=row._mapping.get("document_count"),
+                last_activity_at=row._mapping.get("last_activity_at"),
             )
-            member_count = count_result.scalar() or 1
-
-            # Check if current user is owner
-            ownership_result = await session.execute(
-                select(SearchSpaceMembership).filter(
-                    SearchSpaceMembership.search_space_id == space.id,
-                    SearchSpaceMembership.user_id == user.id,
-                    SearchSpaceMembership.is_owner == True,  # noqa: E712
-                )
-            )
-            is_owner = ownership_result.scalars().first() is not None
-
-            search_spaces_with_stats.append(
-                SearchSpaceWithStats(
-                    id=space.id,
-                    name=space.name,
-                    description=space.description,
-                    created_at=space.created_at,
-                    user_id=space.user_id,
-                    citations_enabled=space.citations_enabled,
-                    qna_custom_instructions=space.qna_custom_instructions,
-                    member_count=member_count,
-                    is_owner=is_owner,
-                )
-            )
-
-        return search_spaces_with_stats
+            for row in result.all()
+        ]
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Failed to fetch search spaces: {e!s}"
@@ -294,6 +345,8 @@ async def delete_search_space(
 
         await session.delete(db_search_space)
         await session.commit()
+        invalidate_agent_cache(search_space_id)
+        invalidate_access_cache(search_space_id, session)
         return {"message": "Search space deleted successfully"}
     except HTTPException:
         raise
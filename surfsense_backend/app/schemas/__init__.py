@@ -2,6 +2,7 @@ from .base import IDModel, TimestampModel
 from .chunks import ChunkBase, ChunkCreate, ChunkRead, ChunkUpdate
 from .documents import (
     DocumentBase,
+    DocumentListRead,
     DocumentRead,
     DocumentsCreate,
     DocumentTitleRead,
@@ -86,6 +87,7 @@ __all__ = [
     "DefaultSystemInstructionsResponse",
     # Document schemas
     "DocumentBase",
+    "DocumentListRead",
     "DocumentRead",
     "DocumentTitleRead",
     "DocumentTitleSearchResponse",
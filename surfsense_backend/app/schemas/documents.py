@@ -61,12 +61,31 @@ class DocumentWithChunksRead(DocumentRead):
     model_config = ConfigDict(from_attributes=True)
 
 
+class DocumentListRead(BaseModel):
+    """Document listing row; only the fields selected with ?fields= are set."""
+
+    id: int
+    title: str | None = None
+    document_type: DocumentType | None = None
+    document_metadata: dict | None = None
+    content: str | None = None
+    content_hash: str | None = None
+    unique_identifier_hash: str | None = None
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
+    search_space_id: int | None = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class PaginatedResponse[T](BaseModel):
     items: list[T]
     total: int
     page: int
     page_size: int
     has_more: bool
+    # Keyset cursor for the next page, when the listing supports it
+    next_cursor: str | None = None
 
 
 class DocumentTitleRead(BaseModel):
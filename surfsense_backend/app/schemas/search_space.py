@@ -41,3 +41,6 @@ class SearchSpaceWithStats(SearchSpaceRead):
 
     member_count: int = 1
     is_owner: bool = False
+    # Only set when requested with ?include=document_counts,last_activity
+    document_count: int | None = None
+    last_activity_at: datetime | None = None
@@ -1,4 +1,5 @@
 import asyncio
+from contextlib import asynccontextmanager
 from datetime import datetime
 from typing import Any
 from urllib.parse import urljoin
@@ -6,10 +7,11 @@ from urllib.parse import urljoin
 import httpx
 from linkup import LinkupClient
 from sqlalchemy import func
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.future import select
 from tavily import TavilyClient
 
+from app.config import config
 from app.db import (
     Chunk,
     Document,
@@ -18,11 +20,23 @@ from app.db import (
 )
 from app.retriever.chunks_hybrid_search import ChucksHybridSearchRetriever
 from app.retriever.documents_hybrid_search import DocumentHybridSearchRetriever
+from app.services.embedding_service import get_embedding_service
 
 
 class ConnectorService:
-    def __init__(self, session: AsyncSession, search_space_id: int | None = None):
+    def __init__(
+        self,
+        session: AsyncSession,
+        search_space_id: int | None = None,
+        session_maker: async_sessionmaker | None = None,
+    ):
         self.session = session
+        # When set, every retrieval leg checks out its own session from this
+        # maker, so retrievers and web searches can run concurrently
+        self.session_maker = session_maker
+        self._session_semaphore = asyncio.Semaphore(
+            max(1, config.SEARCH_MAX_CONCURRENT_SESSIONS)
+        )
         self.chunk_retriever = ChucksHybridSearchRetriever(session)
         self.document_retriever = DocumentHybridSearchRetriever(session)
         self.search_space_id = search_space_id
@@ -32,6 +46,11 @@ class ConnectorService:
         self.counter_lock = (
             asyncio.Lock()
         )  # Lock to protect counter in multithreaded environments
+        # Per-request query embeddings shared by every retriever and connector
+        # searched with the same query text
+        self._query_embeddings: dict[str, Any] = {}
+        # Results of a multi-type search, consumed by _combined_rrf_search
+        self._prefetched_results: dict[tuple, list[dict[str, Any]]] = {}
 
     async def initialize_counter(self):
         """
@@ -57,6 +76,76 @@ class ConnectorService:
                 # Fallback to default value
                 self.source_id_counter = 1
 
+    async def _get_query_embedding(self, query_text: str) -> Any:
+        """
+        Get the embedding for a query, computing it at most once per request.
+
+        A single knowledge-base tool call can search dozens of connectors, each
+        running a chunk-level and a document-level retriever, all with the same
+        query text.
+
+        Args:
+            query_text: The search query text
+
+        Returns:
+            The query embedding
+        """
+        if query_text not in self._query_embeddings:
+            query_embedding = await get_embedding_service().embed_query(query_text)
+            self._query_embeddings[query_text] = query_embedding
+        return self._query_embeddings[query_text]
+
+    @property
+    def supports_concurrent_search(self) -> bool:
+        """Whether searches on this service may be awaited concurrently."""
+        return self.session_maker is not None
+
+    @asynccontextmanager
+    async def _retrieval_session(self):
+        """
+        Session for one retrieval leg: a fresh pooled session in concurrent
+        mode, the shared request session otherwise.
+        """
+        if self.session_maker is None:
+            yield self.session
+            return
+        # Bound the pooled connections a single request can hold at once
+        async with self._session_semaphore, self.session_maker() as session:
+            yield session
+
+    async def _run_retrievers(self, method_name: str, **kwargs) -> tuple[Any, Any]:
+        """
+        Run the same search on the chunk and document retrievers.
+
+        Args:
+            method_name: Retriever method to call (e.g. "hybrid_search")
+            **kwargs: Arguments for the retriever method
+
+        Returns:
+            tuple: (chunk_retriever_results, document_retriever_results)
+        """
+        if self.session_maker is None:
+            # IMPORTANT:
+            # These retrievers share the same AsyncSession. AsyncSession does not permit
+            # concurrent awaits that require DB IO on the same session/connection.
+            # Running these in parallel can raise:
+            # "This session is provisioning a new connection; concurrent operations are not permitted"
+            #
+            # So we run them sequentially.
+            chunk_results = await getattr(self.chunk_retriever, method_name)(**kwargs)
+            doc_results = await getattr(self.document_retriever, method_name)(**kwargs)
+            return chunk_results, doc_results
+
+        async def _run(retriever_cls):
+            async with self._retrieval_session() as session:
+                return await getattr(retriever_cls(session), method_name)(**kwargs)
+
+        chunk_results, doc_results = await asyncio.gather(
+            _run(ChucksHybridSearchRetriever),
+            _run(DocumentHybridSearchRetriever),
+        )
+        return chunk_results, doc_results
+
     async def search_crawled_urls(
         self,
         user_query: str,
@@ -235,6 +324,9 @@ class ConnectorService:
         3. Combines results using RRF based on their ranks in each result set
         4. Returns top-k deduplicated results
 
+        If `prefetch_combined_search` already ran for the same arguments, its
+        results are returned instead.
+
         Args:
             query_text: The search query text
             search_space_id: The search space ID to search within
@@ -246,36 +338,112 @@ class ConnectorService:
         Returns:
             List of combined and deduplicated document results
         """
-        # RRF constant
-        k = 60
+        prefetch_key = (
+            query_text,
+            search_space_id,
+            document_type,
+            top_k,
+            start_date,
+            end_date,
+        )
+        if prefetch_key in self._prefetched_results:
+            return self._prefetched_results.pop(prefetch_key)
 
         # Get more results from each retriever for better fusion
         retriever_top_k = top_k * 2
 
-        # IMPORTANT:
-        # These retrievers share the same AsyncSession. AsyncSession does not permit
-        # concurrent awaits that require DB IO on the same session/connection.
-        # Running these in parallel can raise:
-        # "This session is provisioning a new connection; concurrent operations are not permitted"
-        #
-        # So we run them sequentially.
-        chunk_results = await self.chunk_retriever.hybrid_search(
+        query_embedding = await self._get_query_embedding(query_text)
+        chunk_results, doc_results = await self._run_retrievers(
+            "hybrid_search",
             query_text=query_text,
             top_k=retriever_top_k,
             search_space_id=search_space_id,
             document_type=document_type,
             start_date=start_date,
             end_date=end_date,
+            query_embedding=query_embedding,
         )
-        doc_results = await self.document_retriever.hybrid_search(
+
+        return self._rrf_merge(chunk_results, doc_results, top_k)
+
+    async def prefetch_combined_search(
+        self,
+        query_text: str,
+        search_space_id: int,
+        document_types: list[str],
+        top_k: int = 20,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+    ) -> None:
+        """
+        Run the combined RRF search for several document types in a single pass.
+
+        Both retrievers rank all requested document types in one query each
+        (partitioned per type), instead of two queries per type. The fused
+        per-type results are kept on this service, so the following
+        `search_<type>` calls with the same arguments build their sources from
+        them without touching the database.
+
+        Args:
+            query_text: The search query text
+            search_space_id: The search space ID to search within
+            document_types: Document types to search (e.g., ["FILE", "CRAWLED_URL"])
+            top_k: Number of results to return per document type
+            start_date: Optional start date for filtering documents by updated_at
+            end_date: Optional end date for filtering documents by updated_at
+        """
+        if not document_types:
+            return
+
+        retriever_top_k = top_k * 2
+
+        query_embedding = await self._get_query_embedding(query_text)
+        chunk_results, doc_results = await self._run_retrievers(
+            "hybrid_search_by_type",
             query_text=query_text,
             top_k=retriever_top_k,
             search_space_id=search_space_id,
-            document_type=document_type,
+            document_types=document_types,
             start_date=start_date,
             end_date=end_date,
+            query_embedding=query_embedding,
         )
 
+        for document_type in document_types:
+            prefetch_key = (
+                query_text,
+                search_space_id,
+                document_type,
+                top_k,
+                start_date,
+                end_date,
+            )
+            self._prefetched_results[prefetch_key] = self._rrf_merge(
+                chunk_results.get(document_type, []),
+                doc_results.get(document_type, []),
+                top_k,
+            )
+
+    def _rrf_merge(
+        self,
+        chunk_results: list[dict[str, Any]],
+        doc_results: list[dict[str, Any]],
+        top_k: int,
+    ) -> list[dict[str, Any]]:
+        """
+        Merge chunk-level and document-level results with Reciprocal Rank Fusion.
+
+        Args:
+            chunk_results: Document-grouped results of the chunk retriever
+            doc_results: Document-grouped results of the document retriever
+            top_k: Number of results to return
+
+        Returns:
+            Top-k deduplicated document results ordered by RRF score
+        """
+        # RRF constant
+        k = 60
+
         # Helper to extract document_id from our doc-grouped result
         def _doc_id(item: dict[str, Any]) -> int | None:
             doc = item.get("document", {})
@@ -420,8 +588,9 @@ class ConnectorService:
             SearchSourceConnector.connector_type == connector_type,
         )
 
-        result = await self.session.execute(query)
-        return result.scalars().first()
+        async with self._retrieval_session() as session:
+            result = await session.execute(query)
+            return result.scalars().first()
 
     async def search_tavily(
         self, user_query: str, search_space_id: int, top_k: int = 20
@@ -457,7 +626,9 @@ class ConnectorService:
 
         # Perform search with Tavily
         try:
-            response = tavily_client.search(
+            # The Tavily client is synchronous; keep it off the event loop
+            response = await asyncio.to_thread(
+                tavily_client.search,
                 query=user_query,
                 max_results=top_k,
                 search_depth="advanced",  # Use advanced search for better results
@@ -2110,7 +2281,9 @@ class ConnectorService:
 
         # Perform search with Linkup
         try:
-            response = linkup_client.search(
+            # The Linkup client is synchronous; keep it off the event loop
+            response = await asyncio.to_thread(
+                linkup_client.search,
                 query=user_query,
                 depth=mode,  # Use the provided mode ("standard" or "deep")
                 output_type="searchResults",  # Default to search results
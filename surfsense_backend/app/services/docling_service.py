@@ -4,13 +4,178 @@ Docling Document Processing Service for SurfSense
 SSL-safe implementation with pre-downloaded models
 """
 
+import asyncio
+import hashlib
 import logging
 import os
 import ssl
+import time
 from typing import Any
 
+from langchain_core.prompts import PromptTemplate
+
+from app.config import config
+
 logger = logging.getLogger(__name__)
 
+# Rounds of intermediate combining before the final combine
+MAX_REDUCE_LEVELS = 4
+# Retries of a summary call after a provider rate limit (exponential backoff)
+RATE_LIMIT_RETRIES = 3
+RATE_LIMIT_BACKOFF_SECONDS = 5
+
+# Chunk summaries are cached in the Celery Redis so retried tasks skip
+# chunks that were already summarized
+REDIS_URL = os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
+_redis_client = None
+
+# Template for chunk processing
+CHUNK_SUMMARY_TEMPLATE = PromptTemplate(
+    input_variables=["chunk", "chunk_number", "total_chunks"],
+    template="""<INSTRUCTIONS>
+You are summarizing chunk {chunk_number} of {total_chunks} from a large document.
+
+Create a comprehensive summary of this document chunk. Focus on:
+- Key concepts, facts, and information
+- Important details and context
+- Main topics and themes
+
+Provide a clear, structured summary that captures the essential content.
+
+Chunk {chunk_number}/{total_chunks}:
+<document_chunk>
+{chunk}
+</document_chunk>
+</INSTRUCTIONS>""",
+)
+
+COMBINE_SUMMARIES_TEMPLATE = PromptTemplate(
+    input_variables=["summaries", "document_title"],
+    template="""<INSTRUCTIONS>
+You are combining multiple section summaries into a final comprehensive document summary.
+
+Create a unified, coherent summary from the following section summaries of "{document_title}".
+Ensure:
+- Logical flow and organization
+- No redundancy or repetition  
+- Comprehensive coverage of all key points
+- Professional, objective tone
+
+<section_summaries>
+{summaries}
+</section_summaries>
+</INSTRUCTIONS>""",
+)
+
+
+class _RateLimitBackoff:
+    """Retries rate limited calls, pausing all calls of one document meanwhile."""
+
+    def __init__(self):
+        self._resume_at = 0.0
+
+    async def ainvoke(self, chain, inputs: dict) -> Any:
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            delay = self._resume_at - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            try:
+                return await chain.ainvoke(inputs)
+            except Exception as e:
+                if attempt == RATE_LIMIT_RETRIES or not _is_rate_limit_error(e):
+                    raise
+                backoff = RATE_LIMIT_BACKOFF_SECONDS * 2**attempt
+                self._resume_at = max(self._resume_at, time.monotonic() + backoff)
+                logger.warning(f"⏳ Rate limited, retrying in {backoff}s: {e}")
+
+
+def _is_rate_limit_error(error: Exception) -> bool:
+    import litellm
+
+    return (
+        isinstance(error, litellm.RateLimitError)
+        or getattr(error, "status_code", None) == 429
+    )
+
+
+def _summary_concurrency(llm) -> int:
+    """Number of summary calls one document may run at once."""
+    from app.services.llm_router_service import ChatLiteLLMRouter, LLMRouterService
+
+    limit = max(1, config.DOCUMENT_SUMMARY_MAX_CONCURRENCY)
+    if isinstance(llm, ChatLiteLLMRouter):
+        # The router spreads calls over its deployments and cools down the
+        # rate limited ones, so allow the limit per deployment
+        limit *= max(1, LLMRouterService.get_model_count())
+    return limit
+
+
+def _model_identity(llm) -> str:
+    return str(
+        getattr(llm, "model", None)
+        or getattr(llm, "model_name", None)
+        or type(llm).__name__
+    )
+
+
+def _chunk_summary_cache_key(model_name: str, chunk_text: str) -> str:
+    digest = hashlib.sha256(f"{model_name}\0{chunk_text}".encode()).hexdigest()
+    return f"docling:chunk_summary:{digest}"
+
+
+def _get_redis_client():
+    global _redis_client
+    if _redis_client is None:
+        import redis
+
+        _redis_client = redis.from_url(REDIS_URL, decode_responses=True)
+    return _redis_client
+
+
+async def _get_cached_chunk_summary(cache_key: str) -> str | None:
+    if config.DOCUMENT_SUMMARY_CACHE_TTL <= 0:
+        return None
+    try:
+        return await asyncio.to_thread(_get_redis_client().get, cache_key)
+    except Exception as e:
+        logger.debug(f"Chunk summary cache unavailable: {e}")
+        return None
+
+
+async def _cache_chunk_summary(cache_key: str, summary: str) -> None:
+    if config.DOCUMENT_SUMMARY_CACHE_TTL <= 0:
+        return
+    try:
+        await asyncio.to_thread(
+            _get_redis_client().setex,
+            cache_key,
+            config.DOCUMENT_SUMMARY_CACHE_TTL,
+            summary,
+        )
+    except Exception as e:
+        logger.debug(f"Chunk summary cache unavailable: {e}")
+
+
+def _group_summaries(summaries: list[str], max_chars: int) -> list[list[str]]:
+    """
+    Split summaries into consecutive groups of at most max_chars each.
+
+    When no two summaries fit together, consecutive pairs are returned
+    instead, so every reduce round still halves the number of summaries.
+    """
+    groups: list[list[str]] = []
+    group_chars = 0
+    for summary in summaries:
+        if groups and group_chars + len(summary) <= max_chars:
+            groups[-1].append(summary)
+            group_chars += len(summary)
+        else:
+            groups.append([summary])
+            group_chars = len(summary)
+    if len(groups) == len(summaries) > 1:
+        groups = [summaries[i : i + 2] for i in range(0, len(summaries), 2)]
+    return groups
+
 
 class DoclingService:
     """Docling service for enhanced document processing with SSL fixes."""
@@ -192,6 +357,9 @@ class DoclingService:
         """
         Process large documents using chunked LLM summarization.
 
+        Chunks are summarized concurrently (map), then the chunk summaries are
+        combined in rounds until they fit one combine prompt (reduce).
+
         Args:
             content: The full document content
             llm: The language model to use for summarization
@@ -221,7 +389,6 @@ class DoclingService:
         # Import chunker from config
         # Create LLM-optimized chunks (8K tokens max for safety)
         from chonkie import OverlapRefinery, RecursiveChunker
-        from langchain_core.prompts import PromptTemplate
 
         llm_chunker = RecursiveChunker(
             chunk_size=8000  # Conservative for most LLMs
@@ -238,84 +405,88 @@ class DoclingService:
         chunks = overlap_refinery.refine(initial_chunks)
         total_chunks = len(chunks)
 
-        logger.info(f"📄 Split into {total_chunks} chunks for LLM processing")
-
-        # Template for chunk processing
-        chunk_template = PromptTemplate(
-            input_variables=["chunk", "chunk_number", "total_chunks"],
-            template="""<INSTRUCTIONS>
-You are summarizing chunk {chunk_number} of {total_chunks} from a large document.
-
-Create a comprehensive summary of this document chunk. Focus on:
-- Key concepts, facts, and information
-- Important details and context
-- Main topics and themes
-
-Provide a clear, structured summary that captures the essential content.
-
-Chunk {chunk_number}/{total_chunks}:
-<document_chunk>
-{chunk}
-</document_chunk>
-</INSTRUCTIONS>""",
+        concurrency = _summary_concurrency(llm)
+        logger.info(
+            f"📄 Split into {total_chunks} chunks for LLM processing "
+            f"({concurrency} at a time)"
         )
 
-        # Process each chunk individually
-        chunk_summaries = []
-        for i, chunk in enumerate(chunks, 1):
-            try:
-                logger.info(
-                    f"🔄 Processing chunk {i}/{total_chunks} ({len(chunk.text)} chars)"
-                )
-
-                chunk_chain = chunk_template | llm
-                chunk_result = await chunk_chain.ainvoke(
-                    {
-                        "chunk": chunk.text,
-                        "chunk_number": i,
-                        "total_chunks": total_chunks,
-                    }
-                )
-
-                chunk_summary = chunk_result.content
-                chunk_summaries.append(f"=== Section {i} ===\n{chunk_summary}")
+        semaphore = asyncio.Semaphore(concurrency)
+        rate_limit = _RateLimitBackoff()
+        chunk_chain = CHUNK_SUMMARY_TEMPLATE | llm
+        model_name = _model_identity(llm)
 
-                logger.info(f"✅ Completed chunk {i}/{total_chunks}")
+        async def summarize_chunk(i: int, chunk_text: str) -> str:
+            cache_key = _chunk_summary_cache_key(model_name, chunk_text)
+            cached = await _get_cached_chunk_summary(cache_key)
+            if cached is not None:
+                logger.info(f"♻️ Reusing cached summary for chunk {i}/{total_chunks}")
+                return f"=== Section {i} ===\n{cached}"
 
+            try:
+                async with semaphore:
+                    logger.info(
+                        f"🔄 Processing chunk {i}/{total_chunks} ({len(chunk_text)} chars)"
+                    )
+                    chunk_result = await rate_limit.ainvoke(
+                        chunk_chain,
+                        {
+                            "chunk": chunk_text,
+                            "chunk_number": i,
+                            "total_chunks": total_chunks,
+                        },
+                    )
             except Exception as e:
                 logger.error(f"❌ Failed to process chunk {i}/{total_chunks}: {e}")
-                chunk_summaries.append(f"=== Section {i} ===\n[Processing failed]")
+                return f"=== Section {i} ===\n[Processing failed]"
+
+            chunk_summary = chunk_result.content
+            await _cache_chunk_summary(cache_key, chunk_summary)
+            logger.info(f"✅ Completed chunk {i}/{total_chunks}")
+            return f"=== Section {i} ===\n{chunk_summary}"
+
+        chunk_summaries = await asyncio.gather(
+            *(summarize_chunk(i, chunk.text) for i, chunk in enumerate(chunks, 1))
+        )
 
         # Combine summaries into final document summary
         logger.info(f"🔄 Combining {len(chunk_summaries)} chunk summaries")
 
         try:
-            combine_template = PromptTemplate(
-                input_variables=["summaries", "document_title"],
-                template="""<INSTRUCTIONS>
-You are combining multiple section summaries into a final comprehensive document summary.
-
-Create a unified, coherent summary from the following section summaries of "{document_title}".
-Ensure:
-- Logical flow and organization
-- No redundancy or repetition  
-- Comprehensive coverage of all key points
-- Professional, objective tone
-
-<section_summaries>
-{summaries}
-</section_summaries>
-</INSTRUCTIONS>""",
-            )
-
-            combined_summaries = "\n\n".join(chunk_summaries)
-            combine_chain = combine_template | llm
+            combine_chain = COMBINE_SUMMARIES_TEMPLATE | llm
+
+            async def combine(summaries: list[str]) -> str:
+                async with semaphore:
+                    result = await rate_limit.ainvoke(
+                        combine_chain,
+                        {
+                            "summaries": "\n\n".join(summaries),
+                            "document_title": document_title,
+                        },
+                    )
+                return result.content
 
-            final_result = await combine_chain.ainvoke(
-                {"summaries": combined_summaries, "document_title": document_title}
-            )
+            # Reduce in rounds until the summaries fit one combine prompt
+            summaries = list(chunk_summaries)
+            for level in range(1, MAX_REDUCE_LEVELS + 1):
+                groups = _group_summaries(
+                    summaries, config.DOCUMENT_SUMMARY_COMBINE_MAX_CHARS
+                )
+                if len(groups) <= 1:
+                    break
+                logger.info(
+                    f"🔄 Reduce level {level}: combining {len(summaries)} summaries "
+                    f"in {len(groups)} groups"
+                )
+                summaries = [
+                    f"=== Part {i} ===\n{summary}"
+                    for i, summary in enumerate(
+                        await asyncio.gather(*(combine(group) for group in groups)),
+                        1,
+                    )
+                ]
 
-            final_summary = final_result.content
+            final_summary = await combine(summaries)
             logger.info(
                 f"✅ Large document processing complete: {len(final_summary)} chars summary"
             )
@@ -0,0 +1,239 @@
+"""
+Local Embedding Server
+
+Optional per-host process that owns the embedding model and serves embedding
+requests over a Unix socket, so API and Celery worker processes do not each
+load their own copy of the model.
+
+Requests from concurrent clients (e.g. several indexing workers) are
+micro-batched: the server waits up to EMBEDDING_SERVER_MAX_WAIT_MS for more
+requests, embeds them together and hands every client its slice of the
+result.
+
+Run with:
+
+    python -m app.services.embedding_server
+
+and point clients at it by setting EMBEDDING_SERVER_SOCKET to the same path.
+Loading the model records its max_seq_length (see ``Config.chunk_size``), so
+clients started after the server chunk text to the size its model accepts.
+
+Wire format: every message is a 4-byte big-endian length followed by the
+payload. A request is one JSON message ``{"texts": [...]}``; the response is
+a JSON header ``{"count": n, "dimension": d}`` (or ``{"error": "..."}``)
+followed by the embeddings as ``n * d`` float32 values.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import struct
+
+import numpy as np
+
+from app.config import config
+from app.services.embedding_service import EmbeddingService
+
+logger = logging.getLogger(__name__)
+
+_LENGTH = struct.Struct(">I")
+
+
+async def _read_message(reader: asyncio.StreamReader) -> bytes:
+    (length,) = _LENGTH.unpack(await reader.readexactly(_LENGTH.size))
+    return await reader.readexactly(length)
+
+
+def _write_message(writer: asyncio.StreamWriter, payload: bytes) -> None:
+    writer.write(_LENGTH.pack(len(payload)) + payload)
+
+
+class EmbeddingServer:
+    """Unix socket server that micro-batches embedding requests."""
+
+    def __init__(
+        self,
+        socket_path: str,
+        max_batch_size: int | None = None,
+        max_wait_ms: int | None = None,
+    ):
+        self.socket_path = socket_path
+        self.max_batch_size = max_batch_size or config.EMBEDDING_BATCH_SIZE
+        max_wait_ms = (
+            max_wait_ms
+            if max_wait_ms is not None
+            else config.EMBEDDING_SERVER_MAX_WAIT_MS
+        )
+        self.max_wait = max_wait_ms / 1000
+        self._queue: asyncio.Queue[tuple[list[str], asyncio.Future]] = asyncio.Queue()
+
+    @staticmethod
+    def _embed(texts: list[str]) -> np.ndarray:
+        """Embed texts with the model, split into token-bounded batches."""
+        embedding_model = config.embedding_model_instance
+        embeddings: list = [None] * len(texts)
+        for batch in EmbeddingService.build_batches(texts):
+            results = EmbeddingService._embed_batch_sync(
+                embedding_model, [texts[i] for i in batch]
+            )
+            for index, embedding in zip(batch, results, strict=True):
+                embeddings[index] = embedding
+        return np.asarray(embeddings, dtype=np.float32)
+
+    async def _collect_batch(self) -> list[tuple[list[str], asyncio.Future]]:
+        """Wait for one request, then gather more until full or timed out."""
+        pending = [await self._queue.get()]
+        total = len(pending[0][0])
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+
+        while total < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self._queue.get(), timeout)
+            except TimeoutError:
+                break
+            pending.append(item)
+            total += len(item[0])
+
+        return pending
+
+    async def _batch_loop(self) -> None:
+        while True:
+            pending = await self._collect_batch()
+            texts = [text for request_texts, _ in pending for text in request_texts]
+
+            try:
+                embeddings = await asyncio.to_thread(self._embed, texts)
+            except Exception as e:
+                logger.error(f"Embedding batch of {len(texts)} texts failed: {e!s}")
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            offset = 0
+            for request_texts, future in pending:
+                if not future.done():
+                    future.set_result(embeddings[offset : offset + len(request_texts)])
+                offset += len(request_texts)
+
+            logger.debug(f"Embedded {len(texts)} texts for {len(pending)} request(s)")
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                try:
+                    request = json.loads(await _read_message(reader))
+                except asyncio.IncompleteReadError:
+                    break
+
+                future = asyncio.get_running_loop().create_future()
+                await self._queue.put((request["texts"], future))
+
+                try:
+                    embeddings = await future
+                    header = {
+                        "count": int(embeddings.shape[0]),
+                        "dimension": int(embeddings.shape[1])
+                        if embeddings.ndim == 2
+                        else 0,
+                    }
+                    payload = embeddings.tobytes()
+                except Exception as e:
+                    header = {"error": str(e)}
+                    payload = b""
+
+                _write_message(writer, json.dumps(header).encode("utf-8"))
+                _write_message(writer, payload)
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve_forever(self) -> None:
+        """Load the model and serve requests until cancelled."""
+        # Load the model before accepting connections
+        await asyncio.to_thread(lambda: config.embedding_model_instance)
+
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+        server = await asyncio.start_unix_server(
+            self._handle_client, path=self.socket_path
+        )
+        batcher = asyncio.create_task(self._batch_loop())
+        logger.info(
+            f"Embedding server for {config.EMBEDDING_MODEL} listening on "
+            f"{self.socket_path}"
+        )
+
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batcher.cancel()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+
+class EmbeddingServerClient:
+    """Client for the local embedding server."""
+
+    def __init__(self, socket_path: str):
+        self.socket_path = socket_path
+
+    async def embed(self, texts: list[str]) -> list[np.ndarray]:
+        """
+        Embed texts on the embedding server.
+
+        A connection is opened per call, so the client works from any event
+        loop (including the per-task loops of Celery workers).
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Embeddings in the same order as ``texts``
+        """
+        if not texts:
+            return []
+
+        reader, writer = await asyncio.open_unix_connection(self.socket_path)
+        try:
+            _write_message(writer, json.dumps({"texts": texts}).encode("utf-8"))
+            await writer.drain()
+            header = json.loads(await _read_message(reader))
+            payload = await _read_message(reader)
+        finally:
+            writer.close()
+
+        if "error" in header:
+            raise RuntimeError(f"Embedding server error: {header['error']}")
+
+        embeddings = np.frombuffer(payload, dtype=np.float32).reshape(
+            header["count"], header["dimension"]
+        )
+        return list(embeddings)
+
+
+def get_embedding_server_client() -> EmbeddingServerClient | None:
+    """Get a client for the configured embedding server, if any."""
+    if not config.EMBEDDING_SERVER_SOCKET:
+        return None
+    return EmbeddingServerClient(config.EMBEDDING_SERVER_SOCKET)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+    if not config.EMBEDDING_SERVER_SOCKET:
+        raise SystemExit("EMBEDDING_SERVER_SOCKET is not set")
+    asyncio.run(EmbeddingServer(config.EMBEDDING_SERVER_SOCKET).serve_forever())
@@ -0,0 +1,348 @@
+"""
+Embedding Service
+
+Batched, non-blocking access to the configured embedding model.
+
+The chonkie embedding handlers are synchronous, so calling ``embed()`` once per
+chunk from inside a coroutine blocks the event loop and never uses the model's
+batch path. This service groups texts into batches bounded by both item count
+and token budget, runs each batch through ``embed_batch`` on a worker thread,
+and returns the embeddings in the same order as the input texts.
+
+Embeddings are cached in the ``embedding_cache`` table keyed by
+(embedding model name, sha256 of the text), so re-indexing unchanged chunk
+text only costs one lookup query instead of a model call.
+
+When EMBEDDING_SERVER_SOCKET is set, texts are embedded by the local embedding
+server (see ``app.services.embedding_server``) instead of a model loaded in
+this process.
+"""
+
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.config import config
+from app.db import EmbeddingCache
+
+logger = logging.getLogger(__name__)
+
+# The embedding service is used from both the API event loop and the per-task
+# event loops of Celery workers, so cache queries must not reuse pooled
+# connections across loops. The lookup and the write each open a connection
+# of their own, so none is held while the model runs.
+_cache_engine = create_async_engine(config.DATABASE_URL, poolclass=NullPool, echo=False)
+
+
+class EmbeddingService:
+    """
+    Singleton service that batches embedding requests and runs them off the
+    event loop.
+    """
+
+    _instance = None
+    _executor: ThreadPoolExecutor | None = None
+    _query_cache: OrderedDict[tuple[str, str], Any] = OrderedDict()
+    _query_cache_lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    @classmethod
+    def get_instance(cls) -> "EmbeddingService":
+        """Get the singleton instance."""
+        return cls()
+
+    @classmethod
+    def _get_executor(cls) -> ThreadPoolExecutor:
+        if cls._executor is None:
+            cls._executor = ThreadPoolExecutor(
+                max_workers=config.EMBEDDING_MAX_WORKERS,
+                thread_name_prefix="embedding",
+            )
+        return cls._executor
+
+    @staticmethod
+    def _estimate_tokens(text: str) -> int:
+        # Rough heuristic (~4 chars per token) used when the caller does not
+        # already know the token count; only needs to be good enough for batching.
+        return max(1, len(text) // 4)
+
+    @classmethod
+    def build_batches(
+        cls,
+        texts: list[str],
+        token_counts: list[int] | None = None,
+        max_batch_size: int | None = None,
+        max_batch_tokens: int | None = None,
+    ) -> list[list[int]]:
+        """
+        Split texts into batches bounded by item count and total tokens.
+
+        Args:
+            texts: Texts to embed
+            token_counts: Optional precomputed token count per text
+            max_batch_size: Maximum number of texts per batch
+            max_batch_tokens: Maximum summed token count per batch
+
+        Returns:
+            List of batches, each a list of indices into ``texts``
+        """
+        max_batch_size = max(1, max_batch_size or config.EMBEDDING_BATCH_SIZE)
+        max_batch_tokens = max(1, max_batch_tokens or config.EMBEDDING_BATCH_MAX_TOKENS)
+
+        batches: list[list[int]] = []
+        current: list[int] = []
+        current_tokens = 0
+
+        for index, text in enumerate(texts):
+            tokens = (
+                token_counts[index]
+                if token_counts is not None and token_counts[index]
+                else cls._estimate_tokens(text)
+            )
+            # A single oversized text still gets its own batch
+            if current and (
+                len(current) >= max_batch_size
+                or current_tokens + tokens > max_batch_tokens
+            ):
+                batches.append(current)
+                current = []
+                current_tokens = 0
+            current.append(index)
+            current_tokens += tokens
+
+        if current:
+            batches.append(current)
+
+        return batches
+
+    @staticmethod
+    def _embed_batch_sync(embedding_model: Any, batch: list[str]) -> list[Any]:
+        if hasattr(embedding_model, "embed_batch"):
+            return list(embedding_model.embed_batch(batch))
+        return [embedding_model.embed(text) for text in batch]
+
+    @staticmethod
+    def hash_text(text: str) -> str:
+        """Content address of a text in the embedding cache."""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    async def _load_cached(text_hashes: list[str]) -> dict[str, Any]:
+        """Fetch cached embeddings for the given text hashes in one query."""
+        async with _cache_engine.connect() as connection:
+            result = await connection.execute(
+                select(EmbeddingCache.text_hash, EmbeddingCache.embedding).where(
+                    EmbeddingCache.model_name == config.EMBEDDING_MODEL,
+                    EmbeddingCache.text_hash.in_(text_hashes),
+                )
+            )
+            return {row.text_hash: row.embedding for row in result}
+
+    @staticmethod
+    async def _store_cached(entries: dict[str, Any]) -> None:
+        """Persist newly computed embeddings, ignoring concurrent duplicates."""
+        async with _cache_engine.begin() as connection:
+            await connection.execute(
+                pg_insert(EmbeddingCache)
+                .values(
+                    [
+                        {
+                            "model_name": config.EMBEDDING_MODEL,
+                            "text_hash": text_hash,
+                            "embedding": embedding,
+                        }
+                        for text_hash, embedding in entries.items()
+                    ]
+                )
+                .on_conflict_do_nothing(constraint="uq_embedding_cache_model_text_hash")
+            )
+
+    @staticmethod
+    async def _embed_remote(texts: list[str]) -> list[Any] | None:
+        """
+        Embed texts on the local embedding server, if one is configured.
+
+        Returns None when no server is configured or it cannot be reached, in
+        which case the caller falls back to the in-process model.
+        """
+        from app.services.embedding_server import get_embedding_server_client
+
+        client = get_embedding_server_client()
+        if client is None:
+            return None
+        try:
+            return await client.embed(texts)
+        except (OSError, asyncio.IncompleteReadError) as e:
+            logger.warning(
+                f"Embedding server unavailable, using in-process model: {e!s}"
+            )
+            return None
+
+    async def _embed_uncached(
+        self,
+        texts: list[str],
+        token_counts: list[int] | None = None,
+    ) -> list[Any]:
+        remote = await self._embed_remote(texts)
+        if remote is not None:
+            return remote
+
+        embedding_model = config.embedding_model_instance
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+
+        batches = self.build_batches(texts, token_counts)
+        batch_results = await asyncio.gather(
+            *[
+                loop.run_in_executor(
+                    executor,
+                    self._embed_batch_sync,
+                    embedding_model,
+                    [texts[i] for i in batch],
+                )
+                for batch in batches
+            ]
+        )
+
+        embeddings: list[Any] = [None] * len(texts)
+        for batch, result in zip(batches, batch_results, strict=True):
+            if len(result) != len(batch):
+                raise ValueError(
+                    f"Embedding model returned {len(result)} embeddings "
+                    f"for a batch of {len(batch)} texts"
+                )
+            for index, embedding in zip(batch, result, strict=True):
+                embeddings[index] = embedding
+
+        logger.debug(f"Embedded {len(texts)} texts in {len(batches)} batch(es)")
+        return embeddings
+
+    async def embed_texts(
+        self,
+        texts: list[str],
+        token_counts: list[int] | None = None,
+        use_cache: bool = True,
+    ) -> list[Any]:
+        """
+        Embed a list of texts using batched calls on the embedding thread pool.
+
+        Texts whose embedding is already in the embedding cache are not sent to
+        the model, and identical texts within one call are embedded once.
+
+        Args:
+            texts: Texts to embed
+            token_counts: Optional precomputed token count per text
+            use_cache: Whether to consult and populate the embedding cache
+
+        Returns:
+            Embeddings in the same order as ``texts``
+        """
+        if not texts:
+            return []
+
+        use_cache = use_cache and config.EMBEDDING_CACHE_ENABLED
+        text_hashes = [self.hash_text(text) for text in texts]
+        by_hash: dict[str, Any] = {}
+
+        if use_cache:
+            try:
+                by_hash = await self._load_cached(list(set(text_hashes)))
+            except Exception as e:
+                logger.warning(f"Embedding cache lookup failed: {e!s}")
+
+        # First occurrence of every text that still needs embedding
+        pending: dict[str, int] = {}
+        for index, text_hash in enumerate(text_hashes):
+            if text_hash not in by_hash and text_hash not in pending:
+                pending[text_hash] = index
+
+        if pending:
+            indices = list(pending.values())
+            computed = await self._embed_uncached(
+                [texts[i] for i in indices],
+                [token_counts[i] for i in indices] if token_counts else None,
+            )
+            new_entries = dict(zip(pending.keys(), computed, strict=True))
+            by_hash.update(new_entries)
+
+            if use_cache:
+                try:
+                    await self._store_cached(new_entries)
+                except Exception as e:
+                    logger.warning(f"Embedding cache write failed: {e!s}")
+
+        logger.debug(
+            f"Embedding cache: {len(texts) - len(pending)} hit(s), "
+            f"{len(pending)} miss(es)"
+        )
+        return [by_hash[text_hash] for text_hash in text_hashes]
+
+    async def embed_query(self, query_text: str) -> Any:
+        """
+        Embed a search query, reusing recent query embeddings.
+
+        Query embeddings are kept in a small in-process LRU keyed by
+        (embedding model, query text) instead of the persistent embedding
+        cache, since queries are short-lived and rarely worth storing.
+
+        Args:
+            query_text: The search query text
+
+        Returns:
+            The embedding for ``query_text``
+        """
+        key = (config.EMBEDDING_MODEL, query_text)
+        with self._query_cache_lock:
+            if key in self._query_cache:
+                self._query_cache.move_to_end(key)
+                return self._query_cache[key]
+
+        remote = await self._embed_remote([query_text])
+        if remote is not None:
+            embedding = remote[0]
+        else:
+            embedding_model = config.embedding_model_instance
+            loop = asyncio.get_running_loop()
+            embedding = await loop.run_in_executor(
+                self._get_executor(), embedding_model.embed, query_text
+            )
+
+        with self._query_cache_lock:
+            self._query_cache[key] = embedding
+            self._query_cache.move_to_end(key)
+            while len(self._query_cache) > config.QUERY_EMBEDDING_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
+
+        return embedding
+
+    async def embed_text(self, text: str, use_cache: bool = True) -> Any:
+        """
+        Embed a single text without blocking the event loop.
+
+        Args:
+            text: Text to embed
+            use_cache: Whether to consult and populate the embedding cache
+
+        Returns:
+            The embedding for ``text``
+        """
+        embeddings = await self.embed_texts([text], use_cache=use_cache)
+        return embeddings[0]
+
+
+def get_embedding_service() -> EmbeddingService:
+    """Get the shared embedding service instance."""
+    return EmbeddingService.get_instance()
@@ -8,13 +8,31 @@ Protocol Reference:
 - Uses Server-Sent Events (SSE) format
 - Requires 'x-vercel-ai-ui-message-stream: v1' header
 - Supports text, reasoning, sources, files, tools, data, and error parts
+
+Text deltas can be coalesced: consecutive deltas of the same text block are
+held for up to ``coalesce_ms`` milliseconds or ``coalesce_chars`` characters and
+sent as one text-delta part. Any other part flushes the held text first, so
+parts always reach the client in order.
 """
 
 import json
+import time
 import uuid
 from dataclasses import dataclass, field
 from typing import Any
 
+import orjson
+
+from app.config import config
+
+
+def _dumps(data: Any) -> str:
+    """Serialize data to compact JSON, falling back to json for unusual types."""
+    try:
+        return orjson.dumps(data).decode("utf-8")
+    except TypeError:
+        return json.dumps(data, separators=(",", ":"))
+
 
 def generate_id() -> str:
     """Generate a unique ID for stream parts."""
@@ -32,6 +50,11 @@ class StreamContext:
     active_text_id: str | None = None
     active_reasoning_id: str | None = None
     step_count: int = 0
+    # Text deltas held back for coalescing
+    pending_text_id: str | None = None
+    pending_text_parts: list[str] = field(default_factory=list)
+    pending_text_chars: int = 0
+    pending_text_since: float = 0.0
 
 
 class VercelStreamingService:
@@ -55,13 +78,34 @@ class VercelStreamingService:
         yield service.format_text_delta(text_id, "world!")
         yield service.format_text_end(text_id)
 
+        # Or coalesce deltas ("" is returned while a delta is held back)
+        if part := service.buffer_text_delta(text_id, token):
+            yield part
+
         # Finish the message
         yield service.format_finish()
         yield service.format_done()
     """
 
-    def __init__(self):
+    def __init__(
+        self, coalesce_ms: int | None = None, coalesce_chars: int | None = None
+    ):
+        """
+        Initialize the streaming service.
+
+        Args:
+            coalesce_ms: Max milliseconds a text delta is held for coalescing
+                (defaults to STREAM_COALESCE_MS, 0 disables coalescing)
+            coalesce_chars: Held text length that triggers a flush
+                (defaults to STREAM_COALESCE_CHARS)
+        """
         self.context = StreamContext()
+        self.coalesce_seconds = (
+            config.STREAM_COALESCE_MS if coalesce_ms is None else coalesce_ms
+        ) / 1000
+        self.coalesce_chars = (
+            config.STREAM_COALESCE_CHARS if coalesce_chars is None else coalesce_chars
+        )
 
     @staticmethod
     def get_response_headers() -> dict[str, str]:
@@ -78,20 +122,29 @@ class VercelStreamingService:
             "x-vercel-ai-ui-message-stream": "v1",
         }
 
-    @staticmethod
-    def _format_sse(data: Any) -> str:
+    def _format_sse(self, data: Any) -> str:
         """
         Format data as a Server-Sent Event.
 
+        Any held text deltas are flushed ahead of the event.
+
         Args:
             data: The data to format (will be JSON serialized if not a string)
 
         Returns:
             str: SSE formatted string
         """
-        if isinstance(data, str):
-            return f"data: {data}\n\n"
-        return f"data: {json.dumps(data)}\n\n"
+        if not isinstance(data, str):
+            data = _dumps(data)
+        return f"{self.flush_text_delta()}data: {data}\n\n"
+
+    @staticmethod
+    def _format_text_delta_sse(text_id: str, delta: str) -> str:
+        """Build a text-delta event; only the delta needs JSON encoding."""
+        return (
+            f'data: {{"type":"text-delta","id":"{text_id}",'
+            f'"delta":{_dumps(delta)}}}\n\n'
+        )
 
     @staticmethod
     def generate_text_id() -> str:
@@ -156,7 +209,7 @@ class VercelStreamingService:
         Example output:
             data: [DONE]
         """
-        return "data: [DONE]\n\n"
+        return f"{self.flush_text_delta()}data: [DONE]\n\n"
 
     # =========================================================================
     # Text Parts (start/delta/end pattern)
@@ -194,7 +247,70 @@ class VercelStreamingService:
         Example output:
             data: {"type":"text-delta","id":"text_abc123","delta":"Hello"}
         """
-        return self._format_sse({"type": "text-delta", "id": text_id, "delta": delta})
+        return self.flush_text_delta() + self._format_text_delta_sse(text_id, delta)
+
+    def buffer_text_delta(self, text_id: str, delta: str) -> str:
+        """
+        Add a text delta to the coalescing buffer.
+
+        The buffer is flushed as a single text-delta part once it has been
+        held for coalesce_ms or has reached coalesce_chars.
+
+        Args:
+            text_id: The text block ID
+            delta: The incremental text content
+
+        Returns:
+            str: SSE formatted text delta part, or "" while the delta is held
+        """
+        if self.coalesce_seconds <= 0:
+            return self.format_text_delta(text_id, delta)
+
+        ctx = self.context
+        flushed = ""
+        if ctx.pending_text_id != text_id:
+            flushed = self.flush_text_delta()
+            ctx.pending_text_id = text_id
+            ctx.pending_text_since = time.monotonic()
+        ctx.pending_text_parts.append(delta)
+        ctx.pending_text_chars += len(delta)
+
+        if ctx.pending_text_chars >= self.coalesce_chars:
+            return flushed + self.flush_text_delta()
+        return flushed + self.flush_text_delta_if_due()
+
+    def flush_text_delta_if_due(self) -> str:
+        """
+        Flush the held text deltas if they have been held for coalesce_ms.
+
+        Returns:
+            str: SSE formatted text delta part, or "" if nothing is due
+        """
+        ctx = self.context
+        if (
+            ctx.pending_text_id is not None
+            and time.monotonic() - ctx.pending_text_since >= self.coalesce_seconds
+        ):
+            return self.flush_text_delta()
+        return ""
+
+    def flush_text_delta(self) -> str:
+        """
+        Flush the held text deltas as one text-delta part.
+
+        Returns:
+            str: SSE formatted text delta part, or "" if nothing is held
+        """
+        ctx = self.context
+        if ctx.pending_text_id is None:
+            return ""
+        frame = self._format_text_delta_sse(
+            ctx.pending_text_id, "".join(ctx.pending_text_parts)
+        )
+        ctx.pending_text_id = None
+        ctx.pending_text_parts = []
+        ctx.pending_text_chars = 0
+        return frame
 
     def format_text_end(self, text_id: str) -> str:
         """
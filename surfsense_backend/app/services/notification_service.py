@@ -5,14 +5,18 @@ from datetime import UTC, datetime
 from typing import Any
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import inspect, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm.attributes import flag_modified
 
 from app.db import Notification
+from app.services.progress_reporter import ProgressReporter
 
 logger = logging.getLogger(__name__)
 
+# session.info key holding the session's notification progress reporters
+_PROGRESS_REPORTERS_KEY = "notification_progress_reporters"
+
 
 class BaseNotificationHandler:
     """Base class for notification handlers - provides common functionality."""
@@ -149,6 +153,13 @@ class BaseNotificationHandler:
         Returns:
             Updated notification
         """
+        # Write pending progress first so it can't overwrite this update
+        reporter = session.info.get(_PROGRESS_REPORTERS_KEY, {}).pop(
+            inspect(notification).identity[0], None
+        )
+        if reporter is not None:
+            await reporter.close()
+
         if title is not None:
             notification.title = title
         if message is not None:
@@ -176,6 +187,44 @@ class BaseNotificationHandler:
         logger.info(f"Updated notification {notification.id}")
         return notification
 
+    async def report_progress(
+        self,
+        session: AsyncSession,
+        notification: Notification,
+        message: str | None = None,
+        metadata_updates: dict[str, Any] | None = None,
+    ) -> Notification:
+        """
+        Update an in-progress notification without committing the session.
+
+        Progress ticks are written on a separate connection and at most once
+        per PROGRESS_UPDATE_INTERVAL seconds (see ProgressReporter), so
+        indexers don't commit half-staged work and clients receive fewer
+        replicated updates. The next update_notification() call writes any
+        pending progress first.
+
+        Args:
+            session: Database session
+            notification: Notification to update
+            message: New message (optional)
+            metadata_updates: Additional metadata to merge (optional)
+
+        Returns:
+            Updated notification
+        """
+        reporters = session.info.setdefault(_PROGRESS_REPORTERS_KEY, {})
+        notification_id = inspect(notification).identity[0]
+        if notification_id not in reporters:
+            reporters[notification_id] = ProgressReporter(
+                notification, session.bind, "notification_metadata"
+            )
+
+        values = {"message": message} if message is not None else {}
+        await reporters[notification_id].report(
+            {**(metadata_updates or {}), "status": "in_progress"}, **values
+        )
+        return notification
+
 
 class ConnectorIndexingNotificationHandler(BaseNotificationHandler):
     """Handler for connector indexing notifications."""
@@ -321,11 +370,10 @@ class ConnectorIndexingNotificationHandler(BaseNotificationHandler):
         if stage:
             metadata_updates["sync_stage"] = stage
 
-        return await self.update_notification(
+        return await self.report_progress(
             session=session,
             notification=notification,
             message=progress_msg,
-            status="in_progress",
             metadata_updates=metadata_updates,
         )
 
@@ -405,11 +453,10 @@ class ConnectorIndexingNotificationHandler(BaseNotificationHandler):
             "retry_wait_seconds": wait_seconds,
         }
 
-        return await self.update_notification(
+        return await self.report_progress(
             session=session,
             notification=notification,
             message=message,
-            status="in_progress",
             metadata_updates=metadata_updates,
         )
 
@@ -675,11 +722,10 @@ class DocumentProcessingNotificationHandler(BaseNotificationHandler):
         if chunks_count is not None:
             metadata_updates["chunks_count"] = chunks_count
 
-        return await self.update_notification(
+        return await self.report_progress(
             session=session,
             notification=notification,
             message=message,
-            status="in_progress",
             metadata_updates=metadata_updates,
         )
 
@@ -0,0 +1,152 @@
+"""Throttled progress updates written outside the caller's transaction."""
+
+import asyncio
+import contextlib
+import json
+import logging
+import time
+from typing import Any
+
+from sqlalchemy import cast, func, inspect, literal, text, update
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.config import config
+
+logger = logging.getLogger(__name__)
+
+
+class ProgressReporter:
+    """
+    Write progress for one row (a Log or Notification) on its own connection.
+
+    Indexers stage documents on their session; committing progress on that
+    session would commit half-built batches and, for replicated tables,
+    push every tick to clients. A reporter instead:
+
+    - writes with a separate session on the caller's engine, so the
+      caller's transaction is never committed or flushed,
+    - writes at most once per ``min_interval`` seconds; updates in between
+      are coalesced and written when the interval ends,
+    - merges metadata patches into the JSON column in the same UPDATE.
+
+    The in-memory instance is updated as committed state, so the caller sees
+    the latest progress without its session treating the row as dirty.
+    Call ``close()`` before writing the row's final state on the caller's
+    session, so a pending update can't overwrite it.
+    """
+
+    def __init__(
+        self,
+        instance: Any,
+        bind: AsyncEngine,
+        metadata_attribute: str,
+        min_interval: float | None = None,
+    ):
+        state = inspect(instance)
+        self.instance = instance
+        self.model = state.mapper.class_
+        self.row_id = state.identity[0]
+        self.bind = bind
+        self.metadata_attribute = metadata_attribute
+        self.min_interval = (
+            config.PROGRESS_UPDATE_INTERVAL if min_interval is None else min_interval
+        )
+
+        self._values: dict[str, Any] = {}
+        self._metadata: dict[str, Any] = {}
+        self._last_write = float("-inf")
+        self._lock = asyncio.Lock()
+        self._timer: asyncio.Task | None = None
+        self._closed = False
+
+    async def report(
+        self, metadata: dict[str, Any] | None = None, **values: Any
+    ) -> bool:
+        """
+        Queue new column values and a metadata patch for the row.
+
+        Returns:
+            bool: True if the update was written now, False if it was
+            coalesced into the next write.
+        """
+        if self._closed:
+            return False
+
+        self._values.update(values)
+        if metadata:
+            self._metadata.update(metadata)
+        self._apply_to_instance(values, metadata)
+
+        wait = self._last_write + self.min_interval - time.monotonic()
+        if wait <= 0:
+            await self._safe_flush()
+            return True
+        if self._timer is None or self._timer.done():
+            self._timer = asyncio.create_task(self._flush_later(wait))
+        return False
+
+    async def flush(self) -> None:
+        """Write the pending update, if any, in its own transaction."""
+        async with self._lock:
+            if not self._values and not self._metadata:
+                return
+            values, self._values = self._values, {}
+            metadata, self._metadata = self._metadata, {}
+
+            if metadata:
+                column = getattr(self.model, self.metadata_attribute)
+                # NULL metadata is treated as an empty object; values such as
+                # datetimes are stored as strings
+                patch = cast(literal(json.dumps(metadata, default=str)), JSONB)
+                merged = func.coalesce(cast(column, JSONB), text("'{}'::jsonb")).op(
+                    "||"
+                )(patch)
+                values[self.metadata_attribute] = cast(merged, column.type)
+
+            async with AsyncSession(self.bind) as session:
+                await session.execute(
+                    update(self.model)
+                    .where(self.model.id == self.row_id)
+                    .values(**values)
+                    .execution_options(synchronize_session=False)
+                )
+                await session.commit()
+            self._last_write = time.monotonic()
+
+    async def close(self, flush: bool = True) -> None:
+        """Stop the reporter, writing (or dropping) any pending update."""
+        self._closed = True
+        if self._timer is not None and not self._timer.done():
+            self._timer.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._timer
+        if flush:
+            await self._safe_flush()
+
+    async def _flush_later(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        # Shielded so close() can't interrupt a write half way
+        await asyncio.shield(self._safe_flush())
+
+    async def _safe_flush(self) -> None:
+        try:
+            await self.flush()
+        except Exception as e:
+            # Progress is best effort; the final state is written by the caller
+            logger.warning(
+                f"Failed to write progress for {self.model.__name__} {self.row_id}: {e}"
+            )
+
+    def _apply_to_instance(
+        self, values: dict[str, Any], metadata: dict[str, Any] | None
+    ) -> None:
+        loaded = inspect(self.instance).dict
+        for key, value in values.items():
+            set_committed_value(self.instance, key, value)
+        if metadata and self.metadata_attribute in loaded:
+            current = loaded[self.metadata_attribute] or {}
+            set_committed_value(
+                self.instance, self.metadata_attribute, {**current, **metadata}
+            )
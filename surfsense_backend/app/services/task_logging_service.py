@@ -3,9 +3,11 @@ import logging
 from datetime import datetime
 from typing import Any
 
+from sqlalchemy import inspect
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db import Log, LogLevel, LogStatus
+from app.services.progress_reporter import ProgressReporter
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +18,22 @@ class TaskLoggingService:
     def __init__(self, session: AsyncSession, search_space_id: int):
         self.session = session
         self.search_space_id = search_space_id
+        # Progress reporters by log id, see log_task_progress
+        self._progress_reporters: dict[int, ProgressReporter] = {}
+
+    def _progress_reporter(self, log_entry: Log) -> ProgressReporter:
+        log_id = inspect(log_entry).identity[0]
+        if log_id not in self._progress_reporters:
+            self._progress_reporters[log_id] = ProgressReporter(
+                log_entry, self.session.bind, "log_metadata"
+            )
+        return self._progress_reporters[log_id]
+
+    async def _close_progress_reporter(self, log_entry: Log) -> None:
+        """Write pending progress before the final status is written."""
+        reporter = self._progress_reporters.pop(inspect(log_entry).identity[0], None)
+        if reporter is not None:
+            await reporter.close()
 
     async def log_task_start(
         self,
@@ -74,6 +92,8 @@ class TaskLoggingService:
         Returns:
             Log: The updated log entry
         """
+        await self._close_progress_reporter(log_entry)
+
         # Ensure session is in a valid state
         if not self.session.is_active:
             await self.session.rollback()
@@ -123,6 +143,8 @@ class TaskLoggingService:
         Returns:
             Log: The updated log entry
         """
+        await self._close_progress_reporter(log_entry)
+
         # Ensure session is in a valid state
         if not self.session.is_active:
             await self.session.rollback()
@@ -170,6 +192,10 @@ class TaskLoggingService:
         """
         Update a log entry with progress information while keeping IN_PROGRESS status
 
+        Progress is written on a separate connection, so the task's session is
+        not committed, and at most once per PROGRESS_UPDATE_INTERVAL seconds;
+        updates in between are merged into the next write.
+
         Args:
             log_entry: The log entry to update
             progress_message: Progress update message
@@ -178,31 +204,19 @@ class TaskLoggingService:
         Returns:
             Log: The updated log entry
         """
-        # Ensure session is in a valid state
-        if not self.session.is_active:
-            await self.session.rollback()
-
-        # Refresh log_entry to avoid expired state
-        with contextlib.suppress(Exception):
-            await self.session.refresh(log_entry)
-
-        log_entry.message = progress_message
-
+        metadata = None
         if progress_metadata:
-            if log_entry.log_metadata is None:
-                log_entry.log_metadata = {}
-            log_entry.log_metadata.update(progress_metadata)
-            log_entry.log_metadata["last_progress_update"] = (
-                datetime.utcnow().isoformat()
-            )
+            metadata = {
+                **progress_metadata,
+                "last_progress_update": datetime.utcnow().isoformat(),
+            }
 
-        await self.session.commit()
-        await self.session.refresh(log_entry)
+        await self._progress_reporter(log_entry).report(
+            metadata, message=progress_message
+        )
 
-        task_name = (
-            log_entry.log_metadata.get("task_name", "unknown")
-            if log_entry.log_metadata
-            else "unknown"
+        task_name = (inspect(log_entry).dict.get("log_metadata") or {}).get(
+            "task_name", "unknown"
         )
         logger.info(f"Progress update for task {task_name}: {progress_message}")
         return log_entry
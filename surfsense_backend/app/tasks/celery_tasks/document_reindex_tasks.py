@@ -2,7 +2,7 @@
 
 import logging
 
-from sqlalchemy import delete, select
+from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import selectinload
@@ -109,23 +109,18 @@ async def _reindex_document(document_id: int, user_id: str):
                 )
                 return
 
-            # 2. Delete old chunks explicitly
-            from app.db import Chunk
+            # 2. Diff new chunks against the existing ones: unchanged chunks keep
+            # their rows (and IDs), only changed chunks are deleted/inserted
+            new_chunks = await create_document_chunks(markdown_content, document)
 
-            await session.execute(delete(Chunk).where(Chunk.document_id == document_id))
-            await session.flush()  # Ensure old chunks are deleted
+            # 3. Replace the chunk collection (delete-orphan removes stale chunks)
+            document.chunks = new_chunks
 
-            # 3. Create new chunks
-            new_chunks = await create_document_chunks(markdown_content)
-
-            # 4. Add new chunks to session
-            for chunk in new_chunks:
-                chunk.document_id = document_id
-                session.add(chunk)
-
-            logger.info(f"Created {len(new_chunks)} chunks for document {document_id}")
+            logger.info(
+                f"Updated to {len(new_chunks)} chunks for document {document_id}"
+            )
 
-            # 5. Regenerate summary
+            # 4. Regenerate summary
             user_llm = await get_user_long_context_llm(
                 session, user_id, document.search_space_id
             )
@@ -139,7 +134,7 @@ async def _reindex_document(document_id: int, user_id: str):
                 markdown_content, user_llm, document_metadata
             )
 
-            # 6. Update document
+            # 5. Update document
             document.content = summary_content
             document.embedding = summary_embedding
             document.content_needs_reindexing = False
@@ -0,0 +1,85 @@
+"""Celery task that keeps the embedding cache from growing without bound."""
+
+import logging
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import delete, or_, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.celery_app import celery_app
+from app.config import config
+from app.db import EmbeddingCache
+
+logger = logging.getLogger(__name__)
+
+# Rows deleted per statement, so cleanup never holds long locks on the table
+CLEANUP_BATCH_SIZE = 10_000
+
+
+def get_celery_session_maker():
+    """Create async session maker for Celery tasks."""
+    engine = create_async_engine(
+        config.DATABASE_URL,
+        poolclass=NullPool,
+        echo=False,
+    )
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+
+@celery_app.task(name="cleanup_embedding_cache")
+def cleanup_embedding_cache_task():
+    """
+    Delete expired embedding cache entries.
+
+    Runs daily from Celery beat; does nothing when
+    EMBEDDING_CACHE_RETENTION_DAYS is 0.
+    """
+    import asyncio
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+
+    try:
+        loop.run_until_complete(_cleanup_embedding_cache())
+    finally:
+        loop.close()
+
+
+async def _cleanup_embedding_cache() -> int:
+    """
+    Delete cache entries older than the retention period or computed by an
+    embedding model that is no longer configured.
+
+    Returns:
+        int: Number of deleted entries
+    """
+    if config.EMBEDDING_CACHE_RETENTION_DAYS <= 0:
+        return 0
+
+    cutoff = datetime.now(UTC) - timedelta(days=config.EMBEDDING_CACHE_RETENTION_DAYS)
+    expired = (
+        select(EmbeddingCache.id)
+        .where(
+            or_(
+                EmbeddingCache.created_at < cutoff,
+                EmbeddingCache.model_name != config.EMBEDDING_MODEL,
+            )
+        )
+        .limit(CLEANUP_BATCH_SIZE)
+        .scalar_subquery()
+    )
+
+    deleted = 0
+    async with get_celery_session_maker()() as session:
+        while True:
+            result = await session.execute(
+                delete(EmbeddingCache).where(EmbeddingCache.id.in_(expired))
+            )
+            await session.commit()
+            deleted += result.rowcount
+            if result.rowcount < CLEANUP_BATCH_SIZE:
+                break
+
+    logger.info(f"Deleted {deleted} expired embedding cache entries")
+    return deleted
@@ -0,0 +1,124 @@
+"""
+Agent run events for the chat stream.
+
+``stream_new_chat`` translates agent events into SSE parts. It only needs
+model tokens, tool starts and ends, and the points where a node finishes.
+``astream_events`` dispatches a callback event for every runnable in the
+graph (chains, parsers, middleware, ...), which costs about as much as the
+model's token rate on fast models. By default the agent is therefore run
+with LangGraph's ``messages``/``updates``/``custom`` stream modes and the
+few events the translator uses are rebuilt from them, in the same shape as
+``astream_events(version="v2")`` events:
+
+- ``on_chat_model_stream``: a model token chunk (``data.chunk``)
+- ``on_tool_start``: a tool call the model made (``name``, ``run_id``,
+  ``data.input``)
+- ``on_tool_end``: the tool's ToolMessage (``name``, ``run_id``,
+  ``data.output``)
+- ``on_chain_end``: a graph node finished
+- ``on_custom_event``: data a tool wrote with ``get_stream_writer()``
+
+The ``run_id`` of tool events is the tool call ID. Unlike the event-based
+path, tokens and tool calls of nested graphs (subagents run inside a tool)
+are not streamed. Set CHAT_STREAM_MODE=events to use ``astream_events``.
+"""
+
+from collections.abc import AsyncIterator
+from typing import Any
+
+from langchain_core.messages import AIMessage, AIMessageChunk, ToolMessage
+
+from app.agents.new_chat.checkpointer import get_checkpoint_durability
+from app.config import config
+
+STREAM_MODES = ["messages", "updates", "custom"]
+
+
+def _node_updates(update: Any) -> list[dict]:
+    """Normalize a node's update (a dict, or a list of dicts) to a list."""
+    if isinstance(update, dict):
+        return [update]
+    if isinstance(update, list | tuple):
+        return [item for item in update if isinstance(item, dict)]
+    return []
+
+
+async def stream_agent_events(
+    agent: Any, input_state: dict, run_config: dict
+) -> AsyncIterator[dict[str, Any]]:
+    """
+    Run the agent and yield the events the chat stream translates.
+
+    Args:
+        agent: The compiled agent graph
+        input_state: Input state for the run
+        run_config: LangGraph run config (thread ID, recursion limit, ...)
+
+    Yields:
+        dict: Events in the shape of ``astream_events(version="v2")`` events
+    """
+    if config.CHAT_STREAM_MODE == "events":
+        async for event in agent.astream_events(
+            input_state,
+            config=run_config,
+            version="v2",
+            durability=get_checkpoint_durability(),
+        ):
+            yield event
+        return
+
+    # Tool call ID -> tool name, for calls that have started but not ended.
+    # Middleware (e.g. summarization) can write old messages back to the
+    # state, so only new tool calls and their own results produce events.
+    running_tools: dict[str, str] = {}
+    seen_tool_calls: set[str] = set()
+
+    async for mode, chunk in agent.astream(
+        input_state,
+        config=run_config,
+        stream_mode=STREAM_MODES,
+        durability=get_checkpoint_durability(),
+    ):
+        if mode == "messages":
+            message, _metadata = chunk
+            if isinstance(message, AIMessageChunk):
+                yield {"event": "on_chat_model_stream", "data": {"chunk": message}}
+
+        elif mode == "updates":
+            for node_name, update in chunk.items():
+                if node_name.startswith("__"):
+                    # __interrupt__ and other bookkeeping entries
+                    continue
+                yield {"event": "on_chain_end", "name": node_name, "data": {}}
+
+                for values in _node_updates(update):
+                    messages = values.get("messages")
+                    if not isinstance(messages, list):
+                        continue
+                    for message in messages:
+                        if isinstance(message, AIMessage):
+                            for tool_call in message.tool_calls:
+                                call_id = tool_call.get("id") or ""
+                                if call_id in seen_tool_calls:
+                                    continue
+                                seen_tool_calls.add(call_id)
+                                running_tools[call_id] = tool_call["name"]
+                                yield {
+                                    "event": "on_tool_start",
+                                    "name": tool_call["name"],
+                                    "run_id": call_id,
+                                    "data": {"input": tool_call.get("args", {})},
+                                }
+                        elif (
+                            isinstance(message, ToolMessage)
+                            and message.tool_call_id in running_tools
+                        ):
+                            yield {
+                                "event": "on_tool_end",
+                                "name": running_tools.pop(message.tool_call_id),
+                                "run_id": message.tool_call_id,
+                                "data": {"output": message},
+                            }
+
+        elif mode == "custom":
+            yield {"event": "on_custom_event", "name": "custom", "data": chunk}
@@ -26,7 +26,7 @@ from app.agents.new_chat.llm_config import (
     load_agent_config,
     load_llm_config_from_yaml,
 )
-from app.db import Document, SurfsenseDocsDocument
+from app.db import Document, SurfsenseDocsDocument, async_session_maker
 from app.schemas.new_chat import ChatAttachment
 from app.services.chat_session_state_service import (
     clear_ai_responding,
@@ -34,6 +34,7 @@ from app.services.chat_session_state_service import (
 )
 from app.services.connector_service import ConnectorService
 from app.services.new_streaming_service import VercelStreamingService
+from app.tasks.chat.agent_events import stream_agent_events
 from app.utils.content_utils import bootstrap_history_from_db
 
 
@@ -278,8 +279,13 @@ async def stream_new_chat(
             yield streaming_service.format_done()
             return
 
-        # Create connector service
-        connector_service = ConnectorService(session, search_space_id=search_space_id)
+        # Create connector service; retrieval legs use their own pooled
+        # sessions so knowledge base searches can run concurrently
+        connector_service = ConnectorService(
+            session,
+            search_space_id=search_space_id,
+            session_maker=async_session_maker,
+        )
 
         # Get Firecrawl API key from webcrawler connector if configured
         from app.db import SearchSourceConnectorType
@@ -519,11 +525,13 @@ async def stream_new_chat(
         )
 
         # Stream the agent response with thread config for memory
-        async for event in agent.astream_events(
-            input_state, config=config, version="v2"
-        ):
+        async for event in stream_agent_events(agent, input_state, config):
             event_type = event.get("event", "")
 
+            # Send coalesced text that has waited long enough
+            if pending_text := streaming_service.flush_text_delta_if_due():
+                yield pending_text
+
             # Handle chat model stream events (text streaming)
             if event_type == "on_chat_model_stream":
                 chunk = event.get("data", {}).get("chunk")
@@ -547,10 +555,11 @@ async def stream_new_chat(
                             current_text_id = streaming_service.generate_text_id()
                             yield streaming_service.format_text_start(current_text_id)
 
-                        # Stream the text delta
-                        yield streaming_service.format_text_delta(
+                        # Stream the text delta (coalesced with its neighbours)
+                        if text_part := streaming_service.buffer_text_delta(
                             current_text_id, content
-                        )
+                        ):
+                            yield text_part
                         accumulated_text += content
 
             # Handle tool calls
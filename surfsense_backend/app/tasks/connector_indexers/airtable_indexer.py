@@ -2,12 +2,14 @@
 Airtable connector indexer.
 """
 
+from functools import partial
+
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.config import config
 from app.connectors.airtable_history import AirtableHistoryConnector
 from app.db import Document, DocumentType, SearchSourceConnectorType
+from app.services.embedding_service import get_embedding_service
 from app.services.llm_service import get_user_long_context_llm
 from app.services.task_logging_service import TaskLoggingService
 from app.utils.document_converters import (
@@ -18,12 +20,13 @@ from app.utils.document_converters import (
 )
 
 from .base import (
+    DocumentWriter,
+    build_contents,
     calculate_date_range,
-    check_document_by_unique_identifier,
-    check_duplicate_document_by_hash,
     get_connector_by_id,
     get_current_timestamp,
     logger,
+    prefetch_documents,
     update_connector_last_indexed,
 )
 
@@ -103,6 +106,8 @@ async def index_airtable_records(
         airtable_history = AirtableHistoryConnector(session, connector_id)
         airtable_connector = await airtable_history._get_connector()
         total_processed = 0
+        documents_failed = 0
+        failure_messages = []
 
         try:
             # Get accessible bases
@@ -202,15 +207,46 @@ async def index_airtable_records(
                     documents_indexed = 0
                     skipped_messages = []
                     documents_skipped = 0
+                    writer = DocumentWriter(session)
+
+                    # Look up the table's existing documents with one query
+                    record_markdowns = build_contents(
+                        records,
+                        partial(
+                            airtable_connector.format_record_to_markdown,
+                            table_name=f"{base_name} - {table_name}",
+                        ),
+                    )
+                    lookup = await prefetch_documents(
+                        session,
+                        [
+                            generate_unique_identifier_hash(
+                                DocumentType.AIRTABLE_CONNECTOR,
+                                record.get("id", "Unknown"),
+                                search_space_id,
+                            )
+                            for record in records
+                        ],
+                        [
+                            generate_content_hash(markdown_content, search_space_id)
+                            for markdown_content in record_markdowns
+                            if markdown_content
+                        ],
+                        writer=writer,
+                    )
+
                     # Process each record
-                    for record in records:
+                    for record, markdown_content in zip(
+                        records, record_markdowns, strict=True
+                    ):
                         try:
                             # Generate markdown content
-                            markdown_content = (
-                                airtable_connector.format_record_to_markdown(
-                                    record, f"{base_name} - {table_name}"
+                            if markdown_content is None:
+                                markdown_content = (
+                                    airtable_connector.format_record_to_markdown(
+                                        record, f"{base_name} - {table_name}"
+                                    )
                                 )
-                            )
 
                             if not markdown_content.strip():
                                 logger.warning(
@@ -237,10 +273,8 @@ async def index_airtable_records(
                             )
 
                             # Check if document with this unique identifier already exists
-                            existing_document = (
-                                await check_document_by_unique_identifier(
-                                    session, unique_identifier_hash
-                                )
+                            existing_document = await lookup.get_by_unique_identifier(
+                                unique_identifier_hash, content_hash
                             )
 
                             if existing_document:
@@ -284,14 +318,14 @@ async def index_airtable_records(
                                             f"Airtable Record: {record_id}\n\n"
                                         )
                                         summary_embedding = (
-                                            config.embedding_model_instance.embed(
+                                            await get_embedding_service().embed_text(
                                                 summary_content
                                             )
                                         )
 
                                     # Process chunks
                                     chunks = await create_document_chunks(
-                                        markdown_content
+                                        markdown_content, existing_document
                                     )
 
                                     # Update existing document
@@ -311,6 +345,7 @@ async def index_airtable_records(
                                     existing_document.updated_at = (
                                         get_current_timestamp()
                                     )
+                                    await writer.add(existing_document)
 
                                     documents_indexed += 1
                                     logger.info(
@@ -322,9 +357,7 @@ async def index_airtable_records(
                             # Check if a document with the same content_hash exists (from another connector)
                             with session.no_autoflush:
                                 duplicate_by_content = (
-                                    await check_duplicate_document_by_hash(
-                                        session, content_hash
-                                    )
+                                    await lookup.get_duplicate_by_hash(content_hash)
                                 )
 
                             if duplicate_by_content:
@@ -359,7 +392,7 @@ async def index_airtable_records(
                                 # Fallback to simple summary if no LLM configured
                                 summary_content = f"Airtable Record: {record_id}\n\n"
                                 summary_embedding = (
-                                    config.embedding_model_instance.embed(
+                                    await get_embedding_service().embed_text(
                                         summary_content
                                     )
                                 )
@@ -387,19 +420,12 @@ async def index_airtable_records(
                                 updated_at=get_current_timestamp(),
                             )
 
-                            session.add(document)
+                            await writer.add(document)
                             documents_indexed += 1
                             logger.info(
                                 f"Successfully indexed new Airtable record {summary_content}"
                             )
 
-                            # Batch commit every 10 documents
-                            if documents_indexed % 10 == 0:
-                                logger.info(
-                                    f"Committing batch: {documents_indexed} Airtable records processed so far"
-                                )
-                                await session.commit()
-
                         except Exception as e:
                             logger.error(
                                 f"Error processing the Airtable record {record.get('id', 'Unknown')}: {e!s}",
@@ -419,10 +445,15 @@ async def index_airtable_records(
                         logger.info(
                             f"Final commit for table {table_name}: {documents_indexed} Airtable records processed"
                         )
-                        await session.commit()
+                        await writer.flush()
                         logger.info(
                             f"Successfully committed all Airtable document changes for table {table_name}"
                         )
+                        # Documents the writer could not insert were not indexed
+                        total_processed -= writer.documents_failed
+                        documents_failed += writer.documents_failed
+                        if writer.failure_message:
+                            failure_messages.append(writer.failure_message)
 
             # Update the last_indexed_at timestamp for the connector only if requested
             # (after all tables in all bases are processed)
@@ -438,6 +469,7 @@ async def index_airtable_records(
                 {
                     "events_processed": total_processed,
                     "documents_indexed": total_processed,
+                    "documents_failed": documents_failed,
                 },
             )
 
@@ -446,8 +478,8 @@ async def index_airtable_records(
             )
             return (
                 total_processed,
-                None,
-            )  # Return None as the error message to indicate success
+                "; ".join(failure_messages) or None,
+            )  # None on success, or a warning about records that couldn't be saved
 
         except Exception as e:
             logger.error(
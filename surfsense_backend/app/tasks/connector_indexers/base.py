@@ -3,12 +3,18 @@ Base functionality and shared imports for connector indexers.
 """
 
 import logging
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 
+from sqlalchemy import insert, inspect, or_
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
+from app.config import config
 from app.db import (
+    Chunk,
     Document,
     SearchSourceConnector,
     SearchSourceConnectorType,
@@ -71,6 +77,409 @@ async def check_document_by_unique_identifier(
     return existing_doc_result.scalars().first()
 
 
+# Keep IN (...) lists well below the database's bind parameter limit
+PREFETCH_BATCH_SIZE = 1000
+
+
+@dataclass(frozen=True)
+class ExistingDocument:
+    """The columns of an existing document that indexers check before work."""
+
+    id: int
+    unique_identifier_hash: str | None
+    content_hash: str
+    document_type: str
+
+
+class DocumentLookup:
+    """
+    Existing documents for a batch of items, fetched with one query.
+
+    Indexers used to run ``check_document_by_unique_identifier`` and
+    ``check_duplicate_document_by_hash`` for every item. A lookup is built
+    once per batch with ``prefetch_documents`` and answers the same questions
+    without a query when the item is unchanged or new:
+
+    - ``get_by_unique_identifier`` returns an ``ExistingDocument`` when the
+      content hash is unchanged, the full ``Document`` (with chunks) only when
+      it needs updating, and None without a query for new items.
+    - ``get_duplicate_by_hash`` answers from the prefetched rows.
+
+    Hashes outside the prefetched batch, and identifiers that come up twice
+    (the first one may have been added to the session meanwhile), fall back
+    to the per-item queries.
+
+    Documents added to ``writer`` are not in the session until it flushes, so
+    both lookups check the writer first: an item repeating an identifier or
+    content hash earlier in the run is matched to that document.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        rows: Iterable[ExistingDocument],
+        unique_identifier_hashes: Iterable[str],
+        content_hashes: Iterable[str],
+        writer: "DocumentWriter | None" = None,
+    ):
+        self._session = session
+        self._writer = writer
+        self._prefetched_identifiers = set(unique_identifier_hashes)
+        self._prefetched_content_hashes = set(content_hashes)
+        self._by_identifier: dict[str, ExistingDocument] = {}
+        self._by_content_hash: dict[str, ExistingDocument] = {}
+        self._seen_identifiers: set[str] = set()
+        for row in rows:
+            if row.unique_identifier_hash:
+                self._by_identifier[row.unique_identifier_hash] = row
+            self._by_content_hash[row.content_hash] = row
+
+    def is_unchanged(self, unique_identifier_hash: str, content_hash: str) -> bool:
+        """Whether a prefetched document already has this content hash."""
+        existing = self._by_identifier.get(unique_identifier_hash)
+        return existing is not None and existing.content_hash == content_hash
+
+    async def get_by_unique_identifier(
+        self, unique_identifier_hash: str, content_hash: str | None = None
+    ) -> ExistingDocument | Document | None:
+        """
+        Get the existing document for an item, loading it only to update it.
+
+        Args:
+            unique_identifier_hash: Hash of the unique identifier from the source system
+            content_hash: Hash of the item's current content, if already known
+
+        Returns:
+            ExistingDocument if the content is unchanged, the Document with its
+            chunks if it changed, None if there is no such document
+        """
+        if self._writer is not None:
+            buffered = self._writer.get_buffered(unique_identifier_hash)
+            if buffered is not None:
+                self._seen_identifiers.add(unique_identifier_hash)
+                return buffered
+
+        if (
+            unique_identifier_hash not in self._prefetched_identifiers
+            or unique_identifier_hash in self._seen_identifiers
+        ):
+            return await check_document_by_unique_identifier(
+                self._session, unique_identifier_hash
+            )
+        self._seen_identifiers.add(unique_identifier_hash)
+
+        existing = self._by_identifier.get(unique_identifier_hash)
+        if existing is None:
+            return None
+        if content_hash is not None and existing.content_hash == content_hash:
+            return existing
+        return await check_document_by_unique_identifier(
+            self._session, unique_identifier_hash
+        )
+
+    async def get_duplicate_by_hash(
+        self, content_hash: str
+    ) -> ExistingDocument | Document | None:
+        """
+        Get a document that already has this content hash.
+
+        Args:
+            content_hash: Hash of the document content
+
+        Returns:
+            Existing document if found, None otherwise
+        """
+        if self._writer is not None:
+            written = self._writer.get_by_content_hash(content_hash)
+            if written is not None:
+                return written
+        if content_hash in self._by_content_hash:
+            return self._by_content_hash[content_hash]
+        if content_hash in self._prefetched_content_hashes:
+            return None
+        return await check_duplicate_document_by_hash(self._session, content_hash)
+
+
+async def prefetch_documents(
+    session: AsyncSession,
+    unique_identifier_hashes: Iterable[str],
+    content_hashes: Iterable[str] = (),
+    writer: "DocumentWriter | None" = None,
+) -> DocumentLookup:
+    """
+    Fetch the existing documents for a batch of items.
+
+    Only the columns needed to skip unchanged items are loaded, with one
+    ``IN (...)`` query per PREFETCH_BATCH_SIZE hashes.
+
+    Args:
+        session: Database session
+        unique_identifier_hashes: Unique identifier hashes of the batch's items
+        content_hashes: Content hashes of the batch's items, if known up front
+        writer: The indexer's DocumentWriter, whose unwritten documents the
+            lookup also checks
+
+    Returns:
+        DocumentLookup for the batch
+    """
+    identifiers = list(dict.fromkeys(unique_identifier_hashes))
+    hashes = list(dict.fromkeys(content_hashes))
+
+    rows: list[ExistingDocument] = []
+    for start in range(0, max(len(identifiers), len(hashes)), PREFETCH_BATCH_SIZE):
+        identifier_batch = identifiers[start : start + PREFETCH_BATCH_SIZE]
+        hash_batch = hashes[start : start + PREFETCH_BATCH_SIZE]
+        conditions = []
+        if identifier_batch:
+            conditions.append(Document.unique_identifier_hash.in_(identifier_batch))
+        if hash_batch:
+            conditions.append(Document.content_hash.in_(hash_batch))
+
+        result = await session.execute(
+            select(
+                Document.id,
+                Document.unique_identifier_hash,
+                Document.content_hash,
+                Document.document_type,
+            ).where(or_(*conditions))
+        )
+        rows.extend(ExistingDocument(*row) for row in result.all())
+
+    return DocumentLookup(session, rows, identifiers, hashes, writer)
+
+
+def build_contents[T](
+    items: Sequence[T], build: Callable[[T], str]
+) -> list[str | None]:
+    """
+    Build the document content of a batch's items before the per-item loop.
+
+    Their content hashes can then go to ``prefetch_documents`` with the
+    identifiers, so new items are checked for duplicates without a query each.
+    An item whose content cannot be built gets None; the loop builds it again
+    so the error is logged and counted there as before.
+
+    Args:
+        items: The batch's items
+        build: Builds an item's document content
+
+    Returns:
+        The items' contents, None where building failed
+    """
+    contents: list[str | None] = []
+    for item in items:
+        try:
+            contents.append(build(item))
+        except Exception:
+            contents.append(None)
+    return contents
+
+
+def _column_values(obj: Document | Chunk) -> dict:
+    """The column attributes that are set on a new ORM object."""
+    state = inspect(obj)
+    return {
+        attr.key: state.dict[attr.key]
+        for attr in state.mapper.column_attrs
+        if attr.key in state.dict
+    }
+
+
+def _estimated_size(document: Document) -> int:
+    """Approximate bytes a document and its chunks add to a write batch."""
+    size = len(document.content or "")
+    if document.embedding is not None:
+        size += 4 * len(document.embedding)
+    for chunk in document.chunks:
+        size += len(chunk.content or "")
+        if chunk.embedding is not None:
+            size += 4 * len(chunk.embedding)
+    return size
+
+
+# Titles named in DocumentWriter.failure_message before the rest are counted
+MAX_REPORTED_FAILURES = 5
+
+
+class DocumentWriter:
+    """
+    Batched writes for connector indexers.
+
+    ``add`` takes the Document an indexer built (with its chunks attached) in
+    place of ``session.add``. New documents are buffered and written with one
+    ``INSERT ... RETURNING id`` for the documents and one executemany insert
+    for all their chunks, then the session is committed. Updated documents
+    that are already in the session are only counted towards the batch, so
+    their changes are committed with it.
+
+    A batch is written every ``batch_size`` documents or ``max_batch_bytes``
+    of content and embeddings. Each batch is inserted in a savepoint: if it
+    fails (e.g. a unique constraint on a hash), the batch is retried one
+    document at a time and only the failing documents are dropped. Dropped
+    documents are counted in ``documents_failed``; indexers subtract them
+    from their counts and report ``failure_message``.
+
+    The writer remembers the identifier of every buffered document and the
+    content hash of every document it wrote during the run, so a
+    ``DocumentLookup`` given the writer sees them before they reach the
+    session.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        batch_size: int | None = None,
+        max_batch_bytes: int | None = None,
+    ):
+        self._session = session
+        self.batch_size = batch_size or config.INDEXING_BATCH_SIZE
+        self.max_batch_bytes = max_batch_bytes or config.INDEXING_BATCH_MAX_BYTES
+        self._new_documents: list[Document] = []
+        self._batch_content_hashes: list[str] = []
+        self._buffered_by_identifier: dict[str, Document] = {}
+        self._by_content_hash: dict[str, Document | ExistingDocument] = {}
+        self._batch_count = 0
+        self._batch_bytes = 0
+        self.documents_written = 0
+        self.documents_failed = 0
+        self.failed_titles: list[str] = []
+
+    async def add(self, document: Document) -> None:
+        """
+        Add a new or updated document to the current batch.
+
+        Args:
+            document: The document to write
+        """
+        identifier = document.unique_identifier_hash
+        # A buffered document updated by a later item is only written once
+        if (
+            not inspect(document).persistent
+            and self._buffered_by_identifier.get(identifier) is not document
+        ):
+            self._new_documents.append(document)
+            if identifier:
+                self._buffered_by_identifier[identifier] = document
+        self._batch_content_hashes.append(document.content_hash)
+        self._by_content_hash[document.content_hash] = document
+        self._batch_count += 1
+        self._batch_bytes += _estimated_size(document)
+
+        if (
+            self._batch_count >= self.batch_size
+            or self._batch_bytes >= self.max_batch_bytes
+        ):
+            await self.flush()
+
+    def get_buffered(self, unique_identifier_hash: str) -> Document | None:
+        """The new document with this identifier that is not written yet."""
+        return self._buffered_by_identifier.get(unique_identifier_hash)
+
+    def get_by_content_hash(
+        self, content_hash: str
+    ) -> Document | ExistingDocument | None:
+        """The document added during this run that has this content hash."""
+        document = self._by_content_hash.get(content_hash)
+        # Entries of documents whose content changed after they were added
+        if document is None or document.content_hash != content_hash:
+            return None
+        return document
+
+    @property
+    def failure_message(self) -> str | None:
+        """Warning naming the documents that could not be written, if any."""
+        if not self.documents_failed:
+            return None
+        titles = ", ".join(self.failed_titles[:MAX_REPORTED_FAILURES])
+        if self.documents_failed > MAX_REPORTED_FAILURES:
+            titles += f" and {self.documents_failed - MAX_REPORTED_FAILURES} more"
+        return f"{self.documents_failed} documents could not be saved: {titles}"
+
+    async def flush(self) -> int:
+        """
+        Write the buffered documents and commit the session.
+
+        Returns:
+            int: Number of buffered documents that could not be inserted
+        """
+        failed_before = self.documents_failed
+        documents = self._new_documents
+        batch_content_hashes = self._batch_content_hashes
+        self._new_documents = []
+        self._batch_content_hashes = []
+        self._buffered_by_identifier = {}
+        self._batch_count = 0
+        self._batch_bytes = 0
+
+        if documents:
+            # Flush pending updates first so their errors are not taken for
+            # failed inserts
+            await self._session.flush()
+            try:
+                async with self._session.begin_nested():
+                    await self._insert(documents)
+            except SQLAlchemyError as e:
+                logger.warning(
+                    f"Bulk insert of {len(documents)} documents failed, "
+                    f"retrying one at a time: {e!s}"
+                )
+                for document in documents:
+                    try:
+                        async with self._session.begin_nested():
+                            await self._insert([document])
+                    except SQLAlchemyError as document_error:
+                        self.documents_failed += 1
+                        self.failed_titles.append(document.title)
+                        logger.error(
+                            f"Failed to insert document '{document.title}': "
+                            f"{document_error!s}"
+                        )
+
+        # Keep only the columns the lookups need, read before the commit
+        # expires the updated documents
+        for content_hash in batch_content_hashes:
+            document = self._by_content_hash.get(content_hash)
+            if not isinstance(document, Document):
+                continue
+            if document.id is None or document.content_hash != content_hash:
+                del self._by_content_hash[content_hash]
+            else:
+                self._by_content_hash[content_hash] = ExistingDocument(
+                    document.id,
+                    document.unique_identifier_hash,
+                    document.content_hash,
+                    document.document_type,
+                )
+
+        await self._session.commit()
+        if documents:
+            logger.info(
+                f"Committed batch of {len(documents)} new documents "
+                f"({self.documents_written} written, {self.documents_failed} failed so far)"
+            )
+        return self.documents_failed - failed_before
+
+    async def _insert(self, documents: list[Document]) -> None:
+        """Insert documents and then their chunks, with one statement each."""
+        result = await self._session.execute(
+            insert(Document).returning(Document.id, sort_by_parameter_order=True),
+            [_column_values(document) for document in documents],
+        )
+        document_ids = result.scalars().all()
+
+        chunk_rows = [
+            {**_column_values(chunk), "document_id": document_id}
+            for document, document_id in zip(documents, document_ids, strict=True)
+            for chunk in document.chunks
+        ]
+        if chunk_rows:
+            await self._session.execute(insert(Chunk), chunk_rows)
+
+        for document, document_id in zip(documents, document_ids, strict=True):
+            document.id = document_id
+        self.documents_written += len(documents)
+
+
 async def get_connector_by_id(
     session: AsyncSession, connector_id: int, connector_type: SearchSourceConnectorType
 ) -> SearchSourceConnector | None:
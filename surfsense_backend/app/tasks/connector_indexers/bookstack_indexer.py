@@ -7,9 +7,9 @@ from datetime import datetime
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.config import config
 from app.connectors.bookstack_connector import BookStackConnector
 from app.db import Document, DocumentType, SearchSourceConnectorType
+from app.services.embedding_service import get_embedding_service
 from app.services.llm_service import get_user_long_context_llm
 from app.services.task_logging_service import TaskLoggingService
 from app.utils.document_converters import (
@@ -20,12 +20,12 @@ from app.utils.document_converters import (
 )
 
 from .base import (
+    DocumentWriter,
     calculate_date_range,
-    check_document_by_unique_identifier,
-    check_duplicate_document_by_hash,
     get_connector_by_id,
     get_current_timestamp,
     logger,
+    prefetch_documents,
     update_connector_last_indexed,
 )
 
@@ -179,6 +179,21 @@ async def index_bookstack_pages(
         skipped_pages = []
         documents_skipped = 0
 
+        writer = DocumentWriter(session)
+
+        # Look up the existing documents for all pages with one query
+        lookup = await prefetch_documents(
+            session,
+            [
+                generate_unique_identifier_hash(
+                    DocumentType.BOOKSTACK_CONNECTOR, page["id"], search_space_id
+                )
+                for page in pages
+                if page.get("id")
+            ],
+            writer=writer,
+        )
+
         for page in pages:
             try:
                 page_id = page.get("id")
@@ -225,8 +240,8 @@ async def index_bookstack_pages(
                 content_hash = generate_content_hash(full_content, search_space_id)
 
                 # Check if document with this unique identifier already exists
-                existing_document = await check_document_by_unique_identifier(
-                    session, unique_identifier_hash
+                existing_document = await lookup.get_by_unique_identifier(
+                    unique_identifier_hash, content_hash
                 )
 
                 # Build page URL
@@ -289,12 +304,16 @@ async def index_bookstack_pages(
                                 summary_content += (
                                     f"Content Preview: {content_preview}\n\n"
                                 )
-                            summary_embedding = config.embedding_model_instance.embed(
-                                summary_content
+                            summary_embedding = (
+                                await get_embedding_service().embed_text(
+                                    summary_content
+                                )
                             )
 
                         # Process chunks
-                        chunks = await create_document_chunks(full_content)
+                        chunks = await create_document_chunks(
+                            full_content, existing_document
+                        )
 
                         # Update existing document
                         existing_document.title = f"BookStack - {page_name}"
@@ -304,6 +323,7 @@ async def index_bookstack_pages(
                         existing_document.document_metadata = doc_metadata
                         existing_document.chunks = chunks
                         existing_document.updated_at = get_current_timestamp()
+                        await writer.add(existing_document)
 
                         documents_indexed += 1
                         logger.info(f"Successfully updated BookStack page {page_name}")
@@ -312,8 +332,8 @@ async def index_bookstack_pages(
                 # Document doesn't exist by unique_identifier_hash
                 # Check if a document with the same content_hash exists (from another connector)
                 with session.no_autoflush:
-                    duplicate_by_content = await check_duplicate_document_by_hash(
-                        session, content_hash
+                    duplicate_by_content = await lookup.get_duplicate_by_hash(
+                        content_hash
                     )
 
                 if duplicate_by_content:
@@ -356,7 +376,7 @@ async def index_bookstack_pages(
                         if len(page_content) > 1000:
                             content_preview += "..."
                         summary_content += f"Content Preview: {content_preview}\n\n"
-                    summary_embedding = config.embedding_model_instance.embed(
+                    summary_embedding = await get_embedding_service().embed_text(
                         summary_content
                     )
 
@@ -378,17 +398,10 @@ async def index_bookstack_pages(
                     updated_at=get_current_timestamp(),
                 )
 
-                session.add(document)
+                await writer.add(document)
                 documents_indexed += 1
                 logger.info(f"Successfully indexed new page {page_name}")
 
-                # Batch commit every 10 documents
-                if documents_indexed % 10 == 0:
-                    logger.info(
-                        f"Committing batch: {documents_indexed} BookStack pages processed so far"
-                    )
-                    await session.commit()
-
             except Exception as e:
                 logger.error(
                     f"Error processing page {page.get('name', 'Unknown')}: {e!s}",
@@ -409,7 +422,10 @@ async def index_bookstack_pages(
         logger.info(
             f"Final commit: Total {documents_indexed} BookStack pages processed"
         )
-        await session.commit()
+        await writer.flush()
+        # Documents the writer could not insert were not indexed
+        documents_indexed -= writer.documents_failed
+        total_processed -= writer.documents_failed
         logger.info("Successfully committed all BookStack document changes to database")
 
         # Log success
@@ -420,6 +436,7 @@ async def index_bookstack_pages(
                 "pages_processed": total_processed,
                 "documents_indexed": documents_indexed,
                 "documents_skipped": documents_skipped,
+                "documents_failed": writer.documents_failed,
                 "skipped_pages_count": len(skipped_pages),
             },
         )
@@ -429,8 +446,8 @@ async def index_bookstack_pages(
         )
         return (
             total_processed,
-            None,
-        )  # Return None as the error message to indicate success
+            writer.failure_message,
+        )  # None on success, or a warning about documents that couldn't be saved
 
     except SQLAlchemyError as db_error:
         await session.rollback()
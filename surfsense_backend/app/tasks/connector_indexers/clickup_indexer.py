@@ -8,9 +8,9 @@ from datetime import datetime
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.config import config
 from app.connectors.clickup_history import ClickUpHistoryConnector
 from app.db import Document, DocumentType, SearchSourceConnectorType
+from app.services.embedding_service import get_embedding_service
 from app.services.llm_service import get_user_long_context_llm
 from app.services.task_logging_service import TaskLoggingService
 from app.utils.document_converters import (
@@ -21,15 +21,46 @@ from app.utils.document_converters import (
 )
 
 from .base import (
-    check_document_by_unique_identifier,
-    check_duplicate_document_by_hash,
+    DocumentWriter,
+    build_contents,
     get_connector_by_id,
     get_current_timestamp,
     logger,
+    prefetch_documents,
     update_connector_last_indexed,
 )
 
 
+def _build_task_content(task: dict) -> str:
+    """Build the document content of a ClickUp task."""
+    task_priority = (
+        task.get("priority", {}).get("priority", "Unknown")
+        if task.get("priority")
+        else "None"
+    )
+    content_parts: list[str] = [f"Task: {task.get('name', 'Untitled Task')}"]
+    if task.get("description", ""):
+        content_parts.append(f"Description: {task.get('description', '')}")
+    content_parts.extend(
+        [
+            f"Status: {task.get('status', {}).get('status', 'Unknown')}",
+            f"Priority: {task_priority}",
+            f"List: {task.get('list', {}).get('name', 'Unknown List')}",
+            f"Space: {task.get('space', {}).get('name', 'Unknown Space')}",
+        ]
+    )
+    task_assignees = task.get("assignees", [])
+    if task_assignees:
+        assignee_names = [
+            assignee.get("username", "Unknown") for assignee in task_assignees
+        ]
+        content_parts.append(f"Assignees: {', '.join(assignee_names)}")
+    if task.get("due_date"):
+        content_parts.append(f"Due Date: {task.get('due_date')}")
+
+    return "\n".join(content_parts)
+
+
 async def index_clickup_tasks(
     session: AsyncSession,
     connector_id: int,
@@ -131,6 +162,7 @@ async def index_clickup_tasks(
 
         documents_indexed = 0
         documents_skipped = 0
+        writer = DocumentWriter(session)
 
         # Iterate workspaces and fetch tasks
         for workspace in workspaces:
@@ -169,11 +201,28 @@ async def index_clickup_tasks(
                 {"stage": "tasks_found", "task_count": len(tasks)},
             )
 
-            for task in tasks:
+            # Look up the workspace's existing documents with one query
+            task_contents = build_contents(tasks, _build_task_content)
+            lookup = await prefetch_documents(
+                session,
+                [
+                    generate_unique_identifier_hash(
+                        DocumentType.CLICKUP_CONNECTOR, task.get("id"), search_space_id
+                    )
+                    for task in tasks
+                ],
+                [
+                    generate_content_hash(task_content, search_space_id)
+                    for task_content in task_contents
+                    if task_content
+                ],
+                writer=writer,
+            )
+
+            for task, task_content in zip(tasks, task_contents, strict=True):
                 try:
                     task_id = task.get("id")
                     task_name = task.get("name", "Untitled Task")
-                    task_description = task.get("description", "")
                     task_status = task.get("status", {}).get("status", "Unknown")
                     task_priority = (
                         task.get("priority", {}).get("priority", "Unknown")
@@ -190,28 +239,8 @@ async def index_clickup_tasks(
                     task_space = task.get("space", {})
                     task_space_name = task_space.get("name", "Unknown Space")
 
-                    # Build task content string
-                    content_parts: list[str] = [f"Task: {task_name}"]
-                    if task_description:
-                        content_parts.append(f"Description: {task_description}")
-                    content_parts.extend(
-                        [
-                            f"Status: {task_status}",
-                            f"Priority: {task_priority}",
-                            f"List: {task_list_name}",
-                            f"Space: {task_space_name}",
-                        ]
-                    )
-                    if task_assignees:
-                        assignee_names = [
-                            assignee.get("username", "Unknown")
-                            for assignee in task_assignees
-                        ]
-                        content_parts.append(f"Assignees: {', '.join(assignee_names)}")
-                    if task_due_date:
-                        content_parts.append(f"Due Date: {task_due_date}")
-
-                    task_content = "\n".join(content_parts)
+                    if task_content is None:
+                        task_content = _build_task_content(task)
                     if not task_content.strip():
                         logger.warning(f"Skipping task with no content: {task_name}")
                         documents_skipped += 1
@@ -226,8 +255,8 @@ async def index_clickup_tasks(
                     content_hash = generate_content_hash(task_content, search_space_id)
 
                     # Check if document with this unique identifier already exists
-                    existing_document = await check_document_by_unique_identifier(
-                        session, unique_identifier_hash
+                    existing_document = await lookup.get_by_unique_identifier(
+                        unique_identifier_hash, content_hash
                     )
 
                     if existing_document:
@@ -270,11 +299,15 @@ async def index_clickup_tasks(
                             else:
                                 summary_content = task_content
                                 summary_embedding = (
-                                    config.embedding_model_instance.embed(task_content)
+                                    await get_embedding_service().embed_text(
+                                        task_content
+                                    )
                                 )
 
                             # Process chunks
-                            chunks = await create_document_chunks(task_content)
+                            chunks = await create_document_chunks(
+                                task_content, existing_document
+                            )
 
                             # Update existing document
                             existing_document.title = f"Task - {task_name}"
@@ -296,6 +329,7 @@ async def index_clickup_tasks(
                             }
                             existing_document.chunks = chunks
                             existing_document.updated_at = get_current_timestamp()
+                            await writer.add(existing_document)
 
                             documents_indexed += 1
                             logger.info(
@@ -306,8 +340,8 @@ async def index_clickup_tasks(
                     # Document doesn't exist by unique_identifier_hash
                     # Check if a document with the same content_hash exists (from another connector)
                     with session.no_autoflush:
-                        duplicate_by_content = await check_duplicate_document_by_hash(
-                            session, content_hash
+                        duplicate_by_content = await lookup.get_duplicate_by_hash(
+                            content_hash
                         )
 
                     if duplicate_by_content:
@@ -346,7 +380,7 @@ async def index_clickup_tasks(
                     else:
                         # Fallback to simple summary if no LLM configured
                         summary_content = task_content
-                        summary_embedding = config.embedding_model_instance.embed(
+                        summary_embedding = await get_embedding_service().embed_text(
                             task_content
                         )
 
@@ -375,17 +409,10 @@ async def index_clickup_tasks(
                         updated_at=get_current_timestamp(),
                     )
 
-                    session.add(document)
+                    await writer.add(document)
                     documents_indexed += 1
                     logger.info(f"Successfully indexed new task {task_name}")
 
-                    # Batch commit every 10 documents
-                    if documents_indexed % 10 == 0:
-                        logger.info(
-                            f"Committing batch: {documents_indexed} ClickUp tasks processed so far"
-                        )
-                        await session.commit()
-
                 except Exception as e:
                     logger.error(
                         f"Error processing task {task.get('name', 'Unknown')}: {e!s}",
@@ -400,7 +427,10 @@ async def index_clickup_tasks(
 
         # Final commit for any remaining documents not yet committed in batches
         logger.info(f"Final commit: Total {documents_indexed} ClickUp tasks processed")
-        await session.commit()
+        await writer.flush()
+        # Documents the writer could not insert were not indexed
+        documents_indexed -= writer.documents_failed
+        total_processed -= writer.documents_failed
 
         await task_logger.log_task_success(
             log_entry,
@@ -409,6 +439,7 @@ async def index_clickup_tasks(
                 "pages_processed": total_processed,
                 "documents_indexed": documents_indexed,
                 "documents_skipped": documents_skipped,
+                "documents_failed": writer.documents_failed,
             },
         )
 
@@ -422,7 +453,7 @@ async def index_clickup_tasks(
         except Exception as e:
             logger.warning(f"Error closing ClickUp client: {e!s}")
 
-        return total_processed, None
+        return total_processed, writer.failure_message
 
     except SQLAlchemyError as db_error:
         await session.rollback()
@@ -8,9 +8,9 @@ from datetime import datetime
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.config import config
 from app.connectors.confluence_history import ConfluenceHistoryConnector
 from app.db import Document, DocumentType, SearchSourceConnectorType
+from app.services.embedding_service import get_embedding_service
 from app.services.llm_service import get_user_long_context_llm
 from app.services.task_logging_service import TaskLoggingService
 from app.utils.document_converters import (
@@ -21,16 +21,42 @@ from app.utils.document_converters import (
 )
 
 from .base import (
+    DocumentWriter,
+    build_contents,
     calculate_date_range,
-    check_document_by_unique_identifier,
-    check_duplicate_document_by_hash,
     get_connector_by_id,
     get_current_timestamp,
     logger,
+    prefetch_documents,
     update_connector_last_indexed,
 )
 
 
+def _build_page_content(page: dict) -> str:
+    """Build the document content of a Confluence page and its comments."""
+    page_content = ""
+    if page.get("body") and page["body"].get("storage"):
+        page_content = page["body"]["storage"].get("value", "")
+
+    comments_content = ""
+    comments = page.get("comments", [])
+    if comments:
+        comments_content = "\n\n## Comments\n\n"
+        for comment in comments:
+            comment_body = ""
+            if comment.get("body") and comment["body"].get("storage"):
+                comment_body = comment["body"]["storage"].get("value", "")
+
+            comment_author = comment.get("version", {}).get("authorId", "Unknown")
+            comment_date = comment.get("version", {}).get("createdAt", "")
+
+            comments_content += (
+                f"**Comment by {comment_author}** ({comment_date}):\n{comment_body}\n\n"
+            )
+
+    return f"# {page.get('title', '')}\n\n{page_content}{comments_content}"
+
+
 async def index_confluence_pages(
     session: AsyncSession,
     connector_id: int,
@@ -175,7 +201,28 @@ async def index_confluence_pages(
         skipped_pages = []
         documents_skipped = 0
 
-        for page in pages:
+        writer = DocumentWriter(session)
+
+        # Look up the existing documents for all pages with one query
+        page_contents = build_contents(pages, _build_page_content)
+        lookup = await prefetch_documents(
+            session,
+            [
+                generate_unique_identifier_hash(
+                    DocumentType.CONFLUENCE_CONNECTOR, page["id"], search_space_id
+                )
+                for page in pages
+                if page.get("id")
+            ],
+            [
+                generate_content_hash(full_content, search_space_id)
+                for full_content in page_contents
+                if full_content
+            ],
+            writer=writer,
+        )
+
+        for page, full_content in zip(pages, page_contents, strict=True):
             try:
                 page_id = page.get("id")
                 page_title = page.get("title", "")
@@ -194,25 +241,11 @@ async def index_confluence_pages(
                 if page.get("body") and page["body"].get("storage"):
                     page_content = page["body"]["storage"].get("value", "")
 
-                # Add comments to content
                 comments = page.get("comments", [])
-                comments_content = ""
-                if comments:
-                    comments_content = "\n\n## Comments\n\n"
-                    for comment in comments:
-                        comment_body = ""
-                        if comment.get("body") and comment["body"].get("storage"):
-                            comment_body = comment["body"]["storage"].get("value", "")
-
-                        comment_author = comment.get("version", {}).get(
-                            "authorId", "Unknown"
-                        )
-                        comment_date = comment.get("version", {}).get("createdAt", "")
 
-                        comments_content += f"**Comment by {comment_author}** ({comment_date}):\n{comment_body}\n\n"
-
-                # Combine page content with comments
-                full_content = f"# {page_title}\n\n{page_content}{comments_content}"
+                # Page content combined with comments
+                if full_content is None:
+                    full_content = _build_page_content(page)
 
                 if not full_content.strip():
                     logger.warning(f"Skipping page with no content: {page_title}")
@@ -229,8 +262,8 @@ async def index_confluence_pages(
                 content_hash = generate_content_hash(full_content, search_space_id)
 
                 # Check if document with this unique identifier already exists
-                existing_document = await check_document_by_unique_identifier(
-                    session, unique_identifier_hash
+                existing_document = await lookup.get_by_unique_identifier(
+                    unique_identifier_hash, content_hash
                 )
 
                 comment_count = len(comments)
@@ -279,12 +312,16 @@ async def index_confluence_pages(
                                     f"Content Preview: {content_preview}\n\n"
                                 )
                             summary_content += f"Comments: {comment_count}"
-                            summary_embedding = config.embedding_model_instance.embed(
-                                summary_content
+                            summary_embedding = (
+                                await get_embedding_service().embed_text(
+                                    summary_content
+                                )
                             )
 
                         # Process chunks
-                        chunks = await create_document_chunks(full_content)
+                        chunks = await create_document_chunks(
+                            full_content, existing_document
+                        )
 
                         # Update existing document
                         existing_document.title = f"Confluence - {page_title}"
@@ -300,6 +337,7 @@ async def index_confluence_pages(
                         }
                         existing_document.chunks = chunks
                         existing_document.updated_at = get_current_timestamp()
+                        await writer.add(existing_document)
 
                         documents_indexed += 1
                         logger.info(
@@ -310,8 +348,8 @@ async def index_confluence_pages(
                 # Document doesn't exist by unique_identifier_hash
                 # Check if a document with the same content_hash exists (from another connector)
                 with session.no_autoflush:
-                    duplicate_by_content = await check_duplicate_document_by_hash(
-                        session, content_hash
+                    duplicate_by_content = await lookup.get_duplicate_by_hash(
+                        content_hash
                     )
 
                 if duplicate_by_content:
@@ -356,7 +394,7 @@ async def index_confluence_pages(
                             content_preview += "..."
                         summary_content += f"Content Preview: {content_preview}\n\n"
                     summary_content += f"Comments: {comment_count}"
-                    summary_embedding = config.embedding_model_instance.embed(
+                    summary_embedding = await get_embedding_service().embed_text(
                         summary_content
                     )
 
@@ -384,17 +422,10 @@ async def index_confluence_pages(
                     updated_at=get_current_timestamp(),
                 )
 
-                session.add(document)
+                await writer.add(document)
                 documents_indexed += 1
                 logger.info(f"Successfully indexed new page {page_title}")
 
-                # Batch commit every 10 documents
-                if documents_indexed % 10 == 0:
-                    logger.info(
-                        f"Committing batch: {documents_indexed} Confluence pages processed so far"
-                    )
-                    await session.commit()
-
             except Exception as e:
                 logger.error(
                     f"Error processing page {page.get('title', 'Unknown')}: {e!s}",
@@ -415,7 +446,10 @@ async def index_confluence_pages(
         logger.info(
             f"Final commit: Total {documents_indexed} Confluence pages processed"
         )
-        await session.commit()
+        await writer.flush()
+        # Documents the writer could not insert were not indexed
+        documents_indexed -= writer.documents_failed
+        total_processed -= writer.documents_failed
         logger.info(
             "Successfully committed all Confluence document changes to database"
         )
@@ -428,6 +462,7 @@ async def index_confluence_pages(
                 "pages_processed": total_processed,
                 "documents_indexed": documents_indexed,
                 "documents_skipped": documents_skipped,
+                "documents_failed": writer.documents_failed,
                 "skipped_pages_count": len(skipped_pages),
             },
         )
@@ -442,8 +477,8 @@ async def index_confluence_pages(
 
         return (
             total_processed,
-            None,
-        )  # Return None as the error message to indicate success
+            writer.failure_message,
+        )  # None on success, or a warning about documents that couldn't be saved
 
     except SQLAlchemyError as db_error:
         await session.rollback()
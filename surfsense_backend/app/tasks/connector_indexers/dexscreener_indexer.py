@@ -5,9 +5,9 @@ DexScreener connector indexer.
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.config import config
 from app.connectors.dexscreener_connector import DexScreenerConnector
 from app.db import Document, DocumentType, SearchSourceConnectorType
+from app.services.embedding_service import get_embedding_service
 from app.services.llm_service import get_user_long_context_llm
 from app.services.task_logging_service import TaskLoggingService
 from app.utils.document_converters import (
@@ -18,11 +18,11 @@ from app.utils.document_converters import (
 )
 
 from .base import (
-    check_document_by_unique_identifier,
-    check_duplicate_document_by_hash,
+    DocumentWriter,
     get_connector_by_id,
     get_current_timestamp,
     logger,
+    prefetch_documents,
     update_connector_last_indexed,
 )
 
@@ -115,7 +115,7 @@ async def index_dexscreener_pairs(
         documents_indexed = 0
         documents_skipped = 0
         skipped_pairs = []
-        batch_size = 10  # Commit every 10 documents for performance
+        writer = DocumentWriter(session)
 
         # Process each tracked token
         for token_idx, token in enumerate(tokens):
@@ -153,6 +153,19 @@ async def index_dexscreener_pairs(
 
                 logger.info(f"Retrieved {len(pairs)} pairs for {token_name or address} on {chain}")
 
+                # Look up the token's existing pair documents with one query
+                lookup = await prefetch_documents(
+                    session,
+                    [
+                        generate_unique_identifier_hash(
+                            DocumentType.DEXSCREENER_CONNECTOR, f"{chain}:{pair['pairAddress']}", search_space_id
+                        )
+                        for pair in pairs
+                        if pair.get("pairAddress")
+                    ],
+                    writer=writer,
+                )
+
                 # Process each pair
                 for pair in pairs:
                     try:
@@ -193,8 +206,8 @@ async def index_dexscreener_pairs(
                         content_hash = generate_content_hash(pair_markdown, search_space_id)
 
                         # Check if document with this unique identifier already exists
-                        existing_document = await check_document_by_unique_identifier(
-                            session, unique_identifier_hash
+                        existing_document = await lookup.get_by_unique_identifier(
+                            unique_identifier_hash, content_hash
                         )
 
                         if existing_document:
@@ -245,12 +258,14 @@ async def index_dexscreener_pairs(
                                     summary_content += f"Liquidity: ${liquidity_usd:,.2f}\n"
                                     summary_content += f"24h Volume: ${volume_24h:,.2f}\n"
                                     summary_content += f"24h Change: {price_change_24h:+.2f}%\n"
-                                    summary_embedding = config.embedding_model_instance.embed(
+                                    summary_embedding = await get_embedding_service().embed_text(
                                         summary_content
                                     )
 
                                 # Process chunks
-                                chunks = await create_document_chunks(pair_markdown)
+                                chunks = await create_document_chunks(
+                                    pair_markdown, existing_document
+                                )
 
                                 # Update existing document
                                 existing_document.title = f"DexScreener - {base_symbol}/{quote_symbol} on {chain}"
@@ -272,6 +287,7 @@ async def index_dexscreener_pairs(
                                 }
                                 existing_document.chunks = chunks
                                 existing_document.updated_at = get_current_timestamp()
+                                await writer.add(existing_document)
 
                                 documents_indexed += 1
                                 logger.info(f"Updated document for pair {base_symbol}/{quote_symbol}")
@@ -314,7 +330,7 @@ async def index_dexscreener_pairs(
                                 summary_content += f"Liquidity: ${liquidity_usd:,.2f}\n"
                                 summary_content += f"24h Volume: ${volume_24h:,.2f}\n"
                                 summary_content += f"24h Change: {price_change_24h:+.2f}%\n"
-                                summary_embedding = config.embedding_model_instance.embed(
+                                summary_embedding = await get_embedding_service().embed_text(
                                     summary_content
                                 )
 
@@ -348,15 +364,10 @@ async def index_dexscreener_pairs(
                                 updated_at=get_current_timestamp(),
                             )
 
-                            session.add(new_document)
+                            await writer.add(new_document)
                             documents_indexed += 1
                             logger.info(f"Created new document for pair {base_symbol}/{quote_symbol}")
 
-                        # Batch commit every N documents
-                        if documents_indexed % batch_size == 0:
-                            await session.commit()
-                            logger.info(f"Committed batch of {batch_size} documents")
-
                     except Exception as e:
                         logger.error(f"Error processing pair {pair.get('pairAddress', 'unknown')}: {e!s}", exc_info=True)
                         documents_skipped += 1
@@ -367,9 +378,9 @@ async def index_dexscreener_pairs(
                 continue
 
         # Final commit for any remaining documents
-        if documents_indexed % batch_size != 0:
-            await session.commit()
-            logger.info(f"Committed final batch of documents")
+        await writer.flush()
+        # Documents the writer could not insert were not indexed
+        documents_indexed -= writer.documents_failed
 
         # Update last_indexed_at timestamp
         if update_last_indexed:
@@ -384,6 +395,7 @@ async def index_dexscreener_pairs(
             {
                 "documents_indexed": documents_indexed,
                 "documents_skipped": documents_skipped,
+                "documents_failed": writer.documents_failed,
                 "tokens_processed": len(tokens),
             },
         )
@@ -392,7 +404,7 @@ async def index_dexscreener_pairs(
             f"DexScreener indexing completed: {documents_indexed} documents indexed, {documents_skipped} skipped"
         )
 
-        return documents_indexed, None
+        return documents_indexed, writer.failure_message
 
     except SQLAlchemyError as e:
         await session.rollback()
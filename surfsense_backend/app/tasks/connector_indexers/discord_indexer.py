@@ -11,6 +11,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.config import config
 from app.connectors.discord_connector import DiscordConnector
 from app.db import Document, DocumentType, SearchSourceConnectorType
+from app.services.embedding_service import get_embedding_service
 from app.services.task_logging_service import TaskLoggingService
 from app.utils.document_converters import (
     create_document_chunks,
@@ -19,16 +20,40 @@ from app.utils.document_converters import (
 )
 
 from .base import (
+    DocumentWriter,
     build_document_metadata_markdown,
-    check_document_by_unique_identifier,
-    check_duplicate_document_by_hash,
     get_connector_by_id,
     get_current_timestamp,
     logger,
+    prefetch_documents,
     update_connector_last_indexed,
 )
 
 
+def _build_message_document(
+    guild_name: str, guild_id: str, channel_name: str, channel_id: str, msg: dict
+) -> str:
+    """Build the document string of a formatted Discord message."""
+    metadata_sections = [
+        (
+            "METADATA",
+            [
+                f"GUILD_NAME: {guild_name}",
+                f"GUILD_ID: {guild_id}",
+                f"CHANNEL_NAME: {channel_name}",
+                f"CHANNEL_ID: {channel_id}",
+                f"MESSAGE_TIMESTAMP: {msg.get('created_at', 'Unknown Time')}",
+                f"MESSAGE_USER_NAME: {msg.get('author_name', 'Unknown User')}",
+            ],
+        ),
+        (
+            "CONTENT",
+            ["FORMAT: markdown", "TEXT_START", msg.get("content", ""), "TEXT_END"],
+        ),
+    ]
+    return build_document_metadata_markdown(metadata_sections)
+
+
 async def index_discord_messages(
     session: AsyncSession,
     connector_id: int,
@@ -279,6 +304,7 @@ async def index_discord_messages(
         # Track results
         documents_indexed = 0
         documents_skipped = 0
+        writer = DocumentWriter(session)
         skipped_channels: list[str] = []
 
         # Process each guild and channel
@@ -346,41 +372,38 @@ async def index_discord_messages(
                             documents_skipped += 1
                             continue
 
+                        message_documents = [
+                            _build_message_document(
+                                guild_name, guild_id, channel_name, channel_id, msg
+                            )
+                            for msg in formatted_messages
+                        ]
+
+                        # Look up the channel's existing documents with one query
+                        lookup = await prefetch_documents(
+                            session,
+                            [
+                                generate_unique_identifier_hash(
+                                    DocumentType.DISCORD_CONNECTOR,
+                                    f"{channel_id}_{msg.get('id', '')}",
+                                    search_space_id,
+                                )
+                                for msg in formatted_messages
+                            ],
+                            [
+                                generate_content_hash(document_string, search_space_id)
+                                for document_string in message_documents
+                            ],
+                            writer=writer,
+                        )
+
                         # Process each message as an individual document (like Slack)
-                        for msg in formatted_messages:
+                        for msg, combined_document_string in zip(
+                            formatted_messages, message_documents, strict=True
+                        ):
                             msg_id = msg.get("id", "")
                             msg_user_name = msg.get("author_name", "Unknown User")
                             msg_timestamp = msg.get("created_at", "Unknown Time")
-                            msg_text = msg.get("content", "")
-
-                            # Format document metadata (similar to Slack)
-                            metadata_sections = [
-                                (
-                                    "METADATA",
-                                    [
-                                        f"GUILD_NAME: {guild_name}",
-                                        f"GUILD_ID: {guild_id}",
-                                        f"CHANNEL_NAME: {channel_name}",
-                                        f"CHANNEL_ID: {channel_id}",
-                                        f"MESSAGE_TIMESTAMP: {msg_timestamp}",
-                                        f"MESSAGE_USER_NAME: {msg_user_name}",
-                                    ],
-                                ),
-                                (
-                                    "CONTENT",
-                                    [
-                                        "FORMAT: markdown",
-                                        "TEXT_START",
-                                        msg_text,
-                                        "TEXT_END",
-                                    ],
-                                ),
-                            ]
-
-                            # Build the document string
-                            combined_document_string = build_document_metadata_markdown(
-                                metadata_sections
-                            )
 
                             # Generate unique identifier hash for this Discord message
                             unique_identifier = f"{channel_id}_{msg_id}"
@@ -396,10 +419,8 @@ async def index_discord_messages(
                             )
 
                             # Check if document with this unique identifier already exists
-                            existing_document = (
-                                await check_document_by_unique_identifier(
-                                    session, unique_identifier_hash
-                                )
+                            existing_document = await lookup.get_by_unique_identifier(
+                                unique_identifier_hash, content_hash
                             )
 
                             if existing_document:
@@ -418,10 +439,10 @@ async def index_discord_messages(
 
                                     # Update chunks and embedding
                                     chunks = await create_document_chunks(
-                                        combined_document_string
+                                        combined_document_string, existing_document
                                     )
                                     doc_embedding = (
-                                        config.embedding_model_instance.embed(
+                                        await get_embedding_service().embed_text(
                                             combined_document_string
                                         )
                                     )
@@ -448,6 +469,7 @@ async def index_discord_messages(
                                     existing_document.updated_at = (
                                         get_current_timestamp()
                                     )
+                                    await writer.add(existing_document)
 
                                     documents_indexed += 1
                                     logger.info(
@@ -459,9 +481,7 @@ async def index_discord_messages(
                             # Check if a document with the same content_hash exists (from another connector)
                             with session.no_autoflush:
                                 duplicate_by_content = (
-                                    await check_duplicate_document_by_hash(
-                                        session, content_hash
-                                    )
+                                    await lookup.get_duplicate_by_hash(content_hash)
                                 )
 
                             if duplicate_by_content:
@@ -478,7 +498,7 @@ async def index_discord_messages(
                             chunks = await create_document_chunks(
                                 combined_document_string
                             )
-                            doc_embedding = config.embedding_model_instance.embed(
+                            doc_embedding = await get_embedding_service().embed_text(
                                 combined_document_string
                             )
 
@@ -507,16 +527,9 @@ async def index_discord_messages(
                                 updated_at=get_current_timestamp(),
                             )
 
-                            session.add(document)
+                            await writer.add(document)
                             documents_indexed += 1
 
-                            # Batch commit every 10 documents
-                            if documents_indexed % 10 == 0:
-                                logger.info(
-                                    f"Committing batch: {documents_indexed} Discord messages processed so far"
-                                )
-                                await session.commit()
-
                         logger.info(
                             f"Successfully indexed channel {guild_name}#{channel_name} with {len(formatted_messages)} messages"
                         )
@@ -539,7 +552,9 @@ async def index_discord_messages(
         logger.info(
             f"Final commit: Total {documents_indexed} Discord messages processed"
         )
-        await session.commit()
+        await writer.flush()
+        # Documents the writer could not insert were not indexed
+        documents_indexed -= writer.documents_failed
 
         # Prepare result message
         result_message = None
@@ -559,6 +574,7 @@ async def index_discord_messages(
                 "messages_processed": documents_indexed,
                 "documents_indexed": documents_indexed,
                 "documents_skipped": documents_skipped,
+                "documents_failed": writer.documents_failed,
                 "skipped_channels_count": len(skipped_channels),
                 "guilds_processed": len(guilds),
                 "result_message": result_message,
@@ -570,8 +586,8 @@ async def index_discord_messages(
         )
         return (
             documents_indexed,
-            None,
-        )  # Return None on success (result_message is for logging only)
+            writer.failure_message,
+        )  # result_message is for logging only; warn about unsaved documents
 
     except SQLAlchemyError as db_error:
         await session.rollback()
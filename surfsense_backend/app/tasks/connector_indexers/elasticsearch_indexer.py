@@ -4,6 +4,7 @@ Elasticsearch indexer for SurfSense
 
 import json
 import logging
+from collections.abc import AsyncIterator
 from datetime import UTC, datetime
 from typing import Any
 
@@ -20,9 +21,10 @@ from app.utils.document_converters import (
 )
 
 from .base import (
-    check_document_by_unique_identifier,
-    check_duplicate_document_by_hash,
+    DocumentWriter,
+    build_contents,
     get_current_timestamp,
+    prefetch_documents,
 )
 
 logger = logging.getLogger(__name__)
@@ -154,6 +156,7 @@ async def index_elasticsearch_documents(
         )
 
         documents_processed = 0
+        writer = DocumentWriter(session)
 
         try:
             await task_logger.log_task_progress(
@@ -166,147 +169,185 @@ async def index_elasticsearch_documents(
                 },
             )
             # Use scroll search for large result sets
-            async for hit in es_connector.scroll_search(
+            batch_size = min(max_documents, 100)
+            hits = es_connector.scroll_search(
                 index=index_name,
                 query=query,
-                size=min(max_documents, 100),  # Scroll in batches
+                size=batch_size,  # Scroll in batches
                 fields=config.get("ELASTICSEARCH_FIELDS"),
-            ):
+            )
+            async for batch in _batched(hits, batch_size):
                 if documents_processed >= max_documents:
                     break
 
-                try:
-                    # Extract document data
-                    doc_id = hit["_id"]
-                    source = hit.get("_source", {})
-
-                    # Build document title
-                    title_field = config.get("ELASTICSEARCH_TITLE_FIELD")
-                    if not title_field:
-                        for candidate in ("title", "name", "subject"):
-                            if candidate in source:
-                                title_field = candidate
-                                break
-                    title = (
-                        str(source.get(title_field, doc_id))
-                        if title_field is not None
-                        else str(doc_id)
-                    )
-
-                    # Build document content
-                    content = _build_document_content(source, config)
-
-                    if not content.strip():
-                        logger.warning(f"Skipping document {doc_id} - no content found")
-                        continue
+                # Look up the batch's existing documents with one query
+                contents = build_contents(
+                    batch,
+                    lambda hit: _build_document_content(hit.get("_source", {}), config),
+                )
+                lookup = await prefetch_documents(
+                    session,
+                    [
+                        generate_unique_identifier_hash(
+                            DocumentType.ELASTICSEARCH_CONNECTOR,
+                            f"{hit.get('_index', index_name)}:{hit['_id']}",
+                            search_space_id,
+                        )
+                        for hit in batch
+                    ],
+                    [
+                        generate_content_hash(content, search_space_id)
+                        for content in contents
+                        if content
+                    ],
+                    writer=writer,
+                )
 
-                    # Create content hash
-                    content_hash = generate_content_hash(content, search_space_id)
-
-                    # Build metadata
-                    metadata = {
-                        "elasticsearch_id": doc_id,
-                        "elasticsearch_index": hit.get("_index", index_name),
-                        "elasticsearch_score": hit.get("_score"),
-                        "indexed_at": datetime.now().isoformat(),
-                        "source": "ELASTICSEARCH_CONNECTOR",
-                    }
-
-                    # Add any additional metadata fields specified in config
-                    if "ELASTICSEARCH_METADATA_FIELDS" in config:
-                        for field in config["ELASTICSEARCH_METADATA_FIELDS"]:
-                            if field in source:
-                                metadata[f"es_{field}"] = source[field]
-
-                    # Build source-unique identifier and hash (prefer source id dedupe)
-                    source_identifier = f"{hit.get('_index', index_name)}:{doc_id}"
-                    unique_identifier_hash = generate_unique_identifier_hash(
-                        DocumentType.ELASTICSEARCH_CONNECTOR,
-                        source_identifier,
-                        search_space_id,
-                    )
-
-                    # Two-step duplicate detection: first by source-unique id, then by content hash
-                    existing_doc = await check_document_by_unique_identifier(
-                        session, unique_identifier_hash
-                    )
-                    if not existing_doc:
-                        existing_doc = await check_duplicate_document_by_hash(
-                            session, content_hash
+                for hit, content in zip(batch, contents, strict=True):
+                    if documents_processed >= max_documents:
+                        break
+
+                    try:
+                        # Extract document data
+                        doc_id = hit["_id"]
+                        source = hit.get("_source", {})
+
+                        # Build document title
+                        title_field = config.get("ELASTICSEARCH_TITLE_FIELD")
+                        if not title_field:
+                            for candidate in ("title", "name", "subject"):
+                                if candidate in source:
+                                    title_field = candidate
+                                    break
+                        title = (
+                            str(source.get(title_field, doc_id))
+                            if title_field is not None
+                            else str(doc_id)
                         )
 
-                    if existing_doc:
-                        # If content is unchanged, skip. Otherwise update the existing document.
-                        if existing_doc.content_hash == content_hash:
-                            logger.info(
-                                f"Skipping ES doc {doc_id} — already indexed (doc id {existing_doc.id})"
+                        # Build document content
+                        if content is None:
+                            content = _build_document_content(source, config)
+
+                        if not content.strip():
+                            logger.warning(
+                                f"Skipping document {doc_id} - no content found"
                             )
                             continue
-                        else:
+
+                        # Create content hash
+                        content_hash = generate_content_hash(content, search_space_id)
+
+                        # Build metadata
+                        metadata = {
+                            "elasticsearch_id": doc_id,
+                            "elasticsearch_index": hit.get("_index", index_name),
+                            "elasticsearch_score": hit.get("_score"),
+                            "indexed_at": datetime.now().isoformat(),
+                            "source": "ELASTICSEARCH_CONNECTOR",
+                        }
+
+                        # Add any additional metadata fields specified in config
+                        if "ELASTICSEARCH_METADATA_FIELDS" in config:
+                            for field in config["ELASTICSEARCH_METADATA_FIELDS"]:
+                                if field in source:
+                                    metadata[f"es_{field}"] = source[field]
+
+                        # Build source-unique identifier and hash (prefer source id dedupe)
+                        source_identifier = f"{hit.get('_index', index_name)}:{doc_id}"
+                        unique_identifier_hash = generate_unique_identifier_hash(
+                            DocumentType.ELASTICSEARCH_CONNECTOR,
+                            source_identifier,
+                            search_space_id,
+                        )
+
+                        # Two-step duplicate detection: first by source-unique id, then by content hash
+                        existing_doc = await lookup.get_by_unique_identifier(
+                            unique_identifier_hash, content_hash
+                        )
+                        if not existing_doc:
+                            existing_doc = await lookup.get_duplicate_by_hash(
+                                content_hash
+                            )
+
+                        if existing_doc:
+                            # If content is unchanged, skip. Otherwise update the existing document.
+                            if existing_doc.content_hash == content_hash:
+                                logger.info(
+                                    f"Skipping ES doc {doc_id} — already indexed (doc id {existing_doc.id})"
+                                )
+                                continue
+                            else:
+                                logger.info(
+                                    f"Updating existing document {existing_doc.id} for ES doc {doc_id}"
+                                )
+                                existing_doc.title = title
+                                existing_doc.content = content
+                                existing_doc.content_hash = content_hash
+                                existing_doc.document_metadata = metadata
+                                existing_doc.unique_identifier_hash = (
+                                    unique_identifier_hash
+                                )
+                                chunks = await create_document_chunks(
+                                    content, existing_doc
+                                )
+                                existing_doc.chunks = chunks
+                                existing_doc.updated_at = get_current_timestamp()
+                                await writer.add(existing_doc)
+                                documents_processed += 1
+                                continue
+
+                        # Create document
+                        document = Document(
+                            title=title,
+                            content=content,
+                            content_hash=content_hash,
+                            unique_identifier_hash=unique_identifier_hash,
+                            document_type=DocumentType.ELASTICSEARCH_CONNECTOR,
+                            document_metadata=metadata,
+                            search_space_id=search_space_id,
+                            updated_at=get_current_timestamp(),
+                        )
+
+                        # Create chunks and attach to document (written with it)
+                        chunks = await create_document_chunks(content)
+                        document.chunks = chunks
+                        await writer.add(document)
+
+                        documents_processed += 1
+
+                        if documents_processed % 10 == 0:
                             logger.info(
-                                f"Updating existing document {existing_doc.id} for ES doc {doc_id}"
+                                f"Processed {documents_processed} Elasticsearch documents"
                             )
-                            existing_doc.title = title
-                            existing_doc.content = content
-                            existing_doc.content_hash = content_hash
-                            existing_doc.document_metadata = metadata
-                            existing_doc.unique_identifier_hash = unique_identifier_hash
-                            chunks = await create_document_chunks(content)
-                            existing_doc.chunks = chunks
-                            existing_doc.updated_at = get_current_timestamp()
-                            await session.flush()
-                            documents_processed += 1
-                            if documents_processed % 10 == 0:
-                                await session.commit()
-                            continue
 
-                    # Create document
-                    document = Document(
-                        title=title,
-                        content=content,
-                        content_hash=content_hash,
-                        unique_identifier_hash=unique_identifier_hash,
-                        document_type=DocumentType.ELASTICSEARCH_CONNECTOR,
-                        document_metadata=metadata,
-                        search_space_id=search_space_id,
-                        updated_at=get_current_timestamp(),
-                    )
-
-                    # Create chunks and attach to document (persist via relationship)
-                    chunks = await create_document_chunks(content)
-                    document.chunks = chunks
-                    session.add(document)
-                    await session.flush()
-
-                    documents_processed += 1
-
-                    if documents_processed % 10 == 0:
-                        logger.info(
-                            f"Processed {documents_processed} Elasticsearch documents"
+                    except Exception as e:
+                        msg = f"Error processing Elasticsearch document {hit.get('_id', 'unknown')}: {e}"
+                        logger.error(msg)
+                        await task_logger.log_task_failure(
+                            log_entry,
+                            "Document processing error",
+                            msg,
+                            {
+                                "document_id": hit.get("_id", "unknown"),
+                                "error_type": type(e).__name__,
+                            },
                         )
-                        await session.commit()
-
-                except Exception as e:
-                    msg = f"Error processing Elasticsearch document {hit.get('_id', 'unknown')}: {e}"
-                    logger.error(msg)
-                    await task_logger.log_task_failure(
-                        log_entry,
-                        "Document processing error",
-                        msg,
-                        {
-                            "document_id": hit.get("_id", "unknown"),
-                            "error_type": type(e).__name__,
-                        },
-                    )
-                    continue
-
-            # Final commit
-            await session.commit()
+                        continue
+
+            # Final commit for any remaining documents not yet committed in batches
+            await writer.flush()
+            # Documents the writer could not insert were not indexed
+            documents_processed -= writer.documents_failed
 
             await task_logger.log_task_success(
                 log_entry,
                 f"Successfully indexed {documents_processed} documents from Elasticsearch",
-                {"documents_indexed": documents_processed, "index": index_name},
+                {
+                    "documents_indexed": documents_processed,
+                    "documents_failed": writer.documents_failed,
+                    "index": index_name,
+                },
             )
             logger.info(
                 f"Successfully indexed {documents_processed} documents from Elasticsearch"
@@ -325,7 +366,7 @@ async def index_elasticsearch_documents(
                     {"last_indexed_at": connector.last_indexed_at},
                 )
 
-            return documents_processed, None
+            return documents_processed, writer.failure_message
 
         finally:
             # Clean up Elasticsearch connection
@@ -402,3 +443,26 @@ def _build_document_content(source: dict[str, Any], config: dict[str, Any]) -> s
                 content_parts.append(f"{key}: {json.dumps(value)}")
 
     return "\n".join(content_parts)
+
+
+async def _batched(
+    hits: AsyncIterator[dict[str, Any]], size: int
+) -> AsyncIterator[list[dict[str, Any]]]:
+    """
+    Group scroll search hits into lists of up to size hits
+
+    Args:
+        hits: Hits from the scroll search
+        size: Number of hits per batch
+
+    Yields:
+        Lists of hits
+    """
+    batch: list[dict[str, Any]] = []
+    async for hit in hits:
+        batch.append(hit)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -12,6 +12,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.connectors.google_calendar_connector import GoogleCalendarConnector
 from app.db import Document, DocumentType, SearchSourceConnectorType
+from app.services.embedding_service import get_embedding_service
 from app.services.llm_service import get_user_long_context_llm
 from app.services.task_logging_service import TaskLoggingService
 from app.utils.document_converters import (
@@ -22,11 +23,12 @@ from app.utils.document_converters import (
 )
 
 from .base import (
-    check_document_by_unique_identifier,
-    check_duplicate_document_by_hash,
+    DocumentWriter,
+    build_contents,
     get_connector_by_id,
     get_current_timestamp,
     logger,
+    prefetch_documents,
     update_connector_last_indexed,
 )
 
@@ -298,7 +300,32 @@ async def index_google_calendar_events(
             0  # Track events skipped due to duplicate content_hash
         )
 
-        for event in events:
+        writer = DocumentWriter(session)
+
+        # Look up the existing documents for all events with one query
+        event_markdowns = build_contents(
+            events, calendar_client.format_event_to_markdown
+        )
+        lookup = await prefetch_documents(
+            session,
+            [
+                generate_unique_identifier_hash(
+                    DocumentType.GOOGLE_CALENDAR_CONNECTOR,
+                    event["id"],
+                    search_space_id,
+                )
+                for event in events
+                if event.get("id")
+            ],
+            [
+                generate_content_hash(event_markdown, search_space_id)
+                for event_markdown in event_markdowns
+                if event_markdown
+            ],
+            writer=writer,
+        )
+
+        for event, event_markdown in zip(events, event_markdowns, strict=True):
             try:
                 event_id = event.get("id")
                 event_summary = event.get("summary", "No Title")
@@ -310,7 +337,8 @@ async def index_google_calendar_events(
                     documents_skipped += 1
                     continue
 
-                event_markdown = calendar_client.format_event_to_markdown(event)
+                if event_markdown is None:
+                    event_markdown = calendar_client.format_event_to_markdown(event)
                 if not event_markdown.strip():
                     logger.warning(f"Skipping event with no content: {event_summary}")
                     skipped_events.append(f"{event_summary} (no content)")
@@ -333,8 +361,8 @@ async def index_google_calendar_events(
                 content_hash = generate_content_hash(event_markdown, search_space_id)
 
                 # Check if document with this unique identifier already exists
-                existing_document = await check_document_by_unique_identifier(
-                    session, unique_identifier_hash
+                existing_document = await lookup.get_by_unique_identifier(
+                    unique_identifier_hash, content_hash
                 )
 
                 if existing_document:
@@ -387,12 +415,16 @@ async def index_google_calendar_events(
                                 if len(description) > 1000:
                                     desc_preview += "..."
                                 summary_content += f"Description: {desc_preview}\n"
-                            summary_embedding = config.embedding_model_instance.embed(
-                                summary_content
+                            summary_embedding = (
+                                await get_embedding_service().embed_text(
+                                    summary_content
+                                )
                             )
 
                         # Process chunks
-                        chunks = await create_document_chunks(event_markdown)
+                        chunks = await create_document_chunks(
+                            event_markdown, existing_document
+                        )
 
                         # Update existing document
                         existing_document.title = f"Calendar Event - {event_summary}"
@@ -410,6 +442,7 @@ async def index_google_calendar_events(
                         }
                         existing_document.chunks = chunks
                         existing_document.updated_at = get_current_timestamp()
+                        await writer.add(existing_document)
 
                         documents_indexed += 1
                         logger.info(
@@ -420,8 +453,8 @@ async def index_google_calendar_events(
                 # Document doesn't exist by unique_identifier_hash
                 # Check if a document with the same content_hash exists (from another connector)
                 with session.no_autoflush:
-                    duplicate_by_content = await check_duplicate_document_by_hash(
-                        session, content_hash
+                    duplicate_by_content = await lookup.get_duplicate_by_hash(
+                        content_hash
                     )
 
                 if duplicate_by_content:
@@ -474,7 +507,7 @@ async def index_google_calendar_events(
                         if len(description) > 1000:
                             desc_preview += "..."
                         summary_content += f"Description: {desc_preview}\n"
-                    summary_embedding = config.embedding_model_instance.embed(
+                    summary_embedding = await get_embedding_service().embed_text(
                         summary_content
                     )
                 chunks = await create_document_chunks(event_markdown)
@@ -500,17 +533,10 @@ async def index_google_calendar_events(
                     updated_at=get_current_timestamp(),
                 )
 
-                session.add(document)
+                await writer.add(document)
                 documents_indexed += 1
                 logger.info(f"Successfully indexed new event {event_summary}")
 
-                # Batch commit every 10 documents
-                if documents_indexed % 10 == 0:
-                    logger.info(
-                        f"Committing batch: {documents_indexed} Google Calendar events processed so far"
-                    )
-                    await session.commit()
-
             except Exception as e:
                 logger.error(
                     f"Error processing event {event.get('summary', 'Unknown')}: {e!s}",
@@ -531,7 +557,7 @@ async def index_google_calendar_events(
             f"Final commit: Total {documents_indexed} Google Calendar events processed"
         )
         try:
-            await session.commit()
+            await writer.flush()
         except Exception as e:
             # Handle any remaining integrity errors gracefully (race conditions, etc.)
             if (
@@ -548,10 +574,17 @@ async def index_google_calendar_events(
             else:
                 raise
 
-        # Build warning message if duplicates were found
-        warning_message = None
+        # Documents the writer could not insert were not indexed
+        documents_indexed -= writer.documents_failed
+        total_processed -= writer.documents_failed
+
+        # Build warning message if duplicates were found or documents were dropped
+        warning_parts = []
         if duplicate_content_count > 0:
-            warning_message = f"{duplicate_content_count} skipped (duplicate)"
+            warning_parts.append(f"{duplicate_content_count} skipped (duplicate)")
+        if writer.failure_message:
+            warning_parts.append(writer.failure_message)
+        warning_message = "; ".join(warning_parts) or None
 
         await task_logger.log_task_success(
             log_entry,
@@ -560,6 +593,7 @@ async def index_google_calendar_events(
                 "events_processed": total_processed,
                 "documents_indexed": documents_indexed,
                 "documents_skipped": documents_skipped,
+                "documents_failed": writer.documents_failed,
                 "duplicate_content_count": duplicate_content_count,
                 "skipped_events_count": len(skipped_events),
             },
@@ -14,6 +14,7 @@ from app.db import (
     DocumentType,
     SearchSourceConnectorType,
 )
+from app.services.embedding_service import get_embedding_service
 from app.services.llm_service import get_user_long_context_llm
 from app.services.task_logging_service import TaskLoggingService
 from app.utils.document_converters import (
@@ -24,12 +25,13 @@ from app.utils.document_converters import (
 )
 
 from .base import (
+    DocumentWriter,
+    build_contents,
     calculate_date_range,
-    check_document_by_unique_identifier,
-    check_duplicate_document_by_hash,
     get_connector_by_id,
     get_current_timestamp,
     logger,
+    prefetch_documents,
     update_connector_last_indexed,
 )
 
@@ -212,7 +214,33 @@ async def index_google_gmail_messages(
         documents_indexed = 0
         skipped_messages = []
         documents_skipped = 0
-        for message in messages:
+
+        writer = DocumentWriter(session)
+
+        # Look up the existing documents for all messages with one query
+        message_markdowns = build_contents(
+            messages, gmail_connector.format_message_to_markdown
+        )
+        lookup = await prefetch_documents(
+            session,
+            [
+                generate_unique_identifier_hash(
+                    DocumentType.GOOGLE_GMAIL_CONNECTOR,
+                    message["id"],
+                    search_space_id,
+                )
+                for message in messages
+                if message.get("id")
+            ],
+            [
+                generate_content_hash(markdown_content, search_space_id)
+                for markdown_content in message_markdowns
+                if markdown_content
+            ],
+            writer=writer,
+        )
+
+        for message, markdown_content in zip(messages, message_markdowns, strict=True):
             try:
                 # Extract message information
                 message_id = message.get("id", "")
@@ -243,7 +271,10 @@ async def index_google_gmail_messages(
                     continue
 
                 # Format message to markdown
-                markdown_content = gmail_connector.format_message_to_markdown(message)
+                if markdown_content is None:
+                    markdown_content = gmail_connector.format_message_to_markdown(
+                        message
+                    )
 
                 if not markdown_content.strip():
                     logger.warning(f"Skipping message with no content: {subject}")
@@ -260,8 +291,8 @@ async def index_google_gmail_messages(
                 content_hash = generate_content_hash(markdown_content, search_space_id)
 
                 # Check if document with this unique identifier already exists
-                existing_document = await check_document_by_unique_identifier(
-                    session, unique_identifier_hash
+                existing_document = await lookup.get_by_unique_identifier(
+                    unique_identifier_hash, content_hash
                 )
 
                 if existing_document:
@@ -303,12 +334,16 @@ async def index_google_gmail_messages(
                             summary_content = f"Google Gmail Message: {subject}\n\n"
                             summary_content += f"Sender: {sender}\n"
                             summary_content += f"Date: {date_str}\n"
-                            summary_embedding = config.embedding_model_instance.embed(
-                                summary_content
+                            summary_embedding = (
+                                await get_embedding_service().embed_text(
+                                    summary_content
+                                )
                             )
 
                         # Process chunks
-                        chunks = await create_document_chunks(markdown_content)
+                        chunks = await create_document_chunks(
+                            markdown_content, existing_document
+                        )
 
                         # Update existing document
                         existing_document.title = f"Gmail: {subject}"
@@ -325,6 +360,7 @@ async def index_google_gmail_messages(
                         }
                         existing_document.chunks = chunks
                         existing_document.updated_at = get_current_timestamp()
+                        await writer.add(existing_document)
 
                         documents_indexed += 1
                         logger.info(f"Successfully updated Gmail message {subject}")
@@ -333,8 +369,8 @@ async def index_google_gmail_messages(
                 # Document doesn't exist by unique_identifier_hash
                 # Check if a document with the same content_hash exists (from another connector)
                 with session.no_autoflush:
-                    duplicate_by_content = await check_duplicate_document_by_hash(
-                        session, content_hash
+                    duplicate_by_content = await lookup.get_duplicate_by_hash(
+                        content_hash
                     )
 
                 if duplicate_by_content:
@@ -373,7 +409,7 @@ async def index_google_gmail_messages(
                     summary_content = f"Google Gmail Message: {subject}\n\n"
                     summary_content += f"Sender: {sender}\n"
                     summary_content += f"Date: {date_str}\n"
-                    summary_embedding = config.embedding_model_instance.embed(
+                    summary_embedding = await get_embedding_service().embed_text(
                         summary_content
                     )
 
@@ -401,17 +437,10 @@ async def index_google_gmail_messages(
                     chunks=chunks,
                     updated_at=get_current_timestamp(),
                 )
-                session.add(document)
+                await writer.add(document)
                 documents_indexed += 1
                 logger.info(f"Successfully indexed new email {summary_content}")
 
-                # Batch commit every 10 documents
-                if documents_indexed % 10 == 0:
-                    logger.info(
-                        f"Committing batch: {documents_indexed} Gmail messages processed so far"
-                    )
-                    await session.commit()
-
             except Exception as e:
                 logger.error(
                     f"Error processing the email {message_id}: {e!s}",
@@ -428,7 +457,10 @@ async def index_google_gmail_messages(
 
         # Final commit for any remaining documents not yet committed in batches
         logger.info(f"Final commit: Total {documents_indexed} Gmail messages processed")
-        await session.commit()
+        await writer.flush()
+        # Documents the writer could not insert were not indexed
+        documents_indexed -= writer.documents_failed
+        total_processed -= writer.documents_failed
         logger.info(
             "Successfully committed all Google gmail document changes to database"
         )
@@ -441,6 +473,7 @@ async def index_google_gmail_messages(
                 "events_processed": total_processed,
                 "documents_indexed": documents_indexed,
                 "documents_skipped": documents_skipped,
+                "documents_failed": writer.documents_failed,
                 "skipped_messages_count": len(skipped_messages),
             },
         )
@@ -450,8 +483,8 @@ async def index_google_gmail_messages(
         )
         return (
             total_processed,
-            None,
-        )  # Return None as the error message to indicate success
+            writer.failure_message,
+        )  # None on success, or a warning about documents that couldn't be saved
 
     except SQLAlchemyError as db_error:
         await session.rollback()
@@ -8,9 +8,9 @@ from datetime import datetime
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.config import config
 from app.connectors.jira_history import JiraHistoryConnector
 from app.db import Document, DocumentType, SearchSourceConnectorType
+from app.services.embedding_service import get_embedding_service
 from app.services.llm_service import get_user_long_context_llm
 from app.services.task_logging_service import TaskLoggingService
 from app.utils.document_converters import (
@@ -21,12 +21,13 @@ from app.utils.document_converters import (
 )
 
 from .base import (
+    DocumentWriter,
+    build_contents,
     calculate_date_range,
-    check_document_by_unique_identifier,
-    check_duplicate_document_by_hash,
     get_connector_by_id,
     get_current_timestamp,
     logger,
+    prefetch_documents,
     update_connector_last_indexed,
 )
 
@@ -169,7 +170,33 @@ async def index_jira_issues(
         skipped_issues = []
         documents_skipped = 0
 
-        for issue in issues:
+        writer = DocumentWriter(session)
+
+        # Look up the existing documents for all issues with one query
+        issue_contents = build_contents(
+            issues,
+            lambda issue: jira_client.format_issue_to_markdown(
+                jira_client.format_issue(issue)
+            ),
+        )
+        lookup = await prefetch_documents(
+            session,
+            [
+                generate_unique_identifier_hash(
+                    DocumentType.JIRA_CONNECTOR, issue["key"], search_space_id
+                )
+                for issue in issues
+                if issue.get("key")
+            ],
+            [
+                generate_content_hash(issue_content, search_space_id)
+                for issue_content in issue_contents
+                if issue_content
+            ],
+            writer=writer,
+        )
+
+        for issue, issue_content in zip(issues, issue_contents, strict=True):
             try:
                 issue_id = issue.get("key")
                 issue_identifier = issue.get("key", "")
@@ -189,7 +216,10 @@ async def index_jira_issues(
                 formatted_issue = jira_client.format_issue(issue)
 
                 # Convert to markdown
-                issue_content = jira_client.format_issue_to_markdown(formatted_issue)
+                if issue_content is None:
+                    issue_content = jira_client.format_issue_to_markdown(
+                        formatted_issue
+                    )
 
                 if not issue_content:
                     logger.warning(
@@ -208,8 +238,8 @@ async def index_jira_issues(
                 content_hash = generate_content_hash(issue_content, search_space_id)
 
                 # Check if document with this unique identifier already exists
-                existing_document = await check_document_by_unique_identifier(
-                    session, unique_identifier_hash
+                existing_document = await lookup.get_by_unique_identifier(
+                    unique_identifier_hash, content_hash
                 )
 
                 comment_count = len(formatted_issue.get("comments", []))
@@ -254,12 +284,16 @@ async def index_jira_issues(
                             if formatted_issue.get("description"):
                                 summary_content += f"Description: {formatted_issue.get('description')}\n\n"
                             summary_content += f"Comments: {comment_count}"
-                            summary_embedding = config.embedding_model_instance.embed(
-                                summary_content
+                            summary_embedding = (
+                                await get_embedding_service().embed_text(
+                                    summary_content
+                                )
                             )
 
                         # Process chunks
-                        chunks = await create_document_chunks(issue_content)
+                        chunks = await create_document_chunks(
+                            issue_content, existing_document
+                        )
 
                         # Update existing document
                         existing_document.title = (
@@ -278,6 +312,7 @@ async def index_jira_issues(
                         }
                         existing_document.chunks = chunks
                         existing_document.updated_at = get_current_timestamp()
+                        await writer.add(existing_document)
 
                         documents_indexed += 1
                         logger.info(
@@ -288,8 +323,8 @@ async def index_jira_issues(
                 # Document doesn't exist by unique_identifier_hash
                 # Check if a document with the same content_hash exists (from another connector)
                 with session.no_autoflush:
-                    duplicate_by_content = await check_duplicate_document_by_hash(
-                        session, content_hash
+                    duplicate_by_content = await lookup.get_duplicate_by_hash(
+                        content_hash
                     )
 
                 if duplicate_by_content:
@@ -331,7 +366,7 @@ async def index_jira_issues(
                             f"Description: {formatted_issue.get('description')}\n\n"
                         )
                     summary_content += f"Comments: {comment_count}"
-                    summary_embedding = config.embedding_model_instance.embed(
+                    summary_embedding = await get_embedding_service().embed_text(
                         summary_content
                     )
 
@@ -362,19 +397,12 @@ async def index_jira_issues(
                     updated_at=get_current_timestamp(),
                 )
 
-                session.add(document)
+                await writer.add(document)
                 documents_indexed += 1
                 logger.info(
                     f"Successfully indexed new issue {issue_identifier} - {issue_title}"
                 )
 
-                # Batch commit every 10 documents
-                if documents_indexed % 10 == 0:
-                    logger.info(
-                        f"Committing batch: {documents_indexed} Jira issues processed so far"
-                    )
-                    await session.commit()
-
             except Exception as e:
                 logger.error(
                     f"Error processing issue {issue.get('identifier', 'Unknown')}: {e!s}",
@@ -393,7 +421,10 @@ async def index_jira_issues(
 
         # Final commit for any remaining documents not yet committed in batches
         logger.info(f"Final commit: Total {documents_indexed} Jira issues processed")
-        await session.commit()
+        await writer.flush()
+        # Documents the writer could not insert were not indexed
+        documents_indexed -= writer.documents_failed
+        total_processed -= writer.documents_failed
         logger.info("Successfully committed all JIRA document changes to database")
 
         # Log success
@@ -404,6 +435,7 @@ async def index_jira_issues(
                 "issues_processed": total_processed,
                 "documents_indexed": documents_indexed,
                 "documents_skipped": documents_skipped,
+                "documents_failed": writer.documents_failed,
                 "skipped_issues_count": len(skipped_issues),
             },
         )
@@ -417,8 +449,8 @@ async def index_jira_issues(
 
         return (
             total_processed,
-            None,
-        )  # Return None as the error message to indicate success
+            writer.failure_message,
+        )  # None on success, or a warning about documents that couldn't be saved
 
     except SQLAlchemyError as db_error:
         await session.rollback()
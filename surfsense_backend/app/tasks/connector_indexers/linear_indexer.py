@@ -7,9 +7,9 @@ from datetime import datetime
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.config import config
 from app.connectors.linear_connector import LinearConnector
 from app.db import Document, DocumentType, SearchSourceConnectorType
+from app.services.embedding_service import get_embedding_service
 from app.services.llm_service import get_user_long_context_llm
 from app.services.task_logging_service import TaskLoggingService
 from app.utils.document_converters import (
@@ -20,12 +20,13 @@ from app.utils.document_converters import (
 )
 
 from .base import (
+    DocumentWriter,
+    build_contents,
     calculate_date_range,
-    check_document_by_unique_identifier,
-    check_duplicate_document_by_hash,
     get_connector_by_id,
     get_current_timestamp,
     logger,
+    prefetch_documents,
     update_connector_last_indexed,
 )
 
@@ -194,8 +195,34 @@ async def index_linear_issues(
             {"stage": "process_issues", "total_issues": len(issues)},
         )
 
+        writer = DocumentWriter(session)
+
+        # Look up the existing documents for all issues with one query
+        issue_contents = build_contents(
+            issues,
+            lambda issue: linear_client.format_issue_to_markdown(
+                linear_client.format_issue(issue)
+            ),
+        )
+        lookup = await prefetch_documents(
+            session,
+            [
+                generate_unique_identifier_hash(
+                    DocumentType.LINEAR_CONNECTOR, issue["id"], search_space_id
+                )
+                for issue in issues
+                if issue.get("id")
+            ],
+            [
+                generate_content_hash(issue_content, search_space_id)
+                for issue_content in issue_contents
+                if issue_content
+            ],
+            writer=writer,
+        )
+
         # Process each issue
-        for issue in issues:
+        for issue, issue_content in zip(issues, issue_contents, strict=True):
             try:
                 issue_id = issue.get("id", "")
                 issue_identifier = issue.get("identifier", "")
@@ -215,7 +242,10 @@ async def index_linear_issues(
                 formatted_issue = linear_client.format_issue(issue)
 
                 # Convert issue to markdown format
-                issue_content = linear_client.format_issue_to_markdown(formatted_issue)
+                if issue_content is None:
+                    issue_content = linear_client.format_issue_to_markdown(
+                        formatted_issue
+                    )
 
                 if not issue_content:
                     logger.warning(
@@ -234,8 +264,8 @@ async def index_linear_issues(
                 content_hash = generate_content_hash(issue_content, search_space_id)
 
                 # Check if document with this unique identifier already exists
-                existing_document = await check_document_by_unique_identifier(
-                    session, unique_identifier_hash
+                existing_document = await lookup.get_by_unique_identifier(
+                    unique_identifier_hash, content_hash
                 )
 
                 state = formatted_issue.get("state", "Unknown")
@@ -285,12 +315,16 @@ async def index_linear_issues(
                             if description:
                                 summary_content += f"Description: {description}\n\n"
                             summary_content += f"Comments: {comment_count}"
-                            summary_embedding = config.embedding_model_instance.embed(
-                                summary_content
+                            summary_embedding = (
+                                await get_embedding_service().embed_text(
+                                    summary_content
+                                )
                             )
 
                         # Process chunks
-                        chunks = await create_document_chunks(issue_content)
+                        chunks = await create_document_chunks(
+                            issue_content, existing_document
+                        )
 
                         # Update existing document
                         existing_document.title = (
@@ -309,6 +343,7 @@ async def index_linear_issues(
                         }
                         existing_document.chunks = chunks
                         existing_document.updated_at = get_current_timestamp()
+                        await writer.add(existing_document)
 
                         documents_indexed += 1
                         logger.info(
@@ -319,8 +354,8 @@ async def index_linear_issues(
                 # Document doesn't exist by unique_identifier_hash
                 # Check if a document with the same content_hash exists (from another connector)
                 with session.no_autoflush:
-                    duplicate_by_content = await check_duplicate_document_by_hash(
-                        session, content_hash
+                    duplicate_by_content = await lookup.get_duplicate_by_hash(
+                        content_hash
                     )
 
                 if duplicate_by_content:
@@ -363,7 +398,7 @@ async def index_linear_issues(
                     if description:
                         summary_content += f"Description: {description}\n\n"
                     summary_content += f"Comments: {comment_count}"
-                    summary_embedding = config.embedding_model_instance.embed(
+                    summary_embedding = await get_embedding_service().embed_text(
                         summary_content
                     )
 
@@ -394,19 +429,12 @@ async def index_linear_issues(
                     updated_at=get_current_timestamp(),
                 )
 
-                session.add(document)
+                await writer.add(document)
                 documents_indexed += 1
                 logger.info(
                     f"Successfully indexed new issue {issue_identifier} - {issue_title}"
                 )
 
-                # Batch commit every 10 documents
-                if documents_indexed % 10 == 0:
-                    logger.info(
-                        f"Committing batch: {documents_indexed} Linear issues processed so far"
-                    )
-                    await session.commit()
-
             except Exception as e:
                 logger.error(
                     f"Error processing issue {issue.get('identifier', 'Unknown')}: {e!s}",
@@ -425,7 +453,10 @@ async def index_linear_issues(
 
         # Final commit for any remaining documents not yet committed in batches
         logger.info(f"Final commit: Total {documents_indexed} Linear issues processed")
-        await session.commit()
+        await writer.flush()
+        # Documents the writer could not insert were not indexed
+        documents_indexed -= writer.documents_failed
+        total_processed -= writer.documents_failed
         logger.info("Successfully committed all Linear document changes to database")
 
         # Log success
@@ -436,6 +467,7 @@ async def index_linear_issues(
                 "issues_processed": total_processed,
                 "documents_indexed": documents_indexed,
                 "documents_skipped": documents_skipped,
+                "documents_failed": writer.documents_failed,
                 "skipped_issues_count": len(skipped_issues),
             },
         )
@@ -445,8 +477,8 @@ async def index_linear_issues(
         )
         return (
             total_processed,
-            None,
-        )  # Return None as the error message to indicate success
+            writer.failure_message,
+        )  # None on success, or a warning about documents that couldn't be saved
 
     except SQLAlchemyError as db_error:
         await session.rollback()
@@ -7,9 +7,9 @@ from datetime import datetime, timedelta
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.config import config
 from app.connectors.luma_connector import LumaConnector
 from app.db import Document, DocumentType, SearchSourceConnectorType
+from app.services.embedding_service import get_embedding_service
 from app.services.llm_service import get_user_long_context_llm
 from app.services.task_logging_service import TaskLoggingService
 from app.utils.document_converters import (
@@ -20,11 +20,12 @@ from app.utils.document_converters import (
 )
 
 from .base import (
-    check_document_by_unique_identifier,
-    check_duplicate_document_by_hash,
+    DocumentWriter,
+    build_contents,
     get_connector_by_id,
     get_current_timestamp,
     logger,
+    prefetch_documents,
     update_connector_last_indexed,
 )
 
@@ -221,7 +222,28 @@ async def index_luma_events(
         documents_skipped = 0
         skipped_events = []
 
-        for event in events:
+        writer = DocumentWriter(session)
+
+        # Look up the existing documents for all events with one query
+        event_markdowns = build_contents(events, luma_client.format_event_to_markdown)
+        lookup = await prefetch_documents(
+            session,
+            [
+                generate_unique_identifier_hash(
+                    DocumentType.LUMA_CONNECTOR, event_id, search_space_id
+                )
+                for event in events
+                if (event_id := event.get("api_id") or event.get("event", {}).get("id"))
+            ],
+            [
+                generate_content_hash(event_markdown, search_space_id)
+                for event_markdown in event_markdowns
+                if event_markdown
+            ],
+            writer=writer,
+        )
+
+        for event, event_markdown in zip(events, event_markdowns, strict=True):
             try:
                 # Luma event structure fields - events have nested 'event' field
                 event_data = event.get("event", {})
@@ -236,7 +258,8 @@ async def index_luma_events(
                     continue
 
                 # Format event to markdown using Luma connector's method
-                event_markdown = luma_client.format_event_to_markdown(event)
+                if event_markdown is None:
+                    event_markdown = luma_client.format_event_to_markdown(event)
                 if not event_markdown.strip():
                     logger.warning(f"Skipping event with no content: {event_name}")
                     skipped_events.append(f"{event_name} (no content)")
@@ -271,8 +294,8 @@ async def index_luma_events(
                 content_hash = generate_content_hash(event_markdown, search_space_id)
 
                 # Check if document with this unique identifier already exists
-                existing_document = await check_document_by_unique_identifier(
-                    session, unique_identifier_hash
+                existing_document = await lookup.get_by_unique_identifier(
+                    unique_identifier_hash, content_hash
                 )
 
                 if existing_document:
@@ -333,12 +356,16 @@ async def index_luma_events(
                                 if len(description) > 1000:
                                     desc_preview += "..."
                                 summary_content += f"Description: {desc_preview}\n"
-                            summary_embedding = config.embedding_model_instance.embed(
-                                summary_content
+                            summary_embedding = (
+                                await get_embedding_service().embed_text(
+                                    summary_content
+                                )
                             )
 
                         # Process chunks
-                        chunks = await create_document_chunks(event_markdown)
+                        chunks = await create_document_chunks(
+                            event_markdown, existing_document
+                        )
 
                         # Update existing document
                         existing_document.title = f"Luma Event - {event_name}"
@@ -359,6 +386,7 @@ async def index_luma_events(
                         }
                         existing_document.chunks = chunks
                         existing_document.updated_at = get_current_timestamp()
+                        await writer.add(existing_document)
 
                         documents_indexed += 1
                         logger.info(f"Successfully updated Luma event {event_name}")
@@ -367,8 +395,8 @@ async def index_luma_events(
                 # Document doesn't exist by unique_identifier_hash
                 # Check if a document with the same content_hash exists (from another connector)
                 with session.no_autoflush:
-                    duplicate_by_content = await check_duplicate_document_by_hash(
-                        session, content_hash
+                    duplicate_by_content = await lookup.get_duplicate_by_hash(
+                        content_hash
                     )
 
                 if duplicate_by_content:
@@ -427,7 +455,7 @@ async def index_luma_events(
                             desc_preview += "..."
                         summary_content += f"Description: {desc_preview}\n"
 
-                    summary_embedding = config.embedding_model_instance.embed(
+                    summary_embedding = await get_embedding_service().embed_text(
                         summary_content
                     )
 
@@ -458,17 +486,10 @@ async def index_luma_events(
                     updated_at=get_current_timestamp(),
                 )
 
-                session.add(document)
+                await writer.add(document)
                 documents_indexed += 1
                 logger.info(f"Successfully indexed new event {event_name}")
 
-                # Batch commit every 10 documents
-                if documents_indexed % 10 == 0:
-                    logger.info(
-                        f"Committing batch: {documents_indexed} Luma events processed so far"
-                    )
-                    await session.commit()
-
             except Exception as e:
                 logger.error(
                     f"Error processing event {event.get('name', 'Unknown')}: {e!s}",
@@ -486,7 +507,10 @@ async def index_luma_events(
 
         # Final commit for any remaining documents not yet committed in batches
         logger.info(f"Final commit: Total {documents_indexed} Luma events processed")
-        await session.commit()
+        await writer.flush()
+        # Documents the writer could not insert were not indexed
+        documents_indexed -= writer.documents_failed
+        total_processed -= writer.documents_failed
 
         await task_logger.log_task_success(
             log_entry,
@@ -495,6 +519,7 @@ async def index_luma_events(
                 "events_processed": total_processed,
                 "documents_indexed": documents_indexed,
                 "documents_skipped": documents_skipped,
+                "documents_failed": writer.documents_failed,
                 "skipped_events_count": len(skipped_events),
             },
         )
@@ -502,7 +527,7 @@ async def index_luma_events(
         logger.info(
             f"Luma indexing completed: {documents_indexed} new events, {documents_skipped} skipped"
         )
-        return total_processed, None
+        return total_processed, writer.failure_message
 
     except SQLAlchemyError as db_error:
         await session.rollback()
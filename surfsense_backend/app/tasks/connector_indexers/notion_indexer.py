@@ -20,13 +20,14 @@ from app.utils.document_converters import (
 )
 
 from .base import (
+    DocumentWriter,
+    build_contents,
     build_document_metadata_string,
     calculate_date_range,
-    check_document_by_unique_identifier,
-    check_duplicate_document_by_hash,
     get_connector_by_id,
     get_current_timestamp,
     logger,
+    prefetch_documents,
     update_connector_last_indexed,
 )
 
@@ -35,6 +36,86 @@ from .base import (
 RetryCallbackType = Callable[[str, int, int, float], Awaitable[None]]
 
 
+def _process_blocks(blocks: list[dict], level: int = 0) -> str:
+    """Convert Notion blocks, and their children recursively, to markdown."""
+    result = ""
+    for block in blocks:
+        block_type = block.get("type")
+        block_content = block.get("content", "")
+        children = block.get("children", [])
+
+        # Add indentation based on level
+        indent = "  " * level
+
+        # Format based on block type
+        if block_type in ["paragraph", "text"]:
+            result += f"{indent}{block_content}\n\n"
+        elif block_type in ["heading_1", "header"]:
+            result += f"{indent}# {block_content}\n\n"
+        elif block_type == "heading_2":
+            result += f"{indent}## {block_content}\n\n"
+        elif block_type == "heading_3":
+            result += f"{indent}### {block_content}\n\n"
+        elif block_type == "bulleted_list_item":
+            result += f"{indent}* {block_content}\n"
+        elif block_type == "numbered_list_item":
+            result += f"{indent}1. {block_content}\n"
+        elif block_type == "to_do":
+            result += f"{indent}- [ ] {block_content}\n"
+        elif block_type == "toggle":
+            result += f"{indent}> {block_content}\n"
+        elif block_type == "code":
+            result += f"{indent}```\n{block_content}\n```\n\n"
+        elif block_type == "quote":
+            result += f"{indent}> {block_content}\n\n"
+        elif block_type == "callout":
+            result += f"{indent}> **Note:** {block_content}\n\n"
+        elif block_type == "image":
+            result += f"{indent}![Image]({block_content})\n\n"
+        else:
+            # Default for other block types
+            if block_content:
+                result += f"{indent}{block_content}\n\n"
+
+        # Process children recursively
+        if children:
+            result += _process_blocks(children, level + 1)
+
+    return result
+
+
+def _page_title(page: dict) -> str:
+    """Title of a Notion page, falling back to its ID."""
+    return page.get("title", f"Untitled page ({page.get('page_id')})")
+
+
+def _page_to_markdown(page: dict) -> str:
+    """Convert a Notion page's blocks to markdown."""
+    return f"# Notion Page: {_page_title(page)}\n\n" + _process_blocks(
+        page.get("content", [])
+    )
+
+
+def _build_page_document(page: dict, markdown_content: str) -> str:
+    """Build the document string of a Notion page."""
+    metadata_sections = [
+        (
+            "METADATA",
+            [f"PAGE_TITLE: {_page_title(page)}", f"PAGE_ID: {page.get('page_id')}"],
+        ),
+        (
+            "CONTENT",
+            [
+                "FORMAT: markdown",
+                "TEXT_START",
+                markdown_content,
+                "TEXT_END",
+            ],
+        ),
+    ]
+    return build_document_metadata_string(metadata_sections)
+
+
 async def index_notion_pages(
     session: AsyncSession,
     connector_id: int,
@@ -217,11 +298,33 @@ async def index_notion_pages(
             {"stage": "process_pages", "total_pages": len(pages)},
         )
 
+        writer = DocumentWriter(session)
+
+        # Look up the existing documents for all pages with one query
+        page_markdowns = build_contents(pages, _page_to_markdown)
+        lookup = await prefetch_documents(
+            session,
+            [
+                generate_unique_identifier_hash(
+                    DocumentType.NOTION_CONNECTOR, page.get("page_id"), search_space_id
+                )
+                for page in pages
+            ],
+            [
+                generate_content_hash(
+                    _build_page_document(page, markdown_content), search_space_id
+                )
+                for page, markdown_content in zip(pages, page_markdowns, strict=True)
+                if markdown_content is not None
+            ],
+            writer=writer,
+        )
+
         # Process each page
-        for page in pages:
+        for page, markdown_content in zip(pages, page_markdowns, strict=True):
             try:
                 page_id = page.get("page_id")
-                page_title = page.get("title", f"Untitled page ({page_id})")
+                page_title = _page_title(page)
                 page_content = page.get("content", [])
 
                 logger.info(f"Processing Notion page: {page_title} ({page_id})")
@@ -233,78 +336,9 @@ async def index_notion_pages(
                     continue
 
                 # Convert page content to markdown format
-                markdown_content = f"# Notion Page: {page_title}\n\n"
-
-                # Process blocks recursively
-                def process_blocks(blocks, level=0):
-                    result = ""
-                    for block in blocks:
-                        block_type = block.get("type")
-                        block_content = block.get("content", "")
-                        children = block.get("children", [])
-
-                        # Add indentation based on level
-                        indent = "  " * level
-
-                        # Format based on block type
-                        if block_type in ["paragraph", "text"]:
-                            result += f"{indent}{block_content}\n\n"
-                        elif block_type in ["heading_1", "header"]:
-                            result += f"{indent}# {block_content}\n\n"
-                        elif block_type == "heading_2":
-                            result += f"{indent}## {block_content}\n\n"
-                        elif block_type == "heading_3":
-                            result += f"{indent}### {block_content}\n\n"
-                        elif block_type == "bulleted_list_item":
-                            result += f"{indent}* {block_content}\n"
-                        elif block_type == "numbered_list_item":
-                            result += f"{indent}1. {block_content}\n"
-                        elif block_type == "to_do":
-                            result += f"{indent}- [ ] {block_content}\n"
-                        elif block_type == "toggle":
-                            result += f"{indent}> {block_content}\n"
-                        elif block_type == "code":
-                            result += f"{indent}```\n{block_content}\n```\n\n"
-                        elif block_type == "quote":
-                            result += f"{indent}> {block_content}\n\n"
-                        elif block_type == "callout":
-                            result += f"{indent}> **Note:** {block_content}\n\n"
-                        elif block_type == "image":
-                            result += f"{indent}![Image]({block_content})\n\n"
-                        else:
-                            # Default for other block types
-                            if block_content:
-                                result += f"{indent}{block_content}\n\n"
-
-                        # Process children recursively
-                        if children:
-                            result += process_blocks(children, level + 1)
-
-                    return result
-
-                logger.debug(
-                    f"Converting {len(page_content)} blocks to markdown for page {page_title}"
-                )
-                markdown_content += process_blocks(page_content)
-
-                # Format document metadata
-                metadata_sections = [
-                    ("METADATA", [f"PAGE_TITLE: {page_title}", f"PAGE_ID: {page_id}"]),
-                    (
-                        "CONTENT",
-                        [
-                            "FORMAT: markdown",
-                            "TEXT_START",
-                            markdown_content,
-                            "TEXT_END",
-                        ],
-                    ),
-                ]
-
-                # Build the document string
-                combined_document_string = build_document_metadata_string(
-                    metadata_sections
-                )
+                if markdown_content is None:
+                    markdown_content = _page_to_markdown(page)
+                combined_document_string = _build_page_document(page, markdown_content)
 
                 # Generate unique identifier hash for this Notion page
                 unique_identifier_hash = generate_unique_identifier_hash(
@@ -317,8 +351,8 @@ async def index_notion_pages(
                 )
 
                 # Check if document with this unique identifier already exists
-                existing_document = await check_document_by_unique_identifier(
-                    session, unique_identifier_hash
+                existing_document = await lookup.get_by_unique_identifier(
+                    unique_identifier_hash, content_hash
                 )
 
                 if existing_document:
@@ -362,7 +396,9 @@ async def index_notion_pages(
                         )
 
                         # Process chunks
-                        chunks = await create_document_chunks(markdown_content)
+                        chunks = await create_document_chunks(
+                            markdown_content, existing_document
+                        )
 
                         # Update existing document
                         existing_document.title = f"Notion - {page_title}"
@@ -376,24 +412,18 @@ async def index_notion_pages(
                         }
                         existing_document.chunks = chunks
                         existing_document.updated_at = get_current_timestamp()
+                        await writer.add(existing_document)
 
                         documents_indexed += 1
                         logger.info(f"Successfully updated Notion page: {page_title}")
 
-                        # Batch commit every 10 documents
-                        if documents_indexed % 10 == 0:
-                            logger.info(
-                                f"Committing batch: {documents_indexed} documents processed so far"
-                            )
-                            await session.commit()
-
                         continue
 
                 # Document doesn't exist by unique_identifier_hash
                 # Check if a document with the same content_hash exists (from another connector)
                 with session.no_autoflush:
-                    duplicate_by_content = await check_duplicate_document_by_hash(
-                        session, content_hash
+                    duplicate_by_content = await lookup.get_duplicate_by_hash(
+                        content_hash
                     )
 
                 if duplicate_by_content:
@@ -450,17 +480,10 @@ async def index_notion_pages(
                     updated_at=get_current_timestamp(),
                 )
 
-                session.add(document)
+                await writer.add(document)
                 documents_indexed += 1
                 logger.info(f"Successfully indexed new Notion page: {page_title}")
 
-                # Batch commit every 10 documents
-                if documents_indexed % 10 == 0:
-                    logger.info(
-                        f"Committing batch: {documents_indexed} documents processed so far"
-                    )
-                    await session.commit()
-
             except Exception as e:
                 logger.error(
                     f"Error processing Notion page {page.get('title', 'Unknown')}: {e!s}",
@@ -480,7 +503,10 @@ async def index_notion_pages(
 
         # Final commit for any remaining documents not yet committed in batches
         logger.info(f"Final commit: Total {documents_indexed} documents processed")
-        await session.commit()
+        await writer.flush()
+        # Documents the writer could not insert were not indexed
+        documents_indexed -= writer.documents_failed
+        total_processed -= writer.documents_failed
 
         # Get final count of pages with skipped Notion AI content
         pages_with_skipped_ai_content = notion_client.get_skipped_content_count()
@@ -507,6 +533,7 @@ async def index_notion_pages(
                 "pages_processed": total_processed,
                 "documents_indexed": documents_indexed,
                 "documents_skipped": documents_skipped,
+                "documents_failed": writer.documents_failed,
                 "skipped_pages_count": len(skipped_pages),
                 "pages_with_skipped_ai_content": pages_with_skipped_ai_content,
                 "result_message": result_message,
@@ -534,6 +561,9 @@ async def index_notion_pages(
                 "Using legacy token. Reconnect with OAuth for better reliability."
             )
 
+        if writer.failure_message:
+            notification_parts.append(writer.failure_message)
+
         user_notification_message = (
             " ".join(notification_parts) if notification_parts else None
         )
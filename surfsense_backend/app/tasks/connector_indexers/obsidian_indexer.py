@@ -16,6 +16,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import config
 from app.db import Document, DocumentType, SearchSourceConnectorType
+from app.services.embedding_service import get_embedding_service
 from app.services.llm_service import get_user_long_context_llm
 from app.services.task_logging_service import TaskLoggingService
 from app.utils.document_converters import (
@@ -26,12 +27,13 @@ from app.utils.document_converters import (
 )
 
 from .base import (
+    DocumentWriter,
+    build_contents,
     build_document_metadata_string,
-    check_document_by_unique_identifier,
-    check_duplicate_document_by_hash,
     get_connector_by_id,
     get_current_timestamp,
     logger,
+    prefetch_documents,
     update_connector_last_indexed,
 )
 
@@ -144,6 +146,20 @@ def scan_vault(
     return files
 
 
+def read_note(file_info: dict) -> str:
+    """
+    Read the content of a note found by scan_vault.
+
+    Args:
+        file_info: File info dict from scan_vault
+
+    Returns:
+        The note's markdown content
+    """
+    with open(file_info["path"], encoding="utf-8") as f:
+        return f.read()
+
+
 async def index_obsidian_vault(
     session: AsyncSession,
     connector_id: int,
@@ -305,15 +321,37 @@ async def index_obsidian_vault(
         indexed_count = 0
         skipped_count = 0
 
-        for file_info in files:
+        writer = DocumentWriter(session)
+
+        # Look up the existing documents for all notes with one query
+        note_contents = build_contents(files, read_note)
+        lookup = await prefetch_documents(
+            session,
+            [
+                generate_unique_identifier_hash(
+                    DocumentType.OBSIDIAN_CONNECTOR,
+                    f"{vault_name}:{file_info['relative_path']}",
+                    search_space_id,
+                )
+                for file_info in files
+            ],
+            [
+                generate_content_hash(content, search_space_id)
+                for content in note_contents
+                if content
+            ],
+            writer=writer,
+        )
+
+        for file_info, content in zip(files, note_contents, strict=True):
             try:
                 file_path = file_info["path"]
                 relative_path = file_info["relative_path"]
 
                 # Read file content
                 try:
-                    with open(file_path, encoding="utf-8") as f:
-                        content = f.read()
+                    if content is None:
+                        content = read_note(file_info)
                 except UnicodeDecodeError:
                     logger.warning(f"Could not decode file {file_path}, skipping")
                     skipped_count += 1
@@ -348,14 +386,14 @@ async def index_obsidian_vault(
                     search_space_id,
                 )
 
-                # Check for existing document
-                existing_document = await check_document_by_unique_identifier(
-                    session, unique_identifier_hash
-                )
-
                 # Generate content hash
                 content_hash = generate_content_hash(content, search_space_id)
 
+                # Check for existing document
+                existing_document = await lookup.get_by_unique_identifier(
+                    unique_identifier_hash, content_hash
+                )
+
                 # Build metadata
                 document_metadata = {
                     "vault_name": vault_name,
@@ -416,13 +454,18 @@ async def index_obsidian_vault(
                     existing_document.updated_at = get_current_timestamp()
 
                     # Update embedding
-                    embedding = config.embedding_model_instance.embed(document_string)
+                    embedding = await get_embedding_service().embed_text(
+                        document_string
+                    )
                     existing_document.embedding = embedding
 
-                    # Update chunks - delete old and create new
-                    existing_document.chunks.clear()
-                    new_chunks = await create_document_chunks(document_string)
+                    # Update chunks - unchanged chunks are reused and the
+                    # delete-orphan cascade removes the ones that disappeared
+                    new_chunks = await create_document_chunks(
+                        document_string, existing_document
+                    )
                     existing_document.chunks = new_chunks
+                    await writer.add(existing_document)
 
                     indexed_count += 1
 
@@ -430,8 +473,8 @@ async def index_obsidian_vault(
                     # Document doesn't exist by unique_identifier_hash
                     # Check if a document with the same content_hash exists (from another connector)
                     with session.no_autoflush:
-                        duplicate_by_content = await check_duplicate_document_by_hash(
-                            session, content_hash
+                        duplicate_by_content = await lookup.get_duplicate_by_hash(
+                            content_hash
                         )
 
                     if duplicate_by_content:
@@ -456,7 +499,9 @@ async def index_obsidian_vault(
                         )
 
                     # Generate embedding
-                    embedding = config.embedding_model_instance.embed(document_string)
+                    embedding = await get_embedding_service().embed_text(
+                        document_string
+                    )
 
                     # Add URL and summary to metadata
                     document_metadata["url"] = (
@@ -482,7 +527,7 @@ async def index_obsidian_vault(
                         updated_at=get_current_timestamp(),
                     )
 
-                    session.add(new_document)
+                    await writer.add(new_document)
 
                     indexed_count += 1
 
@@ -496,8 +541,10 @@ async def index_obsidian_vault(
         # Update connector's last indexed timestamp
         await update_connector_last_indexed(session, connector, update_last_indexed)
 
-        # Commit all changes
-        await session.commit()
+        # Commit the remaining batch along with the connector update
+        await writer.flush()
+        # Documents the writer could not insert were not indexed
+        indexed_count -= writer.documents_failed
 
         await task_logger.log_task_success(
             log_entry,
@@ -505,11 +552,12 @@ async def index_obsidian_vault(
             {
                 "indexed_count": indexed_count,
                 "skipped_count": skipped_count,
+                "failed_count": writer.documents_failed,
                 "total_files": len(files),
             },
         )
 
-        return indexed_count, None
+        return indexed_count, writer.failure_message
 
     except SQLAlchemyError as e:
         logger.exception(f"Database error during Obsidian indexing: {e}")
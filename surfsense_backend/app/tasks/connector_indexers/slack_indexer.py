@@ -8,9 +8,9 @@ from slack_sdk.errors import SlackApiError
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.config import config
 from app.connectors.slack_history import SlackHistory
 from app.db import Document, DocumentType, SearchSourceConnectorType
+from app.services.embedding_service import get_embedding_service
 from app.services.task_logging_service import TaskLoggingService
 from app.utils.document_converters import (
     create_document_chunks,
@@ -19,17 +19,38 @@ from app.utils.document_converters import (
 )
 
 from .base import (
+    DocumentWriter,
     build_document_metadata_markdown,
     calculate_date_range,
-    check_document_by_unique_identifier,
-    check_duplicate_document_by_hash,
     get_connector_by_id,
     get_current_timestamp,
     logger,
+    prefetch_documents,
     update_connector_last_indexed,
 )
 
 
+def _build_message_document(channel_name: str, channel_id: str, msg: dict) -> str:
+    """Build the document string of a formatted Slack message."""
+    metadata_sections = [
+        (
+            "METADATA",
+            [
+                f"CHANNEL_NAME: {channel_name}",
+                f"CHANNEL_ID: {channel_id}",
+                f"MESSAGE_TIMESTAMP: {msg.get('datetime', 'Unknown Time')}",
+                f"MESSAGE_USER_NAME: {msg.get('user_name', 'Unknown User')}",
+                f"MESSAGE_USER_EMAIL: {msg.get('user_email', 'Unknown Email')}",
+            ],
+        ),
+        (
+            "CONTENT",
+            ["FORMAT: markdown", "TEXT_START", msg.get("text", ""), "TEXT_END"],
+        ),
+    ]
+    return build_document_metadata_markdown(metadata_sections)
+
+
 async def index_slack_messages(
     session: AsyncSession,
     connector_id: int,
@@ -162,6 +183,7 @@ async def index_slack_messages(
         # Track the number of documents indexed
         documents_indexed = 0
         documents_skipped = 0
+        writer = DocumentWriter(session)
         skipped_channels = []
 
         await task_logger.log_task_progress(
@@ -235,35 +257,34 @@ async def index_slack_messages(
                     documents_skipped += 1
                     continue  # Skip if no valid messages after filtering
 
-                for msg in formatted_messages:
+                message_documents = [
+                    _build_message_document(channel_name, channel_id, msg)
+                    for msg in formatted_messages
+                ]
+
+                # Look up the channel's existing documents with one query
+                lookup = await prefetch_documents(
+                    session,
+                    [
+                        generate_unique_identifier_hash(
+                            DocumentType.SLACK_CONNECTOR,
+                            f"{channel_id}_{msg.get('ts', msg.get('datetime', 'Unknown Time'))}",
+                            search_space_id,
+                        )
+                        for msg in formatted_messages
+                    ],
+                    [
+                        generate_content_hash(document_string, search_space_id)
+                        for document_string in message_documents
+                    ],
+                    writer=writer,
+                )
+
+                for msg, combined_document_string in zip(
+                    formatted_messages, message_documents, strict=True
+                ):
                     timestamp = msg.get("datetime", "Unknown Time")
                     msg_ts = msg.get("ts", timestamp)  # Get original Slack timestamp
-                    msg_user_name = msg.get("user_name", "Unknown User")
-                    msg_user_email = msg.get("user_email", "Unknown Email")
-                    msg_text = msg.get("text", "")
-
-                    # Format document metadata
-                    metadata_sections = [
-                        (
-                            "METADATA",
-                            [
-                                f"CHANNEL_NAME: {channel_name}",
-                                f"CHANNEL_ID: {channel_id}",
-                                f"MESSAGE_TIMESTAMP: {timestamp}",
-                                f"MESSAGE_USER_NAME: {msg_user_name}",
-                                f"MESSAGE_USER_EMAIL: {msg_user_email}",
-                            ],
-                        ),
-                        (
-                            "CONTENT",
-                            ["FORMAT: markdown", "TEXT_START", msg_text, "TEXT_END"],
-                        ),
-                    ]
-
-                    # Build the document string
-                    combined_document_string = build_document_metadata_markdown(
-                        metadata_sections
-                    )
 
                     # Generate unique identifier hash for this Slack message
                     unique_identifier = f"{channel_id}_{msg_ts}"
@@ -277,8 +298,8 @@ async def index_slack_messages(
                     )
 
                     # Check if document with this unique identifier already exists
-                    existing_document = await check_document_by_unique_identifier(
-                        session, unique_identifier_hash
+                    existing_document = await lookup.get_by_unique_identifier(
+                        unique_identifier_hash, content_hash
                     )
 
                     if existing_document:
@@ -297,9 +318,9 @@ async def index_slack_messages(
 
                             # Update chunks and embedding
                             chunks = await create_document_chunks(
-                                combined_document_string
+                                combined_document_string, existing_document
                             )
-                            doc_embedding = config.embedding_model_instance.embed(
+                            doc_embedding = await get_embedding_service().embed_text(
                                 combined_document_string
                             )
 
@@ -321,6 +342,7 @@ async def index_slack_messages(
                             # Delete old chunks and add new ones
                             existing_document.chunks = chunks
                             existing_document.updated_at = get_current_timestamp()
+                            await writer.add(existing_document)
 
                             documents_indexed += 1
                             logger.info(f"Successfully updated Slack message {msg_ts}")
@@ -329,8 +351,8 @@ async def index_slack_messages(
                     # Document doesn't exist by unique_identifier_hash
                     # Check if a document with the same content_hash exists (from another connector)
                     with session.no_autoflush:
-                        duplicate_by_content = await check_duplicate_document_by_hash(
-                            session, content_hash
+                        duplicate_by_content = await lookup.get_duplicate_by_hash(
+                            content_hash
                         )
 
                     if duplicate_by_content:
@@ -345,7 +367,7 @@ async def index_slack_messages(
                     # Document doesn't exist - create new one
                     # Process chunks
                     chunks = await create_document_chunks(combined_document_string)
-                    doc_embedding = config.embedding_model_instance.embed(
+                    doc_embedding = await get_embedding_service().embed_text(
                         combined_document_string
                     )
 
@@ -370,16 +392,9 @@ async def index_slack_messages(
                         updated_at=get_current_timestamp(),
                     )
 
-                    session.add(document)
+                    await writer.add(document)
                     documents_indexed += 1
 
-                    # Batch commit every 10 documents
-                    if documents_indexed % 10 == 0:
-                        logger.info(
-                            f"Committing batch: {documents_indexed} Slack channels processed so far"
-                        )
-                        await session.commit()
-
                 logger.info(
                     f"Successfully indexed new channel {channel_name} with {len(formatted_messages)} messages"
                 )
@@ -405,7 +420,10 @@ async def index_slack_messages(
 
         # Final commit for any remaining documents not yet committed in batches
         logger.info(f"Final commit: Total {documents_indexed} Slack channels processed")
-        await session.commit()
+        await writer.flush()
+        # Documents the writer could not insert were not indexed
+        documents_indexed -= writer.documents_failed
+        total_processed -= writer.documents_failed
 
         # Prepare result message
         result_message = None
@@ -422,6 +440,7 @@ async def index_slack_messages(
                 "channels_processed": total_processed,
                 "documents_indexed": documents_indexed,
                 "documents_skipped": documents_skipped,
+                "documents_failed": writer.documents_failed,
                 "skipped_channels_count": len(skipped_channels),
                 "result_message": result_message,
             },
@@ -432,8 +451,8 @@ async def index_slack_messages(
         )
         return (
             total_processed,
-            None,
-        )  # Return None on success (result_message is for logging only)
+            writer.failure_message,
+        )  # result_message is for logging only; warn about unsaved documents
 
     except SQLAlchemyError as db_error:
         await session.rollback()
@@ -7,9 +7,9 @@ from datetime import UTC
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.config import config
 from app.connectors.teams_history import TeamsHistory
 from app.db import Document, DocumentType, SearchSourceConnectorType
+from app.services.embedding_service import get_embedding_service
 from app.services.task_logging_service import TaskLoggingService
 from app.utils.document_converters import (
     create_document_chunks,
@@ -18,17 +18,51 @@ from app.utils.document_converters import (
 )
 
 from .base import (
+    DocumentWriter,
     build_document_metadata_markdown,
     calculate_date_range,
-    check_document_by_unique_identifier,
-    check_duplicate_document_by_hash,
     get_connector_by_id,
     get_current_timestamp,
     logger,
+    prefetch_documents,
     update_connector_last_indexed,
 )
 
 
+def _build_message_document(
+    team_name: str, team_id: str, channel_name: str, channel_id: str, msg: dict
+) -> str:
+    """Build the document string of a Teams channel message."""
+    user = msg.get("from", {}).get("user", {})
+    body = msg.get("body", {})
+    content_type = body.get("contentType", "text")
+    metadata_sections = [
+        (
+            "METADATA",
+            [
+                f"TEAM_NAME: {team_name}",
+                f"TEAM_ID: {team_id}",
+                f"CHANNEL_NAME: {channel_name}",
+                f"CHANNEL_ID: {channel_id}",
+                f"MESSAGE_TIMESTAMP: {msg.get('createdDateTime', '')}",
+                f"MESSAGE_USER_NAME: {user.get('displayName', 'Unknown User')}",
+                f"MESSAGE_USER_EMAIL: {user.get('userPrincipalName', 'Unknown Email')}",
+                f"CONTENT_TYPE: {content_type}",
+            ],
+        ),
+        (
+            "CONTENT",
+            [
+                f"FORMAT: {content_type}",
+                "TEXT_START",
+                body.get("content", ""),
+                "TEXT_END",
+            ],
+        ),
+    ]
+    return build_document_metadata_markdown(metadata_sections)
+
+
 async def index_teams_messages(
     session: AsyncSession,
     connector_id: int,
@@ -159,6 +193,7 @@ async def index_teams_messages(
         # Track the number of documents indexed
         documents_indexed = 0
         documents_skipped = 0
+        writer = DocumentWriter(session)
         skipped_channels = []
 
         await task_logger.log_task_progress(
@@ -220,63 +255,50 @@ async def index_teams_messages(
                             documents_skipped += 1
                             continue
 
+                        message_documents = [
+                            _build_message_document(
+                                team_name, team_id, channel_name, channel_id, msg
+                            )
+                            for msg in messages
+                        ]
+
+                        # Look up the channel's existing documents with one query
+                        lookup = await prefetch_documents(
+                            session,
+                            [
+                                generate_unique_identifier_hash(
+                                    DocumentType.TEAMS_CONNECTOR,
+                                    f"{team_id}_{channel_id}_{msg.get('id', '')}",
+                                    search_space_id,
+                                )
+                                for msg in messages
+                                if not msg.get("deletedDateTime")
+                            ],
+                            [
+                                generate_content_hash(document_string, search_space_id)
+                                for msg, document_string in zip(
+                                    messages, message_documents, strict=True
+                                )
+                                if not msg.get("deletedDateTime")
+                            ],
+                            writer=writer,
+                        )
+
                         # Process each message
-                        for msg in messages:
+                        for msg, combined_document_string in zip(
+                            messages, message_documents, strict=True
+                        ):
                             # Skip deleted messages or empty content
                             if msg.get("deletedDateTime"):
                                 continue
 
-                            # Extract message details
                             message_id = msg.get("id", "")
-                            created_datetime = msg.get("createdDateTime", "")
-                            from_user = msg.get("from", {})
-                            user_name = from_user.get("user", {}).get(
-                                "displayName", "Unknown User"
-                            )
-                            user_email = from_user.get("user", {}).get(
-                                "userPrincipalName", "Unknown Email"
-                            )
-
-                            # Extract message content
-                            body = msg.get("body", {})
-                            content_type = body.get("contentType", "text")
-                            msg_text = body.get("content", "")
+                            msg_text = msg.get("body", {}).get("content", "")
 
                             # Skip empty messages
                             if not msg_text or msg_text.strip() == "":
                                 continue
 
-                            # Format document metadata
-                            metadata_sections = [
-                                (
-                                    "METADATA",
-                                    [
-                                        f"TEAM_NAME: {team_name}",
-                                        f"TEAM_ID: {team_id}",
-                                        f"CHANNEL_NAME: {channel_name}",
-                                        f"CHANNEL_ID: {channel_id}",
-                                        f"MESSAGE_TIMESTAMP: {created_datetime}",
-                                        f"MESSAGE_USER_NAME: {user_name}",
-                                        f"MESSAGE_USER_EMAIL: {user_email}",
-                                        f"CONTENT_TYPE: {content_type}",
-                                    ],
-                                ),
-                                (
-                                    "CONTENT",
-                                    [
-                                        f"FORMAT: {content_type}",
-                                        "TEXT_START",
-                                        msg_text,
-                                        "TEXT_END",
-                                    ],
-                                ),
-                            ]
-
-                            # Build the document string
-                            combined_document_string = build_document_metadata_markdown(
-                                metadata_sections
-                            )
-
                             # Generate unique identifier hash for this Teams message
                             unique_identifier = f"{team_id}_{channel_id}_{message_id}"
                             unique_identifier_hash = generate_unique_identifier_hash(
@@ -291,10 +313,8 @@ async def index_teams_messages(
                             )
 
                             # Check if document with this unique identifier already exists
-                            existing_document = (
-                                await check_document_by_unique_identifier(
-                                    session, unique_identifier_hash
-                                )
+                            existing_document = await lookup.get_by_unique_identifier(
+                                unique_identifier_hash, content_hash
                             )
 
                             if existing_document:
@@ -317,10 +337,10 @@ async def index_teams_messages(
 
                                     # Update chunks and embedding
                                     chunks = await create_document_chunks(
-                                        combined_document_string
+                                        combined_document_string, existing_document
                                     )
                                     doc_embedding = (
-                                        config.embedding_model_instance.embed(
+                                        await get_embedding_service().embed_text(
                                             combined_document_string
                                         )
                                     )
@@ -347,6 +367,7 @@ async def index_teams_messages(
                                     existing_document.updated_at = (
                                         get_current_timestamp()
                                     )
+                                    await writer.add(existing_document)
 
                                     documents_indexed += 1
                                     logger.info(
@@ -359,9 +380,7 @@ async def index_teams_messages(
                             # Check if a document with the same content_hash exists (from another connector)
                             with session.no_autoflush:
                                 duplicate_by_content = (
-                                    await check_duplicate_document_by_hash(
-                                        session, content_hash
-                                    )
+                                    await lookup.get_duplicate_by_hash(content_hash)
                                 )
 
                             if duplicate_by_content:
@@ -381,7 +400,7 @@ async def index_teams_messages(
                             chunks = await create_document_chunks(
                                 combined_document_string
                             )
-                            doc_embedding = config.embedding_model_instance.embed(
+                            doc_embedding = await get_embedding_service().embed_text(
                                 combined_document_string
                             )
 
@@ -410,17 +429,9 @@ async def index_teams_messages(
                                 updated_at=get_current_timestamp(),
                             )
 
-                            session.add(document)
+                            await writer.add(document)
                             documents_indexed += 1
 
-                            # Batch commit every 10 documents
-                            if documents_indexed % 10 == 0:
-                                logger.info(
-                                    "Committing batch: %s Teams messages processed so far",
-                                    documents_indexed,
-                                )
-                                await session.commit()
-
                         logger.info(
                             "Successfully indexed channel %s in team %s with %s messages",
                             channel_name,
@@ -455,7 +466,10 @@ async def index_teams_messages(
         logger.info(
             "Final commit: Total %s Teams messages processed", documents_indexed
         )
-        await session.commit()
+        await writer.flush()
+        # Documents the writer could not insert were not indexed
+        documents_indexed -= writer.documents_failed
+        total_processed -= writer.documents_failed
 
         # Prepare result message
         result_message = None
@@ -472,6 +486,7 @@ async def index_teams_messages(
                 "messages_processed": total_processed,
                 "documents_indexed": documents_indexed,
                 "documents_skipped": documents_skipped,
+                "documents_failed": writer.documents_failed,
                 "skipped_channels_count": len(skipped_channels),
                 "result_message": result_message,
             },
@@ -484,8 +499,8 @@ async def index_teams_messages(
         )
         return (
             total_processed,
-            None,
-        )  # Return None on success (result_message is for logging only)
+            writer.failure_message,
+        )  # result_message is for logging only; warn about unsaved documents
 
     except SQLAlchemyError as db_error:
         await session.rollback()
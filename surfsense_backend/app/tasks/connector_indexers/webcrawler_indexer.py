@@ -7,9 +7,9 @@ from datetime import datetime
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.config import config
 from app.connectors.webcrawler_connector import WebCrawlerConnector
 from app.db import Document, DocumentType, SearchSourceConnectorType
+from app.services.embedding_service import get_embedding_service
 from app.services.llm_service import get_user_long_context_llm
 from app.services.task_logging_service import TaskLoggingService
 from app.utils.document_converters import (
@@ -21,11 +21,11 @@ from app.utils.document_converters import (
 from app.utils.webcrawler_utils import parse_webcrawler_urls
 
 from .base import (
-    check_document_by_unique_identifier,
-    check_duplicate_document_by_hash,
+    DocumentWriter,
     get_connector_by_id,
     get_current_timestamp,
     logger,
+    prefetch_documents,
     update_connector_last_indexed,
 )
 
@@ -140,6 +140,20 @@ async def index_crawled_urls(
         documents_skipped = 0
         failed_urls = []
 
+        writer = DocumentWriter(session)
+
+        # Look up the existing documents for all URLs with one query
+        lookup = await prefetch_documents(
+            session,
+            [
+                generate_unique_identifier_hash(
+                    DocumentType.CRAWLED_URL, url, search_space_id
+                )
+                for url in urls
+            ],
+            writer=writer,
+        )
+
         for idx, url in enumerate(urls, 1):
             try:
                 logger.info(f"Processing URL {idx}/{len(urls)}: {url}")
@@ -194,8 +208,8 @@ async def index_crawled_urls(
                 )
 
                 # Check if document with this unique identifier already exists
-                existing_document = await check_document_by_unique_identifier(
-                    session, unique_identifier_hash
+                existing_document = await lookup.get_by_unique_identifier(
+                    unique_identifier_hash, content_hash
                 )
 
                 # Extract useful metadata
@@ -251,12 +265,16 @@ async def index_crawled_urls(
                                 content_preview += "..."
                             summary_content += f"Content Preview:\n{content_preview}\n"
 
-                            summary_embedding = config.embedding_model_instance.embed(
-                                summary_content
+                            summary_embedding = (
+                                await get_embedding_service().embed_text(
+                                    summary_content
+                                )
                             )
 
                         # Process chunks
-                        chunks = await create_document_chunks(content)
+                        chunks = await create_document_chunks(
+                            content, existing_document
+                        )
 
                         # Update existing document
                         existing_document.title = title
@@ -272,6 +290,7 @@ async def index_crawled_urls(
                         }
                         existing_document.chunks = chunks
                         existing_document.updated_at = get_current_timestamp()
+                        await writer.add(existing_document)
 
                         documents_updated += 1
                         logger.info(f"Successfully updated URL {url}")
@@ -280,8 +299,8 @@ async def index_crawled_urls(
                 # Document doesn't exist by unique_identifier_hash
                 # Check if a document with the same content_hash exists (from another connector)
                 with session.no_autoflush:
-                    duplicate_by_content = await check_duplicate_document_by_hash(
-                        session, content_hash
+                    duplicate_by_content = await lookup.get_duplicate_by_hash(
+                        content_hash
                     )
 
                 if duplicate_by_content:
@@ -330,7 +349,7 @@ async def index_crawled_urls(
                         content_preview += "..."
                     summary_content += f"Content Preview:\n{content_preview}\n"
 
-                    summary_embedding = config.embedding_model_instance.embed(
+                    summary_embedding = await get_embedding_service().embed_text(
                         summary_content
                     )
 
@@ -353,17 +372,10 @@ async def index_crawled_urls(
                     updated_at=get_current_timestamp(),
                 )
 
-                session.add(document)
+                await writer.add(document)
                 documents_indexed += 1
                 logger.info(f"Successfully indexed new URL {url}")
 
-                # Batch commit every 10 documents
-                if (documents_indexed + documents_updated) % 10 == 0:
-                    logger.info(
-                        f"Committing batch: {documents_indexed + documents_updated} URLs processed so far"
-                    )
-                    await session.commit()
-
             except Exception as e:
                 logger.error(
                     f"Error processing URL {url}: {e!s}",
@@ -381,7 +393,10 @@ async def index_crawled_urls(
         logger.info(
             f"Final commit: Total {documents_indexed} new, {documents_updated} updated URLs processed"
         )
-        await session.commit()
+        await writer.flush()
+        # Documents the writer could not insert were not indexed
+        documents_indexed -= writer.documents_failed
+        total_processed -= writer.documents_failed
 
         # Log failed URLs if any (for debugging purposes)
         if failed_urls:
@@ -400,6 +415,7 @@ async def index_crawled_urls(
                 "documents_indexed": documents_indexed,
                 "documents_updated": documents_updated,
                 "documents_skipped": documents_skipped,
+                "documents_failed": writer.documents_failed,
                 "failed_urls_count": len(failed_urls),
             },
         )
@@ -411,8 +427,8 @@ async def index_crawled_urls(
         )
         return (
             total_processed,
-            None,
-        )  # Return None on success (result_message is for logging only)
+            writer.failure_message,
+        )  # None on success, or a warning about documents that couldn't be saved
 
     except SQLAlchemyError as db_error:
         await session.rollback()
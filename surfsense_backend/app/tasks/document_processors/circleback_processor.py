@@ -106,7 +106,7 @@ async def add_circleback_meeting_document(
             )
 
         # Process chunks
-        chunks = await create_document_chunks(markdown_content)
+        chunks = await create_document_chunks(markdown_content, existing_document)
 
         # Convert to BlockNote JSON for editing capability
         from app.utils.blocknote_converter import convert_markdown_to_blocknote
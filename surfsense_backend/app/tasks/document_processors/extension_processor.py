@@ -144,7 +144,7 @@ async def add_extension_received_document(
         )
 
         # Process chunks
-        chunks = await create_document_chunks(content.pageContent)
+        chunks = await create_document_chunks(content.pageContent, existing_document)
 
         from app.utils.blocknote_converter import convert_markdown_to_blocknote
 
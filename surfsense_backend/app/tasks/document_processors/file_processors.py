@@ -18,6 +18,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import config as app_config
 from app.db import Document, DocumentType, Log, Notification
+from app.services.embedding_service import get_embedding_service
 from app.services.llm_service import get_user_long_context_llm
 from app.services.notification_service import NotificationService
 from app.services.task_logging_service import TaskLoggingService
@@ -473,7 +474,7 @@ async def add_received_file_document_using_unstructured(
         )
 
         # Process chunks
-        chunks = await create_document_chunks(file_in_markdown)
+        chunks = await create_document_chunks(file_in_markdown, existing_document)
 
         from app.utils.blocknote_converter import convert_markdown_to_blocknote
 
@@ -612,7 +613,7 @@ async def add_received_file_document_using_llamacloud(
         )
 
         # Process chunks
-        chunks = await create_document_chunks(file_in_markdown)
+        chunks = await create_document_chunks(file_in_markdown, existing_document)
 
         from app.utils.blocknote_converter import convert_markdown_to_blocknote
 
@@ -769,14 +770,12 @@ async def add_received_file_document_using_docling(
             f"{metadata_section}\n\n# DOCUMENT SUMMARY\n\n{summary_content}"
         )
 
-        from app.config import config
-
-        summary_embedding = config.embedding_model_instance.embed(
+        summary_embedding = await get_embedding_service().embed_text(
             enhanced_summary_content
         )
 
         # Process chunks
-        chunks = await create_document_chunks(file_in_markdown)
+        chunks = await create_document_chunks(file_in_markdown, existing_document)
 
         from app.utils.blocknote_converter import convert_markdown_to_blocknote
 
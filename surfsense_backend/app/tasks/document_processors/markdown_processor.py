@@ -246,7 +246,7 @@ async def add_received_markdown_file_document(
         )
 
         # Process chunks
-        chunks = await create_document_chunks(file_in_markdown)
+        chunks = await create_document_chunks(file_in_markdown, existing_document)
 
         from app.utils.blocknote_converter import convert_markdown_to_blocknote
 
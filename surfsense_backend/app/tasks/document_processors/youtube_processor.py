@@ -302,7 +302,9 @@ async def add_youtube_video_document(
                 "document will not be editable"
             )
 
-        chunks = await create_document_chunks(combined_document_string)
+        chunks = await create_document_chunks(
+            combined_document_string, existing_document
+        )
 
         # Update or create document
         if existing_document:
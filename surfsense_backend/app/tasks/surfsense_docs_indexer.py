@@ -15,6 +15,7 @@ from sqlalchemy.orm import selectinload
 
 from app.config import config
 from app.db import SurfsenseDocsChunk, SurfsenseDocsDocument, async_session_maker
+from app.services.embedding_service import get_embedding_service
 
 logger = logging.getLogger(__name__)
 
@@ -76,7 +77,7 @@ def generate_surfsense_docs_content_hash(content: str) -> str:
     return hashlib.sha256(content.encode("utf-8")).hexdigest()
 
 
-def create_surfsense_docs_chunks(content: str) -> list[SurfsenseDocsChunk]:
+async def create_surfsense_docs_chunks(content: str) -> list[SurfsenseDocsChunk]:
     """
     Create chunks from Surfsense documentation content.
 
@@ -86,12 +87,11 @@ def create_surfsense_docs_chunks(content: str) -> list[SurfsenseDocsChunk]:
     Returns:
         List of SurfsenseDocsChunk objects with embeddings
     """
+    chunk_texts = [chunk.text for chunk in config.chunker_instance.chunk(content)]
+    embeddings = await get_embedding_service().embed_texts(chunk_texts)
     return [
-        SurfsenseDocsChunk(
-            content=chunk.text,
-            embedding=config.embedding_model_instance.embed(chunk.text),
-        )
-        for chunk in config.chunker_instance.chunk(content)
+        SurfsenseDocsChunk(content=chunk_text, embedding=embedding)
+        for chunk_text, embedding in zip(chunk_texts, embeddings, strict=True)
     ]
 
 
@@ -148,13 +148,15 @@ async def index_surfsense_docs(session: AsyncSession) -> tuple[int, int, int, in
                 logger.info(f"Updating changed document: {source}")
 
                 # Create new chunks
-                chunks = create_surfsense_docs_chunks(content)
+                chunks = await create_surfsense_docs_chunks(content)
 
                 # Update document fields
                 existing_doc.title = title
                 existing_doc.content = content
                 existing_doc.content_hash = content_hash
-                existing_doc.embedding = config.embedding_model_instance.embed(content)
+                existing_doc.embedding = await get_embedding_service().embed_text(
+                    content
+                )
                 existing_doc.chunks = chunks
                 existing_doc.updated_at = datetime.now(UTC)
 
@@ -163,14 +165,14 @@ async def index_surfsense_docs(session: AsyncSession) -> tuple[int, int, int, in
                 # New document - create it
                 logger.info(f"Creating new document: {source}")
 
-                chunks = create_surfsense_docs_chunks(content)
+                chunks = await create_surfsense_docs_chunks(content)
 
                 document = SurfsenseDocsDocument(
                     source=source,
                     title=title,
                     content=content,
                     content_hash=content_hash,
-                    embedding=config.embedding_model_instance.embed(content),
+                    embedding=await get_embedding_service().embed_text(content),
                     chunks=chunks,
                     updated_at=datetime.now(UTC),
                 )
@@ -1,12 +1,24 @@
+import asyncio
 import hashlib
+import logging
+from functools import lru_cache
 
 from litellm import get_model_info, token_counter
+from sqlalchemy import inspect
 
 from app.config import config
-from app.db import Chunk, DocumentType
+from app.db import Chunk, Document, DocumentType
 from app.prompts import SUMMARY_PROMPT_TEMPLATE
+from app.services.embedding_service import get_embedding_service
 
+# Content is tokenized in a prefix of this many characters per available
+# token; only when the prefix holds too few tokens is everything tokenized
+TOKENIZE_WINDOW_CHARS_PER_TOKEN = 8
+# Tokens near the end of the prefix may merge differently in the full text
+TOKENIZE_WINDOW_MARGIN = 16
 
+
+@lru_cache(maxsize=256)
 def get_model_context_window(model_name: str) -> int:
     """Get the total context window size for a model (input + output tokens)."""
     try:
@@ -20,11 +32,103 @@ def get_model_context_window(model_name: str) -> int:
         return 4096  # Conservative fallback
 
 
+@lru_cache(maxsize=256)
+def _get_tokenizer(model_name: str) -> dict | None:
+    """Get the tokenizer litellm's token_counter uses for a model."""
+    try:
+        import tiktoken
+        from litellm.utils import _select_tokenizer
+
+        tokenizer = _select_tokenizer(model=model_name)
+        if tokenizer["type"] == "openai_tokenizer":
+            # Same encoding choice as litellm's token_counter
+            try:
+                if "gpt-4o" in model_name:
+                    encoding = tiktoken.get_encoding("o200k_base")
+                else:
+                    encoding = tiktoken.encoding_for_model(model_name)
+            except KeyError:
+                encoding = tiktoken.get_encoding("cl100k_base")
+            tokenizer = {"type": "openai_tokenizer", "tokenizer": encoding}
+        return tokenizer
+    except Exception as e:
+        logging.debug(f"No tokenizer for {model_name}, using token_counter: {e}")
+        return None
+
+
+def _truncate_to_tokens(content: str, max_tokens: int, tokenizer: dict) -> str:
+    """
+    Cut content after max_tokens tokens, tokenizing it once.
+
+    Args:
+        content: Content to truncate
+        max_tokens: Number of tokens to keep
+        tokenizer: Tokenizer entry from litellm ("openai_tokenizer" is a
+            tiktoken Encoding, "huggingface_tokenizer" a tokenizers.Tokenizer)
+
+    Returns:
+        The longest prefix of content with at most max_tokens tokens
+    """
+    window = max_tokens * TOKENIZE_WINDOW_CHARS_PER_TOKEN
+    text = content[:window]
+    while True:
+        if tokenizer["type"] == "openai_tokenizer":
+            tokens = tokenizer["tokenizer"].encode(text, disallowed_special=())
+            token_count = len(tokens)
+        else:
+            encoding = tokenizer["tokenizer"].encode(text, add_special_tokens=False)
+            token_count = len(encoding.ids)
+
+        if len(text) == len(content):
+            if token_count <= max_tokens:
+                return content
+            break
+        if token_count > max_tokens + TOKENIZE_WINDOW_MARGIN:
+            break
+        # The prefix is mostly long tokens, tokenize everything
+        text = content
+
+    if tokenizer["type"] == "openai_tokenizer":
+        # tiktoken is byte level, so the kept tokens' bytes are a prefix of the
+        # content; drop a character split at the cut
+        kept = tokenizer["tokenizer"].decode_bytes(tokens[:max_tokens])
+        return kept.decode("utf-8", errors="ignore")
+    return content[: encoding.offsets[max_tokens - 1][1]] if max_tokens > 0 else ""
+
+
+def _search_content_length(content: str, available_tokens: int, model_name: str) -> int:
+    """Binary search the longest content prefix that fits with token_counter."""
+    left, right = 0, len(content)
+    optimal_length = 0
+
+    while left <= right:
+        mid = (left + right) // 2
+        test_content = content[:mid]
+
+        # Test token count for this content length
+        test_document = f"<DOCUMENT_CONTENT>\n\n{test_content}\n\n</DOCUMENT_CONTENT>"
+        test_tokens = token_counter(
+            messages=[{"role": "user", "content": test_document}], model=model_name
+        )
+
+        if test_tokens <= available_tokens:
+            optimal_length = mid
+            left = mid + 1
+        else:
+            right = mid - 1
+
+    return optimal_length
+
+
 def optimize_content_for_context_window(
     content: str, document_metadata: dict | None, model_name: str
 ) -> str:
     """
-    Optimize content length to fit within model context window using binary search.
+    Optimize content length to fit within model context window.
+
+    The content is tokenized once with the model's tokenizer and cut at the
+    token boundary; models without a known tokenizer fall back to a binary
+    search with token_counter.
 
     Args:
         content: Original document content
@@ -61,25 +165,31 @@ def optimize_content_for_context_window(
         print(f"Warning: Very limited tokens available for content: {available_tokens}")
         return content[:500]  # Fallback to first 500 chars
 
-    # Binary search to find optimal content length
-    left, right = 0, len(content)
-    optimal_length = 0
-
-    while left <= right:
-        mid = (left + right) // 2
-        test_content = content[:mid]
-
-        # Test token count for this content length
-        test_document = f"<DOCUMENT_CONTENT>\n\n{test_content}\n\n</DOCUMENT_CONTENT>"
-        test_tokens = token_counter(
-            messages=[{"role": "user", "content": test_document}], model=model_name
+    optimal_length = None
+    tokenizer = _get_tokenizer(model_name)
+    if tokenizer is not None:
+        # Tokens of the message and the content wrapper itself, plus one for a
+        # token the cut content may merge into at its end
+        wrapper_tokens = token_counter(
+            messages=[
+                {
+                    "role": "user",
+                    "content": "<DOCUMENT_CONTENT>\n\n\n\n</DOCUMENT_CONTENT>",
+                }
+            ],
+            model=model_name,
         )
-
-        if test_tokens <= available_tokens:
-            optimal_length = mid
-            left = mid + 1
-        else:
-            right = mid - 1
+        try:
+            optimal_length = len(
+                _truncate_to_tokens(
+                    content, available_tokens - wrapper_tokens - 1, tokenizer
+                )
+            )
+        except Exception as e:
+            logging.debug(f"Tokenizer failed for {model_name}, using search: {e}")
+
+    if optimal_length is None:
+        optimal_length = _search_content_length(content, available_tokens, model_name)
 
     optimized_content = (
         content[:optimal_length] if optimal_length > 0 else content[:500]
@@ -140,28 +250,77 @@ async def generate_document_summary(
     else:
         enhanced_summary_content = summary_content
 
-    summary_embedding = config.embedding_model_instance.embed(enhanced_summary_content)
+    summary_embedding = await get_embedding_service().embed_text(
+        enhanced_summary_content
+    )
 
     return enhanced_summary_content, summary_embedding
 
 
-async def create_document_chunks(content: str) -> list[Chunk]:
+async def create_document_chunks(
+    content: str, existing_document: Document | None = None
+) -> list[Chunk]:
     """
     Create chunks from document content.
 
+    When ``existing_document`` is given (and its chunks are loaded), the new
+    chunk list is aligned against the existing chunks by content hash: rows for
+    unchanged chunks are reused as-is (keeping their IDs, so citations stay
+    valid) and only chunks with new content are embedded and inserted. Callers
+    assign the result to ``existing_document.chunks`` as before; the
+    delete-orphan cascade then removes only the chunks that disappeared.
+
     Args:
         content: Document content to chunk
+        existing_document: Optional document being updated
 
     Returns:
-        List of Chunk objects with embeddings
+        List of Chunk objects with embeddings, in document order
     """
-    return [
-        Chunk(
-            content=chunk.text,
-            embedding=config.embedding_model_instance.embed(chunk.text),
+    # Chunking and embedding are CPU-bound; keep both off the event loop and
+    # embed all chunk texts through the batched embedding service
+    chunks = await asyncio.to_thread(config.chunker_instance.chunk, content)
+    embedding_service = get_embedding_service()
+
+    reusable: dict[str, list[Chunk]] = {}
+    if (
+        existing_document is not None
+        and "chunks" not in inspect(existing_document).unloaded
+    ):
+        for existing_chunk in existing_document.chunks:
+            reusable.setdefault(
+                embedding_service.hash_text(existing_chunk.content), []
+            ).append(existing_chunk)
+
+    result: list[Chunk] = []
+    to_embed: list[tuple[Chunk, int]] = []
+    for position, chunk in enumerate(chunks):
+        matches = reusable.get(embedding_service.hash_text(chunk.text))
+        if matches:
+            kept = matches.pop(0)
+            if kept.position != position:
+                kept.position = position
+            result.append(kept)
+        else:
+            new_chunk = Chunk(content=chunk.text, position=position)
+            result.append(new_chunk)
+            to_embed.append((new_chunk, getattr(chunk, "token_count", 0)))
+
+    embeddings = await embedding_service.embed_texts(
+        [new_chunk.content for new_chunk, _ in to_embed],
+        token_counts=[token_count for _, token_count in to_embed],
+    )
+    for (new_chunk, _), embedding in zip(to_embed, embeddings, strict=True):
+        new_chunk.embedding = embedding
+
+    if existing_document is not None:
+        logging.debug(
+            f"Chunk diff for document {existing_document.id}: "
+            f"{len(result) - len(to_embed)} kept, {len(to_embed)} new, "
+            f"{sum(len(v) for v in reusable.values())} removed"
         )
-        for chunk in config.chunker_instance.chunk(content)
-    ]
+
+    return result
 
 
 async def convert_element_to_markdown(element) -> str:
@@ -4,6 +4,8 @@ Provides helpers for checking user permissions in search spaces.
 """
 
 import secrets
+import time
+from dataclasses import dataclass
 from uuid import UUID
 
 from fastapi import HTTPException
@@ -11,6 +13,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
 
+from app.config import config
 from app.db import (
     Permission,
     SearchSpace,
@@ -48,13 +51,52 @@ async def get_user_membership(
     return result.scalars().first()
 
 
-async def get_user_permissions(
+@dataclass(frozen=True)
+class SearchSpaceAccess:
+    """A member's resolved access to a search space."""
+
+    is_owner: bool
+    role_name: str | None
+    permissions: tuple[str, ...]
+
+
+# Key of the per-request memo in AsyncSession.info. Each request gets its own
+# session, so entries live exactly as long as the request.
+_SESSION_CACHE_KEY = "rbac_access"
+
+# (user_id, search_space_id) -> (expires_at, access), shared by requests in
+# this process for PERMISSION_CACHE_TTL seconds. Only members are cached, so
+# new members are never denied by a stale entry. Expired entries are pruned
+# at most once per TTL, so the cache only holds recently active members.
+_access_cache: dict[tuple[UUID, int], tuple[float, SearchSpaceAccess]] = {}
+_next_prune_at = 0.0
+
+
+def _cache_access(key: tuple[UUID, int], access: SearchSpaceAccess) -> None:
+    """Store access in the process cache, dropping expired entries first."""
+    global _next_prune_at
+    now = time.monotonic()
+    if now >= _next_prune_at:
+        expired = [
+            k for k, (expires_at, _) in _access_cache.items() if expires_at <= now
+        ]
+        for expired_key in expired:
+            del _access_cache[expired_key]
+        _next_prune_at = now + config.PERMISSION_CACHE_TTL
+    _access_cache[key] = (now + config.PERMISSION_CACHE_TTL, access)
+
+
+async def resolve_access(
     session: AsyncSession,
     user_id: UUID,
     search_space_id: int,
-) -> list[str]:
+) -> SearchSpaceAccess | None:
     """
-    Get the user's permissions in a search space.
+    Resolve the user's access to a search space.
+
+    The result is memoized for the request (the session) and, when
+    PERMISSION_CACHE_TTL is set, for that many seconds in this process.
+    Routes that change roles or memberships call invalidate_access_cache.
 
     Args:
         session: Database session
@@ -62,22 +104,79 @@ async def get_user_permissions(
         search_space_id: Search space ID
 
     Returns:
-        List of permission strings
+        SearchSpaceAccess if the user is a member, None otherwise
     """
-    membership = await get_user_membership(session, user_id, search_space_id)
+    key = (user_id, search_space_id)
+    request_cache = session.info.setdefault(_SESSION_CACHE_KEY, {})
+    if key in request_cache:
+        return request_cache[key]
+
+    cached = _access_cache.get(key)
+    if cached is not None and cached[0] > time.monotonic():
+        request_cache[key] = cached[1]
+        return cached[1]
 
+    membership = await get_user_membership(session, user_id, search_space_id)
     if not membership:
-        return []
+        access = None
+    elif membership.is_owner:
+        # Owners always have full access
+        access = SearchSpaceAccess(
+            is_owner=True,
+            role_name=membership.role.name if membership.role else None,
+            permissions=(Permission.FULL_ACCESS.value,),
+        )
+    else:
+        access = SearchSpaceAccess(
+            is_owner=False,
+            role_name=membership.role.name if membership.role else None,
+            permissions=tuple(membership.role.permissions or [])
+            if membership.role
+            else (),
+        )
 
-    # Owners always have full access
-    if membership.is_owner:
-        return [Permission.FULL_ACCESS.value]
+    request_cache[key] = access
+    if access is not None and config.PERMISSION_CACHE_TTL > 0:
+        _cache_access(key, access)
+    return access
 
-    # Get permissions from role
-    if membership.role:
-        return membership.role.permissions or []
 
-    return []
+def invalidate_access_cache(
+    search_space_id: int | None = None,
+    session: AsyncSession | None = None,
+) -> None:
+    """
+    Drop cached access after roles or memberships change.
+
+    Args:
+        search_space_id: Search space whose entries to drop (all if None)
+        session: Session of the current request, whose memo is cleared too
+    """
+    for key in list(_access_cache):
+        if search_space_id is None or key[1] == search_space_id:
+            _access_cache.pop(key, None)
+    if session is not None:
+        session.info.pop(_SESSION_CACHE_KEY, None)
+
+
+async def get_user_permissions(
+    session: AsyncSession,
+    user_id: UUID,
+    search_space_id: int,
+) -> list[str]:
+    """
+    Get the user's permissions in a search space.
+
+    Args:
+        session: Database session
+        user_id: User UUID
+        search_space_id: Search space ID
+
+    Returns:
+        List of permission strings
+    """
+    access = await resolve_access(session, user_id, search_space_id)
+    return list(access.permissions) if access else []
 
 
 async def check_permission(
@@ -86,7 +185,7 @@ async def check_permission(
     search_space_id: int,
     required_permission: str,
     error_message: str = "You don't have permission to perform this action",
-) -> SearchSpaceMembership:
+) -> SearchSpaceAccess:
     """
     Check if a user has a specific permission in a search space.
     Raises HTTPException if permission is denied.
@@ -99,38 +198,24 @@ async def check_permission(
         error_message: Custom error message for permission denied
 
     Returns:
-        SearchSpaceMembership if permission granted
+        SearchSpaceAccess if permission granted
 
     Raises:
         HTTPException: If user doesn't have access or permission
     """
-    membership = await get_user_membership(session, user.id, search_space_id)
-
-    if not membership:
-        raise HTTPException(
-            status_code=403,
-            detail="You don't have access to this search space",
-        )
-
-    # Get user's permissions
-    if membership.is_owner:
-        permissions = [Permission.FULL_ACCESS.value]
-    elif membership.role:
-        permissions = membership.role.permissions or []
-    else:
-        permissions = []
+    access = await check_search_space_access(session, user, search_space_id)
 
-    if not has_permission(permissions, required_permission):
+    if not has_permission(list(access.permissions), required_permission):
         raise HTTPException(status_code=403, detail=error_message)
 
-    return membership
+    return access
 
 
 async def check_search_space_access(
     session: AsyncSession,
     user: User,
     search_space_id: int,
-) -> SearchSpaceMembership:
+) -> SearchSpaceAccess:
     """
     Check if a user has any access to a search space.
     This is used for basic access control (user is a member).
@@ -141,20 +226,20 @@ async def check_search_space_access(
         search_space_id: Search space ID
 
     Returns:
-        SearchSpaceMembership if user has access
+        SearchSpaceAccess if user has access
 
     Raises:
         HTTPException: If user doesn't have access
     """
-    membership = await get_user_membership(session, user.id, search_space_id)
+    access = await resolve_access(session, user.id, search_space_id)
 
-    if not membership:
+    if not access:
         raise HTTPException(
             status_code=403,
             detail="You don't have access to this search space",
         )
 
-    return membership
+    return access
 
 
 async def is_search_space_owner(
@@ -173,8 +258,8 @@ async def is_search_space_owner(
     Returns:
         True if user is the owner, False otherwise
     """
-    membership = await get_user_membership(session, user_id, search_space_id)
-    return membership is not None and membership.is_owner
+    access = await resolve_access(session, user_id, search_space_id)
+    return access is not None and access.is_owner
 
 
 async def get_search_space_with_access_check(
@@ -182,7 +267,7 @@ async def get_search_space_with_access_check(
     user: User,
     search_space_id: int,
     required_permission: str | None = None,
-) -> tuple[SearchSpace, SearchSpaceMembership]:
+) -> tuple[SearchSpace, SearchSpaceAccess]:
     """
     Get a search space with access and optional permission check.
 
@@ -193,7 +278,7 @@ async def get_search_space_with_access_check(
         required_permission: Optional permission to check
 
     Returns:
-        Tuple of (SearchSpace, SearchSpaceMembership)
+        Tuple of (SearchSpace, SearchSpaceAccess)
 
     Raises:
         HTTPException: If search space not found or user lacks access/permission
@@ -209,13 +294,13 @@ async def get_search_space_with_access_check(
 
     # Check access
     if required_permission:
-        membership = await check_permission(
+        access = await check_permission(
             session, user, search_space_id, required_permission
         )
     else:
-        membership = await check_search_space_access(session, user, search_space_id)
+        access = await check_search_space_access(session, user, search_space_id)
 
-    return search_space, membership
+    return search_space, access
 
 
 def generate_invite_code() -> str:
@@ -4,8 +4,8 @@ set -e
 # Function to handle shutdown gracefully
 cleanup() {
     echo "Shutting down services..."
-    kill -TERM "$backend_pid" "$celery_worker_pid" "$celery_beat_pid" 2>/dev/null || true
-    wait "$backend_pid" "$celery_worker_pid" "$celery_beat_pid" 2>/dev/null || true
+    kill -TERM "$backend_pid" "$celery_worker_pid" "$celery_beat_pid" $embedding_server_pid 2>/dev/null || true
+    wait "$backend_pid" "$celery_worker_pid" "$celery_beat_pid" $embedding_server_pid 2>/dev/null || true
     exit 0
 }
 
@@ -31,6 +31,22 @@ else
     echo "You may need to run migrations manually: alembic upgrade head"
 fi
 
+embedding_server_pid=""
+if [ -n "$EMBEDDING_SERVER_SOCKET" ]; then
+    echo "Starting Embedding Server on $EMBEDDING_SERVER_SOCKET..."
+    python -m app.services.embedding_server &
+    embedding_server_pid=$!
+
+    # Wait for the model to load (max 120 seconds); until then clients fall
+    # back to loading the model themselves
+    for i in {1..120}; do
+        if [ -S "$EMBEDDING_SERVER_SOCKET" ]; then
+            break
+        fi
+        sleep 1
+    done
+fi
+
 echo "Starting FastAPI Backend..."
 python main.py &
 backend_pid=$!
@@ -0,0 +1,162 @@
+"""Unit tests for the compiled agent cache."""
+
+import asyncio
+import contextvars
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.agents.new_chat import agent_cache
+from app.agents.new_chat.agent_cache import (
+    RequestScoped,
+    bind_request_dependencies,
+    get_cached_agent,
+    get_connector_set_version,
+    invalidate_agent_cache,
+    resolve_request_scoped,
+    store_cached_agent,
+)
+from app.db import SearchSourceConnectorType
+
+
+@pytest.fixture(autouse=True)
+def reset_agent_cache():
+    """Start every test with an empty cache."""
+    agent_cache._agent_cache.clear()
+    yield
+    agent_cache._agent_cache.clear()
+
+
+def _session_with_connectors(rows):
+    session = MagicMock()
+    session.execute = AsyncMock(return_value=rows)
+    return session
+
+
+class TestRequestScoped:
+    """Test cases for per-request dependency proxies."""
+
+    @pytest.mark.asyncio
+    async def test_proxy_resolves_per_request(self):
+        """Test that concurrent requests see their own bound objects."""
+        session = RequestScoped("db_session")
+
+        async def handle_request(name: str) -> str:
+            bind_request_dependencies(db_session=MagicMock(name_attr=name))
+            await asyncio.sleep(0)
+            return session.name_attr
+
+        results = await asyncio.gather(
+            asyncio.create_task(handle_request("first")),
+            asyncio.create_task(handle_request("second")),
+        )
+
+        assert results == ["first", "second"]
+
+    @pytest.mark.asyncio
+    async def test_unbound_proxy_raises(self):
+        """Test that using a proxy outside a request fails loudly."""
+
+        async def outside_request():
+            return RequestScoped("connector_service").session
+
+        with pytest.raises(RuntimeError, match="connector_service"):
+            await asyncio.create_task(outside_request(), context=contextvars.Context())
+
+    @pytest.mark.asyncio
+    async def test_ids_resolve_to_the_current_request(self):
+        """Test that tools of a shared agent get each request's user and thread."""
+        user_id = RequestScoped("user_id")
+        thread_id = RequestScoped("thread_id")
+
+        async def handle_request(user: str, thread: int) -> tuple:
+            bind_request_dependencies(user_id=user, thread_id=thread)
+            await asyncio.sleep(0)
+            return resolve_request_scoped(user_id), resolve_request_scoped(thread_id)
+
+        results = await asyncio.gather(
+            asyncio.create_task(handle_request("user-a", 1)),
+            asyncio.create_task(handle_request("user-b", 2)),
+        )
+
+        assert results == [("user-a", 1), ("user-b", 2)]
+        assert resolve_request_scoped(7) == 7
+
+
+class TestAgentCache:
+    """Test cases for caching compiled agents."""
+
+    def test_cached_agent_is_returned(self):
+        """Test that a stored agent is returned for the same key."""
+        agent = object()
+        store_cached_agent((1, "key"), agent)
+
+        assert get_cached_agent((1, "key")) is agent
+        assert get_cached_agent((1, "other")) is None
+
+    def test_expired_agent_is_dropped(self):
+        """Test that agents past the TTL are rebuilt."""
+        with patch.object(agent_cache.config, "AGENT_CACHE_TTL", -1):
+            store_cached_agent((1, "key"), object())
+
+        assert get_cached_agent((1, "key")) is None
+
+    def test_least_recently_used_agent_is_evicted(self):
+        """Test that the cache stays within AGENT_CACHE_MAX_SIZE."""
+        with patch.object(agent_cache.config, "AGENT_CACHE_MAX_SIZE", 2):
+            store_cached_agent((1, "a"), "a")
+            store_cached_agent((1, "b"), "b")
+            get_cached_agent((1, "a"))
+            store_cached_agent((1, "c"), "c")
+
+        assert get_cached_agent((1, "a")) == "a"
+        assert get_cached_agent((1, "b")) is None
+        assert get_cached_agent((1, "c")) == "c"
+
+    def test_invalidate_search_space(self):
+        """Test that invalidation only drops the given search space."""
+        store_cached_agent((1, "a"), "a")
+        store_cached_agent((2, "b"), "b")
+
+        invalidate_agent_cache(1)
+
+        assert get_cached_agent((1, "a")) is None
+        assert get_cached_agent((2, "b")) == "b"
+
+    @pytest.mark.asyncio
+    async def test_connector_set_version_tracks_mcp_config(self):
+        """Test that MCP server config changes produce a new version."""
+        mcp = SearchSourceConnectorType.MCP_CONNECTOR
+        slack = SearchSourceConnectorType.SLACK_CONNECTOR
+
+        version, types = await get_connector_set_version(
+            _session_with_connectors(
+                [
+                    (1, slack, {"token": "a"}),
+                    (2, mcp, {"server_config": {"url": "http://a"}}),
+                ]
+            ),
+            1,
+        )
+        refreshed_token, _ = await get_connector_set_version(
+            _session_with_connectors(
+                [
+                    (1, slack, {"token": "b"}),
+                    (2, mcp, {"server_config": {"url": "http://a"}}),
+                ]
+            ),
+            1,
+        )
+        new_server, _ = await get_connector_set_version(
+            _session_with_connectors(
+                [
+                    (1, slack, {"token": "a"}),
+                    (2, mcp, {"server_config": {"url": "http://b"}}),
+                ]
+            ),
+            1,
+        )
+
+        assert types == [slack, mcp]
+        assert refreshed_token == version
+        assert new_server != version
@@ -0,0 +1,60 @@
+"""Unit tests for the pooled LangGraph checkpointer."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.agents.new_chat import checkpointer
+
+
+@pytest.fixture(autouse=True)
+def reset_checkpointer():
+    """Start every test without a checkpointer."""
+    checkpointer._checkpointer = None
+    checkpointer._checkpointer_pool = None
+    checkpointer._checkpointer_initialized = False
+    yield
+    checkpointer._checkpointer = None
+    checkpointer._checkpointer_pool = None
+    checkpointer._checkpointer_initialized = False
+
+
+class TestCheckpointer:
+    """Test cases for get_checkpointer and get_checkpoint_durability."""
+
+    @pytest.mark.asyncio
+    async def test_checkpointer_shares_one_pool(self):
+        """Test that the saver is built once on a pool of the configured size."""
+        pool = MagicMock(open=AsyncMock(), close=AsyncMock())
+        saver = MagicMock(setup=AsyncMock())
+
+        with (
+            patch.object(checkpointer.config, "CHECKPOINTER_POOL_MIN_SIZE", 2),
+            patch.object(checkpointer.config, "CHECKPOINTER_POOL_MAX_SIZE", 8),
+            patch.object(
+                checkpointer, "AsyncConnectionPool", return_value=pool
+            ) as pool_cls,
+            patch.object(
+                checkpointer, "AsyncPostgresSaver", return_value=saver
+            ) as saver_cls,
+        ):
+            first = await checkpointer.get_checkpointer()
+            second = await checkpointer.get_checkpointer()
+            await checkpointer.close_checkpointer()
+
+        assert first is second is saver
+        pool_cls.assert_called_once()
+        assert pool_cls.call_args.kwargs["min_size"] == 2
+        assert pool_cls.call_args.kwargs["max_size"] == 8
+        saver_cls.assert_called_once_with(pool)
+        saver.setup.assert_awaited_once()
+        pool.close.assert_awaited_once()
+
+    @pytest.mark.parametrize(
+        ("configured", "expected"),
+        [("exit", "exit"), ("sync", "sync"), ("async", "async"), ("bogus", "async")],
+    )
+    def test_checkpoint_durability(self, configured, expected):
+        """Test that unknown durability modes fall back to LangGraph's default."""
+        with patch.object(checkpointer.config, "CHECKPOINT_DURABILITY", configured):
+            assert checkpointer.get_checkpoint_durability() == expected
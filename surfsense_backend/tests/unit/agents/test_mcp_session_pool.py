@@ -0,0 +1,198 @@
+"""Unit tests for the MCP session pool."""
+
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import anyio
+import pytest
+from mcp import types
+
+from app.agents.new_chat.tools import mcp_session_pool
+from app.agents.new_chat.tools.mcp_session_pool import MCPServer, MCPSessionPool
+
+
+class FakeClientSession:
+    """Stands in for mcp.ClientSession on top of the fake transport."""
+
+    instances: list["FakeClientSession"] = []
+    # Errors raised by the next call_tool calls, across sessions
+    call_errors: list[BaseException] = []
+
+    def __init__(self, read, write, message_handler=None):
+        self.message_handler = message_handler
+        self.list_calls = 0
+        self.tool_calls = 0
+        FakeClientSession.instances.append(self)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def initialize(self):
+        pass
+
+    async def send_ping(self):
+        pass
+
+    async def list_tools(self):
+        self.list_calls += 1
+        return SimpleNamespace(
+            tools=[SimpleNamespace(name="echo", description="Echo", inputSchema={})]
+        )
+
+    async def call_tool(self, name, arguments):
+        self.tool_calls += 1
+        if FakeClientSession.call_errors:
+            raise FakeClientSession.call_errors.pop(0)
+        return SimpleNamespace(content=[SimpleNamespace(text=f"{name}:{arguments}")])
+
+
+def _server(opens: list, fail: bool = False) -> MCPServer:
+    @asynccontextmanager
+    async def open_streams():
+        opens.append(1)
+        if fail:
+            raise OSError("command not found")
+        yield None, None
+
+    return MCPServer(
+        key="1:abc", label="fake", transport="stdio", open_streams=open_streams
+    )
+
+
+@pytest.fixture(autouse=True)
+def fake_client_session():
+    """Run the pool against FakeClientSession."""
+    FakeClientSession.instances = []
+    FakeClientSession.call_errors = []
+    with (
+        patch.object(mcp_session_pool, "ClientSession", FakeClientSession),
+        patch.object(mcp_session_pool, "MAX_RETRIES", 1),
+    ):
+        yield
+
+
+@pytest.fixture
+async def pool():
+    """A fresh pool that is closed after the test."""
+    pool = MCPSessionPool()
+    yield pool
+    await pool.close_all()
+
+
+class TestMCPSessionPool:
+    """Test cases for MCPSessionPool."""
+
+    @pytest.mark.asyncio
+    async def test_tool_calls_reuse_one_session(self, pool):
+        """Test that consecutive calls share one warm session."""
+        opens = []
+        server = _server(opens)
+
+        first = await pool.call_tool(server, "echo", {"text": "a"})
+        second = await pool.call_tool(server, "echo", {"text": "b"})
+
+        assert first == "echo:{'text': 'a'}"
+        assert second == "echo:{'text': 'b'}"
+        assert len(opens) == 1
+
+    @pytest.mark.asyncio
+    async def test_tool_definitions_are_cached_until_list_changes(self, pool):
+        """Test that tools are listed once until the server reports a change."""
+        server = _server([])
+
+        tools = await pool.list_tools(server)
+        await pool.list_tools(server)
+        session = FakeClientSession.instances[0]
+        assert session.list_calls == 1
+        assert tools == [{"name": "echo", "description": "Echo", "input_schema": {}}]
+
+        await session.message_handler(
+            types.ServerNotification(
+                types.ToolListChangedNotification(
+                    method="notifications/tools/list_changed"
+                )
+            )
+        )
+        await pool.list_tools(server)
+
+        assert session.list_calls == 2
+
+    @pytest.mark.asyncio
+    async def test_closed_session_is_reconnected(self, pool):
+        """Test that a session whose task ended is replaced on next use."""
+        opens = []
+        server = _server(opens)
+
+        await pool.call_tool(server, "echo", {})
+        await pool._connections[server.key].close()
+        await pool.call_tool(server, "echo", {})
+
+        assert len(opens) == 2
+
+    @pytest.mark.asyncio
+    async def test_idle_sessions_are_evicted(self, pool):
+        """Test that sessions past the idle timeout are closed."""
+        server = _server([])
+        await pool.call_tool(server, "echo", {})
+
+        with patch.object(mcp_session_pool.config, "MCP_SESSION_IDLE_TIMEOUT", -1):
+            await pool.evict_idle()
+
+        assert pool._connections == {}
+
+    @pytest.mark.asyncio
+    async def test_failing_server_is_not_retried_during_cooldown(self, pool):
+        """Test that a broken server is not reconnected on every call."""
+        opens = []
+        server = _server(opens, fail=True)
+
+        with pytest.raises(RuntimeError, match="Failed to connect"):
+            await pool.call_tool(server, "echo", {})
+        with pytest.raises(RuntimeError, match="unavailable"):
+            await pool.call_tool(server, "echo", {})
+
+        assert len(opens) == 1
+
+    @pytest.mark.asyncio
+    async def test_call_on_closed_transport_is_retried(self, pool):
+        """Test that a request that could not be sent is sent on a new session."""
+        opens = []
+        server = _server(opens)
+        await pool.call_tool(server, "echo", {})
+        FakeClientSession.call_errors = [anyio.ClosedResourceError()]
+
+        result = await pool.call_tool(server, "echo", {"text": "a"})
+
+        assert result == "echo:{'text': 'a'}"
+        assert len(opens) == 2
+
+    @pytest.mark.asyncio
+    async def test_call_that_may_have_run_is_not_retried(self, pool):
+        """Test that a tool is not run twice when the connection drops mid-call."""
+        opens = []
+        server = _server(opens)
+        FakeClientSession.call_errors = [anyio.EndOfStream()]
+
+        with pytest.raises(anyio.EndOfStream):
+            await pool.call_tool(server, "echo", {})
+
+        assert FakeClientSession.instances[0].tool_calls == 1
+        assert pool._connections == {}
+        await pool.call_tool(server, "echo", {})
+        assert len(opens) == 2
+
+    @pytest.mark.asyncio
+    async def test_discard_keeps_a_replacement_session(self, pool):
+        """Test that a late discard of a failed session keeps its replacement."""
+        server = _server([])
+        failed = await pool.get_session(server)
+        await pool._discard(server, failed)
+        replacement = await pool.get_session(server)
+
+        await pool._discard(server, failed)
+
+        assert pool._connections[server.key].session is replacement
@@ -0,0 +1,114 @@
+"""Unit tests for lazy model loading in app.config."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.config import Config, config
+
+
+@pytest.fixture(autouse=True)
+def reset_lazy_models():
+    """Run every test with nothing loaded yet."""
+    with (
+        patch.object(Config, "_embedding_model_instance", None),
+        patch.object(Config, "_embedding_dimension", None),
+        patch.object(Config, "_chunker_instance", None),
+        patch.object(Config, "_code_chunker_instance", None),
+    ):
+        yield
+
+
+class TestLazyModels:
+    """Test cases for the lazily initialized models."""
+
+    def test_configured_dimension_does_not_load_model(self):
+        """Test that EMBEDDING_DIMENSION avoids loading the embedding model."""
+        with (
+            patch.object(Config, "EMBEDDING_DIMENSION", 384),
+            patch("chonkie.AutoEmbeddings.get_embeddings") as get_embeddings,
+        ):
+            assert config.embedding_dimension == 384
+
+        get_embeddings.assert_not_called()
+
+    def test_cached_dimension_does_not_load_model(self):
+        """Test that a cached dimension avoids loading the embedding model."""
+        with (
+            patch.object(Config, "EMBEDDING_DIMENSION", None),
+            patch("app.config._read_cached_embedding_dimension", return_value=768),
+            patch("chonkie.AutoEmbeddings.get_embeddings") as get_embeddings,
+        ):
+            assert config.embedding_dimension == 768
+
+        get_embeddings.assert_not_called()
+
+    def test_unknown_dimension_loads_model_once(self):
+        """Test that the model is loaded once and its dimension cached."""
+        model = MagicMock(dimension=1024, max_seq_length=256)
+        with (
+            patch.object(Config, "EMBEDDING_DIMENSION", None),
+            patch("app.config._read_cached_embedding_dimension", return_value=None),
+            patch("app.config._write_cached_embedding_dimension") as write_cache,
+            patch(
+                "app.config._write_cached_embedding_max_seq_length"
+            ) as write_max_seq_length,
+            patch(
+                "chonkie.AutoEmbeddings.get_embeddings", return_value=model
+            ) as get_embeddings,
+        ):
+            assert config.embedding_dimension == 1024
+            assert config.embedding_model_instance is model
+
+        get_embeddings.assert_called_once()
+        write_cache.assert_called_once_with(config.EMBEDDING_MODEL, 1024)
+        write_max_seq_length.assert_called_once_with(config.EMBEDDING_MODEL, 256)
+
+    def test_chunkers_with_embedding_server_do_not_load_model(self):
+        """Test that chunking in embedding server mode never loads the model."""
+        with (
+            patch.object(Config, "EMBEDDING_SERVER_SOCKET", "/tmp/embeddings.sock"),
+            patch.object(Config, "EMBEDDING_MAX_SEQ_LENGTH", None),
+            patch("app.config._read_cached_embedding_max_seq_length", return_value=256),
+            patch("chonkie.RecursiveChunker") as recursive_chunker,
+            patch("chonkie.CodeChunker") as code_chunker,
+            patch("chonkie.AutoEmbeddings.get_embeddings") as get_embeddings,
+        ):
+            _ = config.chunker_instance
+            _ = config.code_chunker_instance
+
+        get_embeddings.assert_not_called()
+        recursive_chunker.assert_called_once_with(chunk_size=256)
+        code_chunker.assert_called_once_with(chunk_size=256)
+
+    def test_unknown_max_seq_length_with_embedding_server_uses_default(self):
+        """Test that 512 is only used when the server never recorded a value."""
+        with (
+            patch.object(Config, "EMBEDDING_SERVER_SOCKET", "/tmp/embeddings.sock"),
+            patch.object(Config, "EMBEDDING_MAX_SEQ_LENGTH", None),
+            patch(
+                "app.config._read_cached_embedding_max_seq_length", return_value=None
+            ),
+            patch("chonkie.AutoEmbeddings.get_embeddings") as get_embeddings,
+        ):
+            assert config.chunk_size == 512
+
+        get_embeddings.assert_not_called()
+
+    def test_configured_max_seq_length_sets_chunk_size(self):
+        """Test that EMBEDDING_MAX_SEQ_LENGTH is used without loading the model."""
+        with (
+            patch.object(Config, "EMBEDDING_MAX_SEQ_LENGTH", 256),
+            patch("chonkie.AutoEmbeddings.get_embeddings") as get_embeddings,
+        ):
+            assert config.chunk_size == 256
+
+        get_embeddings.assert_not_called()
+
+    def test_dimension_above_pgvector_limit_is_rejected(self):
+        """Test that dimensions PGVector cannot index are rejected."""
+        with (
+            patch.object(Config, "EMBEDDING_DIMENSION", 3072),
+            pytest.raises(ValueError, match="exceeds the maximum of 2000"),
+        ):
+            _ = config.embedding_dimension
@@ -0,0 +1,95 @@
+"""Unit tests for the multi-type hybrid search queries."""
+
+import importlib
+import re
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.retriever.chunks_hybrid_search import ChucksHybridSearchRetriever
+from app.retriever.documents_hybrid_search import DocumentHybridSearchRetriever
+
+EMBEDDING = [0.1, 0.2, 0.3]
+
+
+def _empty_session():
+    """Create a mock session whose ranking query returns no rows."""
+    result = MagicMock()
+    result.all.return_value = []
+    session = MagicMock()
+    session.execute = AsyncMock(return_value=result)
+    return session
+
+
+def _prepare_exact_search(session, search_space_column, search_space_id, distance):
+    """Stand-in for prepare_vector_search choosing the exact strategy."""
+    return distance.op("+")(0)
+
+
+@pytest.fixture
+def prepare_vector_search(retriever_class):
+    module = importlib.import_module(retriever_class.__module__)
+    with patch.object(
+        module, "prepare_vector_search", AsyncMock(side_effect=_prepare_exact_search)
+    ) as prepare:
+        yield prepare
+
+
+def _ranking_sql(session) -> str:
+    return str(
+        session.execute.await_args_list[-1]
+        .args[0]
+        .compile(dialect=postgresql.dialect())
+    )
+
+
+@pytest.mark.parametrize(
+    "retriever_class", [ChucksHybridSearchRetriever, DocumentHybridSearchRetriever]
+)
+class TestHybridSearchByType:
+    """Test cases for hybrid_search_by_type."""
+
+    @pytest.mark.asyncio
+    async def test_every_type_gets_a_limited_ranking(
+        self, retriever_class, prepare_vector_search
+    ):
+        """Test that rankings are limited per type instead of ranking every row."""
+        session = _empty_session()
+
+        results = await retriever_class(session).hybrid_search_by_type(
+            query_text="query",
+            top_k=5,
+            search_space_id=1,
+            document_types=["FILE", "NOTE", "NOT_A_TYPE"],
+            query_embedding=EMBEDDING,
+        )
+
+        sql = _ranking_sql(session)
+        assert results == {"FILE": [], "NOTE": [], "NOT_A_TYPE": []}
+        # Two types, each with a semantic and a keyword branch
+        assert sql.count("UNION ALL") == 2
+        assert sql.count("LIMIT") == 4
+        assert "rank() OVER (PARTITION BY" not in sql
+
+    @pytest.mark.asyncio
+    async def test_vector_search_strategy_is_applied(
+        self, retriever_class, prepare_vector_search
+    ):
+        """Test that every type is ranked by the search space's strategy."""
+        session = _empty_session()
+
+        await retriever_class(session).hybrid_search_by_type(
+            query_text="query",
+            top_k=5,
+            search_space_id=1,
+            document_types=["FILE", "NOTE"],
+            query_embedding=EMBEDDING,
+        )
+
+        sql = _ranking_sql(session)
+        prepare_vector_search.assert_awaited_once()
+        assert prepare_vector_search.await_args.args[0] is session
+        assert prepare_vector_search.await_args.args[2] == 1
+        # Both semantic branches rank and order by the exact-search expression
+        assert len(re.findall(r"embedding <=> %\(\w+\)s\S*\) \+ ", sql)) == 4
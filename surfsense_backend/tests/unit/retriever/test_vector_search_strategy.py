@@ -0,0 +1,93 @@
+"""Unit tests for per-search-space vector search strategy selection."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.db import Chunk
+from app.retriever import vector_search_strategy
+from app.retriever.vector_search_strategy import (
+    get_vector_search_strategy,
+    prepare_vector_search,
+)
+
+
+def _session_returning(*values):
+    """Create a mock session whose execute() results yield the given scalars."""
+    session = MagicMock()
+    results = []
+    for value in values:
+        result = MagicMock()
+        result.scalar.return_value = value
+        results.append(result)
+    session.execute = AsyncMock(side_effect=results)
+    return session
+
+
+@pytest.fixture(autouse=True)
+def reset_strategy_cache():
+    """Start every test with empty module caches."""
+    vector_search_strategy._strategy_cache.clear()
+    vector_search_strategy._iterative_scan_supported = None
+    with patch.object(
+        vector_search_strategy.config, "VECTOR_EXACT_SEARCH_MAX_ROWS", 100
+    ):
+        yield
+
+
+class TestVectorSearchStrategy:
+    """Test cases for get_vector_search_strategy and prepare_vector_search."""
+
+    @pytest.mark.asyncio
+    async def test_small_search_space_uses_exact_search(self):
+        """Test that search spaces under the threshold are searched exactly."""
+        session = _session_returning(42)
+
+        strategy = await get_vector_search_strategy(session, Chunk.search_space_id, 1)
+
+        assert strategy == "exact"
+
+    @pytest.mark.asyncio
+    async def test_large_search_space_uses_hnsw(self):
+        """Test that search spaces over the threshold keep the HNSW index."""
+        session = _session_returning(101)
+
+        strategy = await get_vector_search_strategy(session, Chunk.search_space_id, 1)
+
+        assert strategy == "hnsw"
+
+    @pytest.mark.asyncio
+    async def test_strategy_is_cached(self):
+        """Test that the size lookup runs once per search space within the TTL."""
+        session = _session_returning(42)
+
+        await get_vector_search_strategy(session, Chunk.search_space_id, 1)
+        await get_vector_search_strategy(session, Chunk.search_space_id, 1)
+
+        assert session.execute.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_hnsw_enables_iterative_scan_when_supported(self):
+        """Test that iterative index scans are enabled on pgvector >= 0.8."""
+        session = _session_returning(101, "0.8.0", None)
+        distance = MagicMock()
+
+        result = await prepare_vector_search(
+            session, Chunk.search_space_id, 1, distance
+        )
+
+        assert result is distance
+        assert "hnsw.iterative_scan" in str(session.execute.await_args.args[0])
+
+    @pytest.mark.asyncio
+    async def test_hnsw_skips_iterative_scan_on_old_pgvector(self):
+        """Test that older pgvector versions are left untouched."""
+        session = _session_returning(101, "0.7.4")
+        distance = MagicMock()
+
+        result = await prepare_vector_search(
+            session, Chunk.search_space_id, 1, distance
+        )
+
+        assert result is distance
+        assert session.execute.await_count == 2
@@ -0,0 +1,142 @@
+"""Unit tests for the lean document listing endpoints."""
+
+import json
+import uuid
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+
+from app.routes.documents_routes import (
+    _after_cursor,
+    _decode_cursor,
+    _encode_cursor,
+    _parse_list_fields,
+    export_documents,
+    read_documents,
+)
+
+USER = SimpleNamespace(id=uuid.uuid4())
+UPDATED = datetime(2026, 1, 1, tzinfo=UTC)
+
+
+def _rows(count: int):
+    return [
+        SimpleNamespace(id=100 - i, title=f"doc {i}", updated_at=UPDATED)
+        for i in range(count)
+    ]
+
+
+def _session(rows, total: int):
+    count_result = MagicMock()
+    count_result.scalar.return_value = total
+    rows_result = MagicMock()
+    rows_result.all.return_value = rows
+    session = MagicMock()
+    session.execute = AsyncMock(side_effect=[count_result, rows_result])
+    return session
+
+
+class TestDocumentListing:
+    """Test cases for read_documents and its helpers."""
+
+    def test_fields_select_only_requested_columns(self):
+        """Test that fields= is validated and always includes id."""
+        assert _parse_list_fields("title, updated_at") == ["id", "title", "updated_at"]
+        assert "content" in _parse_list_fields(None)
+
+        with pytest.raises(HTTPException) as exc_info:
+            _parse_list_fields("title,embedding")
+        assert exc_info.value.status_code == 400
+
+    def test_cursor_round_trip(self):
+        """Test that cursors encode updated_at and id, including NULLs."""
+        assert _decode_cursor(_encode_cursor(UPDATED, 7)) == (UPDATED, 7)
+        assert _decode_cursor(_encode_cursor(None, 7)) == (None, 7)
+
+        with pytest.raises(HTTPException):
+            _decode_cursor("not-a-cursor")
+
+    def test_cursor_filter_uses_row_comparison(self):
+        """Test that the keyset filter compares (updated_at, id) together."""
+        sql = str(
+            _after_cursor(_encode_cursor(UPDATED, 7)).compile(
+                dialect=postgresql.dialect()
+            )
+        )
+
+        assert "(documents.updated_at, documents.id) <" in sql
+        assert "documents.updated_at IS NULL" in sql
+
+    @pytest.mark.asyncio
+    async def test_page_returns_projected_rows_and_next_cursor(self):
+        """Test that a page only carries requested fields and a next cursor."""
+        session = _session(_rows(3), total=10)
+
+        response = await read_documents(
+            page_size=2,
+            search_space_id=None,
+            fields="title",
+            session=session,
+            user=USER,
+        )
+
+        listing_sql = str(session.execute.await_args_list[1].args[0])
+        assert "documents.content" not in listing_sql
+        assert "embedding" not in listing_sql
+        assert response.has_more
+        assert response.total == 10
+        assert [item.model_dump(exclude_unset=True) for item in response.items] == [
+            {"id": 100, "title": "doc 0"},
+            {"id": 99, "title": "doc 1"},
+        ]
+        assert _decode_cursor(response.next_cursor) == (UPDATED, 99)
+
+    @pytest.mark.asyncio
+    async def test_last_page_has_no_cursor(self):
+        """Test that the final page does not return a next cursor."""
+        session = _session(_rows(1), total=1)
+
+        response = await read_documents(
+            page_size=2,
+            search_space_id=None,
+            fields="title",
+            cursor=_encode_cursor(UPDATED, 101),
+            session=session,
+            user=USER,
+        )
+
+        assert not response.has_more
+        assert response.next_cursor is None
+
+    @pytest.mark.asyncio
+    async def test_export_streams_ndjson(self):
+        """Test that exported rows are written one JSON object per line."""
+
+        async def partitions():
+            yield _rows(2)
+            yield _rows(1)
+
+        result = MagicMock()
+        result.partitions.return_value = partitions()
+        session = MagicMock()
+        session.stream = AsyncMock(return_value=result)
+
+        response = await export_documents(
+            search_space_id=None,
+            document_types=None,
+            fields="title",
+            session=session,
+            user=USER,
+        )
+        body = "".join([chunk async for chunk in response.body_iterator])
+
+        assert response.media_type == "application/x-ndjson"
+        assert [json.loads(line) for line in body.splitlines()] == [
+            {"id": 100, "title": "doc 0"},
+            {"id": 99, "title": "doc 1"},
+            {"id": 100, "title": "doc 0"},
+        ]
@@ -0,0 +1,90 @@
+"""Unit tests for the logs summary endpoint."""
+
+import uuid
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.db import LogLevel, LogStatus
+from app.routes.logs_routes import get_logs_summary
+
+USER = SimpleNamespace(id=uuid.uuid4())
+CREATED = datetime(2026, 1, 1, tzinfo=UTC)
+
+
+def _counts(**values):
+    mapping = {"total": 0}
+    mapping.update({f"status_{status.name}": 0 for status in LogStatus})
+    mapping.update({f"level_{level.name}": 0 for level in LogLevel})
+    mapping.update(values)
+    result = MagicMock()
+    result.one.return_value = SimpleNamespace(_mapping=mapping)
+    return result
+
+
+def _rows(rows):
+    result = MagicMock()
+    result.all.return_value = rows
+    return result
+
+
+def _log(log_id: int, metadata: dict | None):
+    return SimpleNamespace(
+        id=log_id,
+        message=f"log {log_id}",
+        created_at=CREATED,
+        source="indexer",
+        log_metadata=metadata,
+    )
+
+
+class TestLogsSummary:
+    """Test cases for get_logs_summary."""
+
+    @pytest.mark.asyncio
+    async def test_summary_is_aggregated_in_sql(self):
+        """Test that counts come from FILTER/GROUP BY queries, not loaded logs."""
+        session = MagicMock()
+        session.execute = AsyncMock(
+            side_effect=[
+                _counts(
+                    total=5,
+                    status_IN_PROGRESS=1,
+                    status_FAILED=2,
+                    status_SUCCESS=2,
+                    level_INFO=3,
+                    level_ERROR=2,
+                ),
+                _rows([("indexer", 4), ("chat", 1)]),
+                _rows([_log(1, {"task_name": "index_slack", "connector_id": 3})]),
+                _rows([_log(2, {"error_details": "timeout"}), _log(3, None)]),
+            ]
+        )
+
+        with patch("app.routes.logs_routes.check_permission", AsyncMock()):
+            summary = await get_logs_summary(1, hours=24, session=session, user=USER)
+
+        count_sql = str(
+            session.execute.await_args_list[0]
+            .args[0]
+            .compile(dialect=postgresql.dialect())
+        )
+        assert "FILTER (WHERE logs.status" in count_sql
+        assert summary["total_logs"] == 5
+        assert summary["by_status"] == {
+            "IN_PROGRESS": 1,
+            "FAILED": 2,
+            "SUCCESS": 2,
+        }
+        assert summary["by_level"] == {"INFO": 3, "ERROR": 2}
+        assert summary["by_source"] == {"indexer": 4, "chat": 1}
+        assert summary["active_tasks"][0]["task_name"] == "index_slack"
+        assert summary["active_tasks"][0]["connector_id"] == 3
+        assert [f["error_details"] for f in summary["recent_failures"]] == [
+            "timeout",
+            None,
+        ]
+        assert summary["recent_failures"][1]["task_name"] == "Unknown"
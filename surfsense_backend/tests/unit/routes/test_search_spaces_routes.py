@@ -0,0 +1,87 @@
+"""Unit tests for listing search spaces with aggregated stats."""
+
+import uuid
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+
+from app.routes.search_spaces_routes import (
+    _search_spaces_with_stats_query,
+    read_search_spaces,
+)
+
+USER = SimpleNamespace(id=uuid.uuid4())
+
+
+def _sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def _row(**values):
+    space = SimpleNamespace(
+        id=1,
+        name="Research",
+        description=None,
+        created_at=datetime(2026, 1, 1, tzinfo=UTC),
+        user_id=USER.id,
+        citations_enabled=True,
+        qna_custom_instructions=None,
+    )
+    mapping = {"SearchSpace": space, **values}
+    return SimpleNamespace(SearchSpace=space, _mapping=mapping, **values)
+
+
+class TestReadSearchSpaces:
+    """Test cases for read_search_spaces."""
+
+    def test_stats_are_part_of_one_statement(self):
+        """Test that member counts and ownership come from the listing query."""
+        sql = _sql(_search_spaces_with_stats_query(USER, False, set()))
+
+        assert "count(search_space_memberships_1.id)" in sql
+        assert "coalesce(search_space_memberships.is_owner" in sql
+        assert "documents" not in sql
+
+    def test_optional_stats_are_opt_in(self):
+        """Test that include adds document counts and last activity."""
+        sql = _sql(
+            _search_spaces_with_stats_query(
+                USER, True, {"document_counts", "last_activity"}
+            )
+        )
+
+        assert "AS document_count" in sql
+        assert "greatest(" in sql
+        assert "LEFT OUTER JOIN search_space_memberships" in sql
+
+    @pytest.mark.asyncio
+    async def test_search_spaces_are_loaded_in_one_query(self):
+        """Test that the endpoint makes a single round trip for the page."""
+        result = MagicMock()
+        result.all.return_value = [
+            _row(member_count=3, is_owner=True, document_count=12)
+        ]
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=result)
+
+        spaces = await read_search_spaces(
+            include="document_counts", session=session, user=USER
+        )
+
+        session.execute.assert_awaited_once()
+        assert spaces[0].member_count == 3
+        assert spaces[0].is_owner
+        assert spaces[0].document_count == 12
+        assert spaces[0].last_activity_at is None
+
+    @pytest.mark.asyncio
+    async def test_unknown_include_is_rejected(self):
+        """Test that unsupported include values return 400."""
+        with pytest.raises(HTTPException) as exc_info:
+            await read_search_spaces(include="tokens", session=MagicMock(), user=USER)
+
+        assert exc_info.value.status_code == 400
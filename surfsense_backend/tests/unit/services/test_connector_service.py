@@ -0,0 +1,137 @@
+"""Unit tests for knowledge base retrieval in ConnectorService."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.connector_service import ConnectorService
+
+
+def _doc(doc_id: int, document_type: str) -> dict:
+    return {
+        "document_id": doc_id,
+        "content": f"content {doc_id}",
+        "score": 0.5,
+        "chunks": [{"chunk_id": doc_id * 10, "content": f"content {doc_id}"}],
+        "document": {
+            "id": doc_id,
+            "title": f"Doc {doc_id}",
+            "document_type": document_type,
+            "metadata": {},
+        },
+        "source": document_type,
+    }
+
+
+@pytest.fixture
+def service():
+    """Create a ConnectorService with mocked retrievers."""
+    connector_service = ConnectorService(MagicMock())
+    connector_service._get_query_embedding = AsyncMock(return_value=[0.1, 0.2])
+    connector_service.chunk_retriever = MagicMock()
+    connector_service.document_retriever = MagicMock()
+    connector_service.chunk_retriever.hybrid_search = AsyncMock(return_value=[])
+    connector_service.document_retriever.hybrid_search = AsyncMock(return_value=[])
+    return connector_service
+
+
+class TestPrefetchCombinedSearch:
+    """Test cases for prefetch_combined_search."""
+
+    @pytest.mark.asyncio
+    async def test_prefetch_serves_per_connector_searches(self, service):
+        """Test that prefetched results are used instead of per-type queries."""
+        service.chunk_retriever.hybrid_search_by_type = AsyncMock(
+            return_value={"FILE": [_doc(1, "FILE")], "NOTE": [_doc(2, "NOTE")]}
+        )
+        service.document_retriever.hybrid_search_by_type = AsyncMock(
+            return_value={"FILE": [_doc(1, "FILE")], "NOTE": []}
+        )
+
+        await service.prefetch_combined_search(
+            query_text="query",
+            search_space_id=1,
+            document_types=["FILE", "NOTE"],
+            top_k=5,
+        )
+        result_object, docs = await service.search_files(
+            user_query="query", search_space_id=1, top_k=5
+        )
+        _, note_docs = await service.search_notes(
+            user_query="query", search_space_id=1, top_k=5
+        )
+
+        service.chunk_retriever.hybrid_search.assert_not_called()
+        service.document_retriever.hybrid_search.assert_not_called()
+        assert [d["document_id"] for d in docs] == [1]
+        assert result_object["sources"][0]["id"] == 10
+        assert [d["document_id"] for d in note_docs] == [2]
+
+    @pytest.mark.asyncio
+    async def test_search_with_other_arguments_queries_database(self, service):
+        """Test that prefetched results are only used for matching arguments."""
+        service.chunk_retriever.hybrid_search_by_type = AsyncMock(
+            return_value={"FILE": [_doc(1, "FILE")]}
+        )
+        service.document_retriever.hybrid_search_by_type = AsyncMock(
+            return_value={"FILE": []}
+        )
+
+        await service.prefetch_combined_search(
+            query_text="query",
+            search_space_id=1,
+            document_types=["FILE"],
+            top_k=5,
+        )
+        await service.search_files(user_query="query", search_space_id=1, top_k=10)
+
+        service.chunk_retriever.hybrid_search.assert_awaited_once()
+        service.document_retriever.hybrid_search.assert_awaited_once()
+
+
+class TestConcurrentRetrieval:
+    """Test cases for retrieval with per-leg sessions."""
+
+    @pytest.mark.asyncio
+    async def test_retrievers_use_their_own_sessions(self):
+        """Test that each retriever leg gets a fresh session from the maker."""
+        sessions = []
+
+        def _session_maker():
+            session = MagicMock()
+            session.__aenter__ = AsyncMock(return_value=session)
+            session.__aexit__ = AsyncMock(return_value=None)
+            sessions.append(session)
+            return session
+
+        shared_session = MagicMock()
+        connector_service = ConnectorService(
+            shared_session, session_maker=_session_maker
+        )
+        connector_service._get_query_embedding = AsyncMock(return_value=[0.1])
+
+        with (
+            patch(
+                "app.services.connector_service.ChucksHybridSearchRetriever"
+            ) as chunk_cls,
+            patch(
+                "app.services.connector_service.DocumentHybridSearchRetriever"
+            ) as doc_cls,
+        ):
+            chunk_cls.return_value.hybrid_search = AsyncMock(
+                return_value=[_doc(1, "FILE")]
+            )
+            doc_cls.return_value.hybrid_search = AsyncMock(
+                return_value=[_doc(2, "FILE")]
+            )
+
+            docs = await connector_service._combined_rrf_search(
+                query_text="query", search_space_id=1, document_type="FILE"
+            )
+
+        assert connector_service.supports_concurrent_search
+        assert len(sessions) == 2
+        assert chunk_cls.call_args.args[0] in sessions
+        assert doc_cls.call_args.args[0] in sessions
+        assert chunk_cls.call_args.args[0] is not doc_cls.call_args.args[0]
+        assert {d["document_id"] for d in docs} == {1, 2}
@@ -0,0 +1,165 @@
+"""Unit tests for large document summarization in DoclingService."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from langchain_core.runnables import RunnableLambda
+
+from app.services import docling_service
+from app.services.docling_service import (
+    DoclingService,
+    _group_summaries,
+    _RateLimitBackoff,
+)
+
+
+class FakeChunker:
+    """Splits content on blank lines instead of by tokens."""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def chunk(self, content):
+        return [SimpleNamespace(text=part) for part in content.split("\n\n")]
+
+    def refine(self, chunks):
+        return chunks
+
+
+class FakeLLM:
+    """Records prompts and the highest number of calls running at once."""
+
+    def __init__(self):
+        self.prompts: list[str] = []
+        self.running = 0
+        self.max_running = 0
+
+    async def _call(self, prompt_value):
+        prompt = prompt_value.to_string()
+        self.prompts.append(prompt)
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        if "<section_summaries>" in prompt:
+            return SimpleNamespace(content=f"combined {prompt.count('===') // 2}")
+        return SimpleNamespace(content="chunk summary")
+
+    def runnable(self):
+        return RunnableLambda(self._call)
+
+
+@pytest.fixture
+def service():
+    """A DoclingService without the Docling converter."""
+    return DoclingService.__new__(DoclingService)
+
+
+@pytest.fixture
+def summary_cache():
+    """Keep chunk summaries in a dict instead of Redis."""
+    cache: dict[str, str] = {}
+
+    async def get(key):
+        return cache.get(key)
+
+    async def put(key, summary):
+        cache[key] = summary
+
+    with (
+        patch.object(docling_service, "_get_cached_chunk_summary", get),
+        patch.object(docling_service, "_cache_chunk_summary", put),
+        patch("chonkie.RecursiveChunker", FakeChunker),
+        patch("chonkie.OverlapRefinery", FakeChunker),
+    ):
+        yield cache
+
+
+def _large_document(sections: int) -> str:
+    return "\n\n".join(f"section {i} " + "x" * 10_000 for i in range(sections))
+
+
+class TestLargeDocumentSummary:
+    """Test cases for process_large_document_summary."""
+
+    @pytest.mark.asyncio
+    async def test_chunks_are_summarized_concurrently(self, service, summary_cache):
+        """Test that chunk summaries run up to the configured concurrency."""
+        llm = FakeLLM()
+
+        with patch.object(
+            docling_service.config, "DOCUMENT_SUMMARY_MAX_CONCURRENCY", 3
+        ):
+            summary = await service.process_large_document_summary(
+                _large_document(12), llm.runnable()
+            )
+
+        assert summary == "combined 12"
+        assert llm.max_running == 3
+        assert len(llm.prompts) == 13
+
+    @pytest.mark.asyncio
+    async def test_cached_chunks_are_not_summarized_again(self, service, summary_cache):
+        """Test that a retried document only runs the final combine."""
+        content = _large_document(12)
+        await service.process_large_document_summary(content, FakeLLM().runnable())
+
+        llm = FakeLLM()
+        await service.process_large_document_summary(content, llm.runnable())
+
+        assert len(summary_cache) == 12
+        assert len(llm.prompts) == 1
+
+    @pytest.mark.asyncio
+    async def test_summaries_are_reduced_hierarchically(self, service, summary_cache):
+        """Test that summaries over the combine budget are combined in rounds."""
+        llm = FakeLLM()
+        section = len("=== Section 10 ===\nchunk summary")
+
+        with patch.object(
+            docling_service.config, "DOCUMENT_SUMMARY_COMBINE_MAX_CHARS", section * 4
+        ):
+            summary = await service.process_large_document_summary(
+                _large_document(12), llm.runnable()
+            )
+
+        combine_prompts = [p for p in llm.prompts if "<section_summaries>" in p]
+        # 12 sections -> 3 groups of 4 -> 1 final combine
+        assert len(combine_prompts) == 4
+        assert summary == "combined 3"
+
+
+class TestSummaryHelpers:
+    """Test cases for the map-reduce helpers."""
+
+    def test_group_summaries_respects_budget(self):
+        """Test that groups are consecutive and stay within max_chars."""
+        groups = _group_summaries(["aaaa", "bbbb", "cccc", "dddddddd"], 8)
+
+        assert groups == [["aaaa", "bbbb"], ["cccc"], ["dddddddd"]]
+
+    def test_oversized_summaries_are_paired(self):
+        """Test that summaries over the budget are still combined in pairs."""
+        groups = _group_summaries(["aaaa", "bbbb", "cccc"], 2)
+
+        assert groups == [["aaaa", "bbbb"], ["cccc"]]
+        assert _group_summaries(["aaaa"], 2) == [["aaaa"]]
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_call_is_retried(self):
+        """Test that a 429 is retried after backing off."""
+        calls = []
+
+        async def flaky(_inputs):
+            calls.append(1)
+            if len(calls) == 1:
+                raise type("RateLimited", (Exception,), {"status_code": 429})()
+            return "ok"
+
+        with patch.object(docling_service, "RATE_LIMIT_BACKOFF_SECONDS", 0):
+            result = await _RateLimitBackoff().ainvoke(RunnableLambda(flaky), {})
+
+        assert result == "ok"
+        assert len(calls) == 2
@@ -0,0 +1,100 @@
+"""Unit tests for the local embedding server."""
+
+import asyncio
+import os
+import tempfile
+from unittest.mock import MagicMock, PropertyMock, patch
+
+import numpy as np
+import pytest
+
+from app.config import Config
+from app.services.embedding_server import EmbeddingServer, EmbeddingServerClient
+from app.services.embedding_service import EmbeddingService
+
+
+@pytest.fixture
+def socket_path():
+    """Short socket path (Unix socket paths are limited to ~100 bytes)."""
+    directory = tempfile.mkdtemp()
+    yield os.path.join(directory, "embeddings.sock")
+
+
+@pytest.fixture
+def model():
+    """Embedding model whose vectors encode the text length."""
+    model = MagicMock()
+    model.embed_batch.side_effect = lambda batch: [
+        np.array([len(text), 0.5, -1.0]) for text in batch
+    ]
+    with patch.object(
+        Config, "embedding_model_instance", new_callable=PropertyMock
+    ) as embedding_model_instance:
+        embedding_model_instance.return_value = model
+        yield model
+
+
+async def _start_server(server: EmbeddingServer) -> asyncio.Task:
+    task = asyncio.create_task(server.serve_forever())
+    for _ in range(100):
+        if os.path.exists(server.socket_path):
+            return task
+        await asyncio.sleep(0.01)
+    raise TimeoutError("Embedding server did not start")
+
+
+class TestEmbeddingServer:
+    """Test cases for EmbeddingServer and EmbeddingServerClient."""
+
+    @pytest.mark.asyncio
+    async def test_client_receives_embeddings_in_order(self, socket_path, model):
+        """Test that embeddings round-trip through the socket in input order."""
+        task = await _start_server(EmbeddingServer(socket_path, max_wait_ms=0))
+        try:
+            embeddings = await EmbeddingServerClient(socket_path).embed(
+                ["a", "bbb", "cc"]
+            )
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+        assert [embedding[0] for embedding in embeddings] == [1.0, 3.0, 2.0]
+        assert embeddings[0].dtype == np.float32
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_are_batched(self, socket_path, model):
+        """Test that requests arriving within the wait window share a batch."""
+        task = await _start_server(EmbeddingServer(socket_path, max_wait_ms=200))
+        client = EmbeddingServerClient(socket_path)
+        try:
+            first, second = await asyncio.gather(
+                client.embed(["one"]), client.embed(["three", "fives"])
+            )
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+        assert model.embed_batch.call_count == 1
+        assert [embedding[0] for embedding in first] == [3.0]
+        assert [embedding[0] for embedding in second] == [5.0, 5.0]
+
+    @pytest.mark.asyncio
+    async def test_model_errors_are_returned_to_client(self, socket_path, model):
+        """Test that a failing batch raises on the client instead of hanging."""
+        model.embed_batch.side_effect = RuntimeError("out of memory")
+        task = await _start_server(EmbeddingServer(socket_path, max_wait_ms=0))
+        try:
+            with pytest.raises(RuntimeError, match="out of memory"):
+                await EmbeddingServerClient(socket_path).embed(["text"])
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    @pytest.mark.asyncio
+    async def test_service_falls_back_when_server_is_down(self, socket_path):
+        """Test that an unreachable server falls back to the in-process model."""
+        with patch(
+            "app.services.embedding_server.config.EMBEDDING_SERVER_SOCKET",
+            socket_path,
+        ):
+            assert await EmbeddingService._embed_remote(["text"]) is None
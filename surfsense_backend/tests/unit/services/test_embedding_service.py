@@ -0,0 +1,143 @@
+"""Unit tests for the batched embedding service."""
+
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.embedding_service import EmbeddingService
+
+
+class TestEmbeddingService:
+    """Test cases for EmbeddingService batching."""
+
+    def test_build_batches_respects_batch_size(self):
+        """Test that batches never exceed the configured item count."""
+        texts = [f"text {i}" for i in range(10)]
+
+        batches = EmbeddingService.build_batches(
+            texts, max_batch_size=4, max_batch_tokens=10_000
+        )
+
+        assert batches == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+
+    def test_build_batches_respects_token_budget(self):
+        """Test that batches are split when the token budget is reached."""
+        texts = ["a", "b", "c", "d"]
+
+        batches = EmbeddingService.build_batches(
+            texts,
+            token_counts=[300, 300, 500, 100],
+            max_batch_size=100,
+            max_batch_tokens=600,
+        )
+
+        assert batches == [[0, 1], [2, 3]]
+
+    def test_build_batches_oversized_text_gets_own_batch(self):
+        """Test that a text larger than the budget is still embedded."""
+        batches = EmbeddingService.build_batches(
+            ["small", "huge", "small"],
+            token_counts=[10, 5000, 10],
+            max_batch_size=100,
+            max_batch_tokens=100,
+        )
+
+        assert batches == [[0], [1], [2]]
+
+    @pytest.mark.asyncio
+    async def test_embed_texts_preserves_order(self):
+        """Test that embeddings are returned in input order across batches."""
+        model = MagicMock()
+        model.embed_batch.side_effect = lambda batch: [f"emb:{t}" for t in batch]
+        texts = [f"t{i}" for i in range(7)]
+
+        with patch("app.services.embedding_service.config") as mock_config:
+            mock_config.embedding_model_instance = model
+            mock_config.EMBEDDING_BATCH_SIZE = 3
+            mock_config.EMBEDDING_BATCH_MAX_TOKENS = 10_000
+            mock_config.EMBEDDING_MAX_WORKERS = 2
+            mock_config.EMBEDDING_CACHE_ENABLED = False
+
+            result = await EmbeddingService().embed_texts(texts)
+
+        assert result == [f"emb:{t}" for t in texts]
+        assert model.embed_batch.call_count == 3
+        model.embed.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_embed_texts_uses_cache(self):
+        """Test that cached texts skip the model and only misses are stored."""
+        events: list[str] = []
+        model = MagicMock()
+
+        def embed_batch(batch):
+            events.append("embed")
+            return [f"emb:{t}" for t in batch]
+
+        model.embed_batch.side_effect = embed_batch
+        cached = SimpleNamespace(
+            text_hash=EmbeddingService.hash_text("cached"), embedding="emb:from-cache"
+        )
+        connection = MagicMock()
+        connection.execute = AsyncMock(side_effect=[[cached], None])
+
+        @asynccontextmanager
+        async def open_connection():
+            events.append("open")
+            yield connection
+            events.append("close")
+
+        with (
+            patch("app.services.embedding_service.config") as mock_config,
+            patch("app.services.embedding_service._cache_engine") as engine,
+        ):
+            engine.connect.side_effect = open_connection
+            engine.begin.side_effect = open_connection
+            mock_config.embedding_model_instance = model
+            mock_config.EMBEDDING_SERVER_SOCKET = None
+            mock_config.EMBEDDING_BATCH_SIZE = 64
+            mock_config.EMBEDDING_BATCH_MAX_TOKENS = 10_000
+            mock_config.EMBEDDING_MAX_WORKERS = 2
+            mock_config.EMBEDDING_CACHE_ENABLED = True
+
+            result = await EmbeddingService().embed_texts(["cached", "new", "new"])
+
+        assert result == ["emb:from-cache", "emb:new", "emb:new"]
+        model.embed_batch.assert_called_once_with(["new"])
+        # No connection is held while the model runs
+        assert events == ["open", "close", "embed", "open", "close"]
+        stored = connection.execute.await_args_list[1].args[0].compile().params
+        assert EmbeddingService.hash_text("new") in stored.values()
+        assert "emb:new" in stored.values()
+
+    @pytest.mark.asyncio
+    async def test_embed_query_reuses_recent_queries(self):
+        """Test that repeated queries are embedded once and the LRU is bounded."""
+        model = MagicMock()
+        model.embed.side_effect = lambda text: f"emb:{text}"
+        service = EmbeddingService()
+
+        with (
+            patch("app.services.embedding_service.config") as mock_config,
+            patch.object(EmbeddingService, "_query_cache", OrderedDict()),
+        ):
+            mock_config.embedding_model_instance = model
+            mock_config.EMBEDDING_MODEL = "test-model"
+            mock_config.EMBEDDING_MAX_WORKERS = 2
+            mock_config.QUERY_EMBEDDING_CACHE_SIZE = 2
+
+            assert await service.embed_query("a") == "emb:a"
+            assert await service.embed_query("a") == "emb:a"
+            await service.embed_query("b")
+            await service.embed_query("c")
+            await service.embed_query("a")
+
+        assert [call.args[0] for call in model.embed.call_args_list] == [
+            "a",
+            "b",
+            "c",
+            "a",
+        ]
@@ -0,0 +1,80 @@
+"""Unit tests for the Vercel AI SDK streaming service."""
+
+import json
+from unittest.mock import patch
+
+from app.services import new_streaming_service
+from app.services.new_streaming_service import VercelStreamingService
+
+
+def _parse(frames: str) -> list[dict]:
+    """Split SSE output into the JSON parts it carries."""
+    return [
+        json.loads(event.removeprefix("data: "))
+        for event in frames.split("\n\n")
+        if event and event != "data: [DONE]"
+    ]
+
+
+class TestVercelStreamingService:
+    """Test cases for SSE formatting and text delta coalescing."""
+
+    def test_text_delta_frame_is_valid_json(self):
+        """Test that the templated text-delta frame escapes its content."""
+        service = VercelStreamingService(coalesce_ms=0)
+
+        frame = service.format_text_delta("text_1", 'say "hi"\né')
+
+        assert frame.startswith("data: ") and frame.endswith("\n\n")
+        assert _parse(frame) == [
+            {"type": "text-delta", "id": "text_1", "delta": 'say "hi"\né'}
+        ]
+
+    def test_deltas_are_held_within_window(self):
+        """Test that deltas are held until the time window has passed."""
+        service = VercelStreamingService(coalesce_ms=20, coalesce_chars=256)
+
+        with patch.object(new_streaming_service.time, "monotonic", return_value=0):
+            assert service.buffer_text_delta("text_1", "Hello, ") == ""
+            assert service.buffer_text_delta("text_1", "world") == ""
+            assert service.flush_text_delta_if_due() == ""
+
+        with patch.object(new_streaming_service.time, "monotonic", return_value=1):
+            frame = service.buffer_text_delta("text_1", "!")
+
+        assert _parse(frame) == [
+            {"type": "text-delta", "id": "text_1", "delta": "Hello, world!"}
+        ]
+        assert service.flush_text_delta() == ""
+
+    def test_size_limit_flushes_immediately(self):
+        """Test that reaching coalesce_chars sends the held text."""
+        service = VercelStreamingService(coalesce_ms=1000, coalesce_chars=4)
+
+        assert service.buffer_text_delta("text_1", "ab") == ""
+        frame = service.buffer_text_delta("text_1", "cd")
+
+        assert _parse(frame) == [
+            {"type": "text-delta", "id": "text_1", "delta": "abcd"}
+        ]
+
+    def test_other_parts_flush_held_text_first(self):
+        """Test that held text is sent before the next part, preserving order."""
+        service = VercelStreamingService(coalesce_ms=1000, coalesce_chars=256)
+
+        service.buffer_text_delta("text_1", "partial")
+        frames = service.format_text_end("text_1") + service.format_done()
+
+        assert _parse(frames) == [
+            {"type": "text-delta", "id": "text_1", "delta": "partial"},
+            {"type": "text-end", "id": "text_1"},
+        ]
+        assert frames.endswith("data: [DONE]\n\n")
+
+    def test_disabled_coalescing_sends_every_delta(self):
+        """Test that coalesce_ms=0 keeps one part per delta."""
+        service = VercelStreamingService(coalesce_ms=0)
+
+        assert _parse(service.buffer_text_delta("text_1", "a")) == [
+            {"type": "text-delta", "id": "text_1", "delta": "a"}
+        ]
@@ -0,0 +1,104 @@
+"""Unit tests for throttled out-of-band progress updates."""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import inspect
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.db import Log, LogLevel, LogStatus
+from app.services import progress_reporter
+from app.services.progress_reporter import ProgressReporter
+
+
+class FakeSession:
+    """Records the statements each separate progress session executes."""
+
+    writes: list[dict] = []
+
+    def __init__(self, bind):
+        self.bind = bind
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement):
+        self.writes.append(statement.compile(dialect=postgresql.dialect()).params)
+
+    async def commit(self):
+        pass
+
+
+@pytest.fixture
+def writes():
+    FakeSession.writes = []
+    with patch.object(progress_reporter, "AsyncSession", FakeSession):
+        yield FakeSession.writes
+
+
+@pytest.fixture
+def log_entry():
+    """A persisted Log with its metadata loaded."""
+    log = Log(
+        id=1,
+        level=LogLevel.INFO,
+        status=LogStatus.IN_PROGRESS,
+        message="started",
+        log_metadata={"task_name": "index_slack"},
+        search_space_id=1,
+    )
+    make_transient_to_detached(log)
+    return log
+
+
+def _patch(write: dict) -> dict:
+    return json.loads(next(v for v in write.values() if str(v).startswith("{")))
+
+
+class TestProgressReporter:
+    """Test cases for ProgressReporter."""
+
+    @pytest.mark.asyncio
+    async def test_updates_within_interval_are_coalesced(self, writes, log_entry):
+        """Test that ticks between writes are merged into one trailing UPDATE."""
+        reporter = ProgressReporter(log_entry, None, "log_metadata", min_interval=0.05)
+
+        assert await reporter.report({"processed": 1}, message="1 done")
+        assert not await reporter.report({"processed": 2}, message="2 done")
+        assert not await reporter.report({"stage": "storing"}, message="3 done")
+        assert len(writes) == 1
+
+        await asyncio.sleep(0.1)
+
+        assert len(writes) == 2
+        assert writes[1]["message"] == "3 done"
+        assert _patch(writes[1]) == {"processed": 2, "stage": "storing"}
+
+    @pytest.mark.asyncio
+    async def test_instance_is_updated_without_becoming_dirty(self, writes, log_entry):
+        """Test that the caller's object shows progress its session won't flush."""
+        reporter = ProgressReporter(log_entry, None, "log_metadata", min_interval=0)
+
+        await reporter.report({"processed": 5}, message="5 done")
+
+        assert log_entry.message == "5 done"
+        assert log_entry.log_metadata == {"task_name": "index_slack", "processed": 5}
+        assert not inspect(log_entry).modified
+
+    @pytest.mark.asyncio
+    async def test_close_writes_pending_update_once(self, writes, log_entry):
+        """Test that close() writes pending progress and stops the timer."""
+        reporter = ProgressReporter(log_entry, None, "log_metadata", min_interval=60)
+
+        await reporter.report(message="first")
+        await reporter.report(message="pending")
+        await reporter.close()
+        await reporter.report(message="after close")
+
+        assert [write["message"] for write in writes] == ["first", "pending"]
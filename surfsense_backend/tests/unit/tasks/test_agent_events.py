@@ -0,0 +1,103 @@
+"""Unit tests for the chat agent event stream."""
+
+from unittest.mock import patch
+
+import pytest
+from langchain_core.messages import AIMessage, AIMessageChunk, ToolMessage
+
+from app.tasks.chat import agent_events
+from app.tasks.chat.agent_events import stream_agent_events
+
+
+class FakeAgent:
+    """Replays LangGraph stream chunks for a model call followed by a tool."""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.stream_kwargs = None
+
+    async def astream(self, input_state, **kwargs):
+        self.stream_kwargs = kwargs
+        for chunk in self.chunks:
+            yield chunk
+
+
+def _tool_call_chunks():
+    tool_call = {"name": "search_knowledge_base", "args": {"query": "q"}, "id": "c1"}
+    tool_message = ToolMessage(
+        content='{"result_length": 3}', tool_call_id="c1", name="search_knowledge_base"
+    )
+    return [
+        ("messages", (AIMessageChunk(content="Let me "), {})),
+        ("messages", (AIMessageChunk(content="check."), {})),
+        ("messages", (tool_message, {})),
+        (
+            "updates",
+            {"model": {"messages": [AIMessage(content="", tool_calls=[tool_call])]}},
+        ),
+        ("updates", {"tools": {"messages": [tool_message]}}),
+        # Middleware writing old messages back must not repeat tool events
+        (
+            "updates",
+            {
+                "SummarizationMiddleware.before_model": {
+                    "messages": [
+                        AIMessage(content="", tool_calls=[tool_call]),
+                        tool_message,
+                    ]
+                }
+            },
+        ),
+        ("custom", {"progress": 50}),
+    ]
+
+
+class TestStreamAgentEvents:
+    """Test cases for stream_agent_events."""
+
+    @pytest.mark.asyncio
+    async def test_stream_modes_produce_translator_events(self):
+        """Test that stream chunks become astream_events-shaped events."""
+        agent = FakeAgent(_tool_call_chunks())
+
+        with patch.object(agent_events.config, "CHAT_STREAM_MODE", "updates"):
+            events = [
+                event
+                async for event in stream_agent_events(
+                    agent, {"messages": []}, {"configurable": {"thread_id": "1"}}
+                )
+            ]
+
+        assert agent.stream_kwargs["stream_mode"] == ["messages", "updates", "custom"]
+        assert [event["event"] for event in events] == [
+            "on_chat_model_stream",
+            "on_chat_model_stream",
+            "on_chain_end",
+            "on_tool_start",
+            "on_chain_end",
+            "on_tool_end",
+            "on_chain_end",
+            "on_custom_event",
+        ]
+        assert events[0]["data"]["chunk"].content == "Let me "
+        assert events[3]["name"] == "search_knowledge_base"
+        assert events[3]["run_id"] == "c1"
+        assert events[3]["data"]["input"] == {"query": "q"}
+        assert events[5]["run_id"] == "c1"
+        assert events[5]["data"]["output"].content == '{"result_length": 3}'
+
+    @pytest.mark.asyncio
+    async def test_events_mode_uses_astream_events(self):
+        """Test that CHAT_STREAM_MODE=events keeps the callback event path."""
+
+        class EventAgent:
+            async def astream_events(self, input_state, **kwargs):
+                assert kwargs["version"] == "v2"
+                yield {"event": "on_chat_model_start"}
+
+        with patch.object(agent_events.config, "CHAT_STREAM_MODE", "events"):
+            events = [
+                event async for event in stream_agent_events(EventAgent(), {}, {})
+            ]
+
+        assert events == [{"event": "on_chat_model_start"}]
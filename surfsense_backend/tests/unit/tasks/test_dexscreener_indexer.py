@@ -357,7 +357,7 @@ class TestDexScreenerIndexer:
              patch("app.tasks.connector_indexers.dexscreener_indexer.get_user_long_context_llm") as mock_get_llm, \
              patch("app.tasks.connector_indexers.dexscreener_indexer.create_document_chunks") as mock_create_chunks, \
              patch("app.tasks.connector_indexers.dexscreener_indexer.update_connector_last_indexed", new_callable=AsyncMock) as mock_update_indexed, \
-             patch("app.tasks.connector_indexers.dexscreener_indexer.config") as mock_config, \
+             patch("app.tasks.connector_indexers.dexscreener_indexer.get_embedding_service") as mock_get_embedding_service, \
              patch("app.tasks.connector_indexers.dexscreener_indexer.TaskLoggingService") as mock_task_logger:
 
             # Setup mocks
@@ -375,13 +375,13 @@ class TestDexScreenerIndexer:
             # Mock LLM service returns None (fallback mode)
             mock_get_llm.return_value = None
 
-            # Mock embedding model - use side_effect to return unique embeddings
-            mock_embedding_instance = MagicMock()
-            mock_embedding_instance.embed.side_effect = [
+            # Mock embedding service - use side_effect to return unique embeddings
+            mock_embedding_service = MagicMock()
+            mock_embedding_service.embed_text = AsyncMock(side_effect=[
                 [0.1] * 384,
                 [0.2] * 384,
-            ]
-            mock_config.embedding_model_instance = mock_embedding_instance
+            ])
+            mock_get_embedding_service.return_value = mock_embedding_service
 
             # Mock chunk creation
             mock_create_chunks.return_value = []
@@ -404,7 +404,7 @@ class TestDexScreenerIndexer:
             # Assertions - should use fallback summary
             assert error is None
             assert documents_indexed == 2
-            mock_embedding_instance.embed.assert_called()
+            mock_embedding_service.embed_text.assert_awaited()
 
     @pytest.mark.asyncio
     async def test_index_pairs_update_last_indexed_false(self, async_session, mock_connector_config, mock_pair_data):
@@ -0,0 +1,268 @@
+"""Unit tests for the bulk document lookup and writer used by indexers."""
+
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.db import Chunk, Document
+from app.tasks.connector_indexers import base
+from app.tasks.connector_indexers.base import (
+    DocumentWriter,
+    ExistingDocument,
+    build_contents,
+    prefetch_documents,
+)
+
+
+def _session(rows):
+    """A session whose queries return the given (id, uid, hash, type) rows."""
+    result = MagicMock()
+    result.all.return_value = rows
+    session = MagicMock()
+    session.execute = AsyncMock(return_value=result)
+    return session
+
+
+ROWS = [
+    (1, "uid-1", "hash-1", "SLACK_CONNECTOR"),
+    (2, "uid-2", "hash-2", "SLACK_CONNECTOR"),
+]
+
+
+class TestPrefetchDocuments:
+    """Test cases for prefetch_documents and DocumentLookup."""
+
+    @pytest.mark.asyncio
+    async def test_unchanged_and_new_items_need_no_query(self):
+        """Test that unchanged and new items are answered from the prefetch."""
+        session = _session(ROWS)
+        lookup = await prefetch_documents(session, ["uid-1", "uid-2", "uid-3"])
+
+        unchanged = await lookup.get_by_unique_identifier("uid-1", "hash-1")
+        new = await lookup.get_by_unique_identifier("uid-3", "hash-3")
+
+        assert unchanged == ExistingDocument(1, "uid-1", "hash-1", "SLACK_CONNECTOR")
+        assert new is None
+        assert lookup.is_unchanged("uid-2", "hash-2")
+        assert session.execute.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_changed_item_loads_full_document(self):
+        """Test that only changed items load the document with its chunks."""
+        session = _session(ROWS)
+        lookup = await prefetch_documents(session, ["uid-1"])
+        document = object()
+
+        with patch.object(
+            base,
+            "check_document_by_unique_identifier",
+            AsyncMock(return_value=document),
+        ) as check:
+            existing = await lookup.get_by_unique_identifier("uid-1", "changed")
+
+        assert existing is document
+        check.assert_awaited_once_with(session, "uid-1")
+
+    @pytest.mark.asyncio
+    async def test_repeated_and_unknown_identifiers_fall_back(self):
+        """Test that identifiers outside the batch, or seen before, are queried."""
+        session = _session([])
+        lookup = await prefetch_documents(session, ["uid-1"])
+
+        with patch.object(
+            base, "check_document_by_unique_identifier", AsyncMock(return_value=None)
+        ) as check:
+            await lookup.get_by_unique_identifier("uid-1", "hash-1")
+            await lookup.get_by_unique_identifier("uid-1", "hash-1")
+            await lookup.get_by_unique_identifier("uid-9", "hash-9")
+
+        assert [call.args[1] for call in check.await_args_list] == ["uid-1", "uid-9"]
+
+    @pytest.mark.asyncio
+    async def test_duplicate_by_hash(self):
+        """Test that content hash duplicates are answered from the prefetch."""
+        session = _session(ROWS)
+        lookup = await prefetch_documents(session, ["uid-1"], ["hash-2", "hash-3"])
+
+        with patch.object(
+            base, "check_duplicate_document_by_hash", AsyncMock(return_value=None)
+        ) as check:
+            assert (await lookup.get_duplicate_by_hash("hash-2")).id == 2
+            assert await lookup.get_duplicate_by_hash("hash-3") is None
+            await lookup.get_duplicate_by_hash("hash-4")
+
+        check.assert_awaited_once_with(session, "hash-4")
+
+    @pytest.mark.asyncio
+    async def test_large_batches_are_split(self):
+        """Test that IN lists are limited to PREFETCH_BATCH_SIZE hashes."""
+        session = _session([])
+
+        with patch.object(base, "PREFETCH_BATCH_SIZE", 2):
+            await prefetch_documents(session, [f"uid-{i}" for i in range(5)])
+
+        assert session.execute.await_count == 3
+
+    def test_build_contents_leaves_failed_items_to_the_loop(self):
+        """Test that items whose content cannot be built get None."""
+        items = [{"text": "a"}, {}, {"text": ""}]
+
+        contents = build_contents(items, lambda item: item["text"])
+
+        assert contents == ["a", None, ""]
+
+
+class FakeWriteSession:
+    """Records bulk inserts; inserts of documents titled "bad" fail."""
+
+    def __init__(self):
+        self.document_rows: list[dict] = []
+        self.chunk_rows: list[dict] = []
+        self.commit = AsyncMock()
+        self.flush = AsyncMock()
+        self.next_id = 100
+
+    @asynccontextmanager
+    async def begin_nested(self):
+        yield
+
+    async def execute(self, statement, rows):
+        if statement.table.name == "chunks":
+            self.chunk_rows.extend(rows)
+            return None
+        if any(row["title"] == "bad" for row in rows):
+            raise IntegrityError("INSERT", {}, Exception("duplicate content_hash"))
+        self.document_rows.extend(rows)
+        ids = list(range(self.next_id, self.next_id + len(rows)))
+        self.next_id += len(rows)
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = ids
+        return result
+
+
+def _document(title: str, chunk_count: int = 2) -> Document:
+    return Document(
+        title=title,
+        content=f"{title} content",
+        content_hash=f"{title}-hash",
+        chunks=[Chunk(content=f"{title} {i}", position=i) for i in range(chunk_count)],
+    )
+
+
+class TestDocumentWriter:
+    """Test cases for DocumentWriter."""
+
+    @pytest.mark.asyncio
+    async def test_batch_is_bulk_inserted(self):
+        """Test that a full batch is written with one insert per table."""
+        session = FakeWriteSession()
+        writer = DocumentWriter(session, batch_size=2, max_batch_bytes=10**6)
+        first, second = _document("first"), _document("second")
+
+        await writer.add(first)
+        assert session.document_rows == []
+
+        await writer.add(second)
+
+        assert [row["title"] for row in session.document_rows] == ["first", "second"]
+        assert [row["document_id"] for row in session.chunk_rows] == [
+            100,
+            100,
+            101,
+            101,
+        ]
+        assert (first.id, second.id) == (100, 101)
+        session.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_byte_budget_flushes_early(self):
+        """Test that a batch is written once it reaches max_batch_bytes."""
+        session = FakeWriteSession()
+        writer = DocumentWriter(session, batch_size=100, max_batch_bytes=10)
+
+        await writer.add(_document("large"))
+
+        assert len(session.document_rows) == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_is_retried_per_document(self):
+        """Test that one failing document does not drop the whole batch."""
+        session = FakeWriteSession()
+        writer = DocumentWriter(session, batch_size=10, max_batch_bytes=10**6)
+
+        for title in ("good", "bad", "also good"):
+            await writer.add(_document(title, chunk_count=1))
+        failed = await writer.flush()
+
+        assert [row["title"] for row in session.document_rows] == [
+            "good",
+            "also good",
+        ]
+        assert len(session.chunk_rows) == 2
+        assert writer.documents_written == 2
+        assert writer.documents_failed == failed == 1
+        assert writer.failure_message == "1 documents could not be saved: bad"
+        session.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_failure_message_is_none_without_failures(self):
+        """Test that a clean run reports no failures."""
+        writer = DocumentWriter(
+            FakeWriteSession(), batch_size=10, max_batch_bytes=10**6
+        )
+
+        await writer.add(_document("good"))
+
+        assert await writer.flush() == 0
+        assert writer.failure_message is None
+
+    @pytest.mark.asyncio
+    async def test_lookup_sees_documents_in_the_writer(self):
+        """Test that items repeating a buffered or written document match it."""
+        writer = DocumentWriter(
+            FakeWriteSession(), batch_size=10, max_batch_bytes=10**6
+        )
+        lookup = await prefetch_documents(
+            _session([]), ["uid-a"], ["a-hash"], writer=writer
+        )
+        document = _document("a")
+        document.unique_identifier_hash = "uid-a"
+
+        assert await lookup.get_by_unique_identifier("uid-a", "a-hash") is None
+        await writer.add(document)
+
+        with (
+            patch.object(base, "check_document_by_unique_identifier") as by_id,
+            patch.object(base, "check_duplicate_document_by_hash") as by_hash,
+        ):
+            same_item = await lookup.get_by_unique_identifier("uid-a", "a-hash")
+            same_content = await lookup.get_duplicate_by_hash("a-hash")
+            await writer.flush()
+            written = await lookup.get_duplicate_by_hash("a-hash")
+
+        by_id.assert_not_called()
+        by_hash.assert_not_called()
+        assert same_item is document
+        assert same_content is document
+        assert written == ExistingDocument(100, "uid-a", "a-hash", None)
+
+    @pytest.mark.asyncio
+    async def test_buffered_document_updated_again_is_inserted_once(self):
+        """Test that a later item updating a buffered document adds no row."""
+        session = FakeWriteSession()
+        writer = DocumentWriter(session, batch_size=10, max_batch_bytes=10**6)
+        document = _document("a")
+        document.unique_identifier_hash = "uid-a"
+
+        await writer.add(document)
+        document.content_hash = "changed-hash"
+        await writer.add(writer.get_buffered("uid-a"))
+        await writer.flush()
+
+        assert [row["content_hash"] for row in session.document_rows] == [
+            "changed-hash"
+        ]
+        assert writer.get_by_content_hash("a-hash") is None
+        assert writer.get_by_content_hash("changed-hash").id == 100
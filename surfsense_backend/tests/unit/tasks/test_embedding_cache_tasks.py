@@ -0,0 +1,71 @@
+"""Unit tests for the embedding cache cleanup task."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.tasks.celery_tasks import embedding_cache_tasks
+from app.tasks.celery_tasks.embedding_cache_tasks import _cleanup_embedding_cache
+
+
+def _session(rowcounts):
+    """A session whose DELETE statements report the given row counts."""
+    session = MagicMock()
+    session.execute = AsyncMock(
+        side_effect=[MagicMock(rowcount=count) for count in rowcounts]
+    )
+    session.commit = AsyncMock()
+    session.__aenter__ = AsyncMock(return_value=session)
+    session.__aexit__ = AsyncMock(return_value=False)
+    return session
+
+
+class TestCleanupEmbeddingCache:
+    """Test cases for _cleanup_embedding_cache."""
+
+    @pytest.mark.asyncio
+    async def test_deletes_in_batches_until_done(self):
+        """Test that expired rows are deleted batch by batch, one commit each."""
+        session = _session([2, 1])
+
+        with (
+            patch.object(embedding_cache_tasks, "config") as mock_config,
+            patch.object(embedding_cache_tasks, "CLEANUP_BATCH_SIZE", 2),
+            patch.object(
+                embedding_cache_tasks,
+                "get_celery_session_maker",
+                return_value=MagicMock(return_value=session),
+            ),
+        ):
+            mock_config.EMBEDDING_CACHE_RETENTION_DAYS = 30
+            mock_config.EMBEDDING_MODEL = "model-a"
+
+            deleted = await _cleanup_embedding_cache()
+
+        assert deleted == 3
+        assert session.execute.await_count == 2
+        assert session.commit.await_count == 2
+        statement = session.execute.await_args.args[0].compile(
+            dialect=postgresql.dialect()
+        )
+        sql = str(statement)
+        assert sql.startswith("DELETE FROM embedding_cache")
+        assert "embedding_cache.created_at <" in sql
+        assert "embedding_cache.model_name !=" in sql
+        assert "model-a" in statement.params.values()
+
+    @pytest.mark.asyncio
+    async def test_zero_retention_keeps_everything(self):
+        """Test that a retention of 0 days disables the cleanup."""
+        maker = MagicMock()
+
+        with (
+            patch.object(embedding_cache_tasks, "config") as mock_config,
+            patch.object(embedding_cache_tasks, "get_celery_session_maker", maker),
+        ):
+            mock_config.EMBEDDING_CACHE_RETENTION_DAYS = 0
+
+            assert await _cleanup_embedding_cache() == 0
+
+        maker.assert_not_called()
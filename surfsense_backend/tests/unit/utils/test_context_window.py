@@ -0,0 +1,105 @@
+"""Unit tests for fitting document content into a model's context window."""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from litellm import token_counter
+
+from app.utils import document_converters
+from app.utils.document_converters import (
+    _search_content_length,
+    _truncate_to_tokens,
+    get_model_context_window,
+    optimize_content_for_context_window,
+)
+
+MODEL = "gpt-4o"
+
+
+def _content_tokens(text: str) -> int:
+    return token_counter(
+        messages=[
+            {
+                "role": "user",
+                "content": f"<DOCUMENT_CONTENT>\n\n{text}\n\n</DOCUMENT_CONTENT>",
+            }
+        ],
+        model=MODEL,
+    )
+
+
+class FakeHuggingFaceTokenizer:
+    """Splits on single characters and reports their offsets."""
+
+    def encode(self, text, add_special_tokens=True):
+        return SimpleNamespace(
+            ids=list(range(len(text))),
+            offsets=[(i, i + 1) for i in range(len(text))],
+        )
+
+
+class TestOptimizeContentForContextWindow:
+    """Test cases for optimize_content_for_context_window."""
+
+    def test_content_is_cut_at_token_budget(self):
+        """Test that the fitted content matches the token_counter search."""
+        content = "The quick brown fox jumps over the lazy dog. é " * 4000
+
+        with patch.object(
+            document_converters, "get_model_context_window", return_value=12_000
+        ):
+            optimized = optimize_content_for_context_window(content, None, MODEL)
+
+        assert content.startswith(optimized)
+        assert _content_tokens(optimized) <= 10_000
+        expected = _search_content_length(content, 10_000, MODEL)
+        assert abs(len(optimized) - expected) <= 8
+
+    def test_short_content_is_unchanged(self):
+        """Test that content within the budget is returned whole."""
+        with patch.object(
+            document_converters, "get_model_context_window", return_value=12_000
+        ):
+            assert (
+                optimize_content_for_context_window("short text", None, MODEL)
+                == "short text"
+            )
+
+    def test_unknown_tokenizer_falls_back_to_search(self):
+        """Test that token_counter search is used without a tokenizer."""
+        content = "word " * 5000
+
+        with (
+            patch.object(
+                document_converters, "get_model_context_window", return_value=3000
+            ),
+            patch.object(document_converters, "_get_tokenizer", return_value=None),
+        ):
+            optimized = optimize_content_for_context_window(content, None, MODEL)
+
+        assert len(optimized) == _search_content_length(content, 1000, MODEL)
+
+    def test_huggingface_tokenizer_uses_offsets(self):
+        """Test that Hugging Face tokenizers are cut at the token offset."""
+        tokenizer = {
+            "type": "huggingface_tokenizer",
+            "tokenizer": FakeHuggingFaceTokenizer(),
+        }
+
+        assert _truncate_to_tokens("abcdefgh" * 10, 5, tokenizer) == "abcde"
+        assert _truncate_to_tokens("abc", 5, tokenizer) == "abc"
+
+    def test_model_info_is_cached(self):
+        """Test that get_model_info is looked up once per model."""
+        get_model_context_window.cache_clear()
+
+        with patch.object(
+            document_converters,
+            "get_model_info",
+            return_value={"max_input_tokens": 1000},
+        ) as get_model_info:
+            get_model_context_window("cached-model")
+            get_model_context_window("cached-model")
+
+        get_model_context_window.cache_clear()
+        get_model_info.assert_called_once_with("cached-model")
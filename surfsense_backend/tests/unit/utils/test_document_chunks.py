@@ -0,0 +1,74 @@
+"""Unit tests for incremental chunk diffing in create_document_chunks."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.db import Chunk, Document
+from app.utils.document_converters import create_document_chunks
+
+
+def _chonkie_chunks(*texts):
+    return [SimpleNamespace(text=text, token_count=len(text)) for text in texts]
+
+
+class TestCreateDocumentChunks:
+    """Test cases for create_document_chunks."""
+
+    @pytest.mark.asyncio
+    async def test_reuses_unchanged_chunks(self):
+        """Test that unchanged chunks keep their rows and only new text is embedded."""
+        kept_a = Chunk(id=1, content="alpha", embedding=[0.1], position=0)
+        removed = Chunk(id=2, content="beta", embedding=[0.2], position=1)
+        kept_c = Chunk(id=3, content="gamma", embedding=[0.3], position=2)
+        document = Document(id=10, chunks=[kept_a, removed, kept_c])
+
+        embedding_service = MagicMock()
+        embedding_service.hash_text.side_effect = lambda text: f"h:{text}"
+        embedding_service.embed_texts = AsyncMock(return_value=[[0.9]])
+
+        with (
+            patch("app.utils.document_converters.config") as mock_config,
+            patch(
+                "app.utils.document_converters.get_embedding_service",
+                return_value=embedding_service,
+            ),
+        ):
+            mock_config.chunker_instance.chunk.return_value = _chonkie_chunks(
+                "alpha", "delta", "gamma"
+            )
+            result = await create_document_chunks("alpha delta gamma", document)
+
+        assert result[0] is kept_a
+        assert result[2] is kept_c
+        assert result[1].id is None
+        assert result[1].content == "delta"
+        assert result[1].embedding == [0.9]
+        assert [chunk.position for chunk in result] == [0, 1, 2]
+        embedding_service.embed_texts.assert_awaited_once_with(
+            ["delta"], token_counts=[5]
+        )
+
+    @pytest.mark.asyncio
+    async def test_new_document_embeds_all_chunks(self):
+        """Test that all chunks are embedded when there is no existing document."""
+        embedding_service = MagicMock()
+        embedding_service.hash_text.side_effect = lambda text: f"h:{text}"
+        embedding_service.embed_texts = AsyncMock(return_value=[[0.1], [0.2]])
+
+        with (
+            patch("app.utils.document_converters.config") as mock_config,
+            patch(
+                "app.utils.document_converters.get_embedding_service",
+                return_value=embedding_service,
+            ),
+        ):
+            mock_config.chunker_instance.chunk.return_value = _chonkie_chunks(
+                "one", "two"
+            )
+            result = await create_document_chunks("one two")
+
+        assert [chunk.content for chunk in result] == ["one", "two"]
+        assert [chunk.embedding for chunk in result] == [[0.1], [0.2]]
+        assert [chunk.position for chunk in result] == [0, 1]
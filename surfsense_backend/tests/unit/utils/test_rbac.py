@@ -0,0 +1,121 @@
+"""Unit tests for the cached search space permission resolver."""
+
+import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+
+from app.utils import rbac
+from app.utils.rbac import (
+    check_permission,
+    invalidate_access_cache,
+    resolve_access,
+)
+
+USER = SimpleNamespace(id=uuid.uuid4())
+
+
+def _membership(permissions, is_owner=False):
+    role = SimpleNamespace(name="Editor", permissions=permissions)
+    return SimpleNamespace(is_owner=is_owner, role=role)
+
+
+def _session():
+    session = MagicMock()
+    session.info = {}
+    return session
+
+
+@pytest.fixture(autouse=True)
+def access_cache():
+    """Start each test with an empty process cache and a 60s TTL."""
+    invalidate_access_cache()
+    with patch.object(rbac.config, "PERMISSION_CACHE_TTL", 60):
+        yield
+    invalidate_access_cache()
+
+
+class TestResolveAccess:
+    """Test cases for resolve_access and check_permission."""
+
+    @pytest.mark.asyncio
+    async def test_membership_is_queried_once_per_request(self):
+        """Test that repeated checks in one request share one query."""
+        lookup = AsyncMock(return_value=_membership(["documents:read"]))
+
+        with patch.object(rbac, "get_user_membership", lookup):
+            session = _session()
+            await check_permission(session, USER, 1, "documents:read")
+            access = await check_permission(session, USER, 1, "documents:read")
+
+        assert access.permissions == ("documents:read",)
+        assert access.role_name == "Editor"
+        lookup.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_process_cache_is_shared_until_invalidated(self):
+        """Test that other requests reuse the entry until it is invalidated."""
+        lookup = AsyncMock(return_value=_membership(["documents:read"]))
+
+        with patch.object(rbac, "get_user_membership", lookup):
+            await resolve_access(_session(), USER.id, 1)
+            await resolve_access(_session(), USER.id, 1)
+            assert lookup.await_count == 1
+
+            invalidate_access_cache(1)
+            await resolve_access(_session(), USER.id, 1)
+
+        assert lookup.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_non_members_are_not_cached_across_requests(self):
+        """Test that a user who just joined is not denied by a stale entry."""
+        lookup = AsyncMock(side_effect=[None, _membership(["documents:read"])])
+
+        with patch.object(rbac, "get_user_membership", lookup):
+            with pytest.raises(HTTPException) as exc_info:
+                await check_permission(_session(), USER, 1, "documents:read")
+            await check_permission(_session(), USER, 1, "documents:read")
+
+        assert exc_info.value.status_code == 403
+
+    @pytest.mark.asyncio
+    async def test_owner_has_full_access(self):
+        """Test that owners pass any permission check."""
+        lookup = AsyncMock(return_value=_membership([], is_owner=True))
+
+        with patch.object(rbac, "get_user_membership", lookup):
+            access = await check_permission(_session(), USER, 1, "settings:delete")
+
+        assert access.is_owner
+
+    @pytest.mark.asyncio
+    async def test_disabled_ttl_only_memoizes_per_request(self):
+        """Test that PERMISSION_CACHE_TTL=0 queries once per request."""
+        lookup = AsyncMock(return_value=_membership(["documents:read"]))
+
+        with (
+            patch.object(rbac.config, "PERMISSION_CACHE_TTL", 0),
+            patch.object(rbac, "get_user_membership", lookup),
+        ):
+            await resolve_access(_session(), USER.id, 1)
+            await resolve_access(_session(), USER.id, 1)
+
+        assert lookup.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_are_pruned(self):
+        """Test that caching new access drops entries that have expired."""
+        lookup = AsyncMock(return_value=_membership(["documents:read"]))
+        expired_key = (uuid.uuid4(), 2)
+        rbac._access_cache[expired_key] = (0.0, MagicMock())
+
+        with (
+            patch.object(rbac, "_next_prune_at", 0.0),
+            patch.object(rbac, "get_user_membership", lookup),
+        ):
+            await resolve_access(_session(), USER.id, 1)
+
+        assert list(rbac._access_cache) == [(USER.id, 1)]